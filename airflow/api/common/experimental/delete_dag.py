@@ -24,6 +24,7 @@ from airflow import models
 from airflow.exceptions import DagNotFound
 from airflow.models import DagModel, TaskFail
 from airflow.models.serialized_dag import SerializedDagModel
+from airflow.models.xcom import BaseXCom, XCom
 from airflow.utils.session import provide_session
 
 log = logging.getLogger(__name__)
@@ -56,7 +57,10 @@ def delete_dag(dag_id: str, keep_records_in_log: bool = True, session=None) -> i
             if keep_records_in_log and model.__name__ == 'Log':
                 continue
             cond = or_(model.dag_id == dag_id, model.dag_id.like(dag_id + ".%"))
-            count += session.query(model).filter(cond).delete(synchronize_session='fetch')
+            query = session.query(model).filter(cond)
+            if issubclass(model, BaseXCom):
+                XCom.purge_stored_values(query, session=session)
+            count += query.delete(synchronize_session='fetch')
     if dag.is_subdag:
         parent_dag_id, task_id = dag_id.rsplit(".", 1)
         for model in TaskFail, models.TaskInstance:
@@ -31,6 +31,7 @@ from airflow.exceptions import SerializedDagNotFound
 from airflow.models.dag import DagModel
 from airflow.security import permissions
 from airflow.utils.session import provide_session
+from airflow.www.structure_cache import conditional_json_response
 
 
 @security.requires_access([(permissions.ACTION_CAN_READ, permissions.RESOURCE_DAG)])
@@ -54,7 +55,10 @@ def get_dag_details(dag_id):
         raise NotFound("DAG not found", detail=f"The DAG with dag_id: {dag_id} was not found")
     if dag is None:
         raise NotFound("DAG not found", detail=f"The DAG with dag_id: {dag_id} was not found")
-    return dag_detail_schema.dump(dag)
+    dag_hash = current_app.dag_bag.dags_hash.get(dag_id)
+    # is_paused is read from the database, so it is part of the key next to the structure
+    key = None if dag_hash is None else ('dag_details', dag_id, dag_hash, dag.is_paused)
+    return conditional_json_response(key, lambda: dag_detail_schema.dump(dag))
 
 
 @security.requires_access([(permissions.ACTION_CAN_READ, permissions.RESOURCE_DAG)])
@@ -21,18 +21,39 @@ from sqlalchemy import or_
 from airflow._vendor.connexion import NoContent
 from airflow.api_connexion import security
 from airflow.api_connexion.exceptions import AlreadyExists, BadRequest, NotFound
-from airflow.api_connexion.parameters import apply_sorting, check_limit, format_datetime, format_parameters
+from airflow.api_connexion.parameters import (
+    Keyset,
+    apply_sorting,
+    check_bulk_size,
+    check_limit,
+    format_datetime,
+    format_parameters,
+    paginate,
+)
 from airflow.api_connexion.schemas.dag_run_schema import (
     DAGRunCollection,
+    dagrun_bulk_create_form_schema,
+    dagrun_bulk_result_collection_schema,
     dagrun_collection_schema,
     dagrun_schema,
     dagruns_batch_form_schema,
 )
+from airflow.api_connexion.streaming import stream_ndjson, wants_ndjson
 from airflow.models import DagModel, DagRun
 from airflow.security import permissions
+from airflow.utils import timezone
 from airflow.utils.session import provide_session
+from airflow.utils.state import State
 from airflow.utils.types import DagRunType
 
+# Orderings for which keyset pagination and streaming are supported
+DAG_RUN_KEYSETS = {
+    "id": Keyset(DagRun.id),
+    "-id": Keyset(DagRun.id, descending=True),
+    "execution_date": Keyset(DagRun.execution_date, DagRun.id),
+    "-execution_date": Keyset(DagRun.execution_date, DagRun.id, descending=True),
+}
+
 
 @security.requires_access(
     [
@@ -96,6 +117,8 @@ def get_dag_runs(
     offset=None,
     limit=None,
     order_by='id',
+    cursor=None,
+    skip_total_entries=False,
 ):  # pylint: disable=too-many-arguments
     """Get all DAG Runs."""
     query = session.query(DagRun)
@@ -107,7 +130,22 @@ def get_dag_runs(
     else:
         query = query.filter(DagRun.dag_id == dag_id)
 
-    dag_run, total_entries = _fetch_dag_runs(
+    if wants_ndjson():
+        keyset = DAG_RUN_KEYSETS.get(order_by)
+        if keyset is None:
+            raise BadRequest(detail=f"Streaming is not supported with order_by '{order_by}'")
+        query = _apply_date_filters_to_query(
+            query,
+            end_date_gte,
+            end_date_lte,
+            execution_date_gte,
+            execution_date_lte,
+            start_date_gte,
+            start_date_lte,
+        )
+        return stream_ndjson(query, keyset, dagrun_schema.dump, cursor)
+
+    dag_run, total_entries, next_cursor = _fetch_dag_runs(
         query,
         end_date_gte,
         end_date_lte,
@@ -118,9 +156,14 @@ def get_dag_runs(
         limit,
         offset,
         order_by,
+        cursor,
+        skip_total_entries,
     )
 
-    return dagrun_collection_schema.dump(DAGRunCollection(dag_runs=dag_run, total_entries=total_entries))
+    response = dagrun_collection_schema.dump(DAGRunCollection(dag_runs=dag_run, total_entries=total_entries))
+    if next_cursor:
+        response["next_cursor"] = next_cursor
+    return response
 
 
 def _fetch_dag_runs(
@@ -134,6 +177,8 @@ def _fetch_dag_runs(
     limit,
     offset,
     order_by,
+    cursor=None,
+    skip_total_entries=False,
 ):  # pylint: disable=too-many-arguments
     query = _apply_date_filters_to_query(
         query,
@@ -145,7 +190,7 @@ def _fetch_dag_runs(
         start_date_lte,
     )
     # Count items
-    total_entries = query.count()
+    total_entries = None if skip_total_entries else query.count()
     # sort
     to_replace = {"dag_run_id": "run_id"}
     allowed_filter_attrs = [
@@ -159,10 +204,14 @@ def _fetch_dag_runs(
         "external_trigger",
         "conf",
     ]
-    query = apply_sorting(query, order_by, to_replace, allowed_filter_attrs)
+    keyset = DAG_RUN_KEYSETS.get(order_by)
+    if keyset is not None:
+        query = keyset.order(query)
+    else:
+        query = apply_sorting(query, order_by, to_replace, allowed_filter_attrs)
     # apply offset and limit
-    dag_run = query.offset(offset).limit(limit).all()
-    return dag_run, total_entries
+    dag_run, next_cursor = paginate(query, limit, offset, cursor, keyset)
+    return dag_run, total_entries, next_cursor
 
 
 def _apply_date_filters_to_query(
@@ -210,7 +259,7 @@ def get_dag_runs_batch(session):
     else:
         query = query.filter(DagRun.dag_id.in_(readable_dag_ids))
 
-    dag_runs, total_entries = _fetch_dag_runs(
+    dag_runs, total_entries, _ = _fetch_dag_runs(
         query,
         data["end_date_gte"],
         data["end_date_lte"],
@@ -265,3 +314,78 @@ def post_dag_run(dag_id, session):
     raise AlreadyExists(
         detail=f"DAGRun with DAG ID: '{dag_id}' and DAGRun ID: '{post_body['run_id']}' already exists"
     )
+
+
+@security.requires_access(
+    [
+        (permissions.ACTION_CAN_EDIT, permissions.RESOURCE_DAG),
+        (permissions.ACTION_CAN_CREATE, permissions.RESOURCE_DAG_RUN),
+    ]
+)
+@provide_session
+def post_dag_runs_bulk(dag_id, session):
+    """Trigger many runs of a DAG in a single transaction."""
+    if not session.query(DagModel).filter(DagModel.dag_id == dag_id).first():
+        raise NotFound(title="DAG not found", detail=f"DAG with dag_id: '{dag_id}' not found")
+    try:
+        items = check_bulk_size(dagrun_bulk_create_form_schema.load(request.json)["dag_runs"])
+    except ValidationError as err:
+        raise BadRequest(detail=str(err.messages))
+
+    results = {}
+    post_bodies = {}
+    for index, item in enumerate(items):
+        try:
+            post_bodies[index] = dagrun_schema.load(item, session=session)
+        except ValidationError as err:
+            results[index] = {"index": index, "status": 400, "detail": str(err.messages)}
+        except BadRequest as err:
+            results[index] = {"index": index, "status": 400, "detail": err.detail}
+
+    existing = []
+    if post_bodies:
+        existing = (
+            session.query(DagRun.run_id, DagRun.execution_date)
+            .filter(
+                DagRun.dag_id == dag_id,
+                or_(
+                    DagRun.run_id.in_({body["run_id"] for body in post_bodies.values()}),
+                    DagRun.execution_date.in_({body["execution_date"] for body in post_bodies.values()}),
+                ),
+            )
+            .all()
+        )
+    # Runs created earlier in the same request count as existing ones too
+    taken_run_ids = {run_id for run_id, _ in existing}
+    taken_execution_dates = {execution_date for _, execution_date in existing}
+
+    # Column defaults are filled in here, as bulk inserted runs are not refreshed from the database
+    start_date = timezone.utcnow()
+    dag_runs = {}
+    for index, post_body in post_bodies.items():
+        if post_body["execution_date"] in taken_execution_dates:
+            detail = (
+                f"DAGRun with DAG ID: '{dag_id}' and "
+                f"DAGRun ExecutionDate: '{post_body['execution_date']}' already exists"
+            )
+            results[index] = {"index": index, "status": 409, "detail": detail}
+        elif post_body["run_id"] in taken_run_ids:
+            detail = f"DAGRun with DAG ID: '{dag_id}' and DAGRun ID: '{post_body['run_id']}' already exists"
+            results[index] = {"index": index, "status": 409, "detail": detail}
+        else:
+            taken_run_ids.add(post_body["run_id"])
+            taken_execution_dates.add(post_body["execution_date"])
+            dag_runs[index] = DagRun(
+                dag_id=dag_id,
+                run_type=DagRunType.MANUAL,
+                start_date=start_date,
+                external_trigger=True,
+                state=State.RUNNING,
+                **post_body,
+            )
+
+    session.bulk_save_objects(list(dag_runs.values()))
+    session.commit()
+    for index, dag_run in dag_runs.items():
+        results[index] = {"index": index, "status": 200, "dag_run": dag_run}
+    return dagrun_bulk_result_collection_schema.dump({"results": [results[i] for i in sorted(results)]})
@@ -19,17 +19,24 @@
 from sqlalchemy import func
 
 from airflow.api_connexion import security
-from airflow.api_connexion.exceptions import NotFound
-from airflow.api_connexion.parameters import apply_sorting, check_limit, format_parameters
+from airflow.api_connexion.exceptions import BadRequest, NotFound
+from airflow.api_connexion.parameters import Keyset, apply_sorting, check_limit, format_parameters, paginate
 from airflow.api_connexion.schemas.event_log_schema import (
     EventLogCollection,
     event_log_collection_schema,
     event_log_schema,
 )
+from airflow.api_connexion.streaming import stream_ndjson, wants_ndjson
 from airflow.models import Log
 from airflow.security import permissions
 from airflow.utils.session import provide_session
 
+# Orderings for which keyset pagination and streaming are supported
+EVENT_LOG_KEYSETS = {
+    "event_log_id": Keyset(Log.id),
+    "-event_log_id": Keyset(Log.id, descending=True),
+}
+
 
 @security.requires_access([(permissions.ACTION_CAN_READ, permissions.RESOURCE_AUDIT_LOG)])
 @provide_session
@@ -44,7 +51,9 @@ def get_event_log(event_log_id, session):
 @security.requires_access([(permissions.ACTION_CAN_READ, permissions.RESOURCE_AUDIT_LOG)])
 @format_parameters({'limit': check_limit})
 @provide_session
-def get_event_logs(session, limit, offset=None, order_by='event_log_id'):
+def get_event_logs(
+    session, limit, offset=None, order_by='event_log_id', cursor=None, skip_total_entries=False
+):  # pylint: disable=too-many-arguments
     """Get all log entries from event log"""
     to_replace = {"event_log_id": "id", "when": "dttm"}
     allowed_filter_attrs = [
@@ -57,10 +66,22 @@ def get_event_logs(session, limit, offset=None, order_by='event_log_id'):
         "owner",
         "extra",
     ]
-    total_entries = session.query(func.count(Log.id)).scalar()
+    keyset = EVENT_LOG_KEYSETS.get(order_by)
     query = session.query(Log)
-    query = apply_sorting(query, order_by, to_replace, allowed_filter_attrs)
-    event_logs = query.offset(offset).limit(limit).all()
-    return event_log_collection_schema.dump(
+    if wants_ndjson():
+        if keyset is None:
+            raise BadRequest(detail=f"Streaming is not supported with order_by '{order_by}'")
+        return stream_ndjson(query, keyset, event_log_schema.dump, cursor)
+
+    total_entries = None if skip_total_entries else session.query(func.count(Log.id)).scalar()
+    if keyset is not None:
+        query = keyset.order(query)
+    else:
+        query = apply_sorting(query, order_by, to_replace, allowed_filter_attrs)
+    event_logs, next_cursor = paginate(query, limit, offset, cursor, keyset)
+    response = event_log_collection_schema.dump(
         EventLogCollection(event_logs=event_logs, total_entries=total_entries)
     )
+    if next_cursor:
+        response["next_cursor"] = next_cursor
+    return response
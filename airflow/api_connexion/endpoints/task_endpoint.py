@@ -24,6 +24,7 @@ from airflow.api_connexion.exceptions import BadRequest, NotFound
 from airflow.api_connexion.schemas.task_schema import TaskCollection, task_collection_schema, task_schema
 from airflow.exceptions import TaskNotFound
 from airflow.security import permissions
+from airflow.www.structure_cache import conditional_json_response
 
 
 @security.requires_access(
@@ -56,11 +57,14 @@ def get_tasks(dag_id, order_by='task_id'):
     dag: DAG = current_app.dag_bag.get_dag(dag_id)
     if not dag:
         raise NotFound("DAG not found")
-    tasks = dag.tasks
 
-    try:
-        tasks = sorted(tasks, key=attrgetter(order_by.lstrip('-')), reverse=(order_by[0:1] == '-'))
-    except AttributeError as err:
-        raise BadRequest(detail=str(err))
-    task_collection = TaskCollection(tasks=tasks, total_entries=len(tasks))
-    return task_collection_schema.dump(task_collection)
+    def render():
+        try:
+            tasks = sorted(dag.tasks, key=attrgetter(order_by.lstrip('-')), reverse=(order_by[0:1] == '-'))
+        except AttributeError as err:
+            raise BadRequest(detail=str(err))
+        return task_collection_schema.dump(TaskCollection(tasks=tasks, total_entries=len(tasks)))
+
+    dag_hash = current_app.dag_bag.dags_hash.get(dag_id)
+    key = None if dag_hash is None else ('tasks', dag_id, dag_hash, order_by)
+    return conditional_json_response(key, render)
@@ -14,6 +14,7 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+from collections import defaultdict
 from typing import Any, List, Optional, Tuple
 
 from flask import current_app, request
@@ -23,17 +24,27 @@ from sqlalchemy import and_, func
 from airflow.api.common.experimental.mark_tasks import set_state
 from airflow.api_connexion import security
 from airflow.api_connexion.exceptions import BadRequest, NotFound
-from airflow.api_connexion.parameters import format_datetime, format_parameters
+from airflow.api_connexion.parameters import (
+    Keyset,
+    check_bulk_size,
+    format_datetime,
+    format_parameters,
+    paginate,
+)
 from airflow.api_connexion.schemas.task_instance_schema import (
+    SetTaskInstanceStateBulkResult,
     TaskInstanceCollection,
     TaskInstanceReferenceCollection,
     clear_task_instance_form,
+    set_task_instance_state_bulk_form,
+    set_task_instance_state_bulk_result_schema,
     set_task_instance_state_form,
     task_instance_batch_form,
     task_instance_collection_schema,
     task_instance_reference_collection_schema,
     task_instance_schema,
 )
+from airflow.api_connexion.streaming import stream_ndjson, wants_ndjson
 from airflow.exceptions import SerializedDagNotFound
 from airflow.models import SlaMiss
 from airflow.models.dagrun import DagRun as DR
@@ -42,6 +53,9 @@ from airflow.security import permissions
 from airflow.utils.session import provide_session
 from airflow.utils.state import State
 
+# Rows of the task instance list are (TaskInstance, SlaMiss) tuples
+TASK_INSTANCE_KEYSET = Keyset(TI.dag_id, TI.task_id, TI.execution_date, get_object=lambda row: row[0])
+
 
 @security.requires_access(
     [
@@ -125,6 +139,8 @@ def get_task_instances(
     pool: Optional[List[str]] = None,
     queue: Optional[List[str]] = None,
     offset: Optional[int] = None,
+    cursor: Optional[str] = None,
+    skip_total_entries: bool = False,
     session=None,
 ):  # pylint: disable=too-many-arguments
     """Get list of task instances."""
@@ -150,7 +166,10 @@ def get_task_instances(
     base_query = _apply_array_filter(base_query, key=TI.queue, values=queue)
 
     # Count elements before joining extra columns
-    total_entries = base_query.with_entities(func.count('*')).scalar()
+    if skip_total_entries or wants_ndjson():
+        total_entries = None
+    else:
+        total_entries = base_query.with_entities(func.count('*')).scalar()
     # Add join
     base_query = base_query.join(
         SlaMiss,
@@ -162,11 +181,18 @@ def get_task_instances(
         isouter=True,
     )
     ti_query = base_query.add_entity(SlaMiss)
-    task_instances = ti_query.offset(offset).limit(limit).all()
+    if wants_ndjson():
+        return stream_ndjson(ti_query, TASK_INSTANCE_KEYSET, task_instance_schema.dump, cursor)
 
-    return task_instance_collection_schema.dump(
+    ti_query = TASK_INSTANCE_KEYSET.order(ti_query)
+    task_instances, next_cursor = paginate(ti_query, limit, offset, cursor, TASK_INSTANCE_KEYSET)
+
+    response = task_instance_collection_schema.dump(
         TaskInstanceCollection(task_instances=task_instances, total_entries=total_entries)
     )
+    if next_cursor:
+        response["next_cursor"] = next_cursor
+    return response
 
 
 @security.requires_access(
@@ -313,3 +339,87 @@ def post_set_task_instances_state(dag_id, session):
     return task_instance_reference_collection_schema.dump(
         TaskInstanceReferenceCollection(task_instances=tis_with_run_id)
     )
+
+
+@security.requires_access(
+    [
+        (permissions.ACTION_CAN_READ, permissions.RESOURCE_DAG),
+        (permissions.ACTION_CAN_READ, permissions.RESOURCE_DAG_RUN),
+        (permissions.ACTION_CAN_EDIT, permissions.RESOURCE_TASK_INSTANCE),
+    ]
+)
+@provide_session
+def post_set_task_instances_state_bulk(dag_id, session):
+    """Set the state of task instances of many tasks in a single transaction."""
+    body = request.get_json()
+    try:
+        updates = check_bulk_size(set_task_instance_state_bulk_form.load(body)["updates"])
+    except ValidationError as err:
+        raise BadRequest(detail=str(err.messages))
+
+    error_message = f"Dag ID {dag_id} not found"
+    try:
+        dag = current_app.dag_bag.get_dag(dag_id)
+        if not dag:
+            raise NotFound(error_message)
+    except SerializedDagNotFound:
+        # If DAG is not found in serialized_dag table
+        raise NotFound(error_message)
+
+    results = []
+    # Updates that only differ by task are applied together by a single set_state call
+    tasks_by_options = defaultdict(list)
+    for index, update in enumerate(updates):
+        try:
+            data = set_task_instance_state_form.load(update)
+        except ValidationError as err:
+            results.append({"index": index, "status": 400, "detail": str(err.messages)})
+            continue
+        except BadRequest as err:
+            results.append({"index": index, "status": 400, "detail": err.detail})
+            continue
+        task = dag.task_dict.get(data["task_id"])
+        if not task:
+            results.append({"index": index, "status": 404, "detail": f"Task ID {data['task_id']} not found"})
+            continue
+        options = (
+            data.get("dry_run", True),
+            data["execution_date"],
+            data["include_upstream"],
+            data["include_downstream"],
+            data["include_future"],
+            data["include_past"],
+            data["new_state"],
+        )
+        tasks_by_options[options].append((index, task))
+
+    tis = {}
+    for options, indexed_tasks in tasks_by_options.items():
+        dry_run, execution_date, upstream, downstream, future, past, new_state = options
+        altered = set_state(
+            tasks=[task for _, task in indexed_tasks],
+            execution_date=execution_date,
+            upstream=upstream,
+            downstream=downstream,
+            future=future,
+            past=past,
+            state=new_state,
+            commit=not dry_run,
+            session=session,
+        )
+        for ti in altered:
+            tis[(ti.dag_id, ti.task_id, ti.execution_date)] = ti
+        results.extend({"index": index, "status": 200} for index, _ in indexed_tasks)
+
+    execution_dates = {ti.execution_date for ti in tis.values()}
+    execution_date_to_run_id_map = dict(
+        session.query(DR.execution_date, DR.run_id).filter(
+            DR.dag_id == dag_id, DR.execution_date.in_(execution_dates)
+        )
+    )
+    tis_with_run_id = [(ti, execution_date_to_run_id_map.get(ti.execution_date)) for ti in tis.values()]
+    return set_task_instance_state_bulk_result_schema.dump(
+        SetTaskInstanceStateBulkResult(
+            results=sorted(results, key=lambda result: result["index"]), task_instances=tis_with_run_id
+        )
+    )
@@ -22,8 +22,13 @@ from sqlalchemy import func
 
 from airflow.api_connexion import security
 from airflow.api_connexion.exceptions import BadRequest, NotFound
-from airflow.api_connexion.parameters import apply_sorting, check_limit, format_parameters
-from airflow.api_connexion.schemas.variable_schema import variable_collection_schema, variable_schema
+from airflow.api_connexion.parameters import apply_sorting, check_bulk_size, check_limit, format_parameters
+from airflow.api_connexion.schemas.variable_schema import (
+    variable_bulk_form_schema,
+    variable_bulk_result_collection_schema,
+    variable_collection_schema,
+    variable_schema,
+)
 from airflow.models import Variable
 from airflow.security import permissions
 from airflow.utils.session import provide_session
@@ -99,3 +104,37 @@ def post_variables() -> Response:
         raise BadRequest("Invalid Variable schema", detail=str(err.messages))
     Variable.set(data["key"], data["val"])
     return variable_schema.dump(data)
+
+
+@security.requires_access([(permissions.ACTION_CAN_CREATE, permissions.RESOURCE_VARIABLE)])
+@provide_session
+def post_variables_bulk(session) -> Response:
+    """Create or replace many variables in a single transaction"""
+    try:
+        items = check_bulk_size(variable_bulk_form_schema.load(request.json)["variables"])
+    except ValidationError as err:
+        raise BadRequest("Invalid Variable schema", detail=str(err.messages))
+
+    results = []
+    values = {}
+    for index, item in enumerate(items):
+        try:
+            data = variable_schema.load(item)
+        except ValidationError as err:
+            results.append({"index": index, "status": 400, "detail": str(err.messages)})
+            continue
+        if data["key"] in values:
+            results.append(
+                {
+                    "index": index,
+                    "key": data["key"],
+                    "status": 400,
+                    "detail": "The variable key appears more than once in the request",
+                }
+            )
+            continue
+        values[data["key"]] = data["val"]
+        results.append({"index": index, "key": data["key"], "status": 200})
+
+    Variable.set_many(values, session=session)
+    return variable_bulk_result_collection_schema.dump({"results": results})
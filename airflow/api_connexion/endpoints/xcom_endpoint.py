@@ -22,18 +22,22 @@ from sqlalchemy.orm.session import Session
 
 from airflow.api_connexion import security
 from airflow.api_connexion.exceptions import NotFound
-from airflow.api_connexion.parameters import check_limit, format_parameters
+from airflow.api_connexion.parameters import Keyset, check_limit, format_parameters, paginate
 from airflow.api_connexion.schemas.xcom_schema import (
     XComCollection,
     XComCollectionItemSchema,
     XComCollectionSchema,
+    xcom_collection_item_schema,
     xcom_collection_schema,
     xcom_schema,
 )
+from airflow.api_connexion.streaming import stream_ndjson, wants_ndjson
 from airflow.models import DagRun as DR, XCom
 from airflow.security import permissions
 from airflow.utils.session import provide_session
 
+XCOM_KEYSET = Keyset(XCom.execution_date, XCom.task_id, XCom.dag_id, XCom.key)
+
 
 @security.requires_access(
     [
@@ -52,7 +56,9 @@ def get_xcom_entries(
     session: Session,
     limit: Optional[int],
     offset: Optional[int] = None,
-) -> XComCollectionSchema:
+    cursor: Optional[str] = None,
+    skip_total_entries: bool = False,
+) -> XComCollectionSchema:  # pylint: disable=too-many-arguments
     """Get all XCom values"""
     query = session.query(XCom)
     if dag_id == '~':
@@ -68,10 +74,18 @@ def get_xcom_entries(
         query = query.filter(XCom.task_id == task_id)
     if dag_run_id != '~':
         query = query.filter(DR.run_id == dag_run_id)
-    query = query.order_by(XCom.execution_date, XCom.task_id, XCom.dag_id, XCom.key)
-    total_entries = query.count()
-    query = query.offset(offset).limit(limit)
-    return xcom_collection_schema.dump(XComCollection(xcom_entries=query.all(), total_entries=total_entries))
+    if wants_ndjson():
+        return stream_ndjson(query, XCOM_KEYSET, xcom_collection_item_schema.dump, cursor)
+
+    total_entries = None if skip_total_entries else query.count()
+    query = XCOM_KEYSET.order(query)
+    xcom_entries, next_cursor = paginate(query, limit, offset, cursor, XCOM_KEYSET)
+    response = xcom_collection_schema.dump(
+        XComCollection(xcom_entries=xcom_entries, total_entries=total_entries)
+    )
+    if next_cursor:
+        response["next_cursor"] = next_cursor
+    return response
 
 
 @security.requires_access(
@@ -14,15 +14,21 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import base64
+import binascii
+import json
+from datetime import datetime
 from functools import wraps
-from typing import Callable, Dict, TypeVar, cast
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, cast
 
 from pendulum.parsing import ParserError
-from sqlalchemy import text
+from sqlalchemy import and_, or_, text
+from sqlalchemy.orm import Query
 
 from airflow.api_connexion.exceptions import BadRequest
 from airflow.configuration import conf
 from airflow.utils import timezone
+from airflow.utils.sqlalchemy import UtcDateTime
 
 
 def validate_istimezone(value):
@@ -64,6 +70,19 @@ def check_limit(value: int):
     return value
 
 
+def check_bulk_size(items: list) -> list:
+    """
+    This checks the number of items sent to a bulk endpoint and raises BadRequest
+    if it exceeds the user configured maximum page limit
+    """
+    max_val = conf.getint("api", "maximum_page_limit")
+    if len(items) > max_val:
+        raise BadRequest(
+            "Too many items", detail=f"A bulk request can contain at most {max_val} items, got {len(items)}"
+        )
+    return items
+
+
 T = TypeVar("T", bound=Callable)  # pylint: disable=invalid-name
 
 
@@ -104,3 +123,95 @@ def apply_sorting(query, order_by, to_replace=None, allowed_attrs=None):
     else:
         order_by = f"{lstriped_orderby} asc"
     return query.order_by(text(order_by))
+
+
+class Keyset:
+    """
+    Ordering of a list endpoint that supports keyset (cursor) pagination.
+
+    Instead of skipping ``offset`` rows, the page after a cursor is selected
+    with a condition on the ordering columns of the last row of the previous
+    page, which the database answers from an index however deep the page is.
+
+    :param columns: columns the rows are ordered by. They must not be nullable
+        and must be unique together.
+    :param descending: whether the rows are in descending order
+    :param get_object: returns the ORM object holding the columns from a result
+        row, for queries selecting more than one entity
+    """
+
+    def __init__(self, *columns, descending: bool = False, get_object: Optional[Callable] = None):
+        self.columns = columns
+        self.descending = descending
+        self.get_object = get_object
+
+    def order(self, query: Query) -> Query:
+        """Order ``query`` by the keyset columns"""
+        if self.descending:
+            return query.order_by(*(column.desc() for column in self.columns))
+        return query.order_by(*(column.asc() for column in self.columns))
+
+    def after(self, query: Query, cursor: str) -> Query:
+        """Filter ``query`` on the rows that follow ``cursor``"""
+        return self._after_values(query, self._decode(cursor))
+
+    def _after_values(self, query: Query, values: List[Any]) -> Query:
+        # (a, b) > (x, y) written as a > x OR (a = x AND b > y), as row values
+        # are not supported by every database
+        clauses = []
+        for i, (column, value) in enumerate(zip(self.columns, values)):
+            equal = [prev_column == prev_value for prev_column, prev_value in zip(self.columns[:i], values)]
+            clauses.append(and_(*equal, column < value if self.descending else column > value))
+        return query.filter(or_(*clauses))
+
+    def _values_of(self, row) -> List[Any]:
+        obj = self.get_object(row) if self.get_object else row
+        return [getattr(obj, column.key) for column in self.columns]
+
+    def cursor_of(self, row) -> str:
+        """Return the cursor of the page that follows ``row``"""
+        values = [
+            value.isoformat() if isinstance(value, datetime) else value for value in self._values_of(row)
+        ]
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+    def _decode(self, cursor: str) -> List[Any]:
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+            if not isinstance(values, list) or len(values) != len(self.columns):
+                raise ValueError(cursor)
+            return [
+                timezone.parse(value) if isinstance(column.type, UtcDateTime) else value
+                for column, value in zip(self.columns, values)
+            ]
+        except (binascii.Error, ValueError, ParserError, TypeError):
+            raise BadRequest("Invalid cursor", detail="The cursor is malformed or does not fit the order_by")
+
+
+def paginate(
+    query: Query,
+    limit: int,
+    offset: Optional[int] = None,
+    cursor: Optional[str] = None,
+    keyset: Optional[Keyset] = None,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Return a page of an already ordered query and the cursor of the next page.
+
+    The page starts after ``cursor`` if given, and at ``offset`` otherwise.
+    The cursor of the next page is only returned for full pages of queries
+    ordered by ``keyset``.
+    """
+    if cursor:
+        if keyset is None:
+            raise BadRequest(detail="Cursor pagination is not supported for this order_by")
+        if offset:
+            raise BadRequest(detail="The offset and cursor parameters cannot be used together")
+        query = keyset.after(query, cursor)
+    else:
+        query = query.offset(offset)
+    rows = query.limit(limit).all()
+    next_cursor = None
+    if keyset is not None and rows and len(rows) == limit:
+        next_cursor = keyset.cursor_of(rows[-1])
+    return rows, next_cursor
@@ -164,3 +164,11 @@ class ClassReferenceSchema(Schema):
         if isinstance(obj, type):
             return obj.__name__
         return type(obj).__name__
+
+
+class BulkItemResultSchema(Schema):
+    """Outcome of one item of a bulk request"""
+
+    index = fields.Int()
+    status = fields.Int()
+    detail = fields.String()
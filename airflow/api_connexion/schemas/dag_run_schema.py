@@ -25,6 +25,7 @@ from pendulum.parsing import ParserError
 
 from airflow.api_connexion.exceptions import BadRequest
 from airflow.api_connexion.parameters import validate_istimezone
+from airflow.api_connexion.schemas.common_schema import BulkItemResultSchema
 from airflow.api_connexion.schemas.enum_schemas import DagStateField
 from airflow.models.dagrun import DagRun
 from airflow.utils import timezone
@@ -92,6 +93,24 @@ class DAGRunCollectionSchema(Schema):
     total_entries = fields.Int()
 
 
+class DAGRunBulkCreateFormSchema(Schema):
+    """Schema to validate the Form(request payload) submitted to the DagRun bulk create endpoint"""
+
+    dag_runs = fields.List(fields.Dict(), required=True)
+
+
+class DAGRunBulkResultSchema(BulkItemResultSchema):
+    """Outcome of creating one DAG run of a bulk request"""
+
+    dag_run = fields.Nested(DAGRunSchema)
+
+
+class DAGRunBulkResultCollectionSchema(Schema):
+    """DAGRun bulk create response schema"""
+
+    results = fields.List(fields.Nested(DAGRunBulkResultSchema))
+
+
 class DagRunsBatchFormSchema(Schema):
     """Schema to validate and deserialize the Form(request payload) submitted to DagRun Batch endpoint"""
 
@@ -116,3 +135,5 @@ class DagRunsBatchFormSchema(Schema):
 dagrun_schema = DAGRunSchema()
 dagrun_collection_schema = DAGRunCollectionSchema()
 dagruns_batch_form_schema = DagRunsBatchFormSchema()
+dagrun_bulk_create_form_schema = DAGRunBulkCreateFormSchema()
+dagrun_bulk_result_collection_schema = DAGRunBulkResultCollectionSchema()
@@ -21,6 +21,7 @@ from marshmallow import Schema, ValidationError, fields, validate, validates_sch
 from marshmallow.utils import get_value
 
 from airflow.api_connexion.parameters import validate_istimezone
+from airflow.api_connexion.schemas.common_schema import BulkItemResultSchema
 from airflow.api_connexion.schemas.enum_schemas import TaskInstanceStateField
 from airflow.api_connexion.schemas.sla_miss_schema import SlaMissSchema
 from airflow.models import SlaMiss, TaskInstance
@@ -130,6 +131,12 @@ class SetTaskInstanceStateFormSchema(Schema):
     new_state = TaskInstanceStateField(required=True, validate=validate.OneOf([State.SUCCESS, State.FAILED]))
 
 
+class SetTaskInstanceStateBulkFormSchema(Schema):
+    """Schema for handling the request of setting the state of many task instances of a DAG"""
+
+    updates = fields.List(fields.Dict(), required=True)
+
+
 class TaskInstanceReferenceSchema(Schema):
     """Schema for the task instance reference schema"""
 
@@ -159,10 +166,25 @@ class TaskInstanceReferenceCollectionSchema(Schema):
     task_instances = fields.List(fields.Nested(TaskInstanceReferenceSchema))
 
 
+class SetTaskInstanceStateBulkResult(NamedTuple):
+    """Outcome of each update of a bulk request and the task instances they affected"""
+
+    results: List[dict]
+    task_instances: List[Tuple[TaskInstance, str]]
+
+
+class SetTaskInstanceStateBulkResultSchema(TaskInstanceReferenceCollectionSchema):
+    """Set task instance state bulk response schema"""
+
+    results = fields.List(fields.Nested(BulkItemResultSchema))
+
+
 task_instance_schema = TaskInstanceSchema()
 task_instance_collection_schema = TaskInstanceCollectionSchema()
 task_instance_batch_form = TaskInstanceBatchFormSchema()
 clear_task_instance_form = ClearTaskInstanceFormSchema()
 set_task_instance_state_form = SetTaskInstanceStateFormSchema()
+set_task_instance_state_bulk_form = SetTaskInstanceStateBulkFormSchema()
 task_instance_reference_schema = TaskInstanceReferenceSchema()
 task_instance_reference_collection_schema = TaskInstanceReferenceCollectionSchema()
+set_task_instance_state_bulk_result_schema = SetTaskInstanceStateBulkResultSchema()
@@ -17,6 +17,8 @@
 
 from marshmallow import Schema, fields
 
+from airflow.api_connexion.schemas.common_schema import BulkItemResultSchema
+
 
 class VariableSchema(Schema):
     """Variable Schema"""
@@ -32,5 +34,25 @@ class VariableCollectionSchema(Schema):
     total_entries = fields.Int()
 
 
+class VariableBulkFormSchema(Schema):
+    """Variable bulk create request schema"""
+
+    variables = fields.List(fields.Dict(), required=True)
+
+
+class VariableBulkResultSchema(BulkItemResultSchema):
+    """Outcome of setting one variable of a bulk request"""
+
+    key = fields.String()
+
+
+class VariableBulkResultCollectionSchema(Schema):
+    """Variable bulk create response schema"""
+
+    results = fields.List(fields.Nested(VariableBulkResultSchema))
+
+
 variable_schema = VariableSchema()
 variable_collection_schema = VariableCollectionSchema()
+variable_bulk_form_schema = VariableBulkFormSchema()
+variable_bulk_result_collection_schema = VariableBulkResultCollectionSchema()
@@ -0,0 +1,97 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Streamed newline-delimited JSON responses of the list endpoints"""
+import functools
+from typing import Any, Callable, Optional
+
+from flask import Response, json, request, stream_with_context
+from sqlalchemy.orm import Query
+
+from airflow._vendor.connexion.decorators.response import ResponseValidator
+from airflow.api_connexion.parameters import Keyset
+from airflow.configuration import conf
+from airflow.utils.session import create_session
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+
+def wants_ndjson() -> bool:
+    """Whether the client asked for newline-delimited JSON rather than a JSON page"""
+    return request.accept_mimetypes.best_match(["application/json", NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+
+def stream_ndjson(
+    query: Query, keyset: Keyset, dump: Callable[[Any], Any], cursor: Optional[str] = None
+) -> Response:
+    """
+    Stream all rows of ``query`` after ``cursor`` as newline-delimited JSON.
+
+    The rows are read in batches of ``[api] maximum_page_limit`` with keyset
+    pagination, each batch in a short transaction of its own, so neither the
+    webserver nor the database holds the whole result at once.
+
+    :param query: the filtered query, it is ordered by ``keyset``
+    :param keyset: ordering used to select the batches
+    :param dump: serializes a row into a JSON-compatible object
+    :param cursor: cursor of the row the stream starts after
+    """
+    batch_size = conf.getint("api", "maximum_page_limit")
+    query = keyset.order(query)
+    # Decoded before the response starts, so that a bad cursor is still answered with a 400
+    first_batch = keyset.after(query, cursor) if cursor else query
+
+    def generate():
+        batch = first_batch
+        while True:
+            with create_session() as session:
+                rows = batch.with_session(session).limit(batch_size).all()
+                lines = "".join(json.dumps(dump(row)) + "\n" for row in rows)
+                if len(rows) == batch_size:
+                    batch = keyset.after(query, keyset.cursor_of(rows[-1]))
+            yield lines
+            if len(rows) < batch_size:
+                return
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
+
+
+class StreamingResponseValidator(ResponseValidator):
+    """
+    Response validator that passes streamed responses through.
+
+    Validating a streamed response would read it into memory before sending
+    it. The endpoints only stream responses (logs and newline-delimited JSON)
+    that have no JSON schema to validate against.
+    """
+
+    def __call__(self, function):
+        @functools.wraps(function)
+        def wrapper(connexion_request):
+            response = function(connexion_request)
+            if isinstance(response, Response) and response.is_streamed:
+                return response
+            connexion_response = self.operation.api.get_connexion_response(response, self.mimetype)
+            self.validate_response(
+                connexion_response.body,
+                connexion_response.status_code,
+                connexion_response.headers,
+                connexion_request.url,
+            )
+            return response
+
+        return wrapper
@@ -289,6 +289,15 @@ ARG_RUN_BACKWARDS = Arg(
     ),
     action="store_true",
 )
+ARG_RESUME = Arg(
+    ("--resume",),
+    help=(
+        "if set, the backfill carries on where an interrupted backfill stopped: "
+        "the dates whose DAG run already succeeded are skipped, and the tasks "
+        "left running by jobs that are no longer alive are run again"
+    ),
+    action="store_true",
+)
 # test_dag
 ARG_SHOW_DAGRUN = Arg(
     ("--show-dagrun",),
@@ -420,6 +429,36 @@ ARG_MIGRATION_TIMEOUT = Arg(
     type=int,
     default=0,
 )
+ARG_DB_CLEAN_BEFORE_TIMESTAMP = Arg(
+    ("--clean-before-timestamp",),
+    help=(
+        "Delete the rows dated before this timestamp. "
+        "By default the retention periods of the [db_cleanup] section apply"
+    ),
+    type=parsedate,
+)
+ARG_DB_TABLES = Arg(
+    ("--tables",),
+    help=(
+        "Comma-separated tables to clean, among dag_run, job, log, rendered_task_instance_fields, "
+        "sla_miss, task_fail, task_instance, task_reschedule and xcom. All of them by default"
+    ),
+    type=lambda tables: [table.strip() for table in tables.split(',') if table.strip()],
+)
+ARG_DB_DRY_RUN = Arg(
+    ("--dry-run",),
+    help="Only count the rows that would be deleted",
+    action="store_true",
+)
+ARG_DB_BATCH_SIZE = Arg(
+    ("--batch-size",),
+    help="Approximate number of rows deleted per transaction (default: [db_cleanup] batch_size)",
+    type=positive_int(allow_zero=False),
+)
+ARG_DB_ARCHIVE_FOLDER = Arg(
+    ("--archive-folder",),
+    help="Write the rows to gzip compressed files in this folder before deleting them",
+)
 
 # webserver
 ARG_PORT = Arg(
@@ -907,6 +946,7 @@ DAGS_COMMANDS = (
             ARG_RESET_DAG_RUN,
             ARG_RERUN_FAILED_TASKS,
             ARG_RUN_BACKWARDS,
+            ARG_RESUME,
         ),
     ),
     ActionCommand(
@@ -1159,6 +1199,25 @@ DB_COMMANDS = (
         func=lazy_load_command('airflow.cli.commands.db_command.check'),
         args=(),
     ),
+    ActionCommand(
+        name='clean',
+        help="Delete the old rows of the tables that grow with every DAG run",
+        description=(
+            "Delete, in small batches, the old rows of the task instance, DAG run, XCom, rendered fields, "
+            "task failure, task reschedule, SLA miss, log and job tables. The last run and the unfinished "
+            "runs of every DAG are kept, so that it can run while the scheduler is running"
+        ),
+        func=lazy_load_command('airflow.cli.commands.db_command.cleanup_tables'),
+        args=(
+            ARG_DB_CLEAN_BEFORE_TIMESTAMP,
+            ARG_DB_TABLES,
+            ARG_DB_DRY_RUN,
+            ARG_DB_BATCH_SIZE,
+            ARG_DB_ARCHIVE_FOLDER,
+            ARG_YES,
+            ARG_OUTPUT,
+        ),
+    ),
 )
 CONNECTIONS_COMMANDS = (
     ActionCommand(
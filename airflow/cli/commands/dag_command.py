@@ -114,6 +114,7 @@ def dag_backfill(args, dag=None):
             conf=run_conf,
             rerun_failed_tasks=args.rerun_failed_tasks,
             run_backwards=args.run_backwards,
+            resume=args.resume,
         )
 
 
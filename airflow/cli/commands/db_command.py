@@ -20,6 +20,7 @@ import textwrap
 from tempfile import NamedTemporaryFile
 
 from airflow import settings
+from airflow.cli.simple_table import AirflowConsole
 from airflow.exceptions import AirflowException
 from airflow.utils import cli as cli_utils, db
 from airflow.utils.process_utils import execute_interactive
@@ -94,3 +95,36 @@ def shell(args):
 def check(_):
     """Runs a check command that checks if db is available."""
     db.check()
+
+
+@cli_utils.action_logging
+def cleanup_tables(args):
+    """Deletes the old rows of the tables that grow with every DAG run"""
+    from airflow.utils.db_cleanup import run_cleanup
+
+    print("DB: " + repr(settings.engine.url))
+    if not (
+        args.dry_run
+        or args.yes
+        or input("This will permanently delete the old rows of the tables. Proceed? (y/n)").upper() == "Y"
+    ):
+        print("Cancelled")
+        return
+    results = run_cleanup(
+        table_names=args.tables,
+        clean_before_timestamp=args.clean_before_timestamp,
+        batch_size=args.batch_size,
+        dry_run=args.dry_run,
+        archive_folder=args.archive_folder,
+    )
+    AirflowConsole().print_as(
+        data=results,
+        output=args.output,
+        mapper=lambda result: {
+            "table": result.table,
+            "clean before": result.clean_before.isoformat(),
+            "rows to delete" if args.dry_run else "rows deleted": result.rows,
+            "seconds": round(result.seconds, 2),
+            "rows/s": round(result.rows_per_second),
+        },
+    )
@@ -25,6 +25,7 @@ import re
 import shlex
 import subprocess
 import sys
+import time
 import warnings
 from base64 import b64encode
 from collections import OrderedDict
@@ -32,7 +33,7 @@ from collections import OrderedDict
 # Ignored Mypy on configparser because it thinks the configparser module has no _UNSET attribute
 from configparser import _UNSET, ConfigParser, NoOptionError, NoSectionError  # type: ignore
 from json.decoder import JSONDecodeError
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 from airflow.exceptions import AirflowConfigException
 from airflow.secrets import DEFAULT_SECRETS_SEARCH_PATH, BaseSecretsBackend
@@ -189,6 +190,10 @@ class AirflowConfigParser(ConfigParser):  # pylint: disable=too-many-ancestors
         return optionstr
 
     def __init__(self, default_config=None, *args, **kwargs):
+        # Options resolved from the config file, commands, secrets or defaults, keyed by
+        # (section, key) and mapped to (expiry time or None, value). Environment variables
+        # are always checked first, so they are never stored here.
+        self._resolved_options: Dict[Tuple[str, str], Tuple[Optional[float], str]] = {}
         super().__init__(*args, **kwargs)
 
         self.airflow_defaults = ConfigParser(*args, **kwargs)
@@ -343,19 +348,41 @@ class AirflowConfigParser(ConfigParser):  # pylint: disable=too-many-ancestors
         if option is not None:
             return option
 
+        # Only plain lookups are cached, ``raw`` or ``vars`` change the value returned
+        cacheable = not kwargs.keys() - {'fallback'}
+        if cacheable:
+            cached = self._resolved_options.get((section, key))
+            if cached is not None and (cached[0] is None or cached[0] > time.monotonic()):
+                return cached[1]
+
         option = self._get_option_from_config_file(deprecated_key, deprecated_section, key, kwargs, section)
         if option is not None:
+            if cacheable:
+                self._resolved_options[(section, key)] = (None, option)
             return option
 
         option = self._get_option_from_commands(deprecated_key, deprecated_section, key, section)
+        if option is None:
+            option = self._get_option_from_secrets(deprecated_key, deprecated_section, key, section)
         if option is not None:
+            if cacheable:
+                self._cache_sensitive_option(section, key, option)
             return option
 
-        option = self._get_option_from_secrets(deprecated_key, deprecated_section, key, section)
-        if option is not None:
-            return option
+        option = self._get_option_from_default_config(section, key, **kwargs)
+        if cacheable and self.airflow_defaults.has_option(section, key):
+            self._resolved_options[(section, key)] = (None, option)
+        return option
+
+    def _cache_sensitive_option(self, section, key, option):
+        """Cache a value read from a command or a secrets backend for the configured interval"""
+        refresh_interval = self.getint('secrets', 'config_refresh_interval', fallback=0)
+        if refresh_interval > 0:
+            self._resolved_options[(section, key)] = (time.monotonic() + refresh_interval, option)
 
-        return self._get_option_from_default_config(section, key, **kwargs)
+    def invalidate_cache(self):
+        """Drop all cached options, so that they are resolved again on the next read"""
+        self._resolved_options.clear()
 
     def _get_option_from_default_config(self, section, key, **kwargs):
         # ...then the default config
@@ -474,9 +501,23 @@ class AirflowConfigParser(ConfigParser):  # pylint: disable=too-many-ancestors
 
     def read(self, filenames, encoding=None):
         super().read(filenames=filenames, encoding=encoding)
+        self.invalidate_cache()
+
+    def read_file(self, f, source=None):
+        super().read_file(f, source=source)
+        self.invalidate_cache()
 
     def read_dict(self, dictionary, source='<dict>'):
         super().read_dict(dictionary=dictionary, source=source)
+        self.invalidate_cache()
+
+    def set(self, section, option, value=None):
+        super().set(section, option, value)
+        self.invalidate_cache()
+
+    def remove_section(self, section):
+        self.invalidate_cache()
+        return super().remove_section(section)
 
     def has_option(self, section, option):
         try:
@@ -500,6 +541,8 @@ class AirflowConfigParser(ConfigParser):  # pylint: disable=too-many-ancestors
         if self.airflow_defaults.has_option(section, option) and remove_default:
             self.airflow_defaults.remove_option(section, option)
 
+        self.invalidate_cache()
+
     def getsection(self, section: str) -> Optional[Dict[str, Union[str, int, float, bool]]]:
         """
         Returns the section as a dict. Values are converted to int, float, bool
@@ -18,11 +18,11 @@
 #
 
 import time
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
 from datetime import datetime
-from typing import Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 
-from sqlalchemy import and_
+from sqlalchemy import and_, func
 from sqlalchemy.orm.session import Session, make_transient
 from tabulate import tabulate
 
@@ -40,11 +40,13 @@ from airflow.jobs.base_job import BaseJob
 from airflow.models import DAG, DagPickle
 from airflow.models.dagrun import DagRun
 from airflow.models.taskinstance import TaskInstance, TaskInstanceKey
+from airflow.stats import Stats
 from airflow.ti_deps.dep_context import DepContext
 from airflow.ti_deps.dependencies_deps import BACKFILL_QUEUED_DEPS
 from airflow.utils import helpers, timezone
 from airflow.utils.configuration import tmp_configuration_copy
 from airflow.utils.session import provide_session
+from airflow.utils.sqlalchemy import with_row_locks
 from airflow.utils.state import State
 from airflow.utils.types import DagRunType
 
@@ -120,6 +122,8 @@ class BackfillJob(BaseJob):
             self.executed_dag_run_dates = executed_dag_run_dates or set()
             self.finished_runs = finished_runs
             self.total_runs = total_runs
+            # to report the throughput of the backfill
+            self.started_at = time.monotonic()
 
     def __init__(  # pylint: disable=too-many-arguments
         self,
@@ -136,6 +140,7 @@ class BackfillJob(BaseJob):
         conf=None,
         rerun_failed_tasks=False,
         run_backwards=False,
+        resume=False,
         *args,
         **kwargs,
     ):
@@ -166,6 +171,10 @@ class BackfillJob(BaseJob):
         :type rerun_failed_tasks: bool
         :param run_backwards: Whether to process the dates from most to least recent
         :type run_backwards bool
+        :param resume: Whether to carry on with an interrupted backfill: the run dates
+            whose dag run already succeeded are skipped, and the task instances left
+            running by jobs that are no longer alive are run again
+        :type resume: bool
         :param args:
         :param kwargs:
         """
@@ -183,6 +192,7 @@ class BackfillJob(BaseJob):
         self.conf = conf
         self.rerun_failed_tasks = rerun_failed_tasks
         self.run_backwards = run_backwards
+        self.resume = resume
         super().__init__(*args, **kwargs)
 
     @provide_session
@@ -354,18 +364,33 @@ class BackfillJob(BaseJob):
 
         # check if we have orphaned tasks
         self.reset_state_for_orphaned_tasks(filter_by_dag_run=dag_run, session=session)
+        if self.resume:
+            self._reset_running_tasks_of_dead_jobs(dag_run, session=session)
 
         # for some reason if we don't refresh the reference to run is lost
         dag_run.refresh_from_db()
         make_transient(dag_run)
 
         try:
+            tis_to_schedule = []
             for ti in dag_run.get_task_instances():
                 # all tasks part of the backfill are scheduled to run
                 if ti.state == State.NONE:
-                    ti.set_state(State.SCHEDULED, session=session)
+                    tis_to_schedule.append(ti)
                 if ti.state != State.REMOVED:
                     tasks_to_run[ti.key] = ti
+
+            # Like TaskInstance.set_state, in a single query
+            if tis_to_schedule:
+                TI = TaskInstance
+                now = timezone.utcnow()
+                session.query(TI).filter(TI.filter_for_tis(tis_to_schedule), TI.state.is_(None)).update(
+                    {TI.state: State.SCHEDULED, TI.start_date: func.coalesce(TI.start_date, now)},
+                    synchronize_session=False,
+                )
+                for ti in tis_to_schedule:
+                    ti.state = State.SCHEDULED
+                    ti.start_date = ti.start_date or now
             session.commit()
         except Exception:
             session.rollback()
@@ -373,10 +398,79 @@ class BackfillJob(BaseJob):
 
         return tasks_to_run
 
+    @provide_session
+    def _reset_running_tasks_of_dead_jobs(self, dag_run, session=None):
+        """
+        Resets the task instances of the dag run that an interrupted backfill left
+        running: the job running them is no longer alive, so they would never finish.
+
+        :param dag_run: the dag run to reset the task instances of
+        :type dag_run: airflow.models.DagRun
+        :param session: the database session object
+        :type session: sqlalchemy.orm.session.Session
+        :return: the number of TIs reset
+        :rtype: int
+        """
+        TI = TaskInstance
+        running_tis = (
+            session.query(TI, BaseJob)
+            .outerjoin(BaseJob, TI.job_id == BaseJob.id)
+            .filter(
+                TI.dag_id == dag_run.dag_id,
+                TI.execution_date == dag_run.execution_date,
+                TI.state == State.RUNNING,
+            )
+            .all()
+        )
+        tis_to_reset = [ti for ti, job in running_tis if job is None or not job.is_alive()]
+        for ti in tis_to_reset:
+            ti.state = State.NONE
+        session.commit()
+
+        if tis_to_reset:
+            self.log.info(
+                "Reset the following %s TaskInstances left running by dead jobs:\n\t%s",
+                len(tis_to_reset),
+                '\n\t'.join(repr(ti) for ti in tis_to_reset),
+            )
+        return len(tis_to_reset)
+
+    @provide_session
+    def _succeeded_run_dates(self, run_dates, session=None):
+        """
+        Returns the run dates of the given ones for which the dag run of the DAG already
+        succeeded, so that an interrupted backfill carries on where it stopped.
+
+        :param run_dates: Execution dates for dag runs
+        :type run_dates: list
+        :param session: the database session object
+        :type session: sqlalchemy.orm.session.Session
+        :rtype: set[datetime.datetime]
+        """
+        succeeded = set()
+        for chunk in helpers.chunks(run_dates, self.max_tis_per_query or len(run_dates)):
+            succeeded.update(
+                execution_date
+                for (execution_date,) in session.query(DagRun.execution_date).filter(
+                    DagRun.dag_id == self.dag_id,
+                    DagRun.execution_date.in_(chunk),
+                    DagRun.state == State.SUCCESS,
+                )
+            )
+        return succeeded
+
     def _log_progress(self, ti_status):
+        minutes = (time.monotonic() - ti_status.started_at) / 60
+        num_finished = len(ti_status.succeeded) + len(ti_status.failed) + len(ti_status.skipped)
+        throughput = num_finished / minutes if minutes > 0 else 0.0
+        Stats.gauge(f'backfill.tasks_waiting.{self.dag_id}', len(ti_status.to_run))
+        Stats.gauge(f'backfill.tasks_running.{self.dag_id}', len(ti_status.running))
+        Stats.gauge(f'backfill.throughput.{self.dag_id}', throughput)
+
         self.log.info(
             '[backfill progress] | finished run %s of %s | tasks waiting: %s | succeeded: %s | '
-            'running: %s | failed: %s | skipped: %s | deadlocked: %s | not ready: %s',
+            'running: %s | failed: %s | skipped: %s | deadlocked: %s | not ready: %s | '
+            'tasks finished per minute: %.1f',
             ti_status.finished_runs,
             ti_status.total_runs,
             len(ti_status.to_run),
@@ -386,10 +480,63 @@ class BackfillJob(BaseJob):
             len(ti_status.skipped),
             len(ti_status.deadlocked),
             len(ti_status.not_ready),
+            throughput,
         )
 
         self.log.debug("Finished dag run loop iteration. Remaining tasks %s", ti_status.to_run.values())
 
+    @provide_session
+    def _refresh_task_instances(self, ti_status, session=None):
+        """
+        Refreshes the task instances to run from the database. All the task instances
+        of their dag runs are loaded and locked at once, a query per dag and chunk of
+        execution dates rather than a query per task instance, and the finished ones
+        are returned so that the trigger rules of the tasks to run can be evaluated
+        without querying them again.
+
+        :param ti_status: the internal status of the backfill job tasks
+        :type ti_status: BackfillJob._DagRunTaskStatus
+        :param session: the current session object
+        :type session: sqlalchemy.orm.session.Session
+        :return: the finished task instances of every dag run, by dag id and execution date
+        :rtype: dict[tuple[str, datetime.datetime], list[airflow.models.TaskInstance]]
+        """
+        TI = TaskInstance
+        to_run = {(ti.dag_id, ti.task_id, ti.execution_date): ti for ti in ti_status.to_run.values()}
+        execution_dates: Dict[str, Set[datetime]] = defaultdict(set)
+        for dag_id, _, execution_date in to_run:
+            execution_dates[dag_id].add(execution_date)
+
+        finished_tasks: Dict[Tuple[str, datetime], List[TaskInstance]] = defaultdict(list)
+        refreshed = set()
+        for dag_id, dates in execution_dates.items():
+            sorted_dates = sorted(dates)
+            for chunk in helpers.chunks(sorted_dates, self.max_tis_per_query or len(sorted_dates)):
+                # Locked until the iteration commits, like refresh_from_db(lock_for_update=True) did for
+                # each task instance, so that another job cannot change them while they are examined.
+                # Ordered by primary key so that concurrent jobs lock them in the same order.
+                query = (
+                    session.query(TI)
+                    .filter(TI.dag_id == dag_id, TI.execution_date.in_(chunk))
+                    .order_by(TI.task_id, TI.execution_date)
+                )
+                for loaded_ti in with_row_locks(query, of=TI, session=session):
+                    key = (loaded_ti.dag_id, loaded_ti.task_id, loaded_ti.execution_date)
+                    ti = to_run.get(key)
+                    if ti is None:
+                        ti = loaded_ti
+                    else:
+                        ti.refresh_from_task_instance(loaded_ti)
+                        refreshed.add(key)
+                    if ti.state in State.finished:
+                        finished_tasks[(ti.dag_id, ti.execution_date)].append(ti)
+
+        # Like refresh_from_db, a task instance missing from the database has no state
+        for key, ti in to_run.items():
+            if key not in refreshed:
+                ti.state = State.NONE
+        return finished_tasks
+
     @provide_session
     def _process_backfill_task_instances(  # pylint: disable=too-many-statements
         self,
@@ -404,6 +551,11 @@ class BackfillJob(BaseJob):
         to account for different task instance states that could be present when running
         them in a backfill process.
 
+        The task instances of all the dag runs are examined together in every iteration,
+        in order of priority weight, and of the tasks in the DAG for equal weights, so
+        that the slots left in the pools and under the concurrency limits go to the
+        most important tasks first.
+
         :param ti_status: the internal status of the job
         :type ti_status: BackfillJob._DagRunTaskStatus
         :param executor: the executor to run the task instances
@@ -419,18 +571,30 @@ class BackfillJob(BaseJob):
         """
         executed_run_dates = []
 
+        # The task instances are examined by decreasing priority weight, and in topological order
+        # for equal weights, so a task may be examined before its upstream tasks and added to
+        # not_ready although they finish later in the same iteration. The backfill is only
+        # considered deadlocked after an iteration in which no task instance left to_run, as the
+        # next one examines them again with the upstream tasks that finished in the meantime.
+        topological_order: Dict[str, int] = {}
+        tasks_by_id = {}
+        for index, task in enumerate(self.dag.topological_sort(include_subdag_tasks=True)):
+            topological_order.setdefault(task.task_id, index)
+            tasks_by_id.setdefault(task.task_id, task)
+
+        def _priority(item):
+            ti = item[1]
+            return -(ti.priority_weight or 0), topological_order[ti.task_id]
+
         while (len(ti_status.to_run) > 0 or len(ti_status.running) > 0) and len(ti_status.deadlocked) == 0:
             self.log.debug("*** Clearing out not_ready list ***")
             ti_status.not_ready.clear()
 
-            # we need to execute the tasks bottom to top
-            # or leaf to root, as otherwise tasks might be
-            # determined deadlocked while they are actually
-            # waiting for their upstream to finish
-            @provide_session
-            def _per_task_process(key, ti, session=None):  # pylint: disable=too-many-return-statements
-                ti.refresh_from_db(lock_for_update=True, session=session)
+            finished_tasks = self._refresh_task_instances(ti_status, session=session)
 
+            def _per_task_process(
+                key, ti, run_finished_tasks, session
+            ):  # pylint: disable=too-many-return-statements
                 task = self.dag.get_task(ti.task_id, include_subdags=True)
                 ti.task = task
 
@@ -486,6 +650,7 @@ class BackfillJob(BaseJob):
                     ignore_depends_on_past=ignore_depends_on_past,
                     ignore_task_deps=self.ignore_task_deps,
                     flag_upstream_failed=True,
+                    finished_tasks=run_finished_tasks,
                 )
 
                 # Is the task runnable? -- then run it
@@ -523,7 +688,6 @@ class BackfillJob(BaseJob):
                         )
                         ti_status.running[key] = ti
                         ti_status.to_run.pop(key)
-                    session.commit()
                     return
 
                 if ti.state == State.UPSTREAM_FAILED:
@@ -554,58 +718,95 @@ class BackfillJob(BaseJob):
                 self.log.debug('Adding %s to not_ready', ti)
                 ti_status.not_ready.add(key)
 
+            # The open slots and the running task instances are counted once per iteration,
+            # and then kept up to date as the task instances are sent to the executor
+            open_slots: Dict[str, float] = {}
+            num_running_task_instances_in_dag = None
+            num_running_task_instances_in_task: Dict[str, int] = {}
+            num_queued = 0
+            num_to_run = len(ti_status.to_run)
+            tis_to_run = sorted(
+                (item for item in ti_status.to_run.items() if item[1].task_id in topological_order),
+                key=_priority,
+            )
             try:  # pylint: disable=too-many-nested-blocks
-                for task in self.dag.topological_sort(include_subdag_tasks=True):
-                    for key, ti in list(ti_status.to_run.items()):
-                        if task.task_id != ti.task_id:
-                            continue
+                for key, ti in tis_to_run:
+                    task = tasks_by_id[ti.task_id]
 
+                    if task.pool not in open_slots:
                         pool = session.query(models.Pool).filter(models.Pool.pool == task.pool).first()
                         if not pool:
                             raise PoolNotFound(f'Unknown pool: {task.pool}')
+                        open_slots[task.pool] = pool.open_slots(session=session)
 
-                        open_slots = pool.open_slots(session=session)
-                        if open_slots <= 0:
-                            raise NoAvailablePoolSlot(
-                                "Not scheduling since there are "
-                                "{} open slots in pool {}".format(open_slots, task.pool)
-                            )
+                    if open_slots[task.pool] <= 0:
+                        raise NoAvailablePoolSlot(
+                            "Not scheduling since there are "
+                            "{} open slots in pool {}".format(open_slots[task.pool], task.pool)
+                        )
 
+                    if num_running_task_instances_in_dag is None:
                         num_running_task_instances_in_dag = DAG.get_num_task_instances(
                             self.dag_id,
                             states=self.STATES_COUNT_AS_RUNNING,
+                            session=session,
                         )
 
-                        if num_running_task_instances_in_dag >= self.dag.concurrency:
-                            raise DagConcurrencyLimitReached(
-                                "Not scheduling since DAG concurrency limit " "is reached."
-                            )
+                    if num_running_task_instances_in_dag >= self.dag.concurrency:
+                        raise DagConcurrencyLimitReached(
+                            "Not scheduling since DAG concurrency limit " "is reached."
+                        )
 
-                        if task.task_concurrency:
-                            num_running_task_instances_in_task = DAG.get_num_task_instances(
+                    if task.task_concurrency:
+                        if task.task_id not in num_running_task_instances_in_task:
+                            num_running_task_instances_in_task[task.task_id] = DAG.get_num_task_instances(
                                 dag_id=self.dag_id,
                                 task_ids=[task.task_id],
                                 states=self.STATES_COUNT_AS_RUNNING,
+                                session=session,
                             )
 
-                            if num_running_task_instances_in_task >= task.task_concurrency:
-                                raise TaskConcurrencyLimitReached(
-                                    "Not scheduling since Task concurrency limit " "is reached."
-                                )
+                        if num_running_task_instances_in_task[task.task_id] >= task.task_concurrency:
+                            raise TaskConcurrencyLimitReached(
+                                "Not scheduling since Task concurrency limit " "is reached."
+                            )
 
-                        _per_task_process(key, ti)
+                    state = ti.state
+                    was_running = key in ti_status.running
+                    run_finished_tasks = finished_tasks[(ti.dag_id, ti.execution_date)]
+                    _per_task_process(key, ti, run_finished_tasks, session=session)
+
+                    # Keep the finished tasks of the run up to date for the downstream tasks
+                    if ti.state != state:
+                        if state in State.finished:
+                            run_finished_tasks[:] = [other for other in run_finished_tasks if other is not ti]
+                        if ti.state in State.finished:
+                            run_finished_tasks.append(ti)
+
+                    if key in ti_status.running and not was_running:
+                        num_queued += 1
+                        open_slots[task.pool] -= ti.pool_slots
+                        if ti.dag_id == self.dag_id:
+                            num_running_task_instances_in_dag += 1
+                            if task.task_id in num_running_task_instances_in_task:
+                                num_running_task_instances_in_task[task.task_id] += 1
             except (NoAvailablePoolSlot, DagConcurrencyLimitReached, TaskConcurrencyLimitReached) as e:
                 self.log.debug(e)
 
+            session.commit()
+            if num_queued:
+                Stats.incr(f'backfill.tasks_queued.{self.dag_id}', num_queued)
+
             # execute the tasks in the queue
             self.heartbeat()
             executor.heartbeat()
 
             # If the set of tasks that aren't ready ever equals the set of
-            # tasks to run and there are no running tasks then the backfill
-            # is deadlocked
+            # tasks to run, there are no running tasks and none of them finished
+            # or was queued in this iteration then the backfill is deadlocked
             if (
-                ti_status.not_ready
+                len(ti_status.to_run) == num_to_run
+                and ti_status.not_ready
                 and ti_status.not_ready == set(ti_status.to_run)
                 and len(ti_status.running) == 0
             ):
@@ -627,6 +828,7 @@ class BackfillJob(BaseJob):
                     ti_status.finished_runs += 1
                     ti_status.active_runs.remove(run)
                     executed_run_dates.append(run.execution_date)
+                    Stats.incr(f'backfill.dagruns_finished.{self.dag_id}')
 
             self._log_progress(ti_status)
 
@@ -789,6 +991,16 @@ class BackfillJob(BaseJob):
         executor.start()
 
         ti_status.total_runs = len(run_dates)  # total dag runs in backfill
+        if self.resume:
+            succeeded_run_dates = self._succeeded_run_dates(run_dates, session=session)
+            if succeeded_run_dates:
+                self.log.info(
+                    "Resuming the backfill, %s of the %s dag runs already succeeded",
+                    len(succeeded_run_dates),
+                    len(run_dates),
+                )
+            ti_status.executed_dag_run_dates.update(succeeded_run_dates)
+            ti_status.finished_runs = len(succeeded_run_dates)
 
         try:  # pylint: disable=too-many-nested-blocks
             remaining_dates = ti_status.total_runs
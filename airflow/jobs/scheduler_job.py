@@ -17,6 +17,7 @@
 # specific language governing permissions and limitations
 # under the License.
 #
+import bisect
 import datetime
 import itertools
 import logging
@@ -30,10 +31,10 @@ from collections import defaultdict
 from contextlib import redirect_stderr, redirect_stdout, suppress
 from datetime import timedelta
 from multiprocessing.connection import Connection as MultiprocessingConnection
-from typing import DefaultDict, Dict, Iterable, List, Optional, Set, Tuple
+from typing import Any, DefaultDict, Dict, Iterable, List, Optional, Set, Tuple
 
 from setproctitle import setproctitle
-from sqlalchemy import and_, func, not_, or_, tuple_
+from sqlalchemy import and_, bindparam, func, not_, or_, tuple_
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import load_only, selectinload
 from sqlalchemy.orm.session import Session, make_transient
@@ -47,6 +48,7 @@ from airflow.jobs.base_job import BaseJob
 from airflow.models import DAG, DagModel, SlaMiss, errors
 from airflow.models.dagbag import DagBag
 from airflow.models.dagrun import DagRun
+from airflow.models.renderedtifields import RenderedTaskInstanceFields
 from airflow.models.serialized_dag import SerializedDagModel
 from airflow.models.taskinstance import SimpleTaskInstance, TaskInstanceKey
 from airflow.stats import Stats
@@ -65,7 +67,14 @@ from airflow.utils.log.logging_mixin import LoggingMixin, StreamLogWriter, set_c
 from airflow.utils.mixins import MultiprocessingStartMethodMixin
 from airflow.utils.retries import MAX_DB_RETRIES, retry_db_transaction, run_with_db_retries
 from airflow.utils.session import create_session, provide_session
-from airflow.utils.sqlalchemy import is_lock_not_available_error, prohibit_commit, skip_locked, with_row_locks
+from airflow.utils.sqlalchemy import (
+    bakery,
+    is_lock_not_available_error,
+    limit_baked_query,
+    prohibit_commit,
+    skip_locked,
+    with_row_locks,
+)
 from airflow.utils.state import State
 from airflow.utils.types import DagRunType
 
@@ -399,43 +408,47 @@ class DagFileProcessor(LoggingMixin):
             self.log.info("Skipping SLA check for %s because no tasks in DAG have SLAs", dag)
             return
 
-        qry = (
-            session.query(TI.task_id, func.max(TI.execution_date).label('max_ti'))
+        # Latest successful (or skipped) execution date of every task with an SLA
+        latest_successes: Dict[str, datetime.datetime] = dict(
+            session.query(TI.task_id, func.max(TI.execution_date))
             .with_hint(TI, 'USE INDEX (PRIMARY)', dialect_name='mysql')
             .filter(TI.dag_id == dag.dag_id)
             .filter(or_(TI.state == State.SUCCESS, TI.state == State.SKIPPED))
-            .filter(TI.task_id.in_(dag.task_ids))
+            .filter(TI.task_id.in_([task.task_id for task in dag.tasks if task.sla]))
             .group_by(TI.task_id)
-            .subquery('sq')
-        )
-
-        max_tis: List[TI] = (
-            session.query(TI)
-            .filter(
-                TI.dag_id == dag.dag_id,
-                TI.task_id == qry.c.task_id,
-                TI.execution_date == qry.c.max_ti,
-            )
             .all()
         )
-
-        ts = timezone.utcnow()
-        for ti in max_tis:
-            task = dag.get_task(ti.task_id)
-            if task.sla and not isinstance(task.sla, timedelta):
+        for task_id in latest_successes:
+            task = dag.get_task(task_id)
+            if not isinstance(task.sla, timedelta):
                 raise TypeError(
                     f"SLA is expected to be timedelta object, got "
                     f"{type(task.sla)} in {task.dag_id}:{task.task_id}"
                 )
 
-            dttm = dag.following_schedule(ti.execution_date)
-            while dttm < timezone.utcnow():
-                following_schedule = dag.following_schedule(dttm)
-                if following_schedule + task.sla < timezone.utcnow():
-                    session.merge(
-                        SlaMiss(task_id=ti.task_id, dag_id=ti.dag_id, execution_date=dttm, timestamp=ts)
-                    )
-                dttm = dag.following_schedule(dttm)
+        ts = timezone.utcnow()
+        sla_misses = self._find_sla_misses(dag, latest_successes, ts)
+        if sla_misses:
+            # Only the misses not recorded yet are inserted, in one statement
+            recorded = set(
+                session.query(SlaMiss.task_id, SlaMiss.execution_date).filter(
+                    SlaMiss.dag_id == dag.dag_id,
+                    SlaMiss.execution_date >= min(execution_date for _, execution_date in sla_misses),
+                )
+            )
+            session.bulk_insert_mappings(
+                SlaMiss,
+                [
+                    {
+                        'task_id': task_id,
+                        'dag_id': dag.dag_id,
+                        'execution_date': execution_date,
+                        'timestamp': ts,
+                    }
+                    for task_id, execution_date in sla_misses
+                    if (task_id, execution_date) not in recorded
+                ],
+            )
         session.commit()
 
         # pylint: disable=singleton-comparison
@@ -460,7 +473,7 @@ class DagFileProcessor(LoggingMixin):
                     blocking_tis.append(ti)
                 else:
                     session.delete(ti)
-                    session.commit()
+            session.commit()
 
             task_list = "\n".join(sla.task_id + ' on ' + sla.execution_date.isoformat() for sla in slas)
             blocking_task_list = "\n".join(
@@ -518,9 +531,47 @@ class DagFileProcessor(LoggingMixin):
                 for sla in slas:
                     sla.email_sent = email_sent
                     sla.notification_sent = True
-                    session.merge(sla)
             session.commit()
 
+    @staticmethod
+    def _find_sla_misses(
+        dag: DAG, latest_successes: Dict[str, datetime.datetime], now: datetime.datetime
+    ) -> List[Tuple[str, datetime.datetime]]:
+        """
+        Find the runs of the tasks that missed their SLA since their latest success.
+
+        The run of a task at a schedule date missed its SLA when the task did not
+        succeed before the following schedule date plus the SLA. The schedule dates
+        from the oldest latest success up to now are computed once for the DAG,
+        and the misses of each task are the dates between its latest success and
+        the last date whose deadline passed, found by bisection.
+
+        :param dag: DAG of the tasks
+        :param latest_successes: execution date of the latest success of each task
+        :param now: date the deadlines are compared to
+        :return: task ID and execution date of every miss
+        """
+        if not latest_successes:
+            return []
+        first = dag.following_schedule(min(latest_successes.values()))
+        if first is None:
+            return []
+        dates = dag.schedule_calendar.dates(first, end=now)
+        if not dates:
+            return []
+        # Ends with the first date after now, the deadline of the runs before uses it
+        if dates[-1] < now:
+            dates.append(dag.following_schedule(dates[-1]))
+
+        sla_misses = []
+        for task_id, latest_success in latest_successes.items():
+            task = dag.get_task(task_id)
+            first = bisect.bisect_right(dates, latest_success)
+            # The run at dates[i] missed its SLA if dates[i + 1] + sla < now
+            last = bisect.bisect_left(dates, now - task.sla) - 1
+            sla_misses.extend((task_id, execution_date) for execution_date in dates[first:last])
+        return sla_misses
+
     @staticmethod
     def update_import_errors(session: Session, dagbag: DagBag) -> None:
         """
@@ -901,6 +952,44 @@ class SchedulerJob(BaseJob):  # pylint: disable=too-many-instance-attributes
             task_map[(dag_id, task_id)] = count
         return dag_map, task_map
 
+    @staticmethod
+    def _scheduled_task_instances_query(max_tis: int, starved_pools: List[str], session: Session):
+        """
+        Query of at most ``max_tis`` scheduled task instances to examine, locked.
+
+        :param max_tis: Maximum number of task instances returned
+        :param starved_pools: Pools without open slots, their task instances are not returned
+        :param session: ORM session
+        :return: the baked query, bound to the session
+        """
+        # Get all task instances associated with scheduled
+        # DagRuns which are not backfilled, in the given states,
+        # and the dag is not paused. The query is baked: built and compiled only once
+        query = bakery(lambda s: s.query(TI))
+        query += (
+            lambda q: q.outerjoin(TI.dag_run)
+            .filter(or_(DR.run_id.is_(None), DR.run_type != DagRunType.BACKFILL_JOB))
+            .join(TI.dag_model)
+            .filter(not_(DM.is_paused))
+            .filter(TI.state == State.SCHEDULED)
+            .options(selectinload('dag_model'))
+        )
+        params: Dict[str, Any] = {}
+        if starved_pools:
+            query += lambda q: q.filter(not_(TI.pool.in_(bindparam('starved_pools', expanding=True))))
+            params['starved_pools'] = starved_pools
+
+        # The limit changes with the open slots
+        params.update(limit_baked_query(query, 'max_tis', max_tis, session=session))
+
+        result = with_row_locks(
+            query,
+            of=TI,
+            session=session,
+            **skip_locked(session=session),
+        )(session)
+        return result.params(**params)
+
     # pylint: disable=too-many-locals,too-many-statements
     @provide_session
     def _executable_task_instances_to_queued(self, max_tis: int, session: Session = None) -> List[TI]:
@@ -928,30 +1017,9 @@ class SchedulerJob(BaseJob):  # pylint: disable=too-many-instance-attributes
 
         max_tis = min(max_tis, pool_slots_free)
 
-        # Get all task instances associated with scheduled
-        # DagRuns which are not backfilled, in the given states,
-        # and the dag is not paused
-        query = (
-            session.query(TI)
-            .outerjoin(TI.dag_run)
-            .filter(or_(DR.run_id.is_(None), DR.run_type != DagRunType.BACKFILL_JOB))
-            .join(TI.dag_model)
-            .filter(not_(DM.is_paused))
-            .filter(TI.state == State.SCHEDULED)
-            .options(selectinload('dag_model'))
-        )
         starved_pools = [pool_name for pool_name, stats in pools.items() if stats['open'] <= 0]
-        if starved_pools:
-            query = query.filter(not_(TI.pool.in_(starved_pools)))
-
-        query = query.limit(max_tis)
-
-        task_instances_to_examine: List[TI] = with_row_locks(
-            query,
-            of=TI,
-            session=session,
-            **skip_locked(session=session),
-        ).all()
+        result = self._scheduled_task_instances_query(max_tis, starved_pools, session=session)
+        task_instances_to_examine: List[TI] = result.all()
         # TODO[HA]: This was wrong before anyway, as it only looked at a sub-set of dags, not everything.
         # Stats.gauge('scheduler.tasks.pending', len(task_instances_to_examine))
 
@@ -1384,6 +1452,10 @@ class SchedulerJob(BaseJob):  # pylint: disable=too-many-instance-attributes
             self._clean_tis_without_dagrun,
         )
 
+        prune_interval = conf.getfloat('scheduler', 'rendered_ti_fields_prune_interval', fallback=60.0)
+        if prune_interval > 0:
+            timers.call_regular_interval(prune_interval, self._prune_rendered_ti_fields)
+
         for loop_count in itertools.count(start=1):
             with Stats.timer() as timer:
 
@@ -1457,6 +1529,14 @@ class SchedulerJob(BaseJob):  # pylint: disable=too-many-instance-attributes
                     raise
             guard.commit()
 
+    @provide_session
+    def _prune_rendered_ti_fields(self, session: Session = None):
+        """Delete the Rendered Task Instance Fields of all tasks beyond the number kept per task"""
+        with Stats.timer('scheduler.rendered_ti_fields_prune'):
+            num_tasks = RenderedTaskInstanceFields.prune(session=session)
+        if num_tasks:
+            self.log.debug("Pruned the rendered fields of %d tasks", num_tasks)
+
     def _do_scheduling(self, session) -> int:
         """
         This function is where the main scheduling decisions take places. It:
@@ -1576,7 +1656,8 @@ class SchedulerJob(BaseJob):  # pylint: disable=too-many-instance-attributes
     @retry_db_transaction
     def _get_next_dagruns_to_examine(self, session):
         """Get Next DagRuns to Examine with retries"""
-        return DagRun.next_dagruns_to_examine(session)
+        # Loaded at once, as they are iterated more than once
+        return list(DagRun.next_dagruns_to_examine(session))
 
     @retry_db_transaction
     def _create_dagruns_for_dags(self, guard, session):
@@ -1617,41 +1698,56 @@ class SchedulerJob(BaseJob):  # pylint: disable=too-many-instance-attributes
             session.query(DagRun.dag_id, DagRun.execution_date).filter(active_dagruns_filter).all()
         )
 
-        for dag_model in dag_models:
-            try:
-                dag = self.dagbag.get_dag(dag_model.dag_id, session=session)
-            except SerializedDagNotFound:
-                self.log.exception("DAG '%s' not found in serialized_dag table", dag_model.dag_id)
-                continue
-
-            dag_hash = self.dagbag.dags_hash.get(dag.dag_id)
-            # Explicitly check if the DagRun already exists. This is an edge case
-            # where a Dag Run is created but `DagModel.next_dagrun` and `DagModel.next_dagrun_create_after`
-            # are not updated.
-            # We opted to check DagRun existence instead
-            # of catching an Integrity error and rolling back the session i.e
-            # we need to run self._update_dag_next_dagruns if the Dag Run already exists or if we
-            # create a new one. This is so that in the next Scheduling loop we try to create new runs
-            # instead of falling in a loop of Integrity Error.
-            if (dag.dag_id, dag_model.next_dagrun) not in active_dagruns:
-                run = dag.create_dagrun(
-                    run_type=DagRunType.SCHEDULED,
-                    execution_date=dag_model.next_dagrun,
-                    start_date=timezone.utcnow(),
-                    state=State.RUNNING,
-                    external_trigger=False,
-                    session=session,
-                    dag_hash=dag_hash,
-                    creating_job_id=self.id,
-                )
+        dag_runs: List[DagRun] = []
+        with Stats.timer('scheduler.dagrun_creation_duration'):
+            for dag_model in dag_models:
+                try:
+                    dag = self.dagbag.get_dag(dag_model.dag_id, session=session)
+                except SerializedDagNotFound:
+                    self.log.exception("DAG '%s' not found in serialized_dag table", dag_model.dag_id)
+                    continue
 
-                expected_start_date = dag.following_schedule(run.execution_date)
-                if expected_start_date:
-                    schedule_delay = run.start_date - expected_start_date
-                    Stats.timing(
-                        f'dagrun.schedule_delay.{dag.dag_id}',
-                        schedule_delay,
+                dag_hash = self.dagbag.dags_hash.get(dag.dag_id)
+                # Explicitly check if the DagRun already exists. This is an edge case
+                # where a Dag Run is created but `DagModel.next_dagrun` and
+                # `DagModel.next_dagrun_create_after` are not updated.
+                # We opted to check DagRun existence instead
+                # of catching an Integrity error and rolling back the session i.e
+                # we need to run self._update_dag_next_dagruns if the Dag Run already exists or if we
+                # create a new one. This is so that in the next Scheduling loop we try to create new runs
+                # instead of falling in a loop of Integrity Error.
+                if (dag.dag_id, dag_model.next_dagrun) not in active_dagruns:
+                    run = DagRun(
+                        dag_id=dag.dag_id,
+                        run_id=DagRun.generate_run_id(DagRunType.SCHEDULED, dag_model.next_dagrun),
+                        execution_date=dag_model.next_dagrun,
+                        start_date=timezone.utcnow(),
+                        external_trigger=False,
+                        state=State.RUNNING,
+                        run_type=DagRunType.SCHEDULED,
+                        dag_hash=dag_hash,
+                        creating_job_id=self.id,
                     )
+                    run.dag = dag
+                    dag_runs.append(run)
+
+            # Same as dag.create_dagrun, but inserting the runs of all the DAGs, then all their
+            # task instances, at once
+            if dag_runs:
+                session.add_all(dag_runs)
+                session.flush()
+                num_tis = DagRun.create_task_instances(dag_runs, session)
+                Stats.incr('scheduler.dagruns_created', len(dag_runs))
+                self.log.debug("Created %d DAG runs with %d task instances", len(dag_runs), num_tis)
+
+        for run in dag_runs:
+            expected_start_date = run.dag.following_schedule(run.execution_date)
+            if expected_start_date:
+                schedule_delay = run.start_date - expected_start_date
+                Stats.timing(
+                    f'dagrun.schedule_delay.{run.dag_id}',
+                    schedule_delay,
+                )
 
         self._update_dag_next_dagruns(dag_models, session)
 
@@ -45,6 +45,7 @@ fileConfig(config.config_file_name, disable_existing_loggers=False)
 # for 'autogenerate' support
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
+models.import_all_models()
 target_metadata = models.base.Base.metadata
 
 # other values from the config, defined by the needs of env.py,
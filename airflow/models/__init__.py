@@ -15,23 +15,96 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
-"""Airflow models"""
-from airflow.models.base import ID_LEN, Base
-from airflow.models.baseoperator import BaseOperator, BaseOperatorLink
-from airflow.models.connection import Connection
-from airflow.models.dag import DAG, DagModel, DagTag
-from airflow.models.dagbag import DagBag
-from airflow.models.dagpickle import DagPickle
-from airflow.models.dagrun import DagRun
-from airflow.models.errors import ImportError  # pylint: disable=redefined-builtin
-from airflow.models.log import Log
-from airflow.models.pool import Pool
-from airflow.models.renderedtifields import RenderedTaskInstanceFields
-from airflow.models.sensorinstance import SensorInstance  # noqa: F401
-from airflow.models.skipmixin import SkipMixin
-from airflow.models.slamiss import SlaMiss
-from airflow.models.taskfail import TaskFail
-from airflow.models.taskinstance import TaskInstance, clear_task_instances
-from airflow.models.taskreschedule import TaskReschedule
-from airflow.models.variable import Variable
-from airflow.models.xcom import XCOM_RETURN_KEY, XCom
+"""
+Airflow models
+
+The models are imported on first access, as ``airflow.models.DagRun`` or
+``from airflow.models import DagRun``: importing all of them takes long, and most
+processes only use a few. All the models are imported before SQLAlchemy
+configures the mappers, so that relationships can refer to any of them by name.
+"""
+# pylint: disable=wrong-import-position
+from importlib import import_module
+
+from sqlalchemy import event
+from sqlalchemy.orm import Mapper
+
+# Names exposed by the package, and the module they are defined in
+_LAZY_IMPORTS = {
+    'ID_LEN': 'airflow.models.base',
+    'Base': 'airflow.models.base',
+    'BaseOperator': 'airflow.models.baseoperator',
+    'BaseOperatorLink': 'airflow.models.baseoperator',
+    'Connection': 'airflow.models.connection',
+    'DAG': 'airflow.models.dag',
+    'DagModel': 'airflow.models.dag',
+    'DagTag': 'airflow.models.dag',
+    'DagBag': 'airflow.models.dagbag',
+    'DagPickle': 'airflow.models.dagpickle',
+    'DagRun': 'airflow.models.dagrun',
+    'ImportError': 'airflow.models.errors',
+    'Log': 'airflow.models.log',
+    'Pool': 'airflow.models.pool',
+    'RenderedTaskInstanceFields': 'airflow.models.renderedtifields',
+    'SensorInstance': 'airflow.models.sensorinstance',
+    'SkipMixin': 'airflow.models.skipmixin',
+    'SlaMiss': 'airflow.models.slamiss',
+    'TaskFail': 'airflow.models.taskfail',
+    'TaskInstance': 'airflow.models.taskinstance',
+    'clear_task_instances': 'airflow.models.taskinstance',
+    'TaskReschedule': 'airflow.models.taskreschedule',
+    'Variable': 'airflow.models.variable',
+    'XCOM_RETURN_KEY': 'airflow.models.xcom',
+    'XCom': 'airflow.models.xcom',
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name):
+    # PEP-562: Lazy loaded attributes on python modules
+    module_path = _LAZY_IMPORTS.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {__name__} has no attribute {name}")
+    value = getattr(import_module(module_path), name)
+    # Found without calling __getattr__ from now on
+    globals()[name] = value
+    return value
+
+
+def import_all_models():
+    """Imports all the modules of the models exposed by the package"""
+    for module_path in dict.fromkeys(_LAZY_IMPORTS.values()):
+        import_module(module_path)
+
+
+@event.listens_for(Mapper, 'before_configured')
+def _import_all_models_before_configuring_mappers():
+    import_all_models()
+
+
+# This is never executed, but tricks static analyzers (PyDev, PyCharm,
+# pylint, etc.) into knowing the types of these symbols, and what
+# they contain.
+STATICA_HACK = True
+globals()['kcah_acitats'[::-1].upper()] = False
+if STATICA_HACK:  # pragma: no cover
+    from airflow.models.base import ID_LEN, Base
+    from airflow.models.baseoperator import BaseOperator, BaseOperatorLink
+    from airflow.models.connection import Connection
+    from airflow.models.dag import DAG, DagModel, DagTag
+    from airflow.models.dagbag import DagBag
+    from airflow.models.dagpickle import DagPickle
+    from airflow.models.dagrun import DagRun
+    from airflow.models.errors import ImportError  # pylint: disable=redefined-builtin
+    from airflow.models.log import Log
+    from airflow.models.pool import Pool
+    from airflow.models.renderedtifields import RenderedTaskInstanceFields
+    from airflow.models.sensorinstance import SensorInstance
+    from airflow.models.skipmixin import SkipMixin
+    from airflow.models.slamiss import SlaMiss
+    from airflow.models.taskfail import TaskFail
+    from airflow.models.taskinstance import TaskInstance, clear_task_instances
+    from airflow.models.taskreschedule import TaskReschedule
+    from airflow.models.variable import Variable
+    from airflow.models.xcom import XCOM_RETURN_KEY, XCom
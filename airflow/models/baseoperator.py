@@ -726,6 +726,9 @@ class BaseOperator(Operator, LoggingMixin, TaskMixin, metaclass=BaseOperatorMeta
         if self._lock_for_execution:
             # Skip any custom behaviour during execute
             return
+        if key == 'priority_weight' and self.has_dag():
+            # Priority weight totals of the whole DAG are derived from this value
+            self._dag.invalidate_topology()
         if self.__instantiated and key in self.template_fields:
             # Resolve upstreams set by assigning an XComArg after initializing
             # an operator, example:
@@ -880,6 +883,9 @@ class BaseOperator(Operator, LoggingMixin, TaskMixin, metaclass=BaseOperatorMeta
         from airflow.models.dag import DAG
 
         dag: DAG = self._dag
+        topology = dag.topology
+        if topology is not None and self.task_id in topology.positions:
+            return topology.priority_weight_total(self.task_id, upstream=upstream)
         return self.priority_weight + sum(
             map(
                 lambda task_id: dag.task_dict[task_id].priority_weight,
@@ -1207,6 +1213,9 @@ class BaseOperator(Operator, LoggingMixin, TaskMixin, metaclass=BaseOperatorMeta
             return set()
 
         if not found_descendants:
+            topology = self._dag.topology
+            if topology is not None and self.task_id in topology.positions:
+                return topology.get_flat_relative_ids([self.task_id], upstream)
             found_descendants = set()
         relative_ids = self.get_direct_relative_ids(upstream)
 
@@ -1367,6 +1376,8 @@ class BaseOperator(Operator, LoggingMixin, TaskMixin, metaclass=BaseOperatorMeta
                 if edge_modifier:
                     edge_modifier.add_edge_info(self.dag, self.task_id, task.task_id)
 
+        dag.invalidate_topology()
+
     def set_downstream(
         self,
         task_or_task_list: Union[TaskMixin, Sequence[TaskMixin]],
@@ -19,7 +19,7 @@
 import json
 import warnings
 from json import JSONDecodeError
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 from urllib.parse import parse_qsl, quote, unquote, urlencode, urlparse
 
 from sqlalchemy import Boolean, Column, Integer, String, Text
@@ -31,6 +31,7 @@ from airflow.exceptions import AirflowException, AirflowNotFoundException
 from airflow.models.base import ID_LEN, Base
 from airflow.models.crypto import get_fernet
 from airflow.providers_manager import ProvidersManager
+from airflow.secrets.cache import SecretCache, get_secret_cache
 from airflow.utils.log.logging_mixin import LoggingMixin
 from airflow.utils.log.secrets_masker import mask_secret
 from airflow.utils.module_loading import import_string
@@ -380,6 +381,20 @@ class Connection(Base, LoggingMixin):  # pylint: disable=too-many-instance-attri
 
         return obj
 
+    def _cached_fields(self) -> Dict[str, Any]:
+        """Fields the connection is built again from when it is taken from the secrets cache"""
+        return {
+            'conn_id': self.conn_id,
+            'conn_type': self.conn_type,
+            'description': self.description,
+            'host': self.host,
+            'login': self.login,
+            'password': self.password,
+            'schema': self.schema,
+            'port': self.port,
+            'extra': self.extra,
+        }
+
     @classmethod
     def get_connection_from_secrets(cls, conn_id: str) -> 'Connection':
         """
@@ -388,8 +403,21 @@ class Connection(Base, LoggingMixin):  # pylint: disable=too-many-instance-attri
         :param conn_id: connection id
         :return: connection
         """
-        for secrets_backend in ensure_secrets_loaded():
-            conn = secrets_backend.get_connection(conn_id=conn_id)
-            if conn:
-                return conn
+        cache = get_secret_cache("connections")
+        fields = cache.get(conn_id)
+        if fields is SecretCache.NOT_CACHED:
+            conn = None
+            for secrets_backend in ensure_secrets_loaded():
+                conn = secrets_backend.get_connection(conn_id=conn_id)
+                if conn:
+                    break
+            if not cache.enabled:
+                if conn:
+                    return conn
+                raise AirflowNotFoundException(f"The conn_id `{conn_id}` isn't defined")
+            fields = conn._cached_fields() if conn else None  # pylint: disable=protected-access
+            cache.set(conn_id, fields)
+        if fields:
+            # Hooks modify the connection they get, every caller has its own
+            return cls(**fields)
         raise AirflowNotFoundException(f"The conn_id `{conn_id}` isn't defined")
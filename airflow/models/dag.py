@@ -25,7 +25,6 @@ import re
 import sys
 import traceback
 import warnings
-from collections import OrderedDict
 from datetime import datetime, timedelta
 from inspect import signature
 from typing import (
@@ -64,7 +63,9 @@ from airflow.models.dagbag import DagBag
 from airflow.models.dagcode import DagCode
 from airflow.models.dagparam import DagParam
 from airflow.models.dagpickle import DagPickle
+from airflow.models.dagtopology import DagTopology
 from airflow.models.dagrun import DagRun
+from airflow.models.schedulecalendar import ScheduleCalendar
 from airflow.models.taskinstance import Context, TaskInstance, clear_task_instances
 from airflow.security import permissions
 from airflow.stats import Stats
@@ -75,7 +76,14 @@ from airflow.utils.file import correct_maybe_zipped
 from airflow.utils.helpers import validate_key
 from airflow.utils.log.logging_mixin import LoggingMixin
 from airflow.utils.session import provide_session
-from airflow.utils.sqlalchemy import Interval, UtcDateTime, skip_locked, with_row_locks
+from airflow.utils.sqlalchemy import (
+    Interval,
+    UtcDateTime,
+    bakery,
+    limit_baked_query,
+    skip_locked,
+    with_row_locks,
+)
 from airflow.utils.state import State
 from airflow.utils.types import DagRunType, EdgeInfoType
 
@@ -233,6 +241,12 @@ class DAG(LoggingMixin):
 
     __serialized_fields: Optional[FrozenSet[str]] = None
 
+    # Topology index built lazily by the ``topology`` property
+    _topology: Optional[DagTopology] = None
+    _topology_stale = True
+    # Schedule calendar built lazily by the ``schedule_calendar`` property
+    _schedule_calendar: Optional[ScheduleCalendar] = None
+
     def __init__(
         self,
         dag_id: str,
@@ -464,6 +478,24 @@ class DAG(LoggingMixin):
 
         return False
 
+    @property
+    def schedule_calendar(self) -> ScheduleCalendar:
+        """
+        Calendar of the schedule dates of this DAG.
+
+        It is created on first access and replaced when the schedule interval
+        or the time zone of the DAG change.
+        """
+        calendar = self._schedule_calendar
+        schedule_interval = self.normalized_schedule_interval
+        if (
+            calendar is None
+            or calendar.schedule_interval != schedule_interval
+            or calendar.timezone != self.timezone
+        ):
+            calendar = self._schedule_calendar = ScheduleCalendar(schedule_interval, self.timezone)
+        return calendar
+
     def following_schedule(self, dttm):
         """
         Calculates the following schedule for this dag in UTC.
@@ -471,26 +503,7 @@ class DAG(LoggingMixin):
         :param dttm: utc datetime
         :return: utc datetime
         """
-        if isinstance(self.normalized_schedule_interval, str):
-            # we don't want to rely on the transitions created by
-            # croniter as they are not always correct
-            dttm = pendulum.instance(dttm)
-            naive = timezone.make_naive(dttm, self.timezone)
-            cron = croniter(self.normalized_schedule_interval, naive)
-
-            # We assume that DST transitions happen on the minute/hour
-            if not self.is_fixed_time_schedule():
-                # relative offset (eg. every 5 minutes)
-                delta = cron.get_next(datetime) - naive
-                following = dttm.in_timezone(self.timezone) + delta
-            else:
-                # absolute (e.g. 3 AM)
-                naive = cron.get_next(datetime)
-                tz = pendulum.timezone(self.timezone.name)
-                following = timezone.make_aware(naive, tz)
-            return timezone.convert_to_utc(following)
-        elif self.normalized_schedule_interval is not None:
-            return timezone.convert_to_utc(dttm + self.normalized_schedule_interval)
+        return self.schedule_calendar.following(dttm)
 
     def previous_schedule(self, dttm):
         """
@@ -499,26 +512,7 @@ class DAG(LoggingMixin):
         :param dttm: utc datetime
         :return: utc datetime
         """
-        if isinstance(self.normalized_schedule_interval, str):
-            # we don't want to rely on the transitions created by
-            # croniter as they are not always correct
-            dttm = pendulum.instance(dttm)
-            naive = timezone.make_naive(dttm, self.timezone)
-            cron = croniter(self.normalized_schedule_interval, naive)
-
-            # We assume that DST transitions happen on the minute/hour
-            if not self.is_fixed_time_schedule():
-                # relative offset (eg. every 5 minutes)
-                delta = naive - cron.get_prev(datetime)
-                previous = dttm.in_timezone(self.timezone) - delta
-            else:
-                # absolute (e.g. 3 AM)
-                naive = cron.get_prev(datetime)
-                tz = pendulum.timezone(self.timezone.name)
-                previous = timezone.make_aware(naive, tz)
-            return timezone.convert_to_utc(previous)
-        elif self.normalized_schedule_interval is not None:
-            return timezone.convert_to_utc(dttm - self.normalized_schedule_interval)
+        return self.schedule_calendar.previous(dttm)
 
     def next_dagrun_info(
         self,
@@ -633,8 +627,6 @@ class DAG(LoggingMixin):
         :return: a list of dates within the interval following the dag's schedule
         :rtype: list
         """
-        run_dates = []
-
         using_start_date = start_date
         using_end_date = end_date
 
@@ -645,12 +637,10 @@ class DAG(LoggingMixin):
         # next run date for a subdag isn't relevant (schedule_interval for subdags
         # is ignored) so we use the dag run's start date in the case of a subdag
         next_run_date = self.normalize_schedule(using_start_date) if not self.is_subdag else using_start_date
+        if not next_run_date:
+            return []
 
-        while next_run_date and next_run_date <= using_end_date:
-            run_dates.append(next_run_date)
-            next_run_date = self.following_schedule(next_run_date)
-
-        return run_dates
+        return self.schedule_calendar.dates(next_run_date, end=using_end_date)
 
     def normalize_schedule(self, dttm):
         """Returns dttm + interval unless dttm is first interval then it returns dttm"""
@@ -745,6 +735,29 @@ class DAG(LoggingMixin):
     def tasks(self, val):
         raise AttributeError('DAG.tasks can not be modified. Use dag.add_task() instead.')
 
+    @property
+    def topology(self) -> Optional[DagTopology]:
+        """
+        Topology index of the tasks in this DAG, or None if the DAG has a cycle.
+
+        It holds the topological order, roots, leaves, depth, transitive closures
+        and priority weight totals of the tasks. The index is built on first
+        access and rebuilt after tasks, dependencies or priority weights change
+        through :meth:`add_task`, ``set_upstream``/``set_downstream`` or by
+        setting ``priority_weight`` on an operator.
+        """
+        if self._topology_stale or (
+            self._topology is not None and len(self._topology.task_ids) != len(self.task_dict)
+        ):
+            self._topology = DagTopology.build(self.task_dict)
+            self._topology_stale = False
+        return self._topology
+
+    def invalidate_topology(self) -> None:
+        """Discard the topology index, e.g. after changing task dependencies directly."""
+        self._topology = None
+        self._topology_stale = True
+
     @property
     def task_ids(self) -> List[str]:
         return list(self.task_dict.keys())
@@ -1056,11 +1069,17 @@ class DAG(LoggingMixin):
     @property
     def roots(self) -> List[BaseOperator]:
         """Return nodes with no parents. These are first to execute and are called roots or root nodes."""
+        topology = self.topology
+        if topology is not None:
+            return [self.task_dict[task_id] for task_id in topology.root_ids]
         return [task for task in self.tasks if not task.upstream_list]
 
     @property
     def leaves(self) -> List[BaseOperator]:
         """Return nodes with no children. These are last to execute and are called leaves or leaf nodes."""
+        topology = self.topology
+        if topology is not None:
+            return [self.task_dict[task_id] for task_id in topology.leaf_ids]
         return [task for task in self.tasks if not task.downstream_list]
 
     def topological_sort(self, include_subdag_tasks: bool = False):
@@ -1068,52 +1087,23 @@ class DAG(LoggingMixin):
         Sorts tasks in topographical order, such that a task comes after any of its
         upstream dependencies.
 
-        Heavily inspired by:
-        http://blog.jupo.org/2012/04/06/topological-sorting-acyclic-directed-graphs/
+        The order is read from the DAG's :attr:`topology` index.
 
         :param include_subdag_tasks: whether to include tasks in subdags, default to False
         :return: list of tasks in topological order
         """
         from airflow.operators.subdag import SubDagOperator  # Avoid circular import
 
-        # convert into an OrderedDict to speedup lookup while keeping order the same
-        graph_unsorted = OrderedDict((task.task_id, task) for task in self.tasks)
+        topology = self.topology
+        if topology is None:
+            raise AirflowException(f"A cyclic dependency occurred in dag: {self.dag_id}")
 
         graph_sorted = []  # type: List[BaseOperator]
-
-        # special case
-        if len(self.tasks) == 0:
-            return tuple(graph_sorted)
-
-        # Run until the unsorted graph is empty.
-        while graph_unsorted:
-            # Go through each of the node/edges pairs in the unsorted
-            # graph. If a set of edges doesn't contain any nodes that
-            # haven't been resolved, that is, that are still in the
-            # unsorted graph, remove the pair from the unsorted graph,
-            # and append it to the sorted graph. Note here that by using
-            # using the items() method for iterating, a copy of the
-            # unsorted graph is used, allowing us to modify the unsorted
-            # graph as we move through it. We also keep a flag for
-            # checking that graph is acyclic, which is true if any
-            # nodes are resolved during each pass through the graph. If
-            # not, we need to exit as the graph therefore can't be
-            # sorted.
-            acyclic = False
-            for node in list(graph_unsorted.values()):
-                for edge in node.upstream_list:
-                    if edge.task_id in graph_unsorted:
-                        break
-                # no edges in upstream tasks
-                else:
-                    acyclic = True
-                    del graph_unsorted[node.task_id]
-                    graph_sorted.append(node)
-                    if include_subdag_tasks and isinstance(node, SubDagOperator):
-                        graph_sorted.extend(node.subdag.topological_sort(include_subdag_tasks=True))
-
-            if not acyclic:
-                raise AirflowException(f"A cyclic dependency occurred in dag: {self.dag_id}")
+        for task_id in topology.task_ids:
+            node = self.task_dict[task_id]
+            graph_sorted.append(node)
+            if include_subdag_tasks and isinstance(node, SubDagOperator):
+                graph_sorted.extend(node.subdag.topological_sort(include_subdag_tasks=True))
 
         return tuple(graph_sorted)
 
@@ -1425,6 +1415,9 @@ class DAG(LoggingMixin):
         result = cls.__new__(cls)
         memo[id(self)] = result
         for k, v in self.__dict__.items():
+            if k in ('_topology', '_topology_stale', '_schedule_calendar'):
+                # The copy's tasks may be replaced (see partial_subset), so it builds its own indexes
+                continue
             if k not in ('user_defined_macros', 'user_defined_filters', 'params', '_log'):
                 setattr(result, k, copy.deepcopy(v, memo))
 
@@ -1452,9 +1445,15 @@ class DAG(LoggingMixin):
         include_direct_upstream=False,
     ):
         """
-        Returns a subset of the current dag as a deep copy of the current dag
-        based on a regex that should match one or many tasks, and includes
-        upstream and downstream neighbours based on the flag passed.
+        Returns a subset of the current dag based on a regex that should match
+        one or many tasks, and includes upstream and downstream neighbours based
+        on the flag passed.
+
+        The returned dag is a copy of the current dag, but its operators are
+        shallow copies that share their attributes with the original operators:
+        only their dag and upstream/downstream references belong to the subset.
+        Changing other operator attributes of the subset also changes the
+        original operators.
 
         :param task_ids_or_regex: Either a list of task_ids, or a regex to
             match against task ids (as a string, or compiled regex pattern).
@@ -1470,25 +1469,33 @@ class DAG(LoggingMixin):
         dag = copy.deepcopy(self, memo)  # type: ignore
 
         if isinstance(task_ids_or_regex, (str, RePatternType)):
-            matched_tasks = [t for t in self.tasks if re.findall(task_ids_or_regex, t.task_id)]
+            matched_task_ids = [t.task_id for t in self.tasks if re.findall(task_ids_or_regex, t.task_id)]
         else:
-            matched_tasks = [t for t in self.tasks if t.task_id in task_ids_or_regex]
-
-        also_include = []
-        for t in matched_tasks:
-            if include_downstream:
-                also_include += t.get_flat_relatives(upstream=False)
-            if include_upstream:
-                also_include += t.get_flat_relatives(upstream=True)
-            elif include_direct_upstream:
-                also_include += t.upstream_list
-
-        # Compiling the unique list of tasks that made the cut
-        # Make sure to not recursively deepcopy the dag while copying the task
-        dag.task_dict = {
-            t.task_id: copy.deepcopy(t, {id(t.dag): dag})  # type: ignore
-            for t in matched_tasks + also_include
-        }
+            matched_task_ids = [t.task_id for t in self.tasks if t.task_id in task_ids_or_regex]
+
+        included_task_ids = set(matched_task_ids)
+        topology = self.topology
+        for direction, include in ((False, include_downstream), (True, include_upstream)):
+            if not include:
+                continue
+            if topology is not None:
+                included_task_ids.update(topology.get_flat_relative_ids(matched_task_ids, upstream=direction))
+            else:
+                for task_id in matched_task_ids:
+                    included_task_ids.update(self.task_dict[task_id].get_flat_relative_ids(direction))
+        if include_direct_upstream and not include_upstream:
+            for task_id in matched_task_ids:
+                included_task_ids.update(self.task_dict[task_id].upstream_task_ids)
+
+        # Compiling the unique list of tasks that made the cut. Operators are shallow
+        # copies sharing their attributes with the originals; only the DAG reference
+        # and the upstream/downstream references (filtered below) are their own.
+        dag.task_dict = {}
+        for task_id, task in self.task_dict.items():
+            if task_id in included_task_ids:
+                copied = copy.copy(task)
+                copied._dag = dag  # pylint: disable=protected-access
+                dag.task_dict[task_id] = copied
 
         def filter_task_group(group, parent_group):
             """Exclude tasks not included in the subdag from the given TaskGroup."""
@@ -1516,19 +1523,20 @@ class DAG(LoggingMixin):
         dag._task_group = filter_task_group(self._task_group, None)
 
         # Removing upstream/downstream references to tasks and TaskGroups that did not make
-        # the cut.
+        # the cut. Intersecting with sets (rather than dict keys) only walks the smaller side.
         subdag_task_groups = dag.task_group.get_task_group_dict()
+        subdag_group_ids = set(subdag_task_groups)
         for group in subdag_task_groups.values():
-            group.upstream_group_ids = group.upstream_group_ids.intersection(subdag_task_groups.keys())
-            group.downstream_group_ids = group.downstream_group_ids.intersection(subdag_task_groups.keys())
-            group.upstream_task_ids = group.upstream_task_ids.intersection(dag.task_dict.keys())
-            group.downstream_task_ids = group.downstream_task_ids.intersection(dag.task_dict.keys())
+            group.upstream_group_ids = group.upstream_group_ids.intersection(subdag_group_ids)
+            group.downstream_group_ids = group.downstream_group_ids.intersection(subdag_group_ids)
+            group.upstream_task_ids = group.upstream_task_ids.intersection(included_task_ids)
+            group.downstream_task_ids = group.downstream_task_ids.intersection(included_task_ids)
 
         for t in dag.tasks:
             # Removing upstream/downstream references to tasks that did not
-            # make the cut
-            t._upstream_task_ids = t.upstream_task_ids.intersection(dag.task_dict.keys())
-            t._downstream_task_ids = t.downstream_task_ids.intersection(dag.task_dict.keys())
+            # make the cut; this also gives each copy its own sets
+            t._upstream_task_ids = t.upstream_task_ids.intersection(included_task_ids)
+            t._downstream_task_ids = t.downstream_task_ids.intersection(included_task_ids)
 
         if len(dag.tasks) < len(self.tasks):
             dag.partial = True
@@ -1630,6 +1638,7 @@ class DAG(LoggingMixin):
             self._task_group.used_group_ids.add(task.task_id)
 
         self.task_count = len(self.task_dict)
+        self.invalidate_topology()
 
     def add_tasks(self, tasks):
         """
@@ -1657,6 +1666,7 @@ class DAG(LoggingMixin):
         conf=None,
         rerun_failed_tasks=False,
         run_backwards=False,
+        resume=False,
     ):
         """
         Runs the DAG.
@@ -1691,6 +1701,9 @@ class DAG(LoggingMixin):
         :type: bool
         :param run_backwards:
         :type: bool
+        :param resume: True to carry on with an interrupted run, skipping the dates
+            whose dag run already succeeded
+        :type: bool
 
         """
         from airflow.jobs.backfill_job import BackfillJob
@@ -1718,6 +1731,7 @@ class DAG(LoggingMixin):
             conf=conf,
             rerun_failed_tasks=rerun_failed_tasks,
             run_backwards=run_backwards,
+            resume=resume,
         )
         job.run()
 
@@ -2266,21 +2280,19 @@ class DagModel(Base):
         you should ensure that any scheduling decisions are made in a single transaction -- as soon as the
         transaction is committed it will be unlocked.
         """
-        # TODO[HA]: Bake this query, it is run _A lot_
+        # This query is run _A lot_, it is baked: built and compiled only once
+        query = bakery(lambda s: s.query(cls), cls)
+        query += lambda q: q.filter(
+            cls.is_paused == expression.false(),
+            cls.is_active == expression.true(),
+            cls.next_dagrun_create_after <= func.now(),
+        ).order_by(cls.next_dagrun_create_after)
         # We limit so that _one_ scheduler doesn't try to do all the creation
         # of dag runs
-        query = (
-            session.query(cls)
-            .filter(
-                cls.is_paused == expression.false(),
-                cls.is_active == expression.true(),
-                cls.next_dagrun_create_after <= func.now(),
-            )
-            .order_by(cls.next_dagrun_create_after)
-            .limit(cls.NUM_DAGS_PER_DAGRUN_QUERY)
-        )
+        params = limit_baked_query(query, 'num_dags', cls.NUM_DAGS_PER_DAGRUN_QUERY, session=session)
 
-        return with_row_locks(query, of=cls, session=session, **skip_locked(session=session))
+        result = with_row_locks(query, of=cls, session=session, **skip_locked(session=session))(session)
+        return result.params(**params)
 
     def calculate_dagrun_date_fields(
         self, dag: DAG, most_recent_dag_run: Optional[pendulum.DateTime], active_runs_of_dag: int
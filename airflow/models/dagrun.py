@@ -15,8 +15,9 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+from collections import Counter
 from datetime import datetime
-from typing import TYPE_CHECKING, Any, Iterable, List, NamedTuple, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
 
 from sqlalchemy import (
     Boolean,
@@ -29,6 +30,7 @@ from sqlalchemy import (
     UniqueConstraint,
     and_,
     func,
+    inspect,
     or_,
 )
 from sqlalchemy.exc import IntegrityError
@@ -47,12 +49,21 @@ from airflow.ti_deps.dep_context import DepContext
 from airflow.ti_deps.dependencies_states import SCHEDULEABLE_STATES
 from airflow.utils import callback_requests, timezone
 from airflow.utils.log.logging_mixin import LoggingMixin
+from airflow.utils.platform import getuser
 from airflow.utils.session import provide_session
-from airflow.utils.sqlalchemy import UtcDateTime, nulls_first, skip_locked, with_row_locks
+from airflow.utils.sqlalchemy import (
+    UtcDateTime,
+    bakery,
+    limit_baked_query,
+    nulls_first,
+    skip_locked,
+    with_row_locks,
+)
 from airflow.utils.state import State
 from airflow.utils.types import DagRunType
 
 if TYPE_CHECKING:
+    from airflow.models.baseoperator import BaseOperator
     from airflow.models.dag import DAG
 
 
@@ -203,10 +214,10 @@ class DagRun(Base, LoggingMixin):
         if max_number is None:
             max_number = cls.DEFAULT_DAGRUNS_TO_EXAMINE
 
-        # TODO: Bake this query, it is run _A lot_
-        query = (
-            session.query(cls)
-            .filter(cls.state == State.RUNNING, cls.run_type != DagRunType.BACKFILL_JOB)
+        # This query is run _A lot_, it is baked: built and compiled only once
+        query = bakery(lambda s: s.query(cls), cls)
+        query += (
+            lambda q: q.filter(cls.state == State.RUNNING, cls.run_type != DagRunType.BACKFILL_JOB)
             .join(
                 DagModel,
                 DagModel.dag_id == cls.dag_id,
@@ -215,18 +226,19 @@ class DagRun(Base, LoggingMixin):
                 DagModel.is_paused == expression.false(),
                 DagModel.is_active == expression.true(),
             )
-            .order_by(
-                nulls_first(cls.last_scheduling_decision, session=session),
-                cls.execution_date,
-            )
+        )
+        # How NULLs are sorted first depends on the database
+        last_scheduling_decision = nulls_first(cls.last_scheduling_decision, session=session)
+        query.add_criteria(
+            lambda q: q.order_by(last_scheduling_decision, cls.execution_date), session.bind.dialect.name
         )
 
         if not settings.ALLOW_FUTURE_EXEC_DATES:
-            query = query.filter(DagRun.execution_date <= func.now())
+            query += lambda q: q.filter(cls.execution_date <= func.now())
 
-        return with_row_locks(
-            query.limit(max_number), of=cls, session=session, **skip_locked(session=session)
-        )
+        params = limit_baked_query(query, 'max_number', max_number, session=session)
+        result = with_row_locks(query, of=cls, session=session, **skip_locked(session=session))(session)
+        return result.params(**params)
 
     @staticmethod
     @provide_session
@@ -643,37 +655,31 @@ class DagRun(Base, LoggingMixin):
         for ti in tis:
             task_instance_mutation_hook(ti)
             task_ids.add(ti.task_id)
-            task = None
-            try:
-                task = dag.get_task(ti.task_id)
-            except AirflowException:
+            removed = ti.task_id not in dag.task_dict
+            if removed:
                 if ti.state == State.REMOVED:
                     pass  # ti has already been removed, just ignore it
                 elif self.state != State.RUNNING and not dag.partial:
                     self.log.warning("Failed to get task '%s' for dag '%s'. Marking it as removed.", ti, dag)
                     Stats.incr(f"task_removed_from_dag.{dag.dag_id}", 1, 1)
                     ti.state = State.REMOVED
-
-            should_restore_task = (task is not None) and ti.state == State.REMOVED
-            if should_restore_task:
+            elif ti.state == State.REMOVED:
                 self.log.info("Restoring task '%s' which was previously removed from DAG '%s'", ti, dag)
                 Stats.incr(f"task_restored_to_dag.{dag.dag_id}", 1, 1)
                 ti.state = State.NONE
-            session.merge(ti)
 
         # check for missing tasks
-        for task in dag.task_dict.values():
-            if task.start_date > self.execution_date and not self.is_backfill:
-                continue
-
-            if task.task_id not in task_ids:
-                Stats.incr(f"task_instance_created-{task.task_type}", 1, 1)
-                ti = TI(task, self.execution_date)
-                task_instance_mutation_hook(ti)
-                session.add(ti)
+        missing_tasks = [
+            task
+            for task in dag.task_dict.values()
+            if task.task_id not in task_ids
+            and not (task.start_date > self.execution_date and not self.is_backfill)
+        ]
 
         try:
             session.flush()
+            if missing_tasks:
+                session.bulk_insert_mappings(TI, self._task_instance_rows(missing_tasks, self.execution_date))
         except IntegrityError as err:
             self.log.info(str(err))
             self.log.info(
@@ -683,6 +689,81 @@ class DagRun(Base, LoggingMixin):
             # TODO[HA]: We probably need to savepoint this so we can keep the transaction alive.
             session.rollback()
 
+    @staticmethod
+    def _task_instance_rows(
+        tasks: Iterable["BaseOperator"], execution_date: datetime
+    ) -> List[Dict[str, Any]]:
+        """
+        Column values of new task instances of ``tasks``, after ``task_instance_mutation_hook``.
+
+        They are inserted with ``bulk_insert_mappings``, which skips the unit of
+        work of the session, so no ORM object is kept for them. Unless a mutation
+        hook is defined, no ORM object is created for them either.
+        """
+        from airflow.settings import task_instance_mutation_hook
+
+        columns = [attr.key for attr in inspect(TI).column_attrs]
+        rows = []
+        created: Dict[str, int] = Counter()
+        if getattr(task_instance_mutation_hook, 'is_noop', False) is True:
+            # Without a hook to call, the rows hold what TaskInstance.__init__ would set,
+            # skipping the instrumented attribute events of an ORM object per task
+            empty_row = dict.fromkeys(columns)
+            unixname = getuser()
+            for task in tasks:
+                rows.append(
+                    {
+                        **empty_row,
+                        'task_id': task.task_id,
+                        'dag_id': task.dag_id,
+                        'execution_date': execution_date,
+                        '_try_number': 0,
+                        'unixname': unixname,
+                        'hostname': '',
+                        'queue': task.queue,
+                        'pool': task.pool,
+                        'pool_slots': task.pool_slots,
+                        'priority_weight': task.priority_weight_total,
+                        'max_tries': task.retries,
+                        'executor_config': task.executor_config,
+                        'operator': task.task_type,
+                    }
+                )
+                created[task.task_type] += 1
+        else:
+            for task in tasks:
+                ti = TI(task, execution_date)
+                task_instance_mutation_hook(ti)
+                rows.append({column: getattr(ti, column) for column in columns})
+                created[task.task_type] += 1
+        for task_type, count in created.items():
+            Stats.incr(f"task_instance_created-{task_type}", count, 1)
+        return rows
+
+    @classmethod
+    def create_task_instances(cls, dag_runs: Iterable["DagRun"], session: Session) -> int:
+        """
+        Create the task instances of newly created DAG runs, with a single multi-row insert.
+
+        This is what :meth:`verify_integrity` does for a run without any task
+        instance yet, but for many runs at once.
+
+        :param dag_runs: DAG runs, with their ``dag`` set, that have no task instances
+        :param session: Sqlalchemy ORM Session
+        :return: Number of task instances created
+        """
+        rows = []
+        for dag_run in dag_runs:
+            tasks = [
+                task
+                for task in dag_run.get_dag().task_dict.values()
+                if not (task.start_date > dag_run.execution_date and not dag_run.is_backfill)
+            ]
+            rows.extend(cls._task_instance_rows(tasks, dag_run.execution_date))
+        if rows:
+            session.bulk_insert_mappings(TI, rows)
+        return len(rows)
+
     @staticmethod
     def get_run(session: Session, dag_id: str, execution_date: datetime) -> Optional['DagRun']:
         """
@@ -0,0 +1,184 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Topology index over the tasks of a DAG."""
+from collections import deque
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set
+
+if TYPE_CHECKING:
+    from airflow.models.baseoperator import BaseOperator
+
+
+try:
+    _popcount = int.bit_count  # type: ignore  # Python 3.10+
+except AttributeError:
+
+    def _popcount(bits: int) -> int:  # type: ignore
+        return bin(bits).count("1")
+
+
+class DagTopology:
+    """
+    Topological order, transitive closures and depth of a DAG's task graph, computed once.
+
+    Every task is given a bit position following a topological order of the
+    graph. The ancestors and descendants of each task are then stored as a
+    single Python integer, so the closure of any set of tasks is a handful of
+    bitwise ``or`` operations instead of a recursive walk over the operators.
+    Priority weight totals are derived from the same bitsets on first use.
+
+    The index is a snapshot: it must be rebuilt when tasks, dependencies or
+    priority weights of the DAG change. Use :meth:`build` which returns ``None``
+    for cyclic graphs.
+
+    :param task_ids: Task ids in topological order
+    :param upstream: Mapping of task id to the ids of its direct upstream tasks,
+        in the order the tasks were added to the DAG
+    :param downstream: Mapping of task id to the ids of its direct downstream tasks,
+        in the order the tasks were added to the DAG
+    :param priority_weights: Mapping of task id to its own priority weight
+    """
+
+    def __init__(
+        self,
+        task_ids: List[str],
+        upstream: Dict[str, Iterable[str]],
+        downstream: Dict[str, Iterable[str]],
+        priority_weights: Dict[str, int],
+    ):
+        self.task_ids = task_ids
+        self.positions = {task_id: position for position, task_id in enumerate(task_ids)}
+        self.root_ids = [task_id for task_id, upstream_ids in upstream.items() if not upstream_ids]
+        self.leaf_ids = [task_id for task_id, downstream_ids in downstream.items() if not downstream_ids]
+        self.priority_weights = [priority_weights[task_id] for task_id in task_ids]
+        self.ancestors: List[int] = [0] * len(task_ids)
+        self.descendants: List[int] = [0] * len(task_ids)
+        self.depths: List[int] = [0] * len(task_ids)
+        self._priority_weight_totals: Dict[bool, List[int]] = {}
+
+        positions = self.positions
+        ancestors = self.ancestors
+        descendants = self.descendants
+        depths = self.depths
+        # The closure of a task is its direct relatives plus their closures; walking
+        # in (reverse) topological order guarantees those are already complete.
+        inclusive = [0] * len(task_ids)
+        for position, task_id in enumerate(task_ids):
+            bits = 0
+            depth = -1
+            for upstream_id in upstream[task_id]:
+                upstream_position = positions[upstream_id]
+                bits |= inclusive[upstream_position]
+                if depths[upstream_position] > depth:
+                    depth = depths[upstream_position]
+            ancestors[position] = bits
+            inclusive[position] = bits | (1 << position)
+            depths[position] = depth + 1
+        for position in range(len(task_ids) - 1, -1, -1):
+            bits = 0
+            for downstream_id in downstream[task_ids[position]]:
+                bits |= inclusive[positions[downstream_id]]
+            descendants[position] = bits
+            inclusive[position] = bits | (1 << position)
+
+    @classmethod
+    def build(cls, task_dict: Dict[str, "BaseOperator"]) -> Optional["DagTopology"]:
+        """
+        Build the index for the given tasks, or return ``None`` if they contain a cycle.
+
+        Dependencies on task ids that are not part of ``task_dict`` are ignored.
+        """
+        upstream = {
+            task_id: {
+                upstream_id
+                for upstream_id in task.get_direct_relative_ids(upstream=True)
+                if upstream_id in task_dict
+            }
+            for task_id, task in task_dict.items()
+        }
+        downstream: Dict[str, List[str]] = {task_id: [] for task_id in task_dict}
+        for task_id, upstream_ids in upstream.items():
+            for upstream_id in upstream_ids:
+                downstream[upstream_id].append(task_id)
+
+        remaining = {task_id: len(upstream_ids) for task_id, upstream_ids in upstream.items()}
+        queue = deque(task_id for task_id, count in remaining.items() if not count)
+        ordered = []
+        while queue:
+            task_id = queue.popleft()
+            ordered.append(task_id)
+            for downstream_id in downstream[task_id]:
+                remaining[downstream_id] -= 1
+                if not remaining[downstream_id]:
+                    queue.append(downstream_id)
+
+        if len(ordered) != len(task_dict):
+            return None
+        priority_weights = {task_id: task.priority_weight for task_id, task in task_dict.items()}
+        return cls(ordered, upstream, downstream, priority_weights)
+
+    def relative_bits(self, task_ids: Iterable[str], upstream: bool = False) -> int:
+        """Return the union of the upstream or downstream closures of ``task_ids`` as a bitset."""
+        closures = self.ancestors if upstream else self.descendants
+        positions = self.positions
+        bits = 0
+        for task_id in task_ids:
+            bits |= closures[positions[task_id]]
+        return bits
+
+    def ids_from_bits(self, bits: int) -> Set[str]:
+        """Translate a bitset back into task ids."""
+        task_ids = self.task_ids
+        # Scanning the reversed binary representation is much cheaper than
+        # shifting a large integer once per set bit.
+        binary = format(bits, "b")[::-1]
+        result = set()
+        position = binary.find("1")
+        while position != -1:
+            result.add(task_ids[position])
+            position = binary.find("1", position + 1)
+        return result
+
+    def get_flat_relative_ids(self, task_ids: Iterable[str], upstream: bool = False) -> Set[str]:
+        """Get the ids of all tasks upstream or downstream of any of ``task_ids``."""
+        return self.ids_from_bits(self.relative_bits(task_ids, upstream))
+
+    def get_depth(self, task_id: str) -> int:
+        """Length of the longest dependency path from a root task to ``task_id``."""
+        return self.depths[self.positions[task_id]]
+
+    def priority_weight_total(self, task_id: str, upstream: bool = False) -> int:
+        """
+        Own priority weight of ``task_id`` plus the priority weights of all its
+        upstream or downstream tasks.
+        """
+        totals = self._priority_weight_totals.get(upstream)
+        if totals is None:
+            totals = self._priority_weight_totals[upstream] = self._compute_priority_weight_totals(upstream)
+        return totals[self.positions[task_id]]
+
+    def _compute_priority_weight_totals(self, upstream: bool) -> List[int]:
+        # Tasks rarely use more than a few distinct weights, so the sum over a
+        # closure is a population count of the closure masked by each weight.
+        weight_masks: Dict[int, int] = {}
+        for position, weight in enumerate(self.priority_weights):
+            weight_masks[weight] = weight_masks.get(weight, 0) | (1 << position)
+        closures = self.ancestors if upstream else self.descendants
+        return [
+            own_weight + sum(weight * _popcount(closure & mask) for weight, mask in weight_masks.items())
+            for own_weight, closure in zip(self.priority_weights, closures)
+        ]
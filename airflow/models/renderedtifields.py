@@ -20,7 +20,7 @@ import os
 from typing import Optional
 
 import sqlalchemy_jsonfield
-from sqlalchemy import Column, String, and_, not_, tuple_
+from sqlalchemy import Column, String, func
 from sqlalchemy.orm import Session
 
 from airflow.configuration import conf
@@ -136,6 +136,9 @@ class RenderedTaskInstanceFields(Base):
         """
         Keep only Last X (num_to_keep) number of records for a task by deleting others
 
+        The records older than the X-th newest one are deleted with a single
+        range delete on the primary key.
+
         :param task_id: Task ID
         :param dag_id: Dag ID
         :param num_to_keep: Number of Records to keep
@@ -144,50 +147,55 @@ class RenderedTaskInstanceFields(Base):
         if num_to_keep <= 0:
             return
 
-        tis_to_keep_query = (
-            session.query(cls.dag_id, cls.task_id, cls.execution_date)
+        # Execution Date of the oldest record to keep, NULL if there are at most X records
+        oldest_to_keep = (
+            session.query(cls.execution_date)
             .filter(cls.dag_id == dag_id, cls.task_id == task_id)
             .order_by(cls.execution_date.desc())
-            .limit(num_to_keep)
+            .offset(num_to_keep - 1)
+            .limit(1)
         )
+        if session.bind.dialect.name == "mysql":
+            # Workaround for MySQL Limitation (https://stackoverflow.com/a/19344141/5691525)
+            # Limitation: This version of MySQL does not yet support
+            # LIMIT & IN/ALL/ANY/SOME subquery, nor the table being deleted from in a subquery
+            subq1 = oldest_to_keep.subquery('subq1')
+            oldest_to_keep = session.query(subq1.c.execution_date)
 
-        if session.bind.dialect.name in ["postgresql", "sqlite"]:
-            # Fetch Top X records given dag_id & task_id ordered by Execution Date
-            subq1 = tis_to_keep_query.subquery('subq1')
+        session.query(cls).filter(
+            cls.dag_id == dag_id,
+            cls.task_id == task_id,
+            cls.execution_date < oldest_to_keep.as_scalar(),
+        ).delete(synchronize_session=False)
 
-            session.query(cls).filter(
-                cls.dag_id == dag_id,
-                cls.task_id == task_id,
-                tuple_(cls.dag_id, cls.task_id, cls.execution_date).notin_(subq1),
-            ).delete(synchronize_session=False)
-        elif session.bind.dialect.name in ["mysql"]:
-            # Fetch Top X records given dag_id & task_id ordered by Execution Date
-            subq1 = tis_to_keep_query.subquery('subq1')
+    @classmethod
+    @provide_session
+    def prune(
+        cls,
+        num_to_keep: int = conf.getint("core", "max_num_rendered_ti_fields_per_task", fallback=0),
+        session: Session = None,
+    ) -> int:
+        """
+        Keep only the Last X (num_to_keep) records of every task.
 
-            # Second Subquery
-            # Workaround for MySQL Limitation (https://stackoverflow.com/a/19344141/5691525)
-            # Limitation: This version of MySQL does not yet support
-            # LIMIT & IN/ALL/ANY/SOME subquery
-            subq2 = session.query(subq1.c.dag_id, subq1.c.task_id, subq1.c.execution_date).subquery('subq2')
-
-            session.query(cls).filter(
-                cls.dag_id == dag_id,
-                cls.task_id == task_id,
-                tuple_(cls.dag_id, cls.task_id, cls.execution_date).notin_(subq2),
-            ).delete(synchronize_session=False)
-        else:
-            # Fetch Top X records given dag_id & task_id ordered by Execution Date
-            tis_to_keep = tis_to_keep_query.all()
-
-            filter_tis = [
-                not_(
-                    and_(
-                        cls.dag_id == ti.dag_id,
-                        cls.task_id == ti.task_id,
-                        cls.execution_date == ti.execution_date,
-                    )
-                )
-                for ti in tis_to_keep
-            ]
-
-            session.query(cls).filter(and_(*filter_tis)).delete(synchronize_session=False)
+        The tasks with more than X records are found with one query, and the
+        records of each task are deleted and committed on their own, so that
+        locks on the table are only held for a short time.
+
+        :param num_to_keep: Number of Records to keep per task
+        :param session: SqlAlchemy Session
+        :return: Number of tasks whose records were pruned
+        """
+        if num_to_keep <= 0:
+            return 0
+
+        tasks = (
+            session.query(cls.dag_id, cls.task_id)
+            .group_by(cls.dag_id, cls.task_id)
+            .having(func.count() > num_to_keep)
+            .all()
+        )
+        for dag_id, task_id in tasks:
+            cls.delete_old_records(task_id=task_id, dag_id=dag_id, num_to_keep=num_to_keep, session=session)
+            session.commit()
+        return len(tasks)
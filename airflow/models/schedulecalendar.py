@@ -0,0 +1,222 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Schedule dates of a DAG, computed in batches and cached."""
+import bisect
+import datetime as dt
+from datetime import datetime, timedelta
+from typing import List, Optional, Union
+
+import pendulum
+from croniter import croniter
+from dateutil.relativedelta import relativedelta
+from pendulum.tz.timezone import FixedTimezone, Timezone
+
+from airflow.utils import timezone
+
+
+def _is_utc(dttm: datetime) -> bool:
+    tzinfo = dttm.tzinfo
+    if isinstance(tzinfo, (FixedTimezone, dt.timezone)):
+        return tzinfo.utcoffset(dttm) == timedelta(0)
+    return False
+
+
+class ScheduleCalendar:
+    """
+    Schedule dates of a schedule interval in a time zone, in UTC.
+
+    :meth:`following` and :meth:`previous` give the same dates as computing
+    them from scratch for every call, which means building a ``croniter`` and
+    converting between time zones, but:
+
+    * whether a cron expression runs at a fixed time of the day is found once
+      instead of on every call;
+    * :meth:`dates` generates consecutive schedule dates in batches, by plain
+      datetime arithmetic for ``timedelta`` intervals and by iterating a single
+      ``croniter`` for cron expressions in a time zone without daylight saving
+      time;
+    * the last run of consecutive dates that was computed is kept, so finding
+      the date following one of them is a bisection. It is extended as the
+      scheduler moves from one date to the next.
+
+    Only UTC dates are looked up among the kept dates, as the result for a
+    ``timedelta`` interval depends on the time zone of the date it is given.
+
+    :param schedule_interval: normalized schedule interval of the DAG, a cron
+        expression, a ``timedelta``, a ``relativedelta`` or None
+    :param tz: time zone of the DAG
+    """
+
+    #: Number of schedule dates generated at once by :meth:`dates`
+    batch_size = 256
+    #: Maximum number of consecutive schedule dates kept
+    max_kept_dates = 1024
+
+    def __init__(
+        self,
+        schedule_interval: Optional[Union[str, timedelta, relativedelta]],
+        tz: Union[Timezone, dt.tzinfo],
+    ):
+        self.schedule_interval = schedule_interval
+        self.timezone = tz
+        self._is_cron = isinstance(schedule_interval, str)
+        self._fixed_time: Optional[bool] = None
+        self._dates: List[datetime] = []
+
+    @property
+    def is_fixed_time(self) -> bool:
+        """Whether the cron expression runs at a fixed time of the day (e.g. 3 AM)"""
+        if self._fixed_time is None:
+            cron = croniter(self.schedule_interval, datetime.now())
+            start = cron.get_next(datetime)
+            cron_next = cron.get_next(datetime)
+            self._fixed_time = cron_next.minute == start.minute and cron_next.hour == start.hour
+        return self._fixed_time
+
+    def following(self, dttm: datetime) -> Optional[datetime]:
+        """
+        Schedule date following ``dttm``, in UTC.
+
+        :param dttm: utc datetime
+        :return: utc datetime, None if the DAG has no schedule interval
+        """
+        if self.schedule_interval is None:
+            return None
+        dates = self._dates
+        cacheable = _is_utc(dttm)
+        if cacheable and dates:
+            index = bisect.bisect_left(dates, dttm)
+            if index < len(dates) and dates[index] == dttm:
+                if index + 1 < len(dates):
+                    return dates[index + 1]
+                following = self._following(dttm)
+                # The scheduler asks for the dates one after the other
+                if len(dates) >= self.max_kept_dates:
+                    self._dates = dates = dates[-(self.max_kept_dates // 2) :]
+                dates.append(following)
+                return following
+        following = self._following(dttm)
+        if cacheable:
+            self._dates = [dttm, following]
+        return following
+
+    def previous(self, dttm: datetime) -> Optional[datetime]:
+        """
+        Schedule date preceding ``dttm``, in UTC.
+
+        :param dttm: utc datetime
+        :return: utc datetime, None if the DAG has no schedule interval
+        """
+        if self._is_cron:
+            # we don't want to rely on the transitions created by
+            # croniter as they are not always correct
+            dttm = pendulum.instance(dttm)
+            naive = timezone.make_naive(dttm, self.timezone)
+            cron = croniter(self.schedule_interval, naive)
+
+            # We assume that DST transitions happen on the minute/hour
+            if not self.is_fixed_time:
+                # relative offset (eg. every 5 minutes)
+                delta = naive - cron.get_prev(datetime)
+                previous = dttm.in_timezone(self.timezone) - delta
+            else:
+                # absolute (e.g. 3 AM)
+                naive = cron.get_prev(datetime)
+                tz = pendulum.timezone(self.timezone.name)
+                previous = timezone.make_aware(naive, tz)
+            return timezone.convert_to_utc(previous)
+        elif self.schedule_interval is not None:
+            return timezone.convert_to_utc(dttm - self.schedule_interval)
+        return None
+
+    def dates(
+        self, first: datetime, end: Optional[datetime] = None, num: Optional[int] = None
+    ) -> List[datetime]:
+        """
+        Consecutive schedule dates starting at ``first``, each following the previous one.
+
+        :param first: first date returned, assumed to be a schedule date
+        :param end: the dates after it are not returned
+        :param num: maximum number of dates returned
+        :return: the dates, in UTC except for ``first`` which is returned as given
+        """
+        if end is None and num is None:
+            raise ValueError("Either end or num must be given")
+        if (end is not None and first > end) or (num is not None and num <= 0):
+            return []
+        dates = [first]
+        while True:
+            count = self.batch_size if num is None else min(self.batch_size, num - len(dates))
+            batch = self._generate(dates[-1], count)
+            if end is not None and batch and batch[-1] > end:
+                batch = batch[: bisect.bisect_right(batch, end)]
+                dates.extend(batch)
+                break
+            dates.extend(batch)
+            if not batch or (num is not None and len(dates) >= num):
+                break
+        if num is not None:
+            dates = dates[:num]
+        kept = dates if _is_utc(dates[0]) else dates[1:]
+        if len(kept) > 1:
+            self._dates = kept[-self.max_kept_dates :]
+        return dates
+
+    def _generate(self, dttm: datetime, count: int) -> List[datetime]:
+        """The ``count`` schedule dates following ``dttm``"""
+        if self.schedule_interval is None:
+            return []
+        following = self._following(dttm)
+        if isinstance(self.schedule_interval, timedelta):
+            # Once in UTC, adding the interval k times is the same as adding it k times in a row
+            interval = self.schedule_interval
+            return [following + interval * k for k in range(count)]
+        if self._is_cron and isinstance(self.timezone, FixedTimezone):
+            # Without daylight saving time, a single croniter gives the same dates
+            cron = croniter(self.schedule_interval, timezone.make_naive(following, self.timezone))
+            return [following] + [
+                timezone.convert_to_utc(timezone.make_aware(cron.get_next(datetime), self.timezone))
+                for _ in range(count - 1)
+            ]
+        dates = [following]
+        for _ in range(count - 1):
+            dates.append(self._following(dates[-1]))
+        return dates
+
+    def _following(self, dttm: datetime) -> Optional[datetime]:
+        if self._is_cron:
+            # we don't want to rely on the transitions created by
+            # croniter as they are not always correct
+            dttm = pendulum.instance(dttm)
+            naive = timezone.make_naive(dttm, self.timezone)
+            cron = croniter(self.schedule_interval, naive)
+
+            # We assume that DST transitions happen on the minute/hour
+            if not self.is_fixed_time:
+                # relative offset (eg. every 5 minutes)
+                delta = cron.get_next(datetime) - naive
+                following = dttm.in_timezone(self.timezone) + delta
+            else:
+                # absolute (e.g. 3 AM)
+                naive = cron.get_next(datetime)
+                tz = pendulum.timezone(self.timezone.name)
+                following = timezone.make_aware(naive, tz)
+            return timezone.convert_to_utc(following)
+        elif self.schedule_interval is not None:
+            return timezone.convert_to_utc(dttm + self.schedule_interval)
+        return None
@@ -56,7 +56,7 @@ from airflow.models.log import Log
 from airflow.models.taskfail import TaskFail
 from airflow.models.taskreschedule import TaskReschedule
 from airflow.models.variable import Variable
-from airflow.models.xcom import XCOM_RETURN_KEY, XCom
+from airflow.models.xcom import XCOM_RETURN_KEY, XCom, XComPrefetch
 from airflow.plugins_manager import integrate_macros_plugins
 from airflow.sentry import Sentry
 from airflow.stats import Stats
@@ -74,14 +74,6 @@ from airflow.utils.sqlalchemy import UtcDateTime, with_row_locks
 from airflow.utils.state import State
 from airflow.utils.timeout import timeout
 
-try:
-    from kubernetes.client.api_client import ApiClient
-
-    from airflow.kubernetes.kube_config import KubeConfig
-    from airflow.kubernetes.pod_generator import PodGenerator
-except ImportError:
-    ApiClient = None
-
 TR = TaskReschedule
 Context = Dict[str, Any]
 
@@ -349,6 +341,7 @@ class TaskInstance(Base, LoggingMixin):  # pylint: disable=R0902,R0904
     def init_on_load(self):
         """Initialize the attributes that aren't stored in the DB"""
         self.test_mode = False  # can be changed when calling 'run'
+        self._xcom_prefetch: Optional[XComPrefetch] = None
 
     @property
     def try_number(self):
@@ -605,30 +598,40 @@ class TaskInstance(Base, LoggingMixin):  # pylint: disable=R0902,R0904
         else:
             ti = qry.first()
         if ti:
-            # Fields ordered per model definition
-            self.start_date = ti.start_date
-            self.end_date = ti.end_date
-            self.duration = ti.duration
-            self.state = ti.state
-            # Get the raw value of try_number column, don't read through the
-            # accessor here otherwise it will be incremented by one already.
-            self.try_number = ti._try_number  # noqa pylint: disable=protected-access
-            self.max_tries = ti.max_tries
-            self.hostname = ti.hostname
-            self.unixname = ti.unixname
-            self.job_id = ti.job_id
-            self.pool = ti.pool
-            self.pool_slots = ti.pool_slots or 1
-            self.queue = ti.queue
-            self.priority_weight = ti.priority_weight
-            self.operator = ti.operator
-            self.queued_dttm = ti.queued_dttm
-            self.pid = ti.pid
+            self.refresh_from_task_instance(ti)
         else:
             self.state = None
 
         self.log.debug("Refreshed TaskInstance %s", self)
 
+    def refresh_from_task_instance(self, ti: "TaskInstance") -> None:
+        """
+        Copies the fields of another object of the same task instance, e.g. one of
+        many task instances loaded from the database in a single query.
+
+        :param ti: the task instance to copy the fields of
+        :type ti: TaskInstance
+        """
+        # Fields ordered per model definition
+        self.start_date = ti.start_date
+        self.end_date = ti.end_date
+        self.duration = ti.duration
+        self.state = ti.state
+        # Get the raw value of try_number column, don't read through the
+        # accessor here otherwise it will be incremented by one already.
+        self.try_number = ti._try_number  # noqa pylint: disable=protected-access
+        self.max_tries = ti.max_tries
+        self.hostname = ti.hostname
+        self.unixname = ti.unixname
+        self.job_id = ti.job_id
+        self.pool = ti.pool
+        self.pool_slots = ti.pool_slots or 1
+        self.queue = ti.queue
+        self.priority_weight = ti.priority_weight
+        self.operator = ti.operator
+        self.queued_dttm = ti.queued_dttm
+        self.pid = ti.pid
+
     def refresh_from_task(self, task, pool_override=None):
         """
         Copy common attributes from the given task.
@@ -656,11 +659,15 @@ class TaskInstance(Base, LoggingMixin):  # pylint: disable=R0902,R0904
         :type session: Session
         """
         self.log.debug("Clearing XCom data")
-        session.query(XCom).filter(
+        if self._xcom_prefetch is not None:
+            self._xcom_prefetch.discard(self.task_id)
+        query = session.query(XCom).filter(
             XCom.dag_id == self.dag_id,
             XCom.task_id == self.task_id,
             XCom.execution_date == self.execution_date,
-        ).delete()
+        )
+        XCom.purge_stored_values(query, session=session)
+        query.delete()
         session.commit()
         self.log.debug("XCom data cleared")
 
@@ -1276,7 +1283,9 @@ class TaskInstance(Base, LoggingMixin):  # pylint: disable=R0902,R0904
 
             self.render_templates(context=context)
             RenderedTaskInstanceFields.write(RenderedTaskInstanceFields(ti=self, render_templates=False))
-            RenderedTaskInstanceFields.delete_old_records(self.task_id, self.dag_id)
+            # Otherwise the scheduler deletes the old records of all tasks at once
+            if conf.getfloat('scheduler', 'rendered_ti_fields_prune_interval', fallback=60.0) <= 0:
+                RenderedTaskInstanceFields.delete_old_records(self.task_id, self.dag_id)
 
             # Export context to make it available for operators to use.
             airflow_context_vars = context_to_airflow_vars(context, in_env_var_format=True)
@@ -1775,11 +1784,44 @@ class TaskInstance(Base, LoggingMixin):  # pylint: disable=R0902,R0904
         if not context:
             context = self.get_template_context()
 
+        self.prefetch_xcom_args()
         self.task.render_template_fields(context)
 
+    @provide_session
+    def prefetch_xcom_args(self, session=None) -> None:
+        """
+        Load the values of all ``XComArg`` referenced by the template fields of
+        the task with a single query, so that rendering them does not query the
+        database once per argument.
+        """
+        from airflow.models.xcom_arg import XComArg
+
+        maxsize = conf.getint('core', 'xcom_prefetch_cache_size', fallback=1024)
+        if maxsize <= 0:
+            return
+
+        # Only upstream tasks are finished, and their XComs cannot change while this task runs
+        upstream_task_ids = self.task.get_flat_relative_ids(upstream=True)
+        refs = {
+            (xcom_arg.operator.task_id, str(xcom_arg.key))
+            for xcom_arg in XComArg.iter_xcom_args(self.task)
+            if xcom_arg.operator.dag_id == self.dag_id and xcom_arg.operator.task_id in upstream_task_ids
+        }
+        if not refs:
+            return
+
+        if self._xcom_prefetch is None:
+            self._xcom_prefetch = XComPrefetch(self.dag_id, self.execution_date, maxsize=maxsize)
+        self._xcom_prefetch.load(refs, session=session)
+
     def render_k8s_pod_yaml(self) -> Optional[dict]:
         """Render k8s pod yaml"""
+        # Importing the kubernetes client takes long, and is only needed with a kubernetes executor
+        from kubernetes.client.api_client import ApiClient
+
+        from airflow.kubernetes.kube_config import KubeConfig
         from airflow.kubernetes.kubernetes_helper_functions import create_pod_id  # Circular import
+        from airflow.kubernetes.pod_generator import PodGenerator
 
         kube_config = KubeConfig()
         pod = PodGenerator.construct_pod(
@@ -1917,6 +1959,8 @@ class TaskInstance(Base, LoggingMixin):  # pylint: disable=R0902,R0904
                 'execution_date is {}; received {})'.format(self.execution_date, execution_date)
             )
 
+        if self._xcom_prefetch is not None:
+            self._xcom_prefetch.discard(self.task_id, key)
         XCom.set(
             key=key,
             value=value,
@@ -1969,6 +2013,20 @@ class TaskInstance(Base, LoggingMixin):  # pylint: disable=R0902,R0904
         if dag_id is None:
             dag_id = self.dag_id
 
+        prefetch = self._xcom_prefetch
+        use_prefetch = (
+            prefetch is not None
+            and task_ids is not None
+            and key is not None
+            and not include_prior_dates
+            and dag_id == self.dag_id
+        )
+        if use_prefetch:
+            requested = task_ids if is_container(task_ids) else [task_ids]
+            cached = [prefetch.get(task_id, key) for task_id in requested]
+            if all(value is not XComPrefetch.NOT_FOUND for value in cached):
+                return cached if is_container(task_ids) else cached[0]
+
         query = XCom.get_many(
             execution_date=self.execution_date,
             key=key,
@@ -19,7 +19,7 @@
 import json
 import logging
 import os
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 
 from cryptography.fernet import InvalidToken as InvalidFernetToken
 from sqlalchemy import Boolean, Column, Integer, String, Text
@@ -29,6 +29,7 @@ from sqlalchemy.orm import Session, reconstructor, synonym
 from airflow.configuration import ensure_secrets_loaded
 from airflow.models.base import ID_LEN, Base
 from airflow.models.crypto import get_fernet
+from airflow.secrets.cache import SecretCache, get_secret_cache
 from airflow.utils.log.logging_mixin import LoggingMixin
 from airflow.utils.log.secrets_masker import mask_secret
 from airflow.utils.session import provide_session
@@ -174,6 +175,41 @@ class Variable(Base, LoggingMixin):
         Variable.delete(key, session=session)
         session.add(Variable(key=key, val=stored_value))
         session.flush()
+        get_secret_cache("variables").invalidate(key)
+
+    @classmethod
+    @provide_session
+    def set_many(cls, values: Dict[str, Any], serialize_json: bool = False, session: Session = None):
+        """
+        Sets the values of many Airflow Variables at once, replacing the existing
+        ones with a single delete and a batched insert
+
+        :param values: Variable Keys mapped to the values to set
+        :param serialize_json: Serialize the values to JSON strings
+        :param session: SQL Alchemy Sessions
+        """
+        if not values:
+            return
+        for key in values:
+            env_var_name = "AIRFLOW_VAR_" + key.upper()
+            if env_var_name in os.environ:
+                log.warning(
+                    "You have the environment variable %s defined, which takes precedence over reading "
+                    "from the database. The value will be saved, but to read it you have to delete "
+                    "the environment variable.",
+                    env_var_name,
+                )
+        variables = [
+            Variable(key=key, val=json.dumps(value, indent=2) if serialize_json else str(value))
+            for key, value in values.items()
+        ]
+
+        session.query(cls).filter(cls.key.in_(list(values))).delete(synchronize_session=False)
+        session.bulk_save_objects(variables)
+        session.flush()
+        cache = get_secret_cache("variables")
+        for key in values:
+            cache.invalidate(key)
 
     @classmethod
     @provide_session
@@ -184,7 +220,9 @@ class Variable(Base, LoggingMixin):
         :param key: Variable Key
         :param session: SQL Alchemy Sessions
         """
-        return session.query(cls).filter(cls.key == key).delete()
+        deleted = session.query(cls).filter(cls.key == key).delete()
+        get_secret_cache("variables").invalidate(key)
+        return deleted
 
     def rotate_fernet_key(self):
         """Rotate Fernet Key"""
@@ -200,8 +238,14 @@ class Variable(Base, LoggingMixin):
         :param key: Variable Key
         :return: Variable Value
         """
+        cache = get_secret_cache("variables")
+        var_val = cache.get(key)
+        if var_val is not SecretCache.NOT_CACHED:
+            return var_val
+
         for secrets_backend in ensure_secrets_loaded():
             var_val = secrets_backend.get_variable(key=key)
             if var_val is not None:
-                return var_val
-        return None
+                break
+        cache.set(key, var_val)
+        return var_val
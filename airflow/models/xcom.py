@@ -16,16 +16,21 @@
 # specific language governing permissions and limitations
 # under the License.
 
+import copy
 import json
 import logging
+import os
 import pickle
-from typing import Any, Iterable, Optional, Union
+import uuid
+from collections import OrderedDict
+from typing import Any, Iterable, List, Optional, Set, Tuple, Union
 
 import pendulum
-from sqlalchemy import Column, LargeBinary, String, and_
+from sqlalchemy import Column, LargeBinary, String, and_, event
 from sqlalchemy.orm import Query, Session, reconstructor
 
 from airflow.configuration import conf
+from airflow.exceptions import AirflowConfigException
 from airflow.models.base import COLLATION_ARGS, ID_LEN, Base
 from airflow.utils import timezone
 from airflow.utils.helpers import is_container
@@ -79,9 +84,11 @@ class BaseXCom(Base, LoggingMixin):
         value = XCom.serialize_value(value)
 
         # remove any duplicate XComs
-        session.query(cls).filter(
+        query = session.query(cls).filter(
             cls.key == key, cls.execution_date == execution_date, cls.task_id == task_id, cls.dag_id == dag_id
-        ).delete()
+        )
+        XCom.purge_stored_values(query, session=session)
+        query.delete()
 
         session.commit()
 
@@ -214,9 +221,33 @@ class BaseXCom(Base, LoggingMixin):
         for xcom in xcoms:
             if not isinstance(xcom, XCom):
                 raise TypeError(f'Expected XCom; received {xcom.__class__.__name__}')
+            XCom.purge_stored_values(
+                session.query(cls).filter(
+                    cls.key == xcom.key,
+                    cls.execution_date == xcom.execution_date,
+                    cls.task_id == xcom.task_id,
+                    cls.dag_id == xcom.dag_id,
+                ),
+                session=session,
+            )
             session.delete(xcom)
         session.commit()
 
+    @classmethod
+    def purge_stored_values(cls, query: Query, session: Session) -> None:
+        """
+        Delete what the XComs selected by ``query`` store outside of the metadata database.
+
+        It must be called before the XComs are deleted in ``session``. Backends storing
+        values elsewhere delete them once the deletion is committed, so that no XCom
+        ever references a deleted value. The default backend stores everything in the
+        ``xcom`` table and does nothing.
+
+        :param query: query of the XComs about to be deleted
+        :param session: database session the XComs are deleted in
+        :type session: sqlalchemy.orm.session.Session
+        """
+
     @staticmethod
     def serialize_value(value: Any):
         """Serialize Xcom value to str or pickled object"""
@@ -236,16 +267,20 @@ class BaseXCom(Base, LoggingMixin):
     @staticmethod
     def deserialize_value(result: "XCom") -> Any:
         """Deserialize XCom value from str or pickle object"""
-        if conf.getboolean('core', 'enable_xcom_pickling'):
+        return BaseXCom._deserialize_raw_value(result.value, conf.getboolean('core', 'enable_xcom_pickling'))
+
+    @staticmethod
+    def _deserialize_raw_value(value: bytes, enable_pickling: bool) -> Any:
+        if enable_pickling:
             try:
-                return pickle.loads(result.value)
+                return pickle.loads(value)
             except pickle.UnpicklingError:
-                return json.loads(result.value.decode('UTF-8'))
+                return json.loads(value.decode('UTF-8'))
         else:
             try:
-                return json.loads(result.value.decode('UTF-8'))
+                return json.loads(value.decode('UTF-8'))
             except (json.JSONDecodeError, UnicodeDecodeError):
-                return pickle.loads(result.value)
+                return pickle.loads(value)
 
     def orm_deserialize_value(self) -> Any:
         """
@@ -259,6 +294,263 @@ class BaseXCom(Base, LoggingMixin):
         return BaseXCom.deserialize_value(self)
 
 
+class ObjectStorageXCom(BaseXCom):
+    """
+    XCom backend keeping large values out of the metadata database.
+
+    Values whose serialized size reaches ``[core] xcom_storage_threshold`` bytes are
+    written to ``[core] xcom_storage_path`` and only a small reference is stored in
+    the ``xcom`` table. The path must be shared by all workers; it may be a local
+    or mounted directory or, if ``fsspec`` is installed, any URL it supports
+    (for example ``s3://bucket/xcom``).
+
+    pandas DataFrames are stored as Parquet (requires ``pyarrow``), every other
+    value is stored as the raw bytes produced by ``BaseXCom.serialize_value``.
+    ``orm_deserialize_value`` never reads the stored payload, so XCom listings in
+    the UI only show the reference.
+
+    The stored values are deleted with their XComs, when a value replaces them,
+    when they are cleared before a task runs, or when they are deleted with
+    ``airflow db clean`` or with their DAG.
+    """
+
+    REFERENCE_PREFIX = b"airflow-xcom-ref:"
+    # Key of the session info holding the paths to delete when the session commits
+    _PURGED_PATHS_KEY = "airflow.xcom.purged_paths"
+
+    @staticmethod
+    def _open(path: str, mode: str):
+        if "://" in path:
+            try:
+                import fsspec
+            except ImportError:
+                raise AirflowConfigException(
+                    f"The fsspec package is required to store XComs at {path}. "
+                    "Please install it or use a local path in [core] xcom_storage_path."
+                )
+            return fsspec.open(path, mode).open()
+        if "w" in mode:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        return open(path, mode)
+
+    @staticmethod
+    def _is_dataframe(value: Any) -> bool:
+        # Avoid importing pandas unless the value actually comes from it
+        return type(value).__module__.startswith("pandas.") and type(value).__name__ == "DataFrame"
+
+    @staticmethod
+    def _parse_reference(value: Optional[bytes]) -> Optional[dict]:
+        if not value or not value.startswith(ObjectStorageXCom.REFERENCE_PREFIX):
+            return None
+        return json.loads(value[len(ObjectStorageXCom.REFERENCE_PREFIX) :].decode('UTF-8'))
+
+    @staticmethod
+    def _store(data_format: str, write) -> bytes:
+        base_path = conf.get('core', 'xcom_storage_path').rstrip("/")
+        path = f"{base_path}/{uuid.uuid4().hex}.{data_format}"
+        with ObjectStorageXCom._open(path, "wb") as stream:
+            write(stream)
+        reference = json.dumps({"path": path, "format": data_format}).encode('UTF-8')
+        return ObjectStorageXCom.REFERENCE_PREFIX + reference
+
+    @staticmethod
+    def _delete_stored(path: str) -> None:
+        try:
+            if "://" in path:
+                import fsspec
+
+                stored = fsspec.open(path)
+                stored.fs.rm(stored.path)
+            else:
+                os.remove(path)
+        except FileNotFoundError:
+            pass
+        except Exception:  # pylint: disable=broad-except
+            # The XCom is already deleted, failing now would not bring it back
+            log.warning("Could not delete the XCom value stored at %s", path, exc_info=True)
+
+    @classmethod
+    def _delete_purged(cls, session: Session) -> None:
+        paths = session.info[cls._PURGED_PATHS_KEY]
+        purged = list(paths)
+        paths.clear()
+        for path in purged:
+            cls._delete_stored(path)
+
+    @classmethod
+    def _keep_purged(cls, session: Session) -> None:
+        # The XComs are rolled back, their values must stay
+        session.info[cls._PURGED_PATHS_KEY].clear()
+
+    @classmethod
+    def purge_stored_values(cls, query: Query, session: Session) -> None:
+        """Delete the stored values of the XComs selected by ``query`` once their deletion is committed"""
+        paths: List[str] = []
+        for (value,) in query.with_entities(cls.value):
+            reference = cls._parse_reference(value)
+            if reference is not None:
+                paths.append(reference["path"])
+        if not paths:
+            return
+        if cls._PURGED_PATHS_KEY not in session.info:
+            session.info[cls._PURGED_PATHS_KEY] = []
+            event.listen(session, "after_commit", cls._delete_purged)
+            event.listen(session, "after_rollback", cls._keep_purged)
+        session.info[cls._PURGED_PATHS_KEY].extend(paths)
+
+    @staticmethod
+    def serialize_value(value: Any):
+        """Serialize the value, storing it outside of the database if it is large"""
+        threshold = conf.getint('core', 'xcom_storage_threshold')
+        if ObjectStorageXCom._is_dataframe(value):
+            if value.memory_usage(deep=True).sum() >= threshold:
+                return ObjectStorageXCom._store("parquet", lambda stream: value.to_parquet(stream))
+        data = BaseXCom.serialize_value(value)
+        if len(data) >= threshold:
+            return ObjectStorageXCom._store("raw", lambda stream: stream.write(data))
+        return data
+
+    @staticmethod
+    def deserialize_value(result: "XCom") -> Any:
+        """Deserialize the value, reading it from storage if the row holds a reference"""
+        reference = ObjectStorageXCom._parse_reference(result.value)
+        if reference is None:
+            return BaseXCom.deserialize_value(result)
+
+        path = reference["path"]
+        if reference["format"] == "parquet":
+            import pyarrow.parquet as pq
+
+            if "://" in path:
+                with ObjectStorageXCom._open(path, "rb") as stream:
+                    return pq.read_table(stream).to_pandas()
+            # Memory-map local files so Arrow buffers are not copied before conversion
+            return pq.read_table(path, memory_map=True).to_pandas()
+
+        with ObjectStorageXCom._open(path, "rb") as stream:
+            data = stream.read()
+        return BaseXCom._deserialize_raw_value(data, conf.getboolean('core', 'enable_xcom_pickling'))
+
+    def orm_deserialize_value(self) -> Any:
+        """Return the stored location instead of fetching large values for the UI"""
+        reference = self._parse_reference(self.value)
+        if reference is None:
+            return BaseXCom.deserialize_value(self)
+        return f"<{reference['format']} value stored at {reference['path']}>"
+
+
+class XComPrefetch:
+    """
+    Cache of upstream XCom values for a single task execution.
+
+    All ``(task_id, key)`` pairs of upstream tasks referenced by the ``XComArg``
+    template fields of an operator are loaded with a single query, deserialized
+    once and kept in a bounded LRU, so that ``TaskInstance.xcom_pull`` does not
+    have to query the database for each of them while templates are rendered.
+    Only the loaded values are served, other pulls always query the database,
+    and the values of a task are dropped when it pushes or clears XComs. Like
+    values pulled from the database, every value returned is a copy of its own,
+    which the caller may modify.
+
+    :param dag_id: dag_id of the task instance pulling the XComs
+    :type dag_id: str
+    :param execution_date: execution date of the task instance pulling the XComs
+    :type execution_date: datetime.datetime
+    :param maxsize: maximum number of deserialized values kept in memory
+    :type maxsize: int
+    """
+
+    NOT_FOUND = object()
+    # Values of these types cannot be modified, they are returned without a copy
+    _IMMUTABLE_TYPES = (str, bytes, int, float, bool, type(None))
+
+    def __init__(self, dag_id: str, execution_date: pendulum.DateTime, maxsize: int = 1024):
+        self.dag_id = dag_id
+        self.execution_date = execution_date
+        self.maxsize = maxsize
+        self._values: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        # The pickling setting cannot change during a task execution, so it is read only once
+        self._enable_pickling = conf.getboolean('core', 'enable_xcom_pickling')
+
+    def __len__(self):
+        return len(self._values)
+
+    def get(self, task_id: str, key: str) -> Any:
+        """
+        Return a copy of the cached value for ``(task_id, key)`` or
+        ``XComPrefetch.NOT_FOUND`` if the value is not cached.
+        """
+        try:
+            value = self._values[(task_id, key)]
+        except KeyError:
+            return self.NOT_FOUND
+        self._values.move_to_end((task_id, key))
+        if isinstance(value, self._IMMUTABLE_TYPES):
+            return value
+        return copy.deepcopy(value)
+
+    def put(self, task_id: str, key: str, value: Any) -> None:
+        """Store a deserialized value, evicting the least recently used one if needed"""
+        if self.maxsize <= 0:
+            return
+        self._values[(task_id, key)] = value
+        self._values.move_to_end((task_id, key))
+        while len(self._values) > self.maxsize:
+            self._values.popitem(last=False)
+
+    def discard(self, task_id: str, key: Optional[str] = None) -> None:
+        """Drop the cached values of ``task_id``, only the one of ``key`` if given"""
+        for ref in [ref for ref in self._values if ref[0] == task_id and key in (None, ref[1])]:
+            del self._values[ref]
+
+    def deserialize(self, result: Any) -> Any:
+        """Deserialize a row holding an XCom ``value`` column"""
+        # Custom backends may override deserialize_value, only the default one can
+        # use the pickling setting cached on this object.
+        if XCom.deserialize_value is BaseXCom.deserialize_value:
+            return BaseXCom._deserialize_raw_value(result.value, self._enable_pickling)
+        return XCom.deserialize_value(result)
+
+    @provide_session
+    def load(self, refs: Iterable[Tuple[str, str]], session: Session = None) -> int:
+        """
+        Fetch all XComs for the given ``(task_id, key)`` pairs in one query.
+
+        :param refs: pairs of task_id and key to fetch
+        :param session: database session
+        :type session: sqlalchemy.orm.session.Session
+        :return: number of values loaded into the cache
+        """
+        wanted: Set[Tuple[str, str]] = {ref for ref in refs if ref not in self._values}
+        if not wanted or self.maxsize <= 0:
+            return 0
+
+        query = (
+            session.query(XCom.task_id, XCom.key, XCom.value)
+            .filter(
+                XCom.dag_id == self.dag_id,
+                XCom.execution_date == self.execution_date,
+                XCom.task_id.in_({task_id for task_id, _ in wanted}),
+                XCom.key.in_({key for _, key in wanted}),
+            )
+            .order_by(XCom.timestamp)
+        )
+        loaded = 0
+        for result in query:
+            if (result.task_id, result.key) not in wanted:
+                continue
+            self.put(result.task_id, result.key, self.deserialize(result))
+            loaded += 1
+        log.debug(
+            "Prefetched %d of %d upstream XComs for %s @ %s",
+            loaded,
+            len(wanted),
+            self.dag_id,
+            self.execution_date,
+        )
+        return loaded
+
+
 def resolve_xcom_backend():
     """Resolves custom XCom class"""
     clazz = conf.getimport("core", "xcom_backend", fallback=f"airflow.models.xcom.{BaseXCom.__name__}")
@@ -15,7 +15,7 @@
 # specific language governing permissions and limitations
 # under the License.
 
-from typing import Any, Dict, List, Optional, Sequence, Union
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Union
 
 from airflow.exceptions import AirflowException
 from airflow.models.baseoperator import BaseOperator  # pylint: disable=R0401
@@ -128,6 +128,27 @@ class XComArg(TaskMixin):
         """Proxy to underlying operator set_downstream method. Required by TaskMixin."""
         self.operator.set_downstream(task_or_task_list, edge_modifier)
 
+    @staticmethod
+    def iter_xcom_args(arg: Any, seen_oids: Optional[Set] = None) -> Iterator["XComArg"]:
+        """
+        Yield all ``XComArg`` found in ``arg``, looking into collections and
+        into the template fields of nested objects.
+        """
+        if seen_oids is None:
+            seen_oids = set()
+        if isinstance(arg, XComArg):
+            yield arg
+        elif isinstance(arg, (tuple, set, list)):
+            for elem in arg:
+                yield from XComArg.iter_xcom_args(elem, seen_oids)
+        elif isinstance(arg, dict):
+            for elem in arg.values():
+                yield from XComArg.iter_xcom_args(elem, seen_oids)
+        elif hasattr(arg, "template_fields") and id(arg) not in seen_oids:
+            seen_oids.add(id(arg))
+            for field in arg.template_fields:
+                yield from XComArg.iter_xcom_args(getattr(arg, field, None), seen_oids)
+
     def resolve(self, context: Dict) -> Any:
         """
         Pull XCom value for the existing arg. This method is run during ``op.execute()``
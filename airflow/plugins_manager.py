@@ -32,6 +32,7 @@ except ImportError:
     from importlib import metadata as importlib_metadata
 
 from airflow import settings
+from airflow.utils import discovery_cache
 from airflow.utils.entry_points import entry_points_with_dist
 from airflow.utils.file import find_path_from_directory
 
@@ -220,17 +221,31 @@ def load_entrypoint_plugins():
 
 
 def load_plugins_from_plugin_directory():
-    """Load and register Airflow Plugins from plugins directory"""
+    """
+    Load and register Airflow Plugins from plugins directory
+
+    The files defining no plugin are kept in the ``plugins_folder`` discovery cache,
+    and not imported again as long as no file of the plugins directory changes.
+    """
     global import_errors  # pylint: disable=global-statement
     log.debug("Loading plugins from directory: %s", settings.PLUGINS_FOLDER)
 
-    for file_path in find_path_from_directory(settings.PLUGINS_FOLDER, ".airflowignore"):
-        if not os.path.isfile(file_path):
-            continue
-        mod_name, file_ext = os.path.splitext(os.path.split(file_path)[-1])
-        if file_ext != '.py':
-            continue
-
+    file_paths = [
+        file_path
+        for file_path in find_path_from_directory(settings.PLUGINS_FOLDER, ".airflowignore")
+        if os.path.isfile(file_path) and os.path.splitext(file_path)[1] == '.py'
+    ]
+    fingerprint = [discovery_cache.file_fingerprint(file_path) for file_path in file_paths]
+    cached_file_paths = discovery_cache.load('plugins_folder', fingerprint)
+    if cached_file_paths is not None:
+        log.debug("Importing the plugin files found in the discovery cache")
+        file_paths = cached_file_paths
+    # The files failing to import are imported again, so that their errors are reported
+    plugin_file_paths = []
+
+    for file_path in file_paths:
+        mod_name = os.path.splitext(os.path.split(file_path)[-1])[0]
+        num_plugins = len(plugins)
         try:
             loader = importlib.machinery.SourceFileLoader(mod_name, file_path)
             spec = importlib.util.spec_from_loader(mod_name, loader)
@@ -246,6 +261,13 @@ def load_plugins_from_plugin_directory():
         except Exception as e:  # pylint: disable=broad-except
             log.exception('Failed to import plugin %s', file_path)
             import_errors[file_path] = str(e)
+            plugin_file_paths.append(file_path)
+            continue
+        if len(plugins) > num_plugins:
+            plugin_file_paths.append(file_path)
+
+    if cached_file_paths is None:
+        discovery_cache.store('plugins_folder', fingerprint, plugin_file_paths)
 
 
 # pylint: disable=protected-access
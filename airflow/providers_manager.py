@@ -22,14 +22,16 @@ import json
 import logging
 import os
 from collections import OrderedDict
-from typing import Any, Dict, NamedTuple, Set
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Set, Tuple
 
 import jsonschema
-from wtforms import Field
 
-from airflow.utils import yaml
+from airflow.utils import discovery_cache, yaml
 from airflow.utils.entry_points import entry_points_with_dist
 
+if TYPE_CHECKING:
+    from wtforms import Field
+
 try:
     import importlib.resources as importlib_resources
 except ImportError:
@@ -78,7 +80,7 @@ class ConnectionFormWidgetInfo(NamedTuple):
 
     connection_class: str
     package_name: str
-    field: Field
+    field: "Field"
 
 
 class ProvidersManager:
@@ -86,6 +88,11 @@ class ProvidersManager:
     Manages all provider packages. This is a Singleton class. The first time it is
     instantiated, it discovers all available providers in installed packages and
     local source folders (if airflow is run from sources).
+
+    What is discovered is kept in the ``providers`` discovery cache, and found there
+    again as long as the installed providers and the local ``provider.yaml`` files
+    do not change. The hooks are then only imported when used, except for the ones
+    adding widgets to the connection form, which are imported when the widgets are.
     """
 
     _instance = None
@@ -106,6 +113,9 @@ class ProvidersManager:
         # Customizations for javascript fields are kept here
         self._field_behaviours: Dict[str, Dict] = {}
         self._extra_link_class_name_set: Set[str] = set()
+        # Hooks adding widgets to the connection form, as tuples of class name and package
+        self._hooks_with_widgets: List[Tuple[str, str]] = []
+        self._widgets_discovered = False
         self._provider_schema_validator = _create_provider_info_schema_validator()
         self._customized_form_fields_schema_validator = (
             _create_customized_form_field_behaviours_schema_validator()
@@ -125,17 +135,68 @@ class ProvidersManager:
         # Development purpose. In production provider.yaml files are not present in the 'airflow" directory
         # So there is no risk we are going to override package provider accidentally. This can only happen
         # in case of local development
-        self._discover_all_airflow_builtin_providers_from_local_sources()
-        self._discover_all_providers_from_packages()
-        self._discover_hooks()
+        local_provider_files = self._find_all_airflow_builtin_provider_files_from_local_sources()
+        provider_entry_points = list(entry_points_with_dist('apache_airflow_provider'))
+        fingerprint = self._discovery_fingerprint(local_provider_files, provider_entry_points)
+        cached = discovery_cache.load('providers', fingerprint)
+        if cached is not None:
+            self._load_discovered(cached)
+        else:
+            for path, package_name in local_provider_files:
+                self._add_provider_info_from_local_source_file(path, package_name)
+            self._discover_all_providers_from_packages(provider_entry_points)
+            self._discover_hooks()
+            discovery_cache.store('providers', fingerprint, self._dump_discovered())
         self._provider_dict = OrderedDict(sorted(self._provider_dict.items()))  # noqa
         self._hooks_dict = OrderedDict(sorted(self._hooks_dict.items()))  # noqa
-        self._connection_form_widgets = OrderedDict(sorted(self._connection_form_widgets.items()))  # noqa
         self._field_behaviours = OrderedDict(sorted(self._field_behaviours.items()))  # noqa
         self._discover_extra_links()
         self._initialized = True
 
-    def _discover_all_providers_from_packages(self) -> None:
+    @staticmethod
+    def _discovery_fingerprint(local_provider_files, provider_entry_points) -> List:
+        """
+        What the providers are discovered from: the ``provider.yaml`` files and hooks of the
+        local sources, and the versions of the provider packages.
+        """
+        local_files = []
+        for path, _ in local_provider_files:
+            local_files.append(discovery_cache.file_fingerprint(path))
+            hooks_folder = os.path.join(os.path.dirname(path), "hooks")
+            if os.path.isdir(hooks_folder):
+                local_files.extend(
+                    discovery_cache.file_fingerprint(os.path.join(hooks_folder, filename))
+                    for filename in sorted(os.listdir(hooks_folder))
+                    if filename.endswith(".py")
+                )
+        packages = [
+            [dist.metadata['name'], dist.version, entry_point.value]
+            for entry_point, dist in provider_entry_points
+        ]
+        return [local_files, packages]
+
+    def _dump_discovered(self) -> Dict[str, Any]:
+        """What was discovered, as stored in the discovery cache"""
+        return {
+            'providers': {name: list(provider) for name, provider in self._provider_dict.items()},
+            'hooks': {conn_type: list(hook_info) for conn_type, hook_info in self._hooks_dict.items()},
+            'field_behaviours': self._field_behaviours,
+            'hooks_with_widgets': self._hooks_with_widgets,
+        }
+
+    def _load_discovered(self, cached: Dict[str, Any]) -> None:
+        """Loads what was discovered from the discovery cache"""
+        log.debug("Loading the providers from the discovery cache")
+        self._provider_dict = {
+            name: ProviderInfo(*provider) for name, provider in cached['providers'].items()
+        }
+        self._hooks_dict = {
+            conn_type: HookInfo(*hook_info) for conn_type, hook_info in cached['hooks'].items()
+        }
+        self._field_behaviours = cached['field_behaviours']
+        self._hooks_with_widgets = [tuple(hook) for hook in cached['hooks_with_widgets']]
+
+    def _discover_all_providers_from_packages(self, provider_entry_points) -> None:
         """
         Discovers all providers by scanning packages installed. The list of providers should be returned
         via the 'apache_airflow_provider' entrypoint as a dictionary conforming to the
@@ -143,8 +204,10 @@ class ProvidersManager:
         than provider.yaml.schema.json. The development version of provider schema is more strict and changes
         together with the code. The runtime version is more relaxed (allows for additional properties)
         and verifies only the subset of fields that are needed at runtime.
+
+        :param provider_entry_points: the 'apache_airflow_provider' entrypoints and their distributions
         """
-        for entry_point, dist in entry_points_with_dist('apache_airflow_provider'):
+        for entry_point, dist in provider_entry_points:
             package_name = dist.metadata['name']
             if self._provider_dict.get(package_name) is not None:
                 continue
@@ -167,38 +230,49 @@ class ProvidersManager:
                     package_name,
                 )
 
-    def _discover_all_airflow_builtin_providers_from_local_sources(self) -> None:
+    @staticmethod
+    def _find_all_airflow_builtin_provider_files_from_local_sources() -> List[Tuple[str, str]]:
         """
         Finds all built-in airflow providers if airflow is run from the local sources.
-        It finds `provider.yaml` files for all such providers and registers the providers using those.
+        It finds `provider.yaml` files for all such providers, the providers are registered using those.
 
         This 'provider.yaml' scanning takes precedence over scanning packages installed
         in case you have both sources and packages installed, the providers will be loaded from
         the "airflow" sources rather than from the packages.
+
+        :return: the paths of the provider.yaml files, and the names of their packages
         """
         try:
             import airflow.providers
         except ImportError:
             log.info("You have no providers installed.")
-            return
+            return []
+        provider_files: List[Tuple[str, str]] = []
         try:
             for path in airflow.providers.__path__:
-                self._add_provider_info_from_local_source_files_on_path(path)
+                provider_files.extend(
+                    ProvidersManager._find_provider_files_from_local_source_files_on_path(path)
+                )
         except Exception as e:  # noqa pylint: disable=broad-except
             log.warning("Error when loading 'provider.yaml' files from airflow sources: %s", e)
+        return provider_files
 
-    def _add_provider_info_from_local_source_files_on_path(self, path) -> None:
+    @staticmethod
+    def _find_provider_files_from_local_source_files_on_path(path) -> List[Tuple[str, str]]:
         """
         Finds all the provider.yaml files in the directory specified.
 
         :param path: path where to look for provider.yaml files
+        :return: the paths of the provider.yaml files, and the names of their packages
         """
         root_path = path
+        provider_files = []
         for folder, subdirs, files in os.walk(path, topdown=True):
             for filename in fnmatch.filter(files, "provider.yaml"):
                 package_name = "apache-airflow-providers" + folder[len(root_path) :].replace(os.sep, "-")
-                self._add_provider_info_from_local_source_file(os.path.join(folder, filename), package_name)
+                provider_files.append((os.path.join(folder, filename), package_name))
                 subdirs[:] = []
+        return provider_files
 
     def _add_provider_info_from_local_source_file(self, path, package_name) -> None:
         """
@@ -272,9 +346,8 @@ class ProvidersManager:
             # inherited from parent hook. This way we add form fields only once for the whole
             # hierarchy and we add it only from the parent hook that provides those!
             if 'get_connection_form_widgets' in hook_class.__dict__:
-                widgets = hook_class.get_connection_form_widgets()
-                if widgets:
-                    self._add_widgets(provider_package, hook_class, widgets)
+                # The widgets are only created when the connection form needs them
+                self._hooks_with_widgets.append((hook_class_name, provider_package))
             if 'get_ui_field_behaviour' in hook_class.__dict__:
                 field_behaviours = hook_class.get_ui_field_behaviour()
                 if field_behaviours:
@@ -313,7 +386,26 @@ class ProvidersManager:
             hook_name,
         )
 
-    def _add_widgets(self, package_name: str, hook_class: type, widgets: Dict[str, Field]):
+    def _discover_connection_form_widgets(self) -> None:
+        """Retrieves the widgets the hooks add to the connection form"""
+        for hook_class_name, provider_package in self._hooks_with_widgets:
+            try:
+                module, class_name = hook_class_name.rsplit('.', maxsplit=1)
+                hook_class = getattr(importlib.import_module(module), class_name)
+                widgets = hook_class.get_connection_form_widgets()
+            except Exception as e:  # noqa pylint: disable=broad-except
+                log.warning(
+                    "Exception when getting the connection form widgets of '%s' from '%s' package: %s",
+                    hook_class_name,
+                    provider_package,
+                    e,
+                )
+                continue
+            if widgets:
+                self._add_widgets(provider_package, hook_class, widgets)
+        self._connection_form_widgets = OrderedDict(sorted(self._connection_form_widgets.items()))  # noqa
+
+    def _add_widgets(self, package_name: str, hook_class: type, widgets: Dict[str, "Field"]):
         for field_name, field in widgets.items():
             if not field_name.startswith("extra__"):
                 log.warning(
@@ -404,6 +496,9 @@ class ProvidersManager:
     def connection_form_widgets(self) -> Dict[str, ConnectionFormWidgetInfo]:
         """Returns widgets for connection forms."""
         self.initialize_providers_manager()
+        if not self._widgets_discovered:
+            self._discover_connection_form_widgets()
+            self._widgets_discovered = True
         return self._connection_form_widgets
 
     @property
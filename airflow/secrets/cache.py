@@ -0,0 +1,119 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Process-wide cache for Variables and Connections retrieved from secrets backends"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from airflow.configuration import conf
+from airflow.stats import Stats
+
+
+class SecretCache:
+    """
+    Bounded LRU cache with a TTL for values looked up through the secrets backends.
+
+    ``None`` is a valid cached value, which allows negative caching of lookups
+    that found nothing in any backend. A cache with a TTL or size of 0 never
+    stores anything.
+
+    :param name: name used for the ``secrets.cache.<name>.*`` metrics
+    :param ttl_seconds: how long an entry stays valid
+    :param max_size: maximum number of entries
+    """
+
+    NOT_CACHED = object()
+
+    def __init__(self, name: str, ttl_seconds: float, max_size: int):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache stores anything"""
+        return self.ttl_seconds > 0 and self.max_size > 0
+
+    def get(self, key: str) -> Any:
+        """Return the cached value for ``key``, or ``SecretCache.NOT_CACHED``"""
+        if not self.enabled:
+            return self.NOT_CACHED
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                Stats.incr(f'secrets.cache.{self.name}.hit')
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+        Stats.incr(f'secrets.cache.{self.name}.miss')
+        return self.NOT_CACHED
+
+    def set(self, key: str, value: Any) -> None:
+        """Cache ``value`` (which may be ``None``) for ``key``"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                Stats.incr(f'secrets.cache.{self.name}.evicted')
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drop ``key`` from the cache, or every entry if no key is given"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_caches: Dict[str, SecretCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_secret_cache(name: str) -> SecretCache:
+    """
+    Return the process-wide cache called ``name``, creating it from the
+    ``[secrets]`` configuration on first use.
+    """
+    cache = _caches.get(name)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.get(name)
+            if cache is None:
+                if conf.getboolean('secrets', 'use_cache', fallback=False):
+                    ttl_seconds = conf.getint('secrets', 'cache_ttl_seconds', fallback=900)
+                    max_size = conf.getint('secrets', 'cache_max_size', fallback=1024)
+                else:
+                    ttl_seconds, max_size = 0, 0
+                cache = _caches[name] = SecretCache(name, ttl_seconds=ttl_seconds, max_size=max_size)
+    return cache
+
+
+def reset_secret_caches() -> None:
+    """Drop all caches so that they are recreated from the current configuration"""
+    with _caches_lock:
+        _caches.clear()
@@ -19,6 +19,7 @@
 import datetime
 import enum
 import logging
+import sys
 from dataclasses import dataclass
 from inspect import Parameter, signature
 from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set, Union
@@ -49,15 +50,14 @@ from airflow.utils.code_utils import get_python_source
 from airflow.utils.module_loading import import_string
 from airflow.utils.task_group import TaskGroup
 
-try:
-    # isort: off
-    from kubernetes.client import models as k8s
-    from airflow.kubernetes.pod_generator import PodGenerator
 
-    # isort: on
-    HAS_KUBERNETES = True
-except ImportError:
-    HAS_KUBERNETES = False
+def _is_pod(var: Any) -> bool:
+    """
+    Whether ``var`` is a kubernetes pod. The kubernetes client takes long to import, and
+    is only looked up among the imported modules: a pod cannot exist without it.
+    """
+    k8s = sys.modules.get('kubernetes.client.models')
+    return k8s is not None and isinstance(var, k8s.V1Pod)
 
 
 if TYPE_CHECKING:
@@ -217,7 +217,9 @@ class BaseSerialization:
             return cls._encode({str(k): cls._serialize(v) for k, v in var.items()}, type_=DAT.DICT)
         elif isinstance(var, list):
             return [cls._serialize(v) for v in var]
-        elif HAS_KUBERNETES and isinstance(var, k8s.V1Pod):
+        elif _is_pod(var):
+            from airflow.kubernetes.pod_generator import PodGenerator
+
             json_pod = PodGenerator.serialize_pod(var)
             return cls._encode(json_pod, type_=DAT.POD)
         elif isinstance(var, DAG):
@@ -280,7 +282,13 @@ class BaseSerialization:
         elif type_ == DAT.DATETIME:
             return pendulum.from_timestamp(var)
         elif type_ == DAT.POD:
-            if not HAS_KUBERNETES:
+            try:
+                # isort: off
+                from kubernetes.client import models as k8s  # noqa: F401 pylint: disable=unused-import
+                from airflow.kubernetes.pod_generator import PodGenerator
+
+                # isort: on
+            except ImportError:
                 raise RuntimeError("Cannot deserialize POD objects without kubernetes libraries installed!")
             pod = PodGenerator.deserialize_model_dict(var)
             return pod
@@ -775,6 +783,7 @@ class SerializedDAG(DAG, BaseSerialization):
                 # noqa: E501 # pylint: disable=protected-access
                 dag.task_dict[task_id]._upstream_task_ids.add(serializable_task.task_id)
 
+        dag.invalidate_topology()
         return dag
 
     @classmethod
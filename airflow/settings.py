@@ -176,6 +176,10 @@ def task_instance_mutation_hook(task_instance):  # pylint: disable=unused-argume
     """
 
 
+# Lets new task instances be created without an ORM object each when no hook is defined
+task_instance_mutation_hook.is_noop = True  # type: ignore
+
+
 def pod_mutation_hook(pod):  # pylint: disable=unused-argument
     """
     This setting allows altering ``kubernetes.client.models.V1Pod`` object
@@ -0,0 +1,338 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Deletion of the old rows of the metadata database tables that grow with every DAG run.
+
+Rows are deleted one DAG (or one job state) at a time, in batches of about
+``batch_size`` rows ordered by the column that dates them, each batch in a
+transaction of its own, so that the scheduler is never blocked for long. The
+last run of every DAG and the runs that are not finished are kept, together
+with their task instances, XComs, rendered fields, task failures and
+reschedules, so the tables can be cleaned while the scheduler is running.
+"""
+import base64
+import gzip
+import json
+import logging
+import os
+import time
+from datetime import date, datetime, timedelta
+from typing import IO, Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import and_, func, or_, select
+
+from airflow.configuration import conf
+from airflow.exceptions import AirflowException
+from airflow.jobs.base_job import BaseJob
+from airflow.models import DagRun, Log, SlaMiss, TaskFail, TaskInstance, TaskReschedule
+from airflow.models.renderedtifields import RenderedTaskInstanceFields
+from airflow.models.xcom import BaseXCom, resolve_xcom_backend
+from airflow.utils import timezone
+from airflow.utils.session import create_session
+from airflow.utils.state import State
+
+log = logging.getLogger(__name__)
+
+_UNFINISHED_DAG_RUN_STATES = [State.RUNNING, State.QUEUED]
+_UNFINISHED_TI_STATES = [state for state in State.unfinished if state is not None]
+
+
+class TablePolicy(NamedTuple):
+    """
+    Which rows of a table are deleted.
+
+    :param model: model of the table
+    :param recency_column: column dating the rows, the rows older than the
+        retention period are deleted
+    :param partition_column: column the rows are deleted by, one value at a time
+    :param follows_dag_runs: whether the rows belong to a DAG run, and are kept
+        with the last and the unfinished runs of their DAG
+    :param deletable: returns an additional condition the deleted rows must meet
+    :param before_delete: called with the query of the rows about to be deleted
+        and the session they are deleted in
+    """
+
+    model: Any
+    recency_column: str
+    partition_column: str
+    follows_dag_runs: bool = False
+    deletable: Optional[Callable[[Any], Any]] = None
+    before_delete: Optional[Callable[[Any, Any], None]] = None
+
+    @property
+    def name(self) -> str:
+        """Name of the table"""
+        return self.model.__tablename__
+
+
+# Tables referencing task_instance come first
+TABLE_POLICIES = [
+    TablePolicy(TaskReschedule, 'execution_date', 'dag_id', follows_dag_runs=True),
+    TablePolicy(TaskFail, 'execution_date', 'dag_id', follows_dag_runs=True),
+    TablePolicy(RenderedTaskInstanceFields, 'execution_date', 'dag_id', follows_dag_runs=True),
+    TablePolicy(
+        BaseXCom,
+        'execution_date',
+        'dag_id',
+        follows_dag_runs=True,
+        # Values stored outside of the database by the XCom backend are deleted with their rows
+        before_delete=lambda query, session: resolve_xcom_backend().purge_stored_values(query, session),
+    ),
+    TablePolicy(
+        TaskInstance,
+        'execution_date',
+        'dag_id',
+        follows_dag_runs=True,
+        deletable=lambda model: or_(model.state.is_(None), model.state.notin_(_UNFINISHED_TI_STATES)),
+    ),
+    TablePolicy(DagRun, 'execution_date', 'dag_id', follows_dag_runs=True),
+    TablePolicy(SlaMiss, 'execution_date', 'dag_id'),
+    TablePolicy(Log, 'dttm', 'dag_id'),
+    TablePolicy(
+        BaseJob,
+        'latest_heartbeat',
+        'state',
+        deletable=lambda model: or_(model.state.is_(None), model.state != State.RUNNING),
+    ),
+]
+TABLE_POLICIES_BY_NAME = {policy.name: policy for policy in TABLE_POLICIES}
+
+
+class CleanupResult(NamedTuple):
+    """Rows of a table deleted, or that would be deleted in a dry run, and how long it took"""
+
+    table: str
+    clean_before: datetime
+    rows: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        """Deletion throughput"""
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode()
+    return str(value)
+
+
+class _Archive:
+    """Gzip compressed file of the deleted rows of a table, one JSON object per line"""
+
+    def __init__(self, folder: str, table: str, started_at: datetime):
+        directory = os.path.join(folder, table)
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"{table}_{started_at:%Y%m%dT%H%M%S}.jsonl.gz")
+        self._file: IO[str] = gzip.open(self.path, "at", encoding="utf-8")
+
+    def write(self, rows: Iterable) -> None:
+        for row in rows:
+            self._file.write(json.dumps(dict(row), default=_json_default) + "\n")
+        # Written out before the rows are deleted
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def get_retention_cutoffs(
+    table_names: Iterable[str], clean_before_timestamp: Optional[datetime] = None
+) -> Dict[str, datetime]:
+    """
+    Return the date before which the rows of each table are deleted.
+
+    It is ``clean_before_timestamp`` if given, and otherwise follows the
+    ``[db_cleanup]`` retention configuration.
+    """
+    if clean_before_timestamp is not None:
+        return {name: clean_before_timestamp for name in table_names}
+    default_days = conf.getint('db_cleanup', 'retention_days', fallback=365)
+    try:
+        table_days = json.loads(conf.get('db_cleanup', 'table_retention_days', fallback='') or '{}')
+    except ValueError as err:
+        raise AirflowException(f"[db_cleanup] table_retention_days is not valid JSON: {err}")
+    now = timezone.utcnow()
+    return {name: now - timedelta(days=int(table_days.get(name, default_days))) for name in table_names}
+
+
+def _conditions(policy: TablePolicy, value: Any, clean_before: datetime, session) -> List:
+    """Conditions of the rows of the partition ``value`` that may be deleted"""
+    model = policy.model
+    recency = getattr(model, policy.recency_column)
+    partition = getattr(model, policy.partition_column)
+    conditions = [partition.is_(None) if value is None else partition == value]
+    if policy.deletable is not None:
+        conditions.append(policy.deletable(model))
+    if policy.follows_dag_runs:
+        last_run = session.query(func.max(DagRun.execution_date)).filter(DagRun.dag_id == value).scalar()
+        if last_run is not None:
+            clean_before = min(clean_before, last_run)
+        unfinished_runs = [
+            execution_date
+            for (execution_date,) in session.query(DagRun.execution_date).filter(
+                DagRun.dag_id == value, DagRun.state.in_(_UNFINISHED_DAG_RUN_STATES)
+            )
+        ]
+        if unfinished_runs:
+            conditions.append(recency.notin_(unfinished_runs))
+    conditions.append(recency < clean_before)
+    return conditions
+
+
+def _clean_partition(
+    policy: TablePolicy,
+    value: Any,
+    clean_before: datetime,
+    batch_size: int,
+    dry_run: bool,
+    archive: Optional[_Archive],
+) -> int:
+    model = policy.model
+    recency = getattr(model, policy.recency_column)
+    if dry_run:
+        with create_session() as session:
+            conditions = _conditions(policy, value, clean_before, session)
+            return session.query(func.count()).select_from(model).filter(*conditions).scalar()
+
+    deleted = 0
+    while True:
+        with create_session() as session:
+            # Evaluated again for every batch, as runs may start or finish in the meantime
+            conditions = _conditions(policy, value, clean_before, session)
+            # The date of the batch_size-th oldest row bounds the batch, which deletes a range of
+            # the index on the partition and recency columns rather than a list of keys
+            bound = (
+                session.query(recency)
+                .filter(*conditions)
+                .order_by(recency)
+                .offset(batch_size - 1)
+                .limit(1)
+                .scalar()
+            )
+            if bound is not None:
+                conditions.append(recency <= bound)
+            if archive is not None:
+                archive.write(session.execute(select([model.__table__]).where(and_(*conditions))))
+            query = session.query(model).filter(*conditions)
+            if policy.before_delete is not None:
+                policy.before_delete(query, session)
+            count = query.delete(synchronize_session=False)
+        deleted += count
+        if bound is None or count == 0:
+            return deleted
+
+
+def clean_table(
+    policy: TablePolicy,
+    clean_before: datetime,
+    batch_size: int = 1000,
+    dry_run: bool = False,
+    archive_folder: Optional[str] = None,
+) -> CleanupResult:
+    """
+    Delete the rows of a table older than ``clean_before``.
+
+    :param policy: policy of the table
+    :param clean_before: rows dated before are deleted
+    :param batch_size: approximate number of rows deleted per transaction
+    :param dry_run: only count the rows that would be deleted
+    :param archive_folder: if given, the rows are written to a gzip compressed
+        JSON lines file under this folder before being deleted
+    """
+    if batch_size < 1:
+        raise AirflowException(f"The batch size must be a positive integer, got {batch_size}")
+    started_at = timezone.utcnow()
+    start = time.monotonic()
+    with create_session() as session:
+        partition = getattr(policy.model, policy.partition_column)
+        values = [value for (value,) in session.query(partition).distinct()]
+
+    archive = None
+    if archive_folder and not dry_run:
+        archive = _Archive(archive_folder, policy.name, started_at)
+    try:
+        rows = sum(
+            _clean_partition(policy, value, clean_before, batch_size, dry_run, archive) for value in values
+        )
+    finally:
+        if archive is not None:
+            archive.close()
+    result = CleanupResult(policy.name, clean_before, rows, time.monotonic() - start)
+    log.info(
+        "%s %d rows of %s older than %s in %.2fs (%.0f rows/s)%s",
+        "Would delete" if dry_run else "Deleted",
+        rows,
+        policy.name,
+        clean_before.isoformat(),
+        result.seconds,
+        result.rows_per_second,
+        f", archived to {archive.path}" if archive is not None else "",
+    )
+    return result
+
+
+def run_cleanup(
+    table_names: Optional[Iterable[str]] = None,
+    clean_before_timestamp: Optional[datetime] = None,
+    batch_size: Optional[int] = None,
+    dry_run: bool = False,
+    archive_folder: Optional[str] = None,
+) -> List[CleanupResult]:
+    """
+    Delete the old rows of the metadata database tables.
+
+    :param table_names: tables to clean, all of ``TABLE_POLICIES`` by default
+    :param clean_before_timestamp: rows dated before are deleted, by default the
+        retention periods of ``[db_cleanup]`` apply
+    :param batch_size: approximate number of rows deleted per transaction,
+        ``[db_cleanup] batch_size`` by default
+    :param dry_run: only count the rows that would be deleted
+    :param archive_folder: folder the rows are archived to before being deleted,
+        ``[db_cleanup] archive_folder`` by default
+    """
+    if table_names is None:
+        policies = TABLE_POLICIES
+    else:
+        unknown = sorted(set(table_names) - set(TABLE_POLICIES_BY_NAME))
+        if unknown:
+            raise AirflowException(
+                f"Cannot clean tables {unknown}, the tables that can be cleaned are "
+                f"{sorted(TABLE_POLICIES_BY_NAME)}"
+            )
+        # Always in the order of TABLE_POLICIES
+        policies = [policy for policy in TABLE_POLICIES if policy.name in set(table_names)]
+    if batch_size is None:
+        batch_size = conf.getint('db_cleanup', 'batch_size', fallback=1000)
+    if archive_folder is None:
+        archive_folder = conf.get('db_cleanup', 'archive_folder', fallback='') or None
+
+    cutoffs = get_retention_cutoffs([policy.name for policy in policies], clean_before_timestamp)
+    return [
+        clean_table(
+            policy,
+            cutoffs[policy.name],
+            batch_size=batch_size,
+            dry_run=dry_run,
+            archive_folder=archive_folder,
+        )
+        for policy in policies
+    ]
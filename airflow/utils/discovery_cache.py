@@ -0,0 +1,111 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Cache of what the providers and plugins managers discovered, shared by all processes.
+
+Every process discovering the providers or plugins scans the installed
+distributions and the plugins folder, and imports modules to find out what they
+define. The results are stored in a JSON file of ``[core] discovery_cache_folder``
+together with a fingerprint of what they were discovered from, e.g. the versions
+of the installed distributions or the modification times of the files, and used
+as long as the fingerprint is the same.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Any, List, Optional
+
+from airflow.version import version as airflow_version
+
+log = logging.getLogger(__name__)
+
+
+def _cache_path(name: str) -> Optional[str]:
+    from airflow.configuration import conf
+
+    folder = conf.get('core', 'discovery_cache_folder', fallback='')
+    if not folder:
+        return None
+    return os.path.join(os.path.expanduser(folder), f"{name}.json")
+
+
+def _digest(fingerprint: Any) -> str:
+    serialized = json.dumps([airflow_version, fingerprint], sort_keys=True)
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+def file_fingerprint(path: str) -> List:
+    """Path, modification time and size of a file, which change when it is modified"""
+    stat = os.stat(path)
+    return [path, stat.st_mtime_ns, stat.st_size]
+
+
+def load(name: str, fingerprint: Any) -> Optional[Any]:
+    """
+    Return what was stored in the cache ``name``, if it was stored with the same fingerprint.
+
+    :param name: name of the cache
+    :param fingerprint: JSON serializable description of what the data was discovered from
+    :return: the data, None if the cache is disabled, missing or out of date
+    """
+    path = _cache_path(name)
+    if path is None:
+        return None
+    try:
+        with open(path) as cache_file:
+            cached = json.load(cache_file)
+        digest = _digest(fingerprint)
+    except (OSError, TypeError, ValueError) as e:
+        log.debug("Cannot read the %s discovery cache %s: %s", name, path, e)
+        return None
+    if cached.get('fingerprint') != digest:
+        log.debug("The %s discovery cache %s is out of date", name, path)
+        return None
+    return cached.get('data')
+
+
+def store(name: str, fingerprint: Any, data: Any) -> None:
+    """
+    Store the data in the cache ``name``, replacing what was stored before.
+
+    :param name: name of the cache
+    :param fingerprint: JSON serializable description of what the data was discovered from
+    :param data: JSON serializable data
+    """
+    path = _cache_path(name)
+    if path is None:
+        return
+    try:
+        content = json.dumps({'fingerprint': _digest(fingerprint), 'data': data})
+        folder = os.path.dirname(path)
+        os.makedirs(folder, exist_ok=True)
+        # Processes may read the cache while it is written: it is replaced at once
+        handle, tmp_path = tempfile.mkstemp(dir=folder, prefix=f".{name}.", suffix=".tmp")
+        try:
+            with os.fdopen(handle, 'w') as tmp_file:
+                tmp_file.write(content)
+            # Readable by the processes running as other users, as mkstemp creates it private
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except (OSError, TypeError, ValueError) as e:
+        log.debug("Cannot write the %s discovery cache %s: %s", name, path, e)
@@ -24,9 +24,6 @@ from itertools import filterfalse, tee
 from typing import Any, Callable, Dict, Generator, Iterable, List, Optional, TypeVar
 from urllib import parse
 
-from flask import url_for
-from jinja2 import Template
-
 from airflow.configuration import conf
 from airflow.exceptions import AirflowException
 from airflow.utils.module_loading import import_string
@@ -132,6 +129,8 @@ def as_flattened_list(iterable: Iterable[Iterable[T]]) -> List[T]:
 def parse_template_string(template_string):
     """Parses Jinja template string."""
     if "{{" in template_string:  # jinja mode
+        from jinja2 import Template
+
         return None, Template(template_string)
     else:
         return template_string, None
@@ -213,6 +212,9 @@ def build_airflow_url_with_query(query: Dict[str, Any]) -> str:
     For example:
     'http://0.0.0.0:8000/base/graph?dag_id=my-task&root=&execution_date=2020-10-27T10%3A59%3A25.615587
     """
+    # Only the webserver builds urls, importing flask in every process would slow them down
+    from flask import url_for
+
     view = conf.get('webserver', 'dag_default_view').lower()
     url = url_for(f"Airflow.{view}")
     return f"{url}?{parse.urlencode(query)}"
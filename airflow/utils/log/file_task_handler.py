@@ -18,16 +18,28 @@
 """File logging handler for tasks."""
 import logging
 import os
+import threading
 from pathlib import Path
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
 
-import httpx
-
-from airflow.configuration import AirflowConfigException, conf
+from airflow.configuration import conf
 from airflow.utils.helpers import parse_template_string
+from airflow.utils.state import State
 
 if TYPE_CHECKING:
     from airflow.models import TaskInstance
+    from airflow.utils.log.worker_log_fetcher import WorkerLogFetcher
+
+
+def get_worker_log_fetcher() -> "WorkerLogFetcher":
+    """
+    Returns the worker log fetcher of the process. It is imported on first use, as
+    importing httpx takes long and every process configuring its logging imports
+    this module, while only the webserver fetches logs from the workers.
+    """
+    from airflow.utils.log import worker_log_fetcher
+
+    return worker_log_fetcher.get_worker_log_fetcher()
 
 
 class FileTaskHandler(logging.Handler):
@@ -46,6 +58,8 @@ class FileTaskHandler(logging.Handler):
         self.handler = None  # type: Optional[logging.FileHandler]
         self.local_base = base_log_folder
         self.filename_template, self.filename_jinja_template = parse_template_string(filename_template)
+        # Logs of the tries being read by the current thread, fetched from the workers in parallel
+        self._prefetched = threading.local()
 
     def set_context(self, ti: "TaskInstance"):
         """
@@ -160,30 +174,63 @@ class FileTaskHandler(logging.Handler):
             except Exception as f:  # pylint: disable=broad-except
                 log += f'*** Unable to fetch logs from worker pod {ti.hostname} ***\n{str(f)}\n\n'
         else:
-            url = os.path.join("http://{ti.hostname}:{worker_log_server_port}/log", log_relative_path).format(
-                ti=ti, worker_log_server_port=conf.get('celery', 'WORKER_LOG_SERVER_PORT')
-            )
+            url = self._get_worker_log_url(ti, log_relative_path)
             log += f"*** Log file does not exist: {location}\n"
             log += f"*** Fetching from: {url}\n"
             try:
-                timeout = None  # No timeout
-                try:
-                    timeout = conf.getint('webserver', 'log_fetch_timeout_sec')
-                except (AirflowConfigException, ValueError):
-                    pass
-
-                response = httpx.get(url, timeout=timeout)
-                response.encoding = "utf-8"
-
-                # Check if the resource was properly fetched
-                response.raise_for_status()
-
-                log += '\n' + response.text
+                prefetched = getattr(self._prefetched, 'logs', None) or {}
+                if url in prefetched:
+                    worker_log = prefetched[url]
+                    if isinstance(worker_log, Exception):
+                        raise worker_log
+                else:
+                    worker_log = get_worker_log_fetcher().fetch(
+                        url, cacheable=self._is_try_finished(ti, try_number)
+                    )
+
+                log += '\n' + worker_log
             except Exception as e:  # pylint: disable=broad-except
                 log += f"*** Failed to fetch log file from worker. {str(e)}\n"
 
         return log, {'end_of_log': True}
 
+    @staticmethod
+    def _get_worker_log_url(ti, log_relative_path: str) -> str:
+        return os.path.join("http://{ti.hostname}:{worker_log_server_port}/log", log_relative_path).format(
+            ti=ti, worker_log_server_port=conf.get('celery', 'WORKER_LOG_SERVER_PORT')
+        )
+
+    @staticmethod
+    def _is_try_finished(ti, try_number: int) -> bool:
+        """Whether the log of ``try_number`` will not change anymore"""
+        return ti.state in State.finished or try_number < ti.next_try_number - 1
+
+    def _prefetch_worker_logs(self, ti, try_numbers: List[int]) -> Dict[str, Union[str, Exception]]:
+        """
+        Fetch the logs of the tries that are not in the local log folder from
+        the worker in parallel, rather than one try after the other.
+        """
+        # Handlers reading the logs from a remote storage only fall back to the worker
+        # for the tries missing there, which is not known before reading them
+        if (
+            len(try_numbers) < 2
+            or type(self)._read is not FileTaskHandler._read
+            or conf.get('core', 'executor') == 'KubernetesExecutor'
+        ):
+            return {}
+        urls, cacheable = [], []
+        for try_number in try_numbers:
+            log_relative_path = self._render_filename(ti, try_number)
+            if os.path.exists(os.path.join(self.local_base, log_relative_path)):
+                continue
+            url = self._get_worker_log_url(ti, log_relative_path)
+            urls.append(url)
+            if self._is_try_finished(ti, try_number):
+                cacheable.append(url)
+        if not urls:
+            return {}
+        return dict(zip(urls, get_worker_log_fetcher().fetch_many(urls, cacheable=cacheable)))
+
     def read(self, task_instance, try_number=None, metadata=None):
         """
         Read logs of given task instance from local machine.
@@ -213,12 +260,16 @@ class FileTaskHandler(logging.Handler):
 
         logs = [''] * len(try_numbers)
         metadata_array = [{}] * len(try_numbers)
-        for i, try_number_element in enumerate(try_numbers):
-            log, metadata = self._read(task_instance, try_number_element, metadata)
-            # es_task_handler return logs grouped by host. wrap other handler returning log string
-            # with default/ empty host so that UI can render the response in the same way
-            logs[i] = log if self._read_grouped_logs() else [(task_instance.hostname, log)]
-            metadata_array[i] = metadata
+        self._prefetched.logs = self._prefetch_worker_logs(task_instance, try_numbers)
+        try:
+            for i, try_number_element in enumerate(try_numbers):
+                log, metadata = self._read(task_instance, try_number_element, metadata)
+                # es_task_handler return logs grouped by host. wrap other handler returning log string
+                # with default/ empty host so that UI can render the response in the same way
+                logs[i] = log if self._read_grouped_logs() else [(task_instance.hostname, log)]
+                metadata_array[i] = metadata
+        finally:
+            self._prefetched.logs = None
 
         return logs, metadata_array
 
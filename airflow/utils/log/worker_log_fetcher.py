@@ -0,0 +1,221 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Fetching of task logs served by the workers, for the webserver"""
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Union
+from urllib.parse import urlsplit
+
+import httpx
+
+from airflow.configuration import AirflowConfigException, conf
+from airflow.stats import Stats
+from airflow.utils.log.logging_mixin import LoggingMixin
+
+
+class WorkerUnreachable(Exception):
+    """Raised without sending a request to a worker that failed too many times in a row"""
+
+
+class _Circuit:
+    """Consecutive failures of the requests to a worker, and since when it is considered unreachable"""
+
+    def __init__(self):
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+
+class WorkerLogFetcher(LoggingMixin):
+    """
+    Fetches the task logs served by ``serve_logs`` on the workers.
+
+    Requests are sent from an event loop running in a background thread of the
+    process, so the logs of several tries are fetched in parallel over one pool
+    of keep-alive connections, whatever thread asks for them.
+
+    * At most ``max_connections_per_host`` requests are sent to a worker at once.
+    * A request, including the time it waits for a connection, gives up after
+      ``timeout`` seconds.
+    * Once ``failure_threshold`` requests to a worker failed in a row to connect
+      or to answer in time, the worker is considered unreachable and no request
+      is sent to it for ``reset_timeout`` seconds. The next request then decides
+      whether it is still unreachable.
+    * Logs of finished tries do not change, up to ``cache_size`` of them are
+      kept in memory.
+
+    :param timeout: seconds after which a request is abandoned, ``None`` to wait forever
+    :param max_connections_per_host: maximum number of concurrent requests to a worker
+    :param failure_threshold: consecutive failures after which a worker is unreachable
+    :param reset_timeout: seconds during which an unreachable worker is not contacted
+    :param cache_size: maximum number of logs kept in memory
+    :param transport: HTTP transport to send the requests with, for tests
+    """
+
+    def __init__(
+        self,
+        timeout: Optional[float] = 5,
+        max_connections_per_host: int = 4,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30,
+        cache_size: int = 64,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        super().__init__()
+        self.timeout = timeout
+        self.max_connections_per_host = max_connections_per_host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.cache_size = cache_size
+        self.transport = transport
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        # Only used from the event loop thread
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._circuits: Dict[str, _Circuit] = {}
+
+    def fetch_many(self, urls: List[str], cacheable: Iterable[str] = ()) -> List[Union[str, Exception]]:
+        """
+        Fetch the logs at ``urls`` in parallel.
+
+        :param urls: URLs of the logs on the workers
+        :param cacheable: URLs of logs that will not change anymore
+        :return: for each URL, the log or the exception raised while fetching it
+        """
+        cacheable = set(cacheable)
+        results: List[Union[str, Exception, None]] = [None] * len(urls)
+        missing = []
+        with self._lock:
+            for i, url in enumerate(urls):
+                if url in self._cache:
+                    self._cache.move_to_end(url)
+                    results[i] = self._cache[url]
+                else:
+                    missing.append(i)
+        if len(missing) < len(urls):
+            Stats.incr('log_fetcher.cache_hit', len(urls) - len(missing))
+        if missing:
+            future = asyncio.run_coroutine_threadsafe(
+                self._fetch_all([urls[i] for i in missing]), self._get_loop()
+            )
+            for i, result in zip(missing, future.result()):
+                results[i] = result
+                if urls[i] in cacheable and isinstance(result, str):
+                    self._cache_log(urls[i], result)
+        return results  # type: ignore
+
+    def fetch(self, url: str, cacheable: bool = False) -> str:
+        """Fetch the log at ``url``, raising the exception that prevented it"""
+        result = self.fetch_many([url], cacheable=[url] if cacheable else [])[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def _cache_log(self, url: str, log: str):
+        if self.cache_size <= 0:
+            return
+        with self._lock:
+            self._cache[url] = log
+            self._cache.move_to_end(url)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            # The thread running the loop does not survive a fork of the process
+            if self._loop is None or self._pid != os.getpid():
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="worker-log-fetcher", daemon=True).start()
+                self._loop, self._pid = loop, os.getpid()
+                self._client = None
+                self._semaphores, self._circuits = {}, {}
+            return self._loop
+
+    async def _fetch_all(self, urls: List[str]) -> List[Union[str, Exception]]:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout, transport=self.transport)
+        return await asyncio.gather(*(self._fetch_one(url) for url in urls), return_exceptions=True)
+
+    async def _fetch_one(self, url: str) -> str:
+        host = urlsplit(url).netloc
+        circuit = self._circuits.setdefault(host, _Circuit())
+        if circuit.opened_at is not None and time.monotonic() - circuit.opened_at < self.reset_timeout:
+            Stats.incr('log_fetcher.circuit_open')
+            raise WorkerUnreachable(
+                f"{host} failed to answer {circuit.failures} times in a row, "
+                f"it is not contacted again before {self.reset_timeout} seconds passed"
+            )
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._semaphores[host] = asyncio.Semaphore(self.max_connections_per_host)
+
+        try:
+            response = await asyncio.wait_for(self._get(semaphore, url), self.timeout)
+        except (httpx.TransportError, asyncio.TimeoutError) as err:
+            circuit.failures += 1
+            if circuit.failures >= self.failure_threshold:
+                circuit.opened_at = time.monotonic()
+            if isinstance(err, asyncio.TimeoutError):
+                raise TimeoutError(f"No answer from {host} within {self.timeout} seconds") from None
+            raise
+        circuit.failures, circuit.opened_at = 0, None
+        response.encoding = "utf-8"
+        # A missing log file is an answer of a reachable worker
+        response.raise_for_status()
+        return response.text
+
+    async def _get(self, semaphore: asyncio.Semaphore, url: str) -> httpx.Response:
+        async with semaphore:
+            return await self._client.get(url)  # type: ignore
+
+
+_fetcher: Optional[WorkerLogFetcher] = None
+_fetcher_lock = threading.Lock()
+
+
+def get_worker_log_fetcher() -> WorkerLogFetcher:
+    """Return the fetcher of the process, creating it from the ``[webserver]`` configuration on first use"""
+    global _fetcher  # pylint: disable=global-statement
+    with _fetcher_lock:
+        if _fetcher is None:
+            try:
+                timeout: Optional[float] = conf.getint('webserver', 'log_fetch_timeout_sec')
+            except (AirflowConfigException, ValueError):
+                timeout = None  # No timeout
+            _fetcher = WorkerLogFetcher(
+                timeout=timeout,
+                max_connections_per_host=conf.getint(
+                    'webserver', 'log_fetch_max_connections_per_host', fallback=4
+                ),
+                failure_threshold=conf.getint('webserver', 'log_fetch_failure_threshold', fallback=3),
+                reset_timeout=conf.getfloat('webserver', 'log_fetch_circuit_reset_sec', fallback=30),
+                cache_size=conf.getint('webserver', 'log_fetch_cache_size', fallback=64),
+            )
+        return _fetcher
+
+
+def reset_worker_log_fetcher() -> None:
+    """Drop the fetcher so that it is recreated from the current configuration"""
+    global _fetcher  # pylint: disable=global-statement
+    with _fetcher_lock:
+        _fetcher = None
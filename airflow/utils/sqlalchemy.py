@@ -23,8 +23,9 @@ from typing import Any, Dict
 
 import pendulum
 from dateutil import relativedelta
-from sqlalchemy import event, nullsfirst
+from sqlalchemy import bindparam, event, nullsfirst
 from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext import baked
 from sqlalchemy.orm.session import Session
 from sqlalchemy.types import DateTime, Text, TypeDecorator
 
@@ -36,6 +37,11 @@ utc = pendulum.tz.timezone('UTC')
 
 using_mysql = conf.get('core', 'sql_alchemy_conn').lower().startswith('mysql')
 
+# The queries the scheduler runs on every loop are built as baked queries from this bakery: each one
+# is built into a Query and compiled to SQL once per process, instead of on every call. See
+# https://docs.sqlalchemy.org/en/13/orm/extensions/baked.html
+bakery = baked.bakery()
+
 
 # pylint: enable=unused-argument
 class UtcDateTime(TypeDecorator):
@@ -185,6 +191,22 @@ def nulls_first(col, session: Session) -> Dict[str, Any]:
         return col
 
 
+def limit_baked_query(query: baked.BakedQuery, name: str, limit: int, session: Session) -> Dict[str, int]:
+    """
+    Limit the number of rows returned by a baked query, in place.
+
+    The limit is a bound parameter named ``name``, so that the query is compiled only once whatever the
+    limit, and the parameters returned must be passed to the result of the query. MSSQL only supports a
+    bound limit with an ORDER BY, by wrapping the query in a subquery, so there the limit is rendered as
+    a literal and is part of the cache key of the query instead.
+    """
+    if session.bind.dialect.name == "mssql":
+        query.add_criteria(lambda q: q.limit(limit), limit)
+        return {}
+    query.add_criteria(lambda q: q.limit(bindparam(name)), name)
+    return {name: limit}
+
+
 USE_ROW_LEVEL_LOCKING: bool = conf.getboolean('scheduler', 'use_row_level_locking', fallback=True)
 
 
@@ -192,7 +214,7 @@ def with_row_locks(query, session: Session, **kwargs):
     """
     Apply with_for_update to an SQLAlchemy query, if row level locking is in use.
 
-    :param query: An SQLAlchemy Query object
+    :param query: An SQLAlchemy Query object, or a baked query
     :param session: ORM Session
     :param kwargs: Extra kwargs to pass to with_for_update (of, nowait, skip_locked, etc)
     :return: updated query
@@ -201,6 +223,9 @@ def with_row_locks(query, session: Session, **kwargs):
 
     # Don't use row level locks if the MySQL dialect (Mariadb & MySQL < 8) does not support it.
     if USE_ROW_LEVEL_LOCKING and (dialect.name != "mysql" or dialect.supports_for_update_of):
+        if isinstance(query, baked.BakedQuery):
+            # The arguments are part of the cache key of the baked query
+            return query.with_criteria(lambda q: q.with_for_update(**kwargs), *sorted(kwargs.items()))
         return query.with_for_update(**kwargs)
     else:
         return query
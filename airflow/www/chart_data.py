@@ -0,0 +1,328 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Data of the Gantt, Task Duration, Task Tries and Landing Times charts"""
+import threading
+from collections import OrderedDict, defaultdict
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from airflow.models.dag import DAG
+from airflow.models.taskfail import TaskFail
+from airflow.models.taskinstance import TaskInstance
+from airflow.utils import timezone
+from airflow.utils.state import State
+from airflow.www.utils import epoch
+
+
+class TaskInstanceRow(NamedTuple):
+    """The task instance columns the charts need"""
+
+    task_id: str
+    execution_date: datetime
+    state: Optional[str]
+    try_number: int
+    start_date: Optional[datetime]
+    end_date: Optional[datetime]
+    duration: Optional[float]
+
+
+class ChartDataCache:
+    """
+    Process-wide cache of the rows behind the task instance charts.
+
+    Rows are kept per DAG and execution date window together with a
+    fingerprint of the window, built by an aggregate query. They are only
+    fetched again when the fingerprint changed since the last request, and
+    only the columns the charts show are selected.
+
+    :param max_entries: number of windows for which rows are kept
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: Hashable, fingerprint: Any, load: Callable[[], Any]) -> Any:
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] == fingerprint:
+                self._entries.move_to_end(key)
+                return cached[1]
+        value = load()
+        with self._lock:
+            self._entries[key] = (fingerprint, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def get_task_instance_rows(
+        self, dag_id: str, start_date: datetime, end_date: datetime, session: Session
+    ) -> List[TaskInstanceRow]:
+        """
+        Return the task instances of ``dag_id`` with an execution date between
+        ``start_date`` and ``end_date`` (inclusive), ordered by execution date.
+        """
+        TI = TaskInstance
+        window = (TI.dag_id == dag_id, TI.execution_date >= start_date, TI.execution_date <= end_date)
+        fingerprint = frozenset(
+            session.query(
+                TI.state,
+                func.count(),
+                func.max(TI.execution_date),
+                func.max(TI.start_date),
+                func.max(TI.end_date),
+                func.sum(TI._try_number),  # pylint: disable=protected-access
+            )
+            .filter(*window)
+            .group_by(TI.state)
+        )
+
+        def load():
+            return [
+                TaskInstanceRow(*row)
+                for row in session.query(
+                    TI.task_id,
+                    TI.execution_date,
+                    TI.state,
+                    TI._try_number,  # pylint: disable=protected-access
+                    TI.start_date,
+                    TI.end_date,
+                    TI.duration,
+                )
+                .filter(*window)
+                .order_by(TI.execution_date, TI.task_id)
+            ]
+
+        return self._get(('ti', dag_id, start_date, end_date), fingerprint, load)
+
+    def get_failed_durations(
+        self, dag_id: str, start_date: datetime, end_date: datetime, session: Session
+    ) -> Dict[Tuple[str, datetime], float]:
+        """
+        Return the total duration of the failed tries of the task instances of
+        ``dag_id`` in the window, keyed by task id and execution date.
+        """
+        window = (
+            TaskFail.dag_id == dag_id,
+            TaskFail.execution_date >= start_date,
+            TaskFail.execution_date <= end_date,
+        )
+        fingerprint = tuple(session.query(func.count(), func.max(TaskFail.id)).filter(*window).one())
+
+        def load():
+            return {
+                (task_id, execution_date): total
+                for task_id, execution_date, total in session.query(
+                    TaskFail.task_id, TaskFail.execution_date, func.sum(TaskFail.duration)
+                )
+                .filter(*window)
+                .group_by(TaskFail.task_id, TaskFail.execution_date)
+                if total
+            }
+
+        return self._get(('fail', dag_id, start_date, end_date), fingerprint, load)
+
+    def clear(self) -> None:
+        """Drop everything that is cached"""
+        with self._lock:
+            self._entries.clear()
+
+
+CHART_DATA_CACHE = ChartDataCache()
+
+
+def _in_dag(dag: DAG, rows: List[TaskInstanceRow]) -> List[TaskInstanceRow]:
+    return [row for row in rows if row.task_id in dag.task_dict]
+
+
+def get_duration_points(dag: DAG, start_date: datetime, end_date: datetime, session: Session) -> Dict:
+    """
+    Return the points of the Task Duration chart.
+
+    The result has the execution date epochs (``x``), the durations (``y``)
+    and the durations including failed tries (``cumulative_y``) per task, and
+    the latest execution date of the window (``max_date``).
+    """
+    rows = _in_dag(dag, CHART_DATA_CACHE.get_task_instance_rows(dag.dag_id, start_date, end_date, session))
+    failed = CHART_DATA_CACHE.get_failed_durations(dag.dag_id, start_date, end_date, session)
+
+    x_points = defaultdict(list)
+    y_points = defaultdict(list)
+    cumulative_y = defaultdict(list)
+    for row in rows:
+        if row.duration:
+            x_points[row.task_id].append(epoch(row.execution_date))
+            y_points[row.task_id].append(float(row.duration))
+            cumulative_y[row.task_id].append(
+                float(row.duration + failed.get((row.task_id, row.execution_date), 0))
+            )
+    return {
+        'x': x_points,
+        'y': y_points,
+        'cumulative_y': cumulative_y,
+        'max_date': rows[-1].execution_date if rows else None,
+    }
+
+
+def get_tries_points(dag: DAG, start_date: datetime, end_date: datetime, session: Session) -> Dict:
+    """
+    Return the points of the Task Tries chart.
+
+    The result has the execution date epochs (``x``) and the number of
+    attempted tries (``y``) per task, in the order of ``dag.tasks``, and the
+    latest execution date of the window (``max_date``).
+    """
+    rows = _in_dag(dag, CHART_DATA_CACHE.get_task_instance_rows(dag.dag_id, start_date, end_date, session))
+
+    x_points = defaultdict(list)
+    y_points = defaultdict(list)
+    for row in rows:
+        x_points[row.task_id].append(epoch(row.execution_date))
+        # y value should reflect completed tries to have a 0 baseline.
+        y_points[row.task_id].append(row.try_number)
+    task_ids = [task.task_id for task in dag.tasks if task.task_id in x_points]
+    return {
+        'x': {task_id: x_points[task_id] for task_id in task_ids},
+        'y': {task_id: y_points[task_id] for task_id in task_ids},
+        'max_date': rows[-1].execution_date if rows else None,
+    }
+
+
+def get_landing_times_points(dag: DAG, start_date: datetime, end_date: datetime, session: Session) -> Dict:
+    """
+    Return the points of the Landing Times chart.
+
+    The result has the execution date epochs (``x``) and the seconds between
+    the end of the schedule period and the end of the task instance (``y``)
+    for every task of ``dag``, and the latest execution date of the window
+    (``max_date``).
+    """
+    rows = _in_dag(dag, CHART_DATA_CACHE.get_task_instance_rows(dag.dag_id, start_date, end_date, session))
+
+    x_points = {task.task_id: [] for task in dag.tasks}
+    y_points = {task.task_id: [] for task in dag.tasks}
+    period_ends: Dict[datetime, datetime] = {}
+    for row in rows:
+        if not row.end_date:
+            continue
+        period_end = period_ends.get(row.execution_date)
+        if period_end is None:
+            period_end = row.execution_date
+            if dag.schedule_interval:
+                period_end = dag.following_schedule(period_end) or period_end
+            period_ends[row.execution_date] = period_end
+        x_points[row.task_id].append(epoch(row.execution_date))
+        y_points[row.task_id].append((row.end_date - period_end).total_seconds())
+    return {
+        'x': x_points,
+        'y': y_points,
+        'max_date': rows[-1].execution_date if rows else None,
+    }
+
+
+def get_gantt_data(dag: DAG, execution_date: datetime, session: Session) -> Dict:
+    """
+    Return the payload of the Gantt chart of one DAG run.
+
+    Task instances and all their failed tries are fetched with one query each.
+    """
+    TI = TaskInstance
+    tis = (
+        session.query(
+            TI.task_id,
+            TI.dag_id,
+            TI.execution_date,
+            TI.start_date,
+            TI.end_date,
+            TI.duration,
+            TI.state,
+            TI._try_number,  # pylint: disable=protected-access
+            TI.operator,
+        )
+        .filter(
+            TI.dag_id == dag.dag_id,
+            TI.execution_date == execution_date,
+            TI.task_id.in_(dag.task_ids),
+            TI.start_date.isnot(None),
+            TI.state.isnot(None),
+        )
+        .order_by(TI.start_date)
+        .all()
+    )
+    task_ids = {ti.task_id for ti in tis}
+    failures = defaultdict(list)
+    for failure in (
+        session.query(TaskFail.task_id, TaskFail.start_date, TaskFail.end_date, TaskFail.duration)
+        .filter(TaskFail.dag_id == dag.dag_id, TaskFail.execution_date == execution_date)
+        .order_by(TaskFail.id)
+    ):
+        if failure.task_id in task_ids:
+            failures[failure.task_id].append(failure)
+
+    now = timezone.utcnow()
+    tasks = []
+    for ti in tis:
+        task = dag.get_task(ti.task_id)
+        # prev_attempted_tries will reflect the currently running try_number
+        # or the try_number of the last complete run
+        # https://issues.apache.org/jira/browse/AIRFLOW-2143
+        try_number = ti._try_number  # pylint: disable=protected-access
+        if try_number == 0 and ti.state not in State.running:
+            try_number = 1
+        tasks.append(
+            {
+                'task_id': ti.task_id,
+                'dag_id': ti.dag_id,
+                'execution_date': ti.execution_date.isoformat(),
+                'start_date': ti.start_date.isoformat(),
+                'end_date': (ti.end_date or now).isoformat(),
+                'duration': ti.duration,
+                'state': ti.state,
+                'operator': ti.operator,
+                'try_number': try_number,
+                'extraLinks': task.extra_links,
+            }
+        )
+    for ti in tis:
+        task = dag.get_task(ti.task_id)
+        for try_number, failure in enumerate(failures.get(ti.task_id, ()), 1):
+            end_date = failure.end_date or now
+            tasks.append(
+                {
+                    'task_id': ti.task_id,
+                    'dag_id': dag.dag_id,
+                    'execution_date': ti.execution_date.isoformat(),
+                    'start_date': (failure.start_date or end_date).isoformat(),
+                    'end_date': end_date.isoformat(),
+                    'duration': failure.duration,
+                    'state': State.FAILED,
+                    'operator': task.task_type,
+                    'try_number': try_number,
+                    'extraLinks': task.extra_links,
+                }
+            )
+    return {
+        'taskNames': [ti.task_id for ti in tis],
+        'tasks': tasks,
+        'height': len(tis) * 25 + 25,
+    }
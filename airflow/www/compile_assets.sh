@@ -31,4 +31,12 @@ fi
 yarn install --frozen-lockfile
 yarn run build
 
+# Precompress the bundles, the webserver serves them instead of compressing them on every request
+find static/dist -type f \( -name '*.js' -o -name '*.css' -o -name '*.svg' \) \
+  -exec gzip --best --keep --force {} +
+if command -v brotli >/dev/null; then
+  find static/dist -type f \( -name '*.js' -o -name '*.css' -o -name '*.svg' \) \
+    -exec brotli --best --keep --force {} +
+fi
+
 find package.json yarn.lock static/css static/js -type f | sort | xargs md5sum > "${MD5SUM_FILE}"
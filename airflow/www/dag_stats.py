@@ -0,0 +1,248 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Materialized per-DAG counters behind the stats of the DAGs home page"""
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, event, func, union_all
+from sqlalchemy.orm import Session
+
+from airflow.configuration import conf
+from airflow.models.dag import DagModel
+from airflow.models.dagrun import DagRun
+from airflow.models.taskinstance import TaskInstance
+from airflow.utils.state import State
+
+DAG_RUN_STATES = 'dag_run_states'
+TASK_INSTANCE_STATES = 'task_instance_states'
+LAST_DAG_RUNS = 'last_dag_runs'
+
+
+class DagStatsCache:
+    """
+    Process-wide, per-DAG counters of the DAGs home page.
+
+    Each kind of stats is kept per DAG together with the time it was computed.
+    A request only queries the DAGs it asks for whose entry is missing, was
+    invalidated or is older than ``refresh_interval`` seconds, with one grouped
+    query for all of them, so its cost follows the number of DAGs shown rather
+    than the size of the ``dag_run`` and ``task_instance`` tables.
+
+    State changes of DAG runs and task instances flushed by a session of this
+    process invalidate their DAGs right away. Changes made by other processes,
+    such as the scheduler and the workers, are reconciled once the entries
+    are older than ``refresh_interval``.
+
+    :param refresh_interval: seconds after which an entry is computed again,
+        0 disables the cache
+    """
+
+    def __init__(self, refresh_interval: float):
+        self.refresh_interval = refresh_interval
+        self._entries: Dict[str, Dict[str, Tuple[float, Any]]] = {}
+        self._invalidated_at: Dict[str, float] = {}
+        self._cleared_at = 0.0
+        self._lock = threading.Lock()
+
+    def _is_fresh(self, dag_id: str, computed_at: float, now: float) -> bool:
+        return (
+            now - computed_at < self.refresh_interval
+            and computed_at >= self._cleared_at
+            and computed_at >= self._invalidated_at.get(dag_id, 0.0)
+        )
+
+    def get(
+        self,
+        kind: str,
+        dag_ids: Iterable[str],
+        compute: Callable[[List[str]], Dict[str, Any]],
+        default: Any = None,
+    ) -> Dict[str, Any]:
+        """
+        Return the ``kind`` stats of the given DAGs.
+
+        :param kind: name of the stats
+        :param dag_ids: DAGs to return stats for
+        :param compute: called with the DAG ids whose stats are stale, returns
+            their stats keyed by DAG id
+        :param default: stats of the DAGs ``compute`` returns nothing for
+        """
+        dag_ids = set(dag_ids)
+        now = time.monotonic()
+        result: Dict[str, Any] = {}
+        with self._lock:
+            entries = self._entries.setdefault(kind, {})
+            for dag_id in dag_ids:
+                entry = entries.get(dag_id)
+                if entry is not None and self._is_fresh(dag_id, entry[0], now):
+                    result[dag_id] = entry[1]
+        stale = sorted(dag_ids.difference(result))
+        if not stale:
+            return result
+
+        computed = compute(stale)
+        with self._lock:
+            entries = self._entries.setdefault(kind, {})
+            for dag_id in stale:
+                result[dag_id] = computed.get(dag_id, default)
+                if self.refresh_interval > 0:
+                    # Entries are stamped with the time the query started, so that
+                    # changes invalidated while it ran are not masked by its result.
+                    entries[dag_id] = (now, result[dag_id])
+        return result
+
+    def invalidate(self, dag_ids: Iterable[str]) -> None:
+        """Compute the stats of the given DAGs again on their next request"""
+        now = time.monotonic()
+        with self._lock:
+            for dag_id in dag_ids:
+                self._invalidated_at[dag_id] = now
+                for entries in self._entries.values():
+                    entries.pop(dag_id, None)
+
+    def clear(self) -> None:
+        """Compute the stats of all DAGs again on their next request"""
+        with self._lock:
+            self._cleared_at = time.monotonic()
+            self._entries.clear()
+            self._invalidated_at.clear()
+
+
+DAG_STATS_CACHE = DagStatsCache(conf.getfloat('webserver', 'dag_stats_refresh_interval', fallback=30))
+
+
+@event.listens_for(Session, 'after_flush')
+def _invalidate_flushed_dags(session, flush_context):  # pylint: disable=unused-argument
+    dag_ids = set()
+    for obj in session.new.union(session.deleted):
+        if isinstance(obj, (DagRun, TaskInstance)):
+            dag_ids.add(obj.dag_id)
+    for obj in session.dirty:
+        if isinstance(obj, (DagRun, TaskInstance)) and session.is_modified(obj, include_collections=False):
+            dag_ids.add(obj.dag_id)
+    if dag_ids:
+        DAG_STATS_CACHE.invalidate(dag_ids)
+
+
+@event.listens_for(Session, 'after_bulk_update')
+@event.listens_for(Session, 'after_bulk_delete')
+def _invalidate_bulk_changes(context):
+    # The DAGs touched by a bulk statement are not known
+    if context.mapper.class_ in (DagRun, TaskInstance):
+        DAG_STATS_CACHE.clear()
+
+
+def get_dag_run_states(dag_ids: Iterable[str], session: Session) -> Dict[str, Dict[str, int]]:
+    """Return the number of DAG runs per state of the given DAGs"""
+
+    def compute(stale_dag_ids: List[str]) -> Dict[str, Dict[str, int]]:
+        data: Dict[str, Dict[str, int]] = {}
+        for dag_id, state, count in (
+            session.query(DagRun.dag_id, DagRun.state, func.count(DagRun.state))
+            .filter(DagRun.dag_id.in_(stale_dag_ids))
+            .group_by(DagRun.dag_id, DagRun.state)
+        ):
+            data.setdefault(dag_id, {})[state] = count
+        return data
+
+    return DAG_STATS_CACHE.get(DAG_RUN_STATES, dag_ids, compute, default={})
+
+
+def get_task_instance_states(dag_ids: Iterable[str], session: Session) -> Dict[str, Dict[str, int]]:
+    """
+    Return the number of task instances per state of the running DAG runs of
+    the given DAGs and, if ``[webserver] show_recent_stats_for_completed_runs``
+    is set, of their latest completed DAG run.
+    """
+
+    def compute(stale_dag_ids: List[str]) -> Dict[str, Dict[str, int]]:
+        # pylint: disable=comparison-with-callable,no-member
+        running_dag_run = (
+            session.query(DagRun.dag_id, DagRun.execution_date)
+            .join(DagModel, DagModel.dag_id == DagRun.dag_id)
+            .filter(DagRun.state == State.RUNNING, DagModel.is_active, DagRun.dag_id.in_(stale_dag_ids))
+            .subquery('running_dag_run')
+        )
+
+        # Select all task_instances from active dag_runs.
+        running_task_instances = session.query(
+            TaskInstance.dag_id.label('dag_id'), TaskInstance.state.label('state')
+        ).join(
+            running_dag_run,
+            and_(
+                running_dag_run.c.dag_id == TaskInstance.dag_id,
+                running_dag_run.c.execution_date == TaskInstance.execution_date,
+            ),
+        )
+
+        if conf.getboolean('webserver', 'SHOW_RECENT_STATS_FOR_COMPLETED_RUNS', fallback=True):
+            last_dag_run = (
+                session.query(DagRun.dag_id, func.max(DagRun.execution_date).label('execution_date'))
+                .join(DagModel, DagModel.dag_id == DagRun.dag_id)
+                .filter(DagRun.state != State.RUNNING, DagModel.is_active, DagRun.dag_id.in_(stale_dag_ids))
+                .group_by(DagRun.dag_id)
+                .subquery('last_dag_run')
+            )
+            # pylint: enable=comparison-with-callable,no-member
+
+            # Select all task_instances from active dag_runs.
+            # If no dag_run is active, return task instances from most recent dag_run.
+            last_task_instances = session.query(
+                TaskInstance.dag_id.label('dag_id'), TaskInstance.state.label('state')
+            ).join(
+                last_dag_run,
+                and_(
+                    last_dag_run.c.dag_id == TaskInstance.dag_id,
+                    last_dag_run.c.execution_date == TaskInstance.execution_date,
+                ),
+            )
+            final_task_instances = union_all(last_task_instances, running_task_instances).alias('final_ti')
+        else:
+            final_task_instances = running_task_instances.subquery('final_ti')
+
+        data: Dict[str, Dict[str, int]] = {}
+        for dag_id, state, count in session.query(
+            final_task_instances.c.dag_id, final_task_instances.c.state, func.count()
+        ).group_by(final_task_instances.c.dag_id, final_task_instances.c.state):
+            data.setdefault(dag_id, {})[state] = count
+        return data
+
+    return DAG_STATS_CACHE.get(TASK_INSTANCE_STATES, dag_ids, compute, default={})
+
+
+def get_last_dag_runs(
+    dag_ids: Iterable[str], session: Session
+) -> Dict[str, Optional[Tuple[datetime, Optional[datetime]]]]:
+    """
+    Return the latest execution date and start date of the DAG runs of the
+    given DAGs, or None for the DAGs that never ran.
+    """
+
+    def compute(stale_dag_ids: List[str]) -> Dict[str, Tuple[datetime, Optional[datetime]]]:
+        return {
+            dag_id: (execution_date, start_date)
+            for dag_id, execution_date, start_date in session.query(
+                DagRun.dag_id, func.max(DagRun.execution_date), func.max(DagRun.start_date)
+            )
+            .filter(DagRun.dag_id.in_(stale_dag_ids))
+            .group_by(DagRun.dag_id)
+        }
+
+    return DAG_STATS_CACHE.get(LAST_DAG_RUNS, dag_ids, compute)
@@ -0,0 +1,197 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Compression of the webserver responses"""
+import os
+import zlib
+from typing import Iterable, Iterator, Optional
+
+from flask import Flask, request, send_from_directory
+from werkzeug.wrappers import Response
+
+from airflow.configuration import conf
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = frozenset(
+    [
+        "application/javascript",
+        "application/json",
+        "application/x-ndjson",
+        "image/svg+xml",
+        "text/css",
+        "text/html",
+        "text/javascript",
+        "text/plain",
+        "text/xml",
+    ]
+)
+
+# File name suffixes of the static assets precompressed by compile_assets.sh
+PRECOMPRESSED_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+def supported_encodings():
+    """Content codings the webserver can compress with, in order of preference"""
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def _compressor(encoding: str, level: int):
+    if encoding == "br":
+        return brotli.Compressor(quality=level)
+    # wbits=31 writes a gzip header and trailer around the deflate stream
+    return zlib.compressobj(level, zlib.DEFLATED, 31)
+
+
+def compress(data: bytes, encoding: str, level: int) -> bytes:
+    """Compress ``data`` with the ``encoding`` content coding"""
+    compressor = _compressor(encoding, level)
+    if encoding == "br":
+        return compressor.process(data) + compressor.finish()
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_stream(chunks: Iterable, encoding: str, level: int, charset: str = "utf-8") -> Iterator[bytes]:
+    """
+    Compress the chunks of a streamed body as they are produced.
+
+    Compressed data is only yielded once the compressor emits it, so small
+    chunks are sent in larger blocks rather than flushed one by one.
+    """
+    compressor = _compressor(encoding, level)
+    if encoding == "br":
+        compress_chunk, finish = compressor.process, compressor.finish
+    else:
+        compress_chunk, finish = compressor.compress, compressor.flush
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode(charset)
+            data = compress_chunk(chunk)
+            if data:
+                yield data
+        yield finish()
+    finally:
+        if hasattr(chunks, "close"):
+            chunks.close()
+
+
+def _negotiate_encoding(encodings) -> Optional[str]:
+    encoding = request.accept_encodings.best_match(encodings)
+    if encoding and request.accept_encodings[encoding]:
+        return encoding
+    return None
+
+
+def _add_vary(response: Response):
+    response.vary.add("Accept-Encoding")
+
+
+def _is_compressible(response: Response) -> bool:
+    return (
+        200 <= response.status_code < 300
+        and response.status_code not in (204, 206)
+        and "Content-Encoding" not in response.headers
+        and "Content-Range" not in response.headers
+        and not response.cache_control.no_transform
+        and response.mimetype in COMPRESSIBLE_MIMETYPES
+    )
+
+
+def _precompressed_static(app: Flask, response: Response) -> Response:
+    """Serve the precompressed variant of a static file if the client accepts it and it exists"""
+    filename = (request.view_args or {}).get("filename")
+    if response.status_code != 200 or not filename or not app.static_folder:
+        return response
+    available = [
+        encoding
+        for encoding, suffix in PRECOMPRESSED_SUFFIXES.items()
+        if os.path.isfile(os.path.join(app.static_folder, filename + suffix))
+    ]
+    if not available:
+        return response
+    _add_vary(response)
+    encoding = _negotiate_encoding(available)
+    if encoding is None:
+        return response
+    precompressed = send_from_directory(
+        app.static_folder,
+        filename + PRECOMPRESSED_SUFFIXES[encoding],
+        mimetype=response.mimetype,
+        cache_timeout=app.get_send_file_max_age(filename),
+        conditional=True,
+    )
+    precompressed.headers["Content-Encoding"] = encoding
+    _add_vary(precompressed)
+    return precompressed
+
+
+def init_response_compression(app: Flask):
+    """
+    Compress the responses of the views and of the REST API.
+
+    Responses are compressed with brotli when the ``brotli`` package is
+    installed and the client accepts it, and with gzip otherwise. Bodies
+    smaller than ``[webserver] compress_min_size`` are sent as they are,
+    streamed bodies are compressed while they are sent. Static files are
+    served from the ``.br`` and ``.gz`` files written next to them by
+    ``compile_assets.sh`` when they exist.
+    """
+    if not conf.getboolean("webserver", "compress_responses", fallback=True):
+        return
+    min_size = conf.getint("webserver", "compress_min_size", fallback=1024)
+    level = conf.getint("webserver", "compress_level", fallback=6)
+
+    def compress_response(response: Response) -> Response:
+        if request.endpoint == "static":
+            response = _precompressed_static(app, response)
+        if not _is_compressible(response):
+            return response
+
+        if response.is_streamed:
+            content_length = response.content_length
+            if content_length is not None and content_length < min_size:
+                return response
+            _add_vary(response)
+            encoding = _negotiate_encoding(supported_encodings())
+            if encoding is None:
+                return response
+            # Static files are sent as a file wrapper the WSGI server may pass through as is
+            response.direct_passthrough = False
+            response.response = compress_stream(response.response, encoding, level, response.charset)
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < min_size:
+                return response
+            _add_vary(response)
+            encoding = _negotiate_encoding(supported_encodings())
+            if encoding is None:
+                return response
+            response.set_data(compress(data, encoding, level))
+
+        response.headers["Content-Encoding"] = encoding
+        # The compressed body is a different representation, but the same resource
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+    app.after_request(compress_response)
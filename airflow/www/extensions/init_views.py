@@ -24,6 +24,7 @@ from flask import Flask, request
 from airflow._vendor import connexion
 from airflow._vendor.connexion import ProblemException
 from airflow.api_connexion.exceptions import common_error_handler
+from airflow.api_connexion.streaming import StreamingResponseValidator
 from airflow.configuration import conf
 from airflow.security import permissions
 from airflow.www.views import lazy_add_provider_discovered_options_to_connection_form
@@ -183,7 +184,11 @@ def init_api_connexion(app: Flask) -> None:
     connexion_app = connexion.App(__name__, specification_dir=spec_dir, skip_error_handlers=True)
     connexion_app.app = app
     api_bp = connexion_app.add_api(
-        specification='v1.yaml', base_path=base_path, validate_responses=True, strict_validation=True
+        specification='v1.yaml',
+        base_path=base_path,
+        validate_responses=True,
+        strict_validation=True,
+        validator_map={'response': StreamingResponseValidator},
     ).blueprint
     # Like "api_bp.after_request", but the BP is already registered, so we have
     # to register it in the app directly.
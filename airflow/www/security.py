@@ -18,13 +18,20 @@
 #
 
 import warnings
-from typing import Dict, List, Optional, Sequence, Set, Tuple
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
 
-from flask import current_app, g
+from flask import current_app, g, has_app_context
 from flask_appbuilder.security.sqla import models as sqla_models
 from flask_appbuilder.security.sqla.manager import SecurityManager
-from flask_appbuilder.security.sqla.models import Permission, PermissionView, Role, User, ViewMenu
-from sqlalchemy import or_
+from flask_appbuilder.security.sqla.models import (
+    Permission,
+    PermissionView,
+    Role,
+    User,
+    ViewMenu,
+    assoc_permissionview_role,
+)
+from sqlalchemy import func, or_, true
 from sqlalchemy.orm import joinedload
 
 from airflow.exceptions import AirflowException
@@ -58,6 +65,48 @@ EXISTING_ROLES = {
 }
 
 
+class PermissionIndex:
+    """
+    Set-based index of the permissions granted by a set of roles.
+
+    Answers "may these roles perform this action on this resource" and "which
+    DAGs may they access" from memory, without querying the roles and
+    permissions tables.
+
+    :param perms: (action name, resource name) pairs granted by the roles
+    """
+
+    def __init__(self, perms: Iterable[Tuple[str, str]]):
+        self.perms: FrozenSet[Tuple[str, str]] = frozenset(perms)
+        self._all_dags_actions: Set[str] = set()
+        self._dag_ids_by_action: Dict[str, Set[str]] = {}
+        for action, resource in self.perms:
+            if resource == permissions.RESOURCE_DAG:
+                self._all_dags_actions.add(action)
+                continue
+            if resource.startswith(permissions.RESOURCE_DAG_PREFIX):
+                resource = resource[len(permissions.RESOURCE_DAG_PREFIX) :]
+            # Resources without the DAG prefix are kept as well, matching DAG level
+            # permissions created before the prefix was introduced.
+            self._dag_ids_by_action.setdefault(action, set()).add(resource)
+
+    def has(self, action: str, resource: str) -> bool:
+        """Whether the action on the resource is granted."""
+        return (action, resource) in self.perms
+
+    def get_dag_ids(self, actions: Iterable[str]) -> Optional[Set[str]]:
+        """
+        Ids of the DAGs on which any of the actions is granted, or None if any of
+        them is granted on all DAGs.
+        """
+        dag_ids: Set[str] = set()
+        for action in actions:
+            if action in self._all_dags_actions:
+                return None
+            dag_ids.update(self._dag_ids_by_action.get(action, ()))
+        return dag_ids
+
+
 class AirflowSecurityManager(SecurityManager, LoggingMixin):  # pylint: disable=too-many-public-methods
     """Custom security manager, which introduces a permission model adapted to Airflow"""
 
@@ -198,6 +247,8 @@ class AirflowSecurityManager(SecurityManager, LoggingMixin):  # pylint: disable=
                 continue
             view.datamodel = CustomSQLAInterface(view.datamodel.obj)
         self.perms = None
+        self._permission_indexes: Dict[FrozenSet[int], Tuple[tuple, PermissionIndex]] = {}
+        self._permission_index_version = 0
 
     def init_role(self, role_name, perms):
         """
@@ -318,6 +369,7 @@ class AirflowSecurityManager(SecurityManager, LoggingMixin):  # pylint: disable=
             self.log.info("Deleting role '%s'", role_name)
             session.delete(role)
             session.commit()
+            self.invalidate_permission_indexes()
         else:
             raise AirflowException(f"Role named '{role_name}' does not exist")
 
@@ -338,12 +390,7 @@ class AirflowSecurityManager(SecurityManager, LoggingMixin):  # pylint: disable=
 
     def get_current_user_permissions(self):
         """Returns permissions for logged in user as a set of tuples with the perm name and view menu name"""
-        perms_views = set()
-        for role in self.get_user_roles():
-            perms_views.update(
-                {(perm_view.permission.name, perm_view.view_menu.name) for perm_view in role.permissions}
-            )
-        return perms_views
+        return set(self._get_permission_index_for_roles(self.get_user_roles()).perms)
 
     def get_readable_dags(self, user):
         """Gets the DAGs readable by authenticated user."""
@@ -355,54 +402,102 @@ class AirflowSecurityManager(SecurityManager, LoggingMixin):  # pylint: disable=
 
     def get_readable_dag_ids(self, user) -> Set[str]:
         """Gets the DAG IDs readable by authenticated user."""
-        return {dag.dag_id for dag in self.get_readable_dags(user)}
+        return self._get_accessible_dag_ids([permissions.ACTION_CAN_READ], user)
 
     def get_editable_dag_ids(self, user) -> Set[str]:
         """Gets the DAG IDs editable by authenticated user."""
-        return {dag.dag_id for dag in self.get_editable_dags(user)}
+        return self._get_accessible_dag_ids([permissions.ACTION_CAN_EDIT], user)
 
     def get_accessible_dag_ids(self, user) -> Set[str]:
         """Gets the DAG IDs editable or readable by authenticated user."""
-        accessible_dags = self.get_accessible_dags(
-            [permissions.ACTION_CAN_EDIT, permissions.ACTION_CAN_READ], user
+        return self._get_accessible_dag_ids([permissions.ACTION_CAN_EDIT, permissions.ACTION_CAN_READ], user)
+
+    @provide_session
+    def _get_accessible_dag_ids(self, user_actions, user, session=None) -> Set[str]:
+        query = session.query(DagModel.dag_id).filter(
+            self.dag_access_filter(DagModel.dag_id, user_actions, user)
         )
-        return {dag.dag_id for dag in accessible_dags}
+        return {dag_id for dag_id, in query}
 
     @provide_session
     def get_accessible_dags(self, user_actions, user, session=None):
         """Generic function to get readable or writable DAGs for user."""
-        if user.is_anonymous:
-            roles = self.get_user_roles(user)
+        return session.query(DagModel).filter(self.dag_access_filter(DagModel.dag_id, user_actions, user))
+
+    def dag_access_filter(self, column, user_actions, user):
+        """
+        SQL criterion restricting ``column`` to the ids of the DAGs on which the user
+        may perform any of ``user_actions``.
+
+        Users with access to all DAGs get an always-true criterion instead of a list
+        of every DAG id.
+        """
+        dag_ids = self.get_permission_index(user).get_dag_ids(user_actions)
+        if dag_ids is None:
+            return true()
+        return column.in_(dag_ids)
+
+    def get_permission_index(self, user) -> PermissionIndex:
+        """
+        Returns the index of the permissions granted to the user through their roles.
+
+        Indexes are shared by all users with the same roles. Once per request, a
+        cached index is checked against a fingerprint of the roles' permission
+        assignments (their count, highest id and the sum of their permission
+        ids), so changes made by other webserver processes are picked up by the
+        next request.
+        """
+        roles = self.get_user_roles(user) if user.is_anonymous else user.roles
+        return self._get_permission_index_for_roles(roles)
+
+    def _get_permission_index_for_roles(self, roles) -> PermissionIndex:
+        role_ids = frozenset(role.id for role in roles if role is not None)
+        if not role_ids:
+            return PermissionIndex([])
+
+        checked = None
+        if has_app_context():
+            checked = g.setdefault('_airflow_checked_permission_indexes', {})
+            index = checked.get((self._permission_index_version, role_ids))
+            if index is not None:
+                return index
+
+        session = self.get_session
+        fingerprint = tuple(
+            session.query(
+                func.count(assoc_permissionview_role.c.id),
+                func.max(assoc_permissionview_role.c.id),
+                func.sum(assoc_permissionview_role.c.permission_view_id),
+            )
+            .filter(assoc_permissionview_role.c.role_id.in_(role_ids))
+            .one()
+        )
+        cached = self._permission_indexes.get(role_ids)
+        if cached is not None and cached[0] == fingerprint:
+            index = cached[1]
         else:
-            user_query = (
-                session.query(User)
-                .options(
-                    joinedload(User.roles)
-                    .subqueryload(Role.permissions)
-                    .options(joinedload(PermissionView.permission), joinedload(PermissionView.view_menu))
+            perms = (
+                session.query(self.permissionview_model)
+                .join(self.permission_model)
+                .join(self.viewmenu_model)
+                .join(
+                    assoc_permissionview_role,
+                    assoc_permissionview_role.c.permission_view_id == self.permissionview_model.id,
                 )
-                .filter(User.id == user.id)
-                .first()
+                .filter(assoc_permissionview_role.c.role_id.in_(role_ids))
+                .with_entities(self.permission_model.name, self.viewmenu_model.name)
             )
-            roles = user_query.roles
-
-        resources = set()
-        for role in roles:
-            for permission in role.permissions:
-                action = permission.permission.name
-                if action not in user_actions:
-                    continue
-
-                resource = permission.view_menu.name
-                if resource == permissions.RESOURCE_DAG:
-                    return session.query(DagModel)
+            index = PermissionIndex(perms)
+            self._permission_indexes[role_ids] = (fingerprint, index)
 
-                if resource.startswith(permissions.RESOURCE_DAG_PREFIX):
-                    resources.add(resource[len(permissions.RESOURCE_DAG_PREFIX) :])
-                else:
-                    resources.add(resource)
+        if checked is not None:
+            checked[(self._permission_index_version, role_ids)] = index
+        return index
 
-        return session.query(DagModel).filter(DagModel.dag_id.in_(resources))
+    def invalidate_permission_indexes(self) -> None:
+        """Discards the cached permission indexes after roles or their permissions change."""
+        self._permission_indexes.clear()
+        self._permission_index_version += 1
 
     def can_access_some_dags(self, action: str, dag_id: Optional[str] = None) -> bool:
         """Checks if user has read or write access to some dags."""
@@ -451,11 +546,21 @@ class AirflowSecurityManager(SecurityManager, LoggingMixin):  # pylint: disable=
 
     def _has_view_access(self, user, action, resource) -> bool:
         """
-        Overriding the method to ensure that it always returns a bool
-        _has_view_access can return NoneType which gives us
-        issues later on, this fixes that.
+        Overriding the method to answer from the user's permission index rather
+        than querying the database for every check. Builtin roles configured
+        in ``FAB_ROLES`` are still matched by FAB.
         """
-        return bool(super()._has_view_access(user, action, resource))
+        if self.get_permission_index(user).has(action, resource):
+            return True
+        builtin_roles = getattr(self, 'builtin_roles', None)
+        if not builtin_roles:
+            return False
+        roles = self.get_user_roles(user) if user.is_anonymous else user.roles
+        return any(
+            self._has_access_builtin_roles(role, action, resource)
+            for role in roles
+            if role is not None and role.name in builtin_roles
+        )
 
     def has_access(self, permission, resource, user=None) -> bool:
         """
@@ -594,6 +699,14 @@ class AirflowSecurityManager(SecurityManager, LoggingMixin):  # pylint: disable=
 
         self.get_session.commit()
 
+    def add_permission_role(self, role, perm_view):
+        super().add_permission_role(role, perm_view)
+        self.invalidate_permission_indexes()
+
+    def del_permission_role(self, role, perm_view):
+        super().del_permission_role(role, perm_view)
+        self.invalidate_permission_indexes()
+
     def add_permission_to_role(self, role: Role, permission: PermissionView) -> None:
         """
         Add an existing permission pair to a role.
@@ -907,6 +1020,8 @@ class ApplessAirflowSecurityManager(AirflowSecurityManager):
 
     def __init__(self, session=None):  # pylint: disable=super-init-not-called
         self.session = session
+        self._permission_indexes = {}
+        self._permission_index_version = 0
 
     @property
     def get_session(self):
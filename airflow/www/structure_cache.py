@@ -0,0 +1,110 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Rendered DAG structure, cached per serialized DAG hash and served with ETags"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from flask import Response, json, request
+
+from airflow.models.dag import DAG
+from airflow.version import version
+
+
+class StructureCache:
+    """
+    Process-wide cache of everything derived from the structure of a DAG
+    alone: partial subsets, graph nodes and edges, and rendered JSON bodies.
+
+    Every key contains the ``dag_hash`` of the serialized DAG it was built
+    from, so a new version of a DAG is simply a new key and stale entries age
+    out of the LRU.
+
+    :param max_entries: number of entries kept
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """Return the entry for ``key``, calling ``build`` if it is not cached"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        value = build()
+        with self._lock:
+            self._entries[key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """Drop everything that is cached"""
+        with self._lock:
+            self._entries.clear()
+
+
+STRUCTURE_CACHE = StructureCache()
+
+
+def get_partial_subset(
+    dag: DAG, dag_hash: Optional[str], root: str, include_upstream: bool, include_downstream: bool
+) -> DAG:
+    """
+    Return ``dag.partial_subset`` for the ``root`` regex, shared between
+    requests while the DAG does not change. Callers must not modify it.
+    """
+    if dag_hash is None:
+        return dag.partial_subset(
+            task_ids_or_regex=root, include_upstream=include_upstream, include_downstream=include_downstream
+        )
+    return STRUCTURE_CACHE.get(
+        ('subset', dag.dag_id, dag_hash, root, include_upstream, include_downstream),
+        lambda: dag.partial_subset(
+            task_ids_or_regex=root, include_upstream=include_upstream, include_downstream=include_downstream
+        ),
+    )
+
+
+def conditional_json_response(key: Optional[Tuple], render: Callable[[], Any]) -> Any:
+    """
+    Serve the JSON of ``render()`` with an ETag derived from ``key``.
+
+    ``key`` must identify everything the body depends on, including the
+    ``dag_hash``. The ETag is computed from the key alone, so a request whose
+    ``If-None-Match`` matches is answered with 304 without rendering, and
+    other requests reuse the body rendered for the same key. If ``key`` is
+    None, ``render()`` is returned as is.
+    """
+    if key is None:
+        return render()
+
+    etag = hashlib.sha1(repr((version,) + key).encode('utf-8')).hexdigest()
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        body = STRUCTURE_CACHE.get(('json',) + key, lambda: json.dumps(render()))
+        response = Response(body, mimetype='application/json')
+    # Weak, as the body may be compressed on its way out
+    response.set_etag(etag, weak=True)
+    response.cache_control.no_cache = True
+    return response
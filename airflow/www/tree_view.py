@@ -0,0 +1,287 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Server-side cache of the Tree View payload"""
+import json
+import re
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from flask import Markup
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from airflow.models.dag import DAG
+from airflow.models.taskinstance import TaskInstance
+from airflow.utils.state import State
+
+
+def truncate_task_duration(task_duration):
+    """
+    Cast the task_duration to an int was for optimization for large/huge dags if task_duration > 10s
+    otherwise we keep it as a float with 3dp
+    """
+    return int(task_duration) if task_duration > 10.0 else round(task_duration, 3)
+
+
+def htmlsafe_json(json_str: str) -> Markup:
+    """Escape an already serialized JSON string the same way ``jinja2.utils.htmlsafe_json_dumps`` does"""
+    return Markup(
+        json_str.replace('<', '\\u003c')
+        .replace('>', '\\u003e')
+        .replace('&', '\\u0026')
+        .replace("'", '\\u0027')
+    )
+
+
+class TreeLayout:
+    """
+    Task hierarchy of the Tree View for one version of a DAG.
+
+    The nested nodes are serialized once. The ``instances`` of each node are
+    left as slots which ``render`` fills with one pre-serialized row per task,
+    so building the payload for new task instance states is a string join.
+
+    :param dag: the DAG (or partial subset of it) to lay out
+    """
+
+    def __init__(self, dag: DAG):
+        marker = uuid.uuid4().hex
+        task_index: Dict[str, int] = {}
+
+        expanded = set()
+        # The default recursion traces every path so that tree view has full
+        # expand/collapse functionality. After 5,000 nodes we stop and fall
+        # back on a quick DFS search for performance. See PR #320.
+        node_count = 0
+        node_limit = 5000 / max(1, len(dag.leaves))
+
+        def recurse_nodes(task, visited):
+            nonlocal node_count
+            node_count += 1
+            visited.add(task)
+            task_id = task.task_id
+
+            node = {
+                'name': task.task_id,
+                'instances': f"{marker}:{task_index.setdefault(task_id, len(task_index))}",
+                'num_dep': len(task.downstream_list),
+                'operator': task.task_type,
+                'retries': task.retries,
+                'owner': task.owner,
+                'ui_color': task.ui_color,
+            }
+
+            if task.downstream_list:
+                children = [
+                    recurse_nodes(t, visited)
+                    for t in task.downstream_list
+                    if node_count < node_limit or t not in visited
+                ]
+
+                # D3 tree uses children vs _children to define what is
+                # expanded or not. The following block makes it such that
+                # repeated nodes are collapsed by default.
+                if task.task_id not in expanded:
+                    children_key = 'children'
+                    expanded.add(task.task_id)
+                else:
+                    children_key = "_children"
+                node[children_key] = children
+
+            if task.depends_on_past:
+                node['depends_on_past'] = task.depends_on_past
+            if task.start_date:
+                # round to seconds to reduce payload size
+                node['start_ts'] = int(task.start_date.timestamp())
+                if task.end_date:
+                    # round to seconds to reduce payload size
+                    node['end_ts'] = int(task.end_date.timestamp())
+            if task.extra_links:
+                node['extra_links'] = task.extra_links
+            return node
+
+        children = json.dumps([recurse_nodes(t, set()) for t in dag.roots], separators=(',', ':'))
+        parts = re.split(f'"{marker}:(\\d+)"', children)
+
+        #: task ids in the order of their rows in ``render``
+        self.task_ids: List[str] = list(task_index)
+        self._chunks: List[str] = parts[0::2]
+        self._slots: List[int] = [int(slot) for slot in parts[1::2]]
+
+    def render(self, rows: List[str]) -> str:
+        """
+        Return the JSON list of root nodes.
+
+        :param rows: serialized ``instances`` of each task, in the order of ``task_ids``
+        """
+        output = [self._chunks[0]]
+        for slot, chunk in zip(self._slots, self._chunks[1:]):
+            output.append(rows[slot])
+            output.append(chunk)
+        return ''.join(output)
+
+
+class TreeDataCache:
+    """
+    Process-wide cache backing the Tree View.
+
+    Layouts are kept per ``(dag_id, dag_hash, root)``. Serialized task instance
+    cells are kept per DAG run together with a fingerprint of its task
+    instances (count, latest dates and try numbers per state), so only runs
+    whose fingerprint changed since the last request are fetched again.
+
+    :param max_dags: number of DAGs for which layouts and runs are kept
+    """
+
+    def __init__(self, max_dags: int = 128):
+        self.max_dags = max_dags
+        self._layouts: "OrderedDict[Tuple[str, str, Optional[str]], TreeLayout]" = OrderedDict()
+        self._runs: "OrderedDict[str, Dict[datetime, Tuple[frozenset, Dict[str, str]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_layout(self, dag: DAG, dag_hash: Optional[str], root: Optional[str] = None) -> TreeLayout:
+        """Return the layout of ``dag``, building it only if ``dag_hash`` was not seen before"""
+        if dag_hash is None:
+            return TreeLayout(dag)
+        key = (dag.dag_id, dag_hash, root)
+        with self._lock:
+            layout = self._layouts.get(key)
+            if layout is not None:
+                self._layouts.move_to_end(key)
+                return layout
+        layout = TreeLayout(dag)
+        with self._lock:
+            self._layouts[key] = layout
+            while len(self._layouts) > self.max_dags:
+                self._layouts.popitem(last=False)
+        return layout
+
+    @staticmethod
+    def _encode_cell(state, try_number, start_date, duration) -> str:
+        # NOTE: order of entry is important here because client JS relies on it for
+        # tree node reconstruction. Remember to change JS code in tree.html
+        # whenever order is altered.
+        if state not in State.running:
+            try_number += 1
+        start_ts = None
+        if start_date:
+            # round to seconds to reduce payload size
+            start_ts = int(start_date.timestamp())
+            if duration is not None:
+                duration = truncate_task_duration(duration)
+        else:
+            duration = None
+        return json.dumps([state, try_number, start_ts, duration], separators=(',', ':'))
+
+    def get_task_instance_cells(
+        self, dag_id: str, dates: Iterable[datetime], session: Session
+    ) -> Dict[datetime, Dict[str, str]]:
+        """
+        Return the serialized task instance cells of the given runs, keyed by
+        execution date and task id.
+        """
+        dates = list(dates)
+        if not dates:
+            return {}
+        TI = TaskInstance
+        fingerprints: Dict[datetime, set] = {date: set() for date in dates}
+        for execution_date, *fingerprint in (
+            session.query(
+                TI.execution_date,
+                TI.state,
+                func.count(),
+                func.max(TI.start_date),
+                func.max(TI.end_date),
+                func.sum(TI._try_number),  # pylint: disable=protected-access
+            )
+            .filter(TI.dag_id == dag_id, TI.execution_date.in_(dates))
+            .group_by(TI.execution_date, TI.state)
+        ):
+            fingerprints.setdefault(execution_date, set()).add(tuple(fingerprint))
+
+        with self._lock:
+            cached_runs = dict(self._runs.get(dag_id, {}))
+
+        result: Dict[datetime, Dict[str, str]] = {}
+        changed = []
+        for date in dates:
+            fingerprint = frozenset(fingerprints.get(date, ()))
+            cached = cached_runs.get(date)
+            if cached is not None and cached[0] == fingerprint:
+                result[date] = cached[1]
+            else:
+                changed.append(date)
+                result[date] = {}
+                cached_runs[date] = (fingerprint, result[date])
+
+        if changed:
+            for task_id, execution_date, state, try_number, start_date, duration in session.query(
+                TI.task_id, TI.execution_date, TI.state, TI._try_number, TI.start_date, TI.duration
+            ).filter(TI.dag_id == dag_id, TI.execution_date.in_(changed)):
+                result[execution_date][task_id] = self._encode_cell(state, try_number, start_date, duration)
+
+        with self._lock:
+            # Only keep the runs of the latest request, older ones are rarely requested again
+            self._runs[dag_id] = {date: cached_runs[date] for date in dates}
+            self._runs.move_to_end(dag_id)
+            while len(self._runs) > self.max_dags:
+                self._runs.popitem(last=False)
+        return result
+
+    def clear(self) -> None:
+        """Drop everything that is cached"""
+        with self._lock:
+            self._layouts.clear()
+            self._runs.clear()
+
+
+TREE_DATA_CACHE = TreeDataCache()
+
+
+def get_tree_data(
+    dag: DAG,
+    dag_runs: Dict[datetime, Dict],
+    dag_hash: Optional[str],
+    session: Session,
+    root: Optional[str] = None,
+) -> Markup:
+    """
+    Return the HTML-safe JSON payload of the Tree View.
+
+    :param dag: the DAG (or the partial subset of it for ``root``) to display
+    :param dag_runs: serialized DAG runs keyed by execution date
+    :param dag_hash: hash of the serialized DAG, layouts are not cached if None
+    :param session: database session
+    :param root: task id regex the DAG was filtered on, if any
+    """
+    dates = sorted(dag_runs.keys())
+    layout = TREE_DATA_CACHE.get_layout(dag, dag_hash, root)
+    cells = TREE_DATA_CACHE.get_task_instance_cells(dag.dag_id, dates, session)
+
+    rows = [
+        '[' + ','.join(cells[date].get(task_id, 'null') for date in dates) + ']'
+        for task_id in layout.task_ids
+    ]
+    instances = json.dumps(
+        [dag_runs.get(d) or {'execution_date': d.isoformat()} for d in dates], separators=(',', ':')
+    )
+    # avoid spaces to reduce payload size
+    return htmlsafe_json(f'{{"name":"[DAG]","children":{layout.render(rows)},"instances":{instances}}}')
@@ -18,18 +18,16 @@
 #
 import collections
 import copy
-import itertools
 import json
 import logging
 import math
 import socket
 import sys
 import traceback
-from collections import defaultdict
 from datetime import timedelta
 from json import JSONDecodeError
 from operator import itemgetter
-from typing import Iterable, List, Optional, Tuple
+from typing import List, Tuple
 from urllib.parse import parse_qsl, unquote, urlencode, urlparse
 
 import lazy_object_proxy
@@ -77,7 +75,7 @@ from jinja2.utils import htmlsafe_json_dumps, pformat  # type: ignore
 from pendulum.datetime import DateTime
 from pygments import highlight, lexers
 from pygments.formatters import HtmlFormatter  # noqa pylint: disable=no-name-in-module
-from sqlalchemy import Date, and_, desc, func, or_, union_all
+from sqlalchemy import Date, desc, func, or_
 from sqlalchemy.orm import joinedload
 from wtforms import SelectField, validators
 from wtforms.validators import InputRequired
@@ -93,7 +91,7 @@ from airflow.exceptions import AirflowException
 from airflow.executors.executor_loader import ExecutorLoader
 from airflow.jobs.base_job import BaseJob
 from airflow.jobs.scheduler_job import SchedulerJob
-from airflow.models import DAG, Connection, DagModel, DagTag, Log, SlaMiss, TaskFail, XCom, errors
+from airflow.models import Connection, DagModel, DagTag, Log, SlaMiss, XCom, errors
 from airflow.models.baseoperator import BaseOperator
 from airflow.models.dagcode import DagCode
 from airflow.models.dagrun import DagRun, DagRunType
@@ -104,6 +102,7 @@ from airflow.security import permissions
 from airflow.ti_deps.dep_context import DepContext
 from airflow.ti_deps.dependencies_deps import RUNNING_DEPS, SCHEDULER_QUEUED_DEPS
 from airflow.utils import json as utils_json, timezone, yaml
+from airflow.utils.dag_edges import dag_edges
 from airflow.utils.dates import infer_time_unit, scale_time_units
 from airflow.utils.docs import get_docs_url
 from airflow.utils.helpers import alchemy_to_dict
@@ -113,6 +112,13 @@ from airflow.utils.session import create_session, provide_session
 from airflow.utils.state import State
 from airflow.version import version
 from airflow.www import auth, utils as wwwutils
+from airflow.www.chart_data import (
+    get_duration_points,
+    get_gantt_data,
+    get_landing_times_points,
+    get_tries_points,
+)
+from airflow.www.dag_stats import get_dag_run_states, get_last_dag_runs, get_task_instance_states
 from airflow.www.decorators import action_logging, gzipped
 from airflow.www.forms import (
     ConnectionForm,
@@ -123,6 +129,8 @@ from airflow.www.forms import (
     DateTimeWithNumRunsWithDagRunsForm,
     TaskInstanceEditForm,
 )
+from airflow.www.structure_cache import STRUCTURE_CACHE, get_partial_subset
+from airflow.www.tree_view import get_tree_data
 from airflow.www.widgets import AirflowModelListWidget
 
 PAGE_SIZE = conf.getint('webserver', 'page_size')
@@ -130,14 +138,6 @@ FILTER_TAGS_COOKIE = 'tags_filter'
 FILTER_STATUS_COOKIE = 'dag_status_filter'
 
 
-def truncate_task_duration(task_duration):
-    """
-    Cast the task_duration to an int was for optimization for large/huge dags if task_duration > 10s
-    otherwise we keep it as a float with 3dp
-    """
-    return int(task_duration) if task_duration > 10.0 else round(task_duration, 3)
-
-
 def get_safe_url(url):
     """Given a user-supplied URL, ensure it points to our web server"""
     valid_schemes = ['http', 'https', '']
@@ -275,109 +275,6 @@ def task_group_to_dict(task_group):
     }
 
 
-def dag_edges(dag):
-    """
-    Create the list of edges needed to construct the Graph View.
-
-    A special case is made if a TaskGroup is immediately upstream/downstream of another
-    TaskGroup or task. Two dummy nodes named upstream_join_id and downstream_join_id are
-    created for the TaskGroup. Instead of drawing an edge onto every task in the TaskGroup,
-    all edges are directed onto the dummy nodes. This is to cut down the number of edges on
-    the graph.
-
-    For example: A DAG with TaskGroups group1 and group2:
-        group1: task1, task2, task3
-        group2: task4, task5, task6
-
-    group2 is downstream of group1:
-        group1 >> group2
-
-    Edges to add (This avoids having to create edges between every task in group1 and group2):
-        task1 >> downstream_join_id
-        task2 >> downstream_join_id
-        task3 >> downstream_join_id
-        downstream_join_id >> upstream_join_id
-        upstream_join_id >> task4
-        upstream_join_id >> task5
-        upstream_join_id >> task6
-    """
-    # Edges to add between TaskGroup
-    edges_to_add = set()
-    # Edges to remove between individual tasks that are replaced by edges_to_add.
-    edges_to_skip = set()
-
-    task_group_map = dag.task_group.get_task_group_dict()
-
-    def collect_edges(task_group):
-        """Update edges_to_add and edges_to_skip according to TaskGroups."""
-        if isinstance(task_group, BaseOperator):
-            return
-
-        for target_id in task_group.downstream_group_ids:
-            # For every TaskGroup immediately downstream, add edges between downstream_join_id
-            # and upstream_join_id. Skip edges between individual tasks of the TaskGroups.
-            target_group = task_group_map[target_id]
-            edges_to_add.add((task_group.downstream_join_id, target_group.upstream_join_id))
-
-            for child in task_group.get_leaves():
-                edges_to_add.add((child.task_id, task_group.downstream_join_id))
-                for target in target_group.get_roots():
-                    edges_to_skip.add((child.task_id, target.task_id))
-                edges_to_skip.add((child.task_id, target_group.upstream_join_id))
-
-            for child in target_group.get_roots():
-                edges_to_add.add((target_group.upstream_join_id, child.task_id))
-                edges_to_skip.add((task_group.downstream_join_id, child.task_id))
-
-        # For every individual task immediately downstream, add edges between downstream_join_id and
-        # the downstream task. Skip edges between individual tasks of the TaskGroup and the
-        # downstream task.
-        for target_id in task_group.downstream_task_ids:
-            edges_to_add.add((task_group.downstream_join_id, target_id))
-
-            for child in task_group.get_leaves():
-                edges_to_add.add((child.task_id, task_group.downstream_join_id))
-                edges_to_skip.add((child.task_id, target_id))
-
-        # For every individual task immediately upstream, add edges between the upstream task
-        # and upstream_join_id. Skip edges between the upstream task and individual tasks
-        # of the TaskGroup.
-        for source_id in task_group.upstream_task_ids:
-            edges_to_add.add((source_id, task_group.upstream_join_id))
-            for child in task_group.get_roots():
-                edges_to_add.add((task_group.upstream_join_id, child.task_id))
-                edges_to_skip.add((source_id, child.task_id))
-
-        for child in task_group.children.values():
-            collect_edges(child)
-
-    collect_edges(dag.task_group)
-
-    # Collect all the edges between individual tasks
-    edges = set()
-
-    def get_downstream(task):
-        for child in task.downstream_list:
-            edge = (task.task_id, child.task_id)
-            if edge not in edges:
-                edges.add(edge)
-                get_downstream(child)
-
-    for root in dag.roots:
-        get_downstream(root)
-
-    result = []
-    # Build result dicts with the two ends of the edge, plus any extra metadata
-    # if we have it.
-    for source_id, target_id in sorted(edges.union(edges_to_add) - edges_to_skip):
-        record = {"source_id": source_id, "target_id": target_id}
-        label = dag.get_edge_info(source_id, target_id).get("label")
-        if label:
-            record["label"] = label
-        result.append(record)
-    return result
-
-
 ######################################################################################
 #                                    Error handlers
 ######################################################################################
@@ -543,8 +440,10 @@ class Airflow(AirflowBaseView):  # noqa: D101  pylint: disable=too-many-public-m
         start = current_page * dags_per_page
         end = start + dags_per_page
 
-        # Get all the dag id the user could access
-        filter_dag_ids = current_app.appbuilder.sm.get_accessible_dag_ids(g.user)
+        # Restrict the DAGs to the ones the user could access
+        dag_access_filter = current_app.appbuilder.sm.dag_access_filter(
+            DagModel.dag_id, [permissions.ACTION_CAN_EDIT, permissions.ACTION_CAN_READ], g.user
+        )
 
         with create_session() as session:
             # read orm_dags from the db
@@ -560,7 +459,7 @@ class Airflow(AirflowBaseView):  # noqa: D101  pylint: disable=too-many-public-m
             if arg_tags_filter:
                 dags_query = dags_query.filter(DagModel.tags.any(DagTag.name.in_(arg_tags_filter)))
 
-            dags_query = dags_query.filter(DagModel.dag_id.in_(filter_dag_ids))
+            dags_query = dags_query.filter(dag_access_filter)
             # pylint: enable=no-member
 
             all_dags = dags_query
@@ -678,14 +577,8 @@ class Airflow(AirflowBaseView):  # noqa: D101  pylint: disable=too-many-public-m
     @provide_session
     def dag_stats(self, session=None):
         """Dag statistics."""
-        dr = models.DagRun
-
         allowed_dag_ids = current_app.appbuilder.sm.get_accessible_dag_ids(g.user)
 
-        dag_state_stats = session.query(dr.dag_id, dr.state, sqla.func.count(dr.state)).group_by(
-            dr.dag_id, dr.state
-        )
-
         # Filter by post parameters
         selected_dag_ids = {unquote(dag_id) for dag_id in request.form.getlist('dag_ids') if dag_id}
 
@@ -697,19 +590,13 @@ class Airflow(AirflowBaseView):  # noqa: D101  pylint: disable=too-many-public-m
         if not filter_dag_ids:
             return wwwutils.json_response({})
 
-        payload = {}
-        dag_state_stats = dag_state_stats.filter(dr.dag_id.in_(filter_dag_ids))  # pylint: disable=no-member
-        data = {}
-
-        for dag_id, state, count in dag_state_stats:
-            if dag_id not in data:
-                data[dag_id] = {}
-            data[dag_id][state] = count
+        data = get_dag_run_states(filter_dag_ids, session)
 
+        payload = {}
         for dag_id in filter_dag_ids:
             payload[dag_id] = []
             for state in State.dag_states:
-                count = data.get(dag_id, {}).get(state, 0)
+                count = data[dag_id].get(state, 0)
                 payload[dag_id].append({'state': state, 'count': count})
 
         return wwwutils.json_response(payload)
@@ -738,82 +625,13 @@ class Airflow(AirflowBaseView):  # noqa: D101  pylint: disable=too-many-public-m
         else:
             filter_dag_ids = allowed_dag_ids
 
-        # pylint: disable=comparison-with-callable
-        running_dag_run_query_result = (
-            session.query(DagRun.dag_id, DagRun.execution_date)
-            .join(DagModel, DagModel.dag_id == DagRun.dag_id)
-            .filter(DagRun.state == State.RUNNING, DagModel.is_active)
-        )
-        # pylint: enable=comparison-with-callable
-
-        # pylint: disable=no-member
-        running_dag_run_query_result = running_dag_run_query_result.filter(DagRun.dag_id.in_(filter_dag_ids))
-        # pylint: enable=no-member
-
-        running_dag_run_query_result = running_dag_run_query_result.subquery('running_dag_run')
-
-        # pylint: disable=no-member
-        # Select all task_instances from active dag_runs.
-        running_task_instance_query_result = session.query(
-            TaskInstance.dag_id.label('dag_id'), TaskInstance.state.label('state')
-        ).join(
-            running_dag_run_query_result,
-            and_(
-                running_dag_run_query_result.c.dag_id == TaskInstance.dag_id,
-                running_dag_run_query_result.c.execution_date == TaskInstance.execution_date,
-            ),
-        )
-        # pylint: enable=no-member
-
-        if conf.getboolean('webserver', 'SHOW_RECENT_STATS_FOR_COMPLETED_RUNS', fallback=True):
-            # pylint: disable=comparison-with-callable
-            last_dag_run = (
-                session.query(DagRun.dag_id, sqla.func.max(DagRun.execution_date).label('execution_date'))
-                .join(DagModel, DagModel.dag_id == DagRun.dag_id)
-                .filter(DagRun.state != State.RUNNING, DagModel.is_active)
-                .group_by(DagRun.dag_id)
-            )
-            # pylint: enable=comparison-with-callable
-            # pylint: disable=no-member
-            last_dag_run = last_dag_run.filter(DagRun.dag_id.in_(filter_dag_ids))
-            last_dag_run = last_dag_run.subquery('last_dag_run')
-            # pylint: enable=no-member
-
-            # Select all task_instances from active dag_runs.
-            # If no dag_run is active, return task instances from most recent dag_run.
-            last_task_instance_query_result = session.query(
-                TaskInstance.dag_id.label('dag_id'), TaskInstance.state.label('state')
-            ).join(
-                last_dag_run,
-                and_(
-                    last_dag_run.c.dag_id == TaskInstance.dag_id,
-                    last_dag_run.c.execution_date == TaskInstance.execution_date,
-                ),
-            )
-
-            final_task_instance_query_result = union_all(
-                last_task_instance_query_result, running_task_instance_query_result
-            ).alias('final_ti')
-        else:
-            final_task_instance_query_result = running_task_instance_query_result.subquery('final_ti')
-
-        qry = session.query(
-            final_task_instance_query_result.c.dag_id,
-            final_task_instance_query_result.c.state,
-            sqla.func.count(),
-        ).group_by(final_task_instance_query_result.c.dag_id, final_task_instance_query_result.c.state)
-
-        data = {}
-        for dag_id, state, count in qry:
-            if dag_id not in data:
-                data[dag_id] = {}
-            data[dag_id][state] = count
+        data = get_task_instance_states(filter_dag_ids, session)
 
         payload = {}
         for dag_id in filter_dag_ids:
             payload[dag_id] = []
             for state in State.task_states:
-                count = data.get(dag_id, {}).get(state, 0)
+                count = data[dag_id].get(state, 0)
                 payload[dag_id].append({'state': state, 'count': count})
         return wwwutils.json_response(payload)
 
@@ -840,22 +658,14 @@ class Airflow(AirflowBaseView):  # noqa: D101  pylint: disable=too-many-public-m
         if not filter_dag_ids:
             return wwwutils.json_response({})
 
-        query = session.query(
-            DagRun.dag_id,
-            sqla.func.max(DagRun.execution_date).label('execution_date'),
-            sqla.func.max(DagRun.start_date).label('start_date'),
-        ).group_by(DagRun.dag_id)
-
-        # Filter to only ask for accessible and selected dags
-        query = query.filter(DagRun.dag_id.in_(filter_dag_ids))  # pylint: enable=no-member
-
         resp = {
-            r.dag_id.replace('.', '__dot__'): {
-                'dag_id': r.dag_id,
-                'execution_date': r.execution_date.isoformat(),
-                'start_date': r.start_date.isoformat(),
+            dag_id.replace('.', '__dot__'): {
+                'dag_id': dag_id,
+                'execution_date': last_dag_run[0].isoformat(),
+                'start_date': last_dag_run[1].isoformat(),
             }
-            for r in query
+            for dag_id, last_dag_run in get_last_dag_runs(filter_dag_ids, session).items()
+            if last_dag_run
         }
         return wwwutils.json_response(resp)
 
@@ -1669,17 +1479,13 @@ class Airflow(AirflowBaseView):  # noqa: D101  pylint: disable=too-many-public-m
         if not filter_dag_ids:
             return wwwutils.json_response([])
 
-        # pylint: disable=comparison-with-callable
-        dags = (
-            session.query(DagRun.dag_id, sqla.func.count(DagRun.id))
-            .filter(DagRun.state == State.RUNNING)
-            .filter(DagRun.dag_id.in_(filter_dag_ids))
-            .group_by(DagRun.dag_id)
-        )
-        # pylint: enable=comparison-with-callable
+        dag_run_states = get_dag_run_states(filter_dag_ids, session)
 
         payload = []
-        for dag_id, active_dag_runs in dags:
+        for dag_id, states in dag_run_states.items():
+            active_dag_runs = states.get(State.RUNNING)
+            if not active_dag_runs:
+                continue
             max_active_runs = 0
             dag = current_app.dag_bag.get_dag(dag_id)
             if dag:
@@ -1941,96 +1747,6 @@ class Airflow(AirflowBaseView):  # noqa: D101  pylint: disable=too-many-public-m
             State.SUCCESS,
         )
 
-    def _get_tree_data(self, dag_runs: Iterable[DagRun], dag: DAG, base_date: DateTime):
-        """Returns formatted dag_runs for Tree View"""
-        dates = sorted(dag_runs.keys())
-        min_date = min(dag_runs, default=None)
-
-        task_instances = {
-            (ti.task_id, ti.execution_date): ti
-            for ti in dag.get_task_instances(start_date=min_date, end_date=base_date)
-        }
-
-        expanded = set()
-        # The default recursion traces every path so that tree view has full
-        # expand/collapse functionality. After 5,000 nodes we stop and fall
-        # back on a quick DFS search for performance. See PR #320.
-        node_count = 0
-        node_limit = 5000 / max(1, len(dag.leaves))
-
-        def encode_ti(task_instance: Optional[models.TaskInstance]) -> Optional[List]:
-            if not task_instance:
-                return None
-
-            # NOTE: order of entry is important here because client JS relies on it for
-            # tree node reconstruction. Remember to change JS code in tree.html
-            # whenever order is altered.
-            task_instance_data = [
-                task_instance.state,
-                task_instance.try_number,
-                None,  # start_ts
-                None,  # duration
-            ]
-
-            if task_instance.start_date:
-                # round to seconds to reduce payload size
-                task_instance_data[2] = int(task_instance.start_date.timestamp())
-                if task_instance.duration is not None:
-                    task_instance_data[3] = truncate_task_duration(task_instance.duration)
-
-            return task_instance_data
-
-        def recurse_nodes(task, visited):
-            nonlocal node_count
-            node_count += 1
-            visited.add(task)
-            task_id = task.task_id
-
-            node = {
-                'name': task.task_id,
-                'instances': [encode_ti(task_instances.get((task_id, d))) for d in dates],
-                'num_dep': len(task.downstream_list),
-                'operator': task.task_type,
-                'retries': task.retries,
-                'owner': task.owner,
-                'ui_color': task.ui_color,
-            }
-
-            if task.downstream_list:
-                children = [
-                    recurse_nodes(t, visited)
-                    for t in task.downstream_list
-                    if node_count < node_limit or t not in visited
-                ]
-
-                # D3 tree uses children vs _children to define what is
-                # expanded or not. The following block makes it such that
-                # repeated nodes are collapsed by default.
-                if task.task_id not in expanded:
-                    children_key = 'children'
-                    expanded.add(task.task_id)
-                else:
-                    children_key = "_children"
-                node[children_key] = children
-
-            if task.depends_on_past:
-                node['depends_on_past'] = task.depends_on_past
-            if task.start_date:
-                # round to seconds to reduce payload size
-                node['start_ts'] = int(task.start_date.timestamp())
-                if task.end_date:
-                    # round to seconds to reduce payload size
-                    node['end_ts'] = int(task.end_date.timestamp())
-            if task.extra_links:
-                node['extra_links'] = task.extra_links
-            return node
-
-        return {
-            'name': '[DAG]',
-            'children': [recurse_nodes(t, set()) for t in dag.roots],
-            'instances': [dag_runs.get(d) or {'execution_date': d.isoformat()} for d in dates],
-        }
-
     @expose('/tree')
     @auth.has_access(
         [
@@ -2049,9 +1765,10 @@ class Airflow(AirflowBaseView):  # noqa: D101  pylint: disable=too-many-public-m
             flash(f'DAG "{dag_id}" seems to be missing from DagBag.', "error")
             return redirect(url_for('Airflow.index'))
 
+        dag_hash = current_app.dag_bag.dags_hash.get(dag.dag_id)
         root = request.args.get('root')
         if root:
-            dag = dag.partial_subset(task_ids_or_regex=root, include_downstream=False, include_upstream=True)
+            dag = get_partial_subset(dag, dag_hash, root, include_upstream=True, include_downstream=False)
 
         num_runs = request.args.get('num_runs', type=int)
         if num_runs is None:
@@ -2089,10 +1806,8 @@ class Airflow(AirflowBaseView):  # noqa: D101  pylint: disable=too-many-public-m
         else:
             external_log_name = None
 
-        data = self._get_tree_data(dag_runs, dag, base_date)
-
-        # avoid spaces to reduce payload size
-        data = htmlsafe_json_dumps(data, separators=(',', ':'))
+        with create_session() as session:
+            data = get_tree_data(dag, dag_runs, dag_hash, session=session, root=root)
 
         return self.render_template(
             'airflow/tree.html',
@@ -2198,13 +1913,31 @@ class Airflow(AirflowBaseView):  # noqa: D101  pylint: disable=too-many-public-m
             flash(f'DAG "{dag_id}" seems to be missing.', "error")
             return redirect(url_for('Airflow.index'))
 
+        dag_hash = current_app.dag_bag.dags_hash.get(dag.dag_id)
         root = request.args.get('root')
         if root:
-            dag = dag.partial_subset(task_ids_or_regex=root, include_upstream=True, include_downstream=False)
+            dag = get_partial_subset(dag, dag_hash, root, include_upstream=True, include_downstream=False)
         arrange = request.args.get('arrange', dag.orientation)
 
-        nodes = task_group_to_dict(dag.task_group)
-        edges = dag_edges(dag)
+        def build_structure():
+            tasks = {
+                t.task_id: {
+                    'dag_id': t.dag_id,
+                    'task_type': t.task_type,
+                    'extra_links': t.extra_links,
+                }
+                for t in dag.tasks
+            }
+            return {
+                'nodes': htmlsafe_json_dumps(task_group_to_dict(dag.task_group)),
+                'edges': htmlsafe_json_dumps(dag_edges(dag)),
+                'tasks': htmlsafe_json_dumps(tasks),
+            }
+
+        if dag_hash is None:
+            structure = build_structure()
+        else:
+            structure = STRUCTURE_CACHE.get(('graph', dag.dag_id, dag_hash, root), build_structure)
 
         dt_nr_dr_data = get_date_time_num_runs_dag_runs_form_data(request, session, dag)
         dt_nr_dr_data['arrange'] = arrange
@@ -2227,15 +1960,7 @@ class Airflow(AirflowBaseView):  # noqa: D101  pylint: disable=too-many-public-m
         form.execution_date.choices = dt_nr_dr_data['dr_choices']
 
         task_instances = {ti.task_id: alchemy_to_dict(ti) for ti in dag.get_task_instances(dttm, dttm)}
-        tasks = {
-            t.task_id: {
-                'dag_id': t.dag_id,
-                'task_type': t.task_type,
-                'extra_links': t.extra_links,
-            }
-            for t in dag.tasks
-        }
-        if not tasks:
+        if not dag.tasks:
             flash("No tasks found", "error")
         session.commit()
         doc_md = wwwutils.wrapped_markdown(getattr(dag, 'doc_md', None))
@@ -2259,9 +1984,9 @@ class Airflow(AirflowBaseView):  # noqa: D101  pylint: disable=too-many-public-m
             operators=sorted({op.task_type: op for op in dag.tasks}.values(), key=lambda x: x.task_type),
             root=root or '',
             task_instances=task_instances,
-            tasks=tasks,
-            nodes=nodes,
-            edges=edges,
+            tasks=structure['tasks'],
+            nodes=structure['nodes'],
+            edges=structure['edges'],
             show_external_log_redirect=task_log_reader.supports_external_link,
             external_log_name=external_log_name,
             dag_run_state=dt_nr_dr_data['dr_state'],
@@ -2308,40 +2033,10 @@ class Airflow(AirflowBaseView):  # noqa: D101  pylint: disable=too-many-public-m
         chart = nvd3.lineChart(name="lineChart", x_is_date=True, height=chart_height, width="1200")
         cum_chart = nvd3.lineChart(name="cumLineChart", x_is_date=True, height=chart_height, width="1200")
 
-        y_points = defaultdict(list)
-        x_points = defaultdict(list)
-        cumulative_y = defaultdict(list)
-
-        task_instances = dag.get_task_instances(start_date=min_date, end_date=base_date)
-        ti_fails = (
-            session.query(TaskFail)
-            .filter(
-                TaskFail.dag_id == dag.dag_id,
-                TaskFail.execution_date >= min_date,
-                TaskFail.execution_date <= base_date,
-                TaskFail.task_id.in_([t.task_id for t in dag.tasks]),
-            )
-            .all()
-        )
-
-        fails_totals = defaultdict(int)
-        for failed_task_instance in ti_fails:
-            dict_key = (
-                failed_task_instance.dag_id,
-                failed_task_instance.task_id,
-                failed_task_instance.execution_date,
-            )
-            if failed_task_instance.duration:
-                fails_totals[dict_key] += failed_task_instance.duration
-
-        for task_instance in task_instances:
-            if task_instance.duration:
-                date_time = wwwutils.epoch(task_instance.execution_date)
-                x_points[task_instance.task_id].append(date_time)
-                y_points[task_instance.task_id].append(float(task_instance.duration))
-                fails_dict_key = (task_instance.dag_id, task_instance.task_id, task_instance.execution_date)
-                fails_total = fails_totals[fails_dict_key]
-                cumulative_y[task_instance.task_id].append(float(task_instance.duration + fails_total))
+        points = get_duration_points(dag, min_date, base_date, session)
+        x_points = points['x']
+        y_points = points['y']
+        cumulative_y = points['cumulative_y']
 
         # determine the most relevant time unit for the set of task instance
         # durations for the DAG
@@ -2365,8 +2060,7 @@ class Airflow(AirflowBaseView):  # noqa: D101  pylint: disable=too-many-public-m
                 y=scale_time_units(cumulative_y[task_id], cum_y_unit),
             )
 
-        dates = sorted({ti.execution_date for ti in task_instances})
-        max_date = max(ti.execution_date for ti in task_instances) if dates else None
+        max_date = points['max_date']
 
         session.commit()
 
@@ -2428,20 +2122,11 @@ class Airflow(AirflowBaseView):  # noqa: D101  pylint: disable=too-many-public-m
             name="lineChart", x_is_date=True, y_axis_format='d', height=chart_height, width="1200"
         )
 
-        for task in dag.tasks:
-            y_points = []
-            x_points = []
-            for ti in task.get_task_instances(start_date=min_date, end_date=base_date):
-                dttm = wwwutils.epoch(ti.execution_date)
-                x_points.append(dttm)
-                # y value should reflect completed tries to have a 0 baseline.
-                y_points.append(ti.prev_attempted_tries)
-            if x_points:
-                chart.add_serie(name=task.task_id, x=x_points, y=y_points)
-
-        tis = dag.get_task_instances(start_date=min_date, end_date=base_date)
-        tries = sorted({ti.try_number for ti in tis})
-        max_date = max(ti.execution_date for ti in tis) if tries else None
+        points = get_tries_points(dag, min_date, base_date, session)
+        for task_id, x_points in points['x'].items():
+            chart.add_serie(name=task_id, x=x_points, y=points['y'][task_id])
+
+        max_date = points['max_date']
         chart.create_y_axis('yAxis', format='.02f', custom_format=False, label='Tries')
         chart.axislist['yAxis']['axisLabelDistance'] = '-15'
 
@@ -2496,21 +2181,9 @@ class Airflow(AirflowBaseView):  # noqa: D101  pylint: disable=too-many-public-m
 
         chart_height = wwwutils.get_chart_height(dag)
         chart = nvd3.lineChart(name="lineChart", x_is_date=True, height=chart_height, width="1200")
-        y_points = {}
-        x_points = {}
-        for task in dag.tasks:
-            task_id = task.task_id
-            y_points[task_id] = []
-            x_points[task_id] = []
-            for ti in task.get_task_instances(start_date=min_date, end_date=base_date):
-                ts = ti.execution_date
-                if dag.schedule_interval and dag.following_schedule(ts):
-                    ts = dag.following_schedule(ts)
-                if ti.end_date:
-                    dttm = wwwutils.epoch(ti.execution_date)
-                    secs = (ti.end_date - ts).total_seconds()
-                    x_points[task_id].append(dttm)
-                    y_points[task_id].append(secs)
+        points = get_landing_times_points(dag, min_date, base_date, session)
+        x_points = points['x']
+        y_points = points['y']
 
         # determine the most relevant time unit for the set of landing times
         # for the DAG
@@ -2526,9 +2199,7 @@ class Airflow(AirflowBaseView):  # noqa: D101  pylint: disable=too-many-public-m
                 y=scale_time_units(y_points[task_id], y_unit),
             )
 
-        tis = dag.get_task_instances(start_date=min_date, end_date=base_date)
-        dates = sorted({ti.execution_date for ti in tis})
-        max_date = max(ti.execution_date for ti in tis) if dates else None
+        max_date = points['max_date']
 
         session.commit()
 
@@ -2629,63 +2300,7 @@ class Airflow(AirflowBaseView):  # noqa: D101  pylint: disable=too-many-public-m
         form = DateTimeWithNumRunsWithDagRunsForm(data=dt_nr_dr_data)
         form.execution_date.choices = dt_nr_dr_data['dr_choices']
 
-        tis = [ti for ti in dag.get_task_instances(dttm, dttm) if ti.start_date and ti.state]
-        tis = sorted(tis, key=lambda ti: ti.start_date)
-        ti_fails = list(
-            itertools.chain(
-                *(
-                    (
-                        session.query(TaskFail)
-                        .filter(
-                            TaskFail.dag_id == ti.dag_id,
-                            TaskFail.task_id == ti.task_id,
-                            TaskFail.execution_date == ti.execution_date,
-                        )
-                        .all()
-                    )
-                    for ti in tis
-                )
-            )
-        )
-
-        tasks = []
-        for ti in tis:
-            # prev_attempted_tries will reflect the currently running try_number
-            # or the try_number of the last complete run
-            # https://issues.apache.org/jira/browse/AIRFLOW-2143
-            try_count = ti.prev_attempted_tries if ti.prev_attempted_tries != 0 else ti.try_number
-            task_dict = alchemy_to_dict(ti)
-            task_dict['end_date'] = task_dict['end_date'] or timezone.utcnow()
-            task_dict['extraLinks'] = dag.get_task(ti.task_id).extra_links
-            task_dict['try_number'] = try_count
-            tasks.append(task_dict)
-
-        tf_count = 0
-        try_count = 1
-        prev_task_id = ""
-        for failed_task_instance in ti_fails:
-            if tf_count != 0 and failed_task_instance.task_id == prev_task_id:
-                try_count += 1
-            else:
-                try_count = 1
-            prev_task_id = failed_task_instance.task_id
-            tf_count += 1
-            task = dag.get_task(failed_task_instance.task_id)
-            task_dict = alchemy_to_dict(failed_task_instance)
-            end_date = task_dict['end_date'] or timezone.utcnow()
-            task_dict['end_date'] = end_date
-            task_dict['start_date'] = task_dict['start_date'] or end_date
-            task_dict['state'] = State.FAILED
-            task_dict['operator'] = task.task_type
-            task_dict['try_number'] = try_count
-            task_dict['extraLinks'] = task.extra_links
-            tasks.append(task_dict)
-
-        data = {
-            'taskNames': [ti.task_id for ti in tis],
-            'tasks': tasks,
-            'height': len(tis) * 25 + 25,
-        }
+        data = get_gantt_data(dag, dttm, session)
 
         session.commit()
 
@@ -2800,9 +2415,10 @@ class Airflow(AirflowBaseView):  # noqa: D101  pylint: disable=too-many-public-m
             response.status_code = 404
             return response
 
+        dag_hash = current_app.dag_bag.dags_hash.get(dag.dag_id)
         root = request.args.get('root')
         if root:
-            dag = dag.partial_subset(task_ids_or_regex=root, include_downstream=False, include_upstream=True)
+            dag = get_partial_subset(dag, dag_hash, root, include_upstream=True, include_downstream=False)
 
         num_runs = request.args.get('num_runs', type=int)
         if num_runs is None:
@@ -2823,10 +2439,14 @@ class Airflow(AirflowBaseView):  # noqa: D101  pylint: disable=too-many-public-m
             )
         dag_runs = {dr.execution_date: alchemy_to_dict(dr) for dr in dag_runs}
 
-        tree_data = self._get_tree_data(dag_runs, dag, base_date)
+        with create_session() as session:
+            data = get_tree_data(dag, dag_runs, dag_hash, session=session, root=root)
 
-        # avoid spaces to reduce payload size
-        return htmlsafe_json_dumps(tree_data, separators=(',', ':'))
+        # Auto-refresh polls mostly get the same data back, let them skip the download
+        response = make_response(data)
+        response.add_etag()
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
 
 
 class ConfigurationView(AirflowBaseView):
@@ -2910,8 +2530,11 @@ class DagFilter(BaseFilter):
     def apply(self, query, func):  # noqa pylint: disable=redefined-outer-name,unused-argument
         if current_app.appbuilder.sm.has_all_dags_access():
             return query
-        filter_dag_ids = current_app.appbuilder.sm.get_accessible_dag_ids(g.user)
-        return query.filter(self.model.dag_id.in_(filter_dag_ids))
+        return query.filter(
+            current_app.appbuilder.sm.dag_access_filter(
+                self.model.dag_id, [permissions.ACTION_CAN_EDIT, permissions.ACTION_CAN_READ], g.user
+            )
+        )
 
 
 class AirflowModelView(ModelView):  # noqa: D101
@@ -3991,11 +3614,11 @@ class DagModelView(AirflowModelView):
             dag_ids_query = dag_ids_query.filter(DagModel.is_paused)
             owners_query = owners_query.filter(DagModel.is_paused)
 
-        filter_dag_ids = current_app.appbuilder.sm.get_accessible_dag_ids(g.user)
-        # pylint: disable=no-member
-        dag_ids_query = dag_ids_query.filter(DagModel.dag_id.in_(filter_dag_ids))
-        owners_query = owners_query.filter(DagModel.dag_id.in_(filter_dag_ids))
-        # pylint: enable=no-member
+        dag_access_filter = current_app.appbuilder.sm.dag_access_filter(
+            DagModel.dag_id, [permissions.ACTION_CAN_EDIT, permissions.ACTION_CAN_READ], g.user
+        )
+        dag_ids_query = dag_ids_query.filter(dag_access_filter)
+        owners_query = owners_query.filter(dag_access_filter)
 
         payload = [row[0] for row in dag_ids_query.union(owners_query).limit(10).all()]
 
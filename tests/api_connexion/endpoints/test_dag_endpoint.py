@@ -30,6 +30,7 @@ from airflow.models.serialized_dag import SerializedDagModel
 from airflow.operators.dummy import DummyOperator
 from airflow.security import permissions
 from airflow.utils.session import provide_session
+from airflow.www.structure_cache import STRUCTURE_CACHE
 from tests.test_utils.api_connexion_utils import assert_401, create_user, delete_user
 from tests.test_utils.config import conf_vars
 from tests.test_utils.db import clear_db_dags, clear_db_runs, clear_db_serialized_dags
@@ -297,6 +298,46 @@ class TestGetDagDetails(TestDagEndpoint):
         }
         assert response.json == expected
 
+    def test_should_respond_304_while_dag_is_unchanged(self):
+        STRUCTURE_CACHE.clear()
+        dag = self.app.dag_bag.get_dag(self.dag_id)
+        SerializedDagModel.write_dag(dag)
+        dag_bag = DagBag(os.devnull, include_examples=False, read_dags_from_db=True)
+        url = f"/api/v1/dags/{self.dag_id}/details"
+
+        with unittest.mock.patch.object(self.app, 'dag_bag', dag_bag), unittest.mock.patch(
+            "airflow.api_connexion.endpoints.dag_endpoint.dag_detail_schema.dump", return_value={}
+        ) as mock_dump:
+            response = self.client.get(url, environ_overrides={'REMOTE_USER': "test"})
+            assert response.status_code == 200
+            etag = response.headers["ETag"]
+            assert response.headers["Cache-Control"] == "no-cache"
+
+            response = self.client.get(url, environ_overrides={'REMOTE_USER': "test"})
+            assert response.status_code == 200
+            assert response.headers["ETag"] == etag
+
+            response = self.client.get(
+                url, headers={"If-None-Match": etag}, environ_overrides={'REMOTE_USER': "test"}
+            )
+            assert response.status_code == 304
+            assert response.data == b""
+        # The second full response was served from the cache
+        assert mock_dump.call_count == 1
+
+        dag.doc_md = "changed details"
+        SerializedDagModel.write_dag(dag)
+        dag_bag = DagBag(os.devnull, include_examples=False, read_dags_from_db=True)
+        with unittest.mock.patch.object(self.app, 'dag_bag', dag_bag):
+            response = self.client.get(
+                url, headers={"If-None-Match": etag}, environ_overrides={'REMOTE_USER': "test"}
+            )
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert response.json["doc_md"] == "changed details"
+        dag.doc_md = "details"
+        STRUCTURE_CACHE.clear()
+
     def test_should_respond_200_serialized(self):
         # Get the dag out of the dagbag before we patch it to an empty one
         SerializedDagModel.write_dag(self.app.dag_bag.get_dag(self.dag_id))
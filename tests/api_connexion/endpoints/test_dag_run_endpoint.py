@@ -14,6 +14,7 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import json
 from datetime import timedelta
 
 import pytest
@@ -422,6 +423,52 @@ class TestGetDagRunsPagination(TestDagRunEndpoint):
         assert response.status_code == 200
         assert len(response.json["dag_runs"]) == 150
 
+    @parameterized.expand([("id",), ("-id",), ("execution_date",), ("-execution_date",)])
+    def test_cursor_pagination_returns_every_dag_run_once(self, order_by):
+        self._create_dag_runs(10)
+        base_url = f"api/v1/dags/TEST_DAG_ID/dagRuns?limit=3&order_by={order_by}&skip_total_entries=true"
+        url = base_url
+        dag_run_ids = []
+        while url:
+            response = self.client.get(url, environ_overrides={'REMOTE_USER': "test"})
+            assert response.status_code == 200
+            assert response.json["total_entries"] is None
+            dag_run_ids.extend(dag_run["dag_run_id"] for dag_run in response.json["dag_runs"])
+            next_cursor = response.json.get("next_cursor")
+            url = next_cursor and f"{base_url}&cursor={next_cursor}"
+
+        expected = [f"TEST_DAG_RUN_ID{i}" for i in range(1, 11)]
+        assert dag_run_ids == (expected[::-1] if order_by.startswith("-") else expected)
+
+    @parameterized.expand(
+        [
+            ("api/v1/dags/TEST_DAG_ID/dagRuns?cursor=WzFd&offset=1", "cannot be used together"),
+            ("api/v1/dags/TEST_DAG_ID/dagRuns?cursor=WzFd&order_by=state", "not supported"),
+            ("api/v1/dags/TEST_DAG_ID/dagRuns?cursor=invalid", "malformed"),
+        ]
+    )
+    def test_invalid_cursor_requests(self, url, detail):
+        self._create_dag_runs(1)
+        response = self.client.get(url, environ_overrides={'REMOTE_USER': "test"})
+        assert response.status_code == 400
+        assert detail in response.json["detail"]
+
+    @conf_vars({("api", "maximum_page_limit"): "4"})
+    def test_should_stream_ndjson(self):
+        self._create_dag_runs(10)
+        response = self.client.get(
+            "api/v1/dags/TEST_DAG_ID/dagRuns?order_by=-execution_date",
+            headers={"Accept": "application/x-ndjson"},
+            environ_overrides={'REMOTE_USER': "test"},
+        )
+        assert response.status_code == 200
+        assert response.mimetype == "application/x-ndjson"
+        assert response.is_streamed
+        lines = response.get_data(as_text=True).splitlines()
+        assert [json.loads(line)["dag_run_id"] for line in lines] == [
+            f"TEST_DAG_RUN_ID{i}" for i in range(10, 0, -1)
+        ]
+
     def _create_dag_runs(self, count):
         dag_runs = [
             DagRun(
@@ -1057,3 +1104,93 @@ class TestPostDagRun(TestDagRunEndpoint):
             environ_overrides={'REMOTE_USER': "test_view_dags"},
         )
         assert response.status_code == 403
+
+
+class TestPostDagRunsBulk(TestDagRunEndpoint):
+    def test_should_create_valid_runs_and_report_the_others(self):
+        self._create_test_dag_run()
+        response = self.client.post(
+            "api/v1/dags/TEST_DAG_ID/dagRuns/bulk",
+            json={
+                "dag_runs": [
+                    {"dag_run_id": "NEW_RUN_1", "execution_date": self.default_time_3},
+                    {"dag_run_id": "TEST_DAG_RUN_ID_1", "execution_date": "2020-06-14T18:00:00+00:00"},
+                    {"dag_run_id": "NEW_RUN_2", "execution_date": self.default_time},
+                    {"dag_run_id": "NEW_RUN_3", "execution_date": self.default_time_3},
+                    {"execution_date": "2020-11-10T08:25:56.939143"},
+                    {"execution_date": "2020-06-15T18:00:00+00:00", "conf": {"a": 1}},
+                ]
+            },
+            environ_overrides={'REMOTE_USER': "test"},
+        )
+        assert response.status_code == 200, response.data
+        results = response.json["results"]
+        assert [result["index"] for result in results] == list(range(6))
+        assert [result["status"] for result in results] == [200, 409, 409, 409, 400, 200]
+        assert results[1]["detail"] == (
+            "DAGRun with DAG ID: 'TEST_DAG_ID' and DAGRun ID: 'TEST_DAG_RUN_ID_1' already exists"
+        )
+        assert results[2]["detail"] == (
+            "DAGRun with DAG ID: 'TEST_DAG_ID' and "
+            "DAGRun ExecutionDate: '2020-06-11 18:00:00+00:00' already exists"
+        )
+        assert results[4]["detail"] == "Naive datetime is disallowed"
+        assert results[0]["dag_run"] == {
+            "conf": {},
+            "dag_id": "TEST_DAG_ID",
+            "dag_run_id": "NEW_RUN_1",
+            "end_date": None,
+            "execution_date": self.default_time_3,
+            "external_trigger": True,
+            "start_date": results[0]["dag_run"]["start_date"],
+            "state": "running",
+        }
+        assert results[5]["dag_run"]["conf"] == {"a": 1}
+        assert results[5]["dag_run"]["dag_run_id"] == "manual__2020-06-15T18:00:00+00:00"
+
+        with create_session() as session:
+            runs = {
+                dag_run.run_id: dag_run
+                for dag_run in session.query(DagRun).filter(DagRun.dag_id == "TEST_DAG_ID")
+            }
+        assert set(runs) == {
+            "TEST_DAG_RUN_ID_1",
+            "TEST_DAG_RUN_ID_2",
+            "NEW_RUN_1",
+            "manual__2020-06-15T18:00:00+00:00",
+        }
+        assert runs["NEW_RUN_1"].state == "running"
+        assert runs["NEW_RUN_1"].run_type == DagRunType.MANUAL
+        assert runs["NEW_RUN_1"].external_trigger
+
+    def test_should_respond_400_when_exceeding_maximum_page_limit(self):
+        self._create_dag("TEST_DAG_ID")
+        with conf_vars({("api", "maximum_page_limit"): "2"}):
+            response = self.client.post(
+                "api/v1/dags/TEST_DAG_ID/dagRuns/bulk",
+                json={"dag_runs": [{}, {}, {}]},
+                environ_overrides={'REMOTE_USER': "test"},
+            )
+        assert response.status_code == 400
+        assert response.json["detail"] == "A bulk request can contain at most 2 items, got 3"
+
+    def test_response_404(self):
+        response = self.client.post(
+            "api/v1/dags/TEST_DAG_ID/dagRuns/bulk",
+            json={"dag_runs": [{}]},
+            environ_overrides={'REMOTE_USER': "test"},
+        )
+        assert response.status_code == 404
+
+    def test_should_raises_401_unauthenticated(self):
+        response = self.client.post("api/v1/dags/TEST_DAG_ID/dagRuns/bulk", json={"dag_runs": [{}]})
+        assert_401(response)
+
+    def test_should_raises_403_unauthorized(self):
+        self._create_dag("TEST_DAG_ID")
+        response = self.client.post(
+            "api/v1/dags/TEST_DAG_ID/dagRuns/bulk",
+            json={"dag_runs": [{}]},
+            environ_overrides={'REMOTE_USER': "test_view_dags"},
+        )
+        assert response.status_code == 403
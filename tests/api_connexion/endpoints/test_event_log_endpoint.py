@@ -309,6 +309,25 @@ class TestGetEventLogPagination(TestEventLogEndpoint):
         events = [event_log["event"] for event_log in response.json["event_logs"]]
         assert events == expected_events
 
+    @provide_session
+    def test_should_page_with_cursor(self, session):
+        session.add_all(self._create_event_logs(5))
+        session.commit()
+
+        response = self.client.get("api/v1/eventLogs?limit=3", environ_overrides={'REMOTE_USER': "test"})
+        assert response.status_code == 200
+        cursor = response.json["next_cursor"]
+
+        response = self.client.get(
+            f"api/v1/eventLogs?limit=3&cursor={cursor}", environ_overrides={'REMOTE_USER': "test"}
+        )
+        assert response.status_code == 200
+        assert [event_log["event"] for event_log in response.json["event_logs"]] == [
+            "TEST_EVENT_4",
+            "TEST_EVENT_5",
+        ]
+        assert "next_cursor" not in response.json
+
     @provide_session
     def test_should_respect_page_size_limit_default(self, session):
         log_models = self._create_event_logs(200)
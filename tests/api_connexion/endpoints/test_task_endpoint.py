@@ -269,6 +269,31 @@ class TestGetTasks(TestTaskEndpoint):
         assert response.json['tasks'][0]['task_id'] == self.task_id2
         assert response.json['tasks'][1]['task_id'] == self.task_id
 
+    def test_should_respond_304_while_dag_is_unchanged(self):
+        SerializedDagModel.write_dag(self.app.dag_bag.get_dag(self.dag_id))
+        dag_bag = DagBag(os.devnull, include_examples=False, read_dags_from_db=True)
+        url = f"/api/v1/dags/{self.dag_id}/tasks"
+
+        with unittest.mock.patch.object(self.app, 'dag_bag', dag_bag):
+            response = self.client.get(url, environ_overrides={'REMOTE_USER': "test"})
+            assert response.status_code == 200
+            assert [task["task_id"] for task in response.json["tasks"]] == [self.task_id, self.task_id2]
+            etag = response.headers["ETag"]
+
+            response = self.client.get(
+                url, headers={"If-None-Match": etag}, environ_overrides={'REMOTE_USER': "test"}
+            )
+            assert response.status_code == 304
+
+            response = self.client.get(
+                f"{url}?order_by=-task_id",
+                headers={"If-None-Match": etag},
+                environ_overrides={'REMOTE_USER': "test"},
+            )
+            assert response.status_code == 200
+            assert response.headers["ETag"] != etag
+            assert [task["task_id"] for task in response.json["tasks"]] == [self.task_id2, self.task_id]
+
     def test_should_raise_400_for_invalid_order_by_name(self):
         response = self.client.get(
             f"/api/v1/dags/{self.dag_id}/tasks?order_by=invalid_task_colume_name",
@@ -444,6 +444,25 @@ class TestGetTaskInstances(TestTaskInstanceEndpoint):
         assert count == response.json["total_entries"]
         assert count == len(response.json["task_instances"])
 
+    def test_should_page_with_cursor_without_total_entries(self, session):
+        self.create_task_instances(session)
+        url = "/api/v1/dags/example_python_operator/dagRuns/~/taskInstances?limit=2&skip_total_entries=true"
+        pages = []
+        response = self.client.get(url, environ_overrides={"REMOTE_USER": "test"})
+        while True:
+            assert response.status_code == 200
+            assert response.json["total_entries"] is None
+            pages.append([ti["task_id"] for ti in response.json["task_instances"]])
+            if "next_cursor" not in response.json:
+                break
+            response = self.client.get(
+                f"{url}&cursor={response.json['next_cursor']}", environ_overrides={"REMOTE_USER": "test"}
+            )
+
+        task_ids = sorted(ti.task_id for ti in session.query(TaskInstance))
+        assert [task_id for page in pages for task_id in page] == task_ids
+        assert all(len(page) == 2 for page in pages[:-1])
+
     def test_should_raises_401_unauthenticated(self):
         response = self.client.get(
             "/api/v1/dags/example_python_operator/dagRuns/~/taskInstances",
@@ -1180,3 +1199,114 @@ class TestPostSetTaskInstanceState(TestTaskInstanceEndpoint):
         )
         assert response.status_code == 400
         assert response.json['detail'] == expected
+
+
+class TestPostSetTaskInstanceStateBulk(TestTaskInstanceEndpoint):
+    @staticmethod
+    def _update(task_id, **kwargs):
+        update = {
+            "dry_run": False,
+            "task_id": task_id,
+            "execution_date": DEFAULT_DATETIME_1,
+            "include_upstream": False,
+            "include_downstream": False,
+            "include_future": False,
+            "include_past": False,
+            "new_state": "success",
+        }
+        update.update(kwargs)
+        return update
+
+    @mock.patch('airflow.api_connexion.endpoints.task_instance_endpoint.set_state')
+    def test_should_group_updates_with_the_same_options(self, mock_set_state, session):
+        self.create_task_instances(session)
+        mock_set_state.side_effect = lambda tasks, **kwargs: (
+            session.query(TaskInstance)
+            .filter(TaskInstance.task_id.in_([task.task_id for task in tasks]))
+            .all()
+        )
+        response = self.client.post(
+            "/api/v1/dags/example_python_operator/updateTaskInstancesState/bulk",
+            environ_overrides={'REMOTE_USER': "test"},
+            json={
+                "updates": [
+                    self._update("print_the_context"),
+                    self._update("sleep_for_0", new_state="failed"),
+                    self._update("INVALID_TASK"),
+                    self._update("sleep_for_1"),
+                    self._update("sleep_for_2", execution_date="2020-11-10T12:42:39.442973"),
+                ]
+            },
+        )
+        assert response.status_code == 200, response.data
+        assert response.json["results"] == [
+            {"index": 0, "status": 200},
+            {"index": 1, "status": 200},
+            {"index": 2, "status": 404, "detail": "Task ID INVALID_TASK not found"},
+            {"index": 3, "status": 200},
+            {"index": 4, "status": 400, "detail": "Naive datetime is disallowed"},
+        ]
+        assert sorted(ti["task_id"] for ti in response.json["task_instances"]) == [
+            "print_the_context",
+            "sleep_for_0",
+            "sleep_for_1",
+        ]
+
+        dag = self.app.dag_bag.dags['example_python_operator']  # pylint: disable=no-member
+        options = dict(
+            commit=True,
+            downstream=False,
+            execution_date=DEFAULT_DATETIME_1,
+            future=False,
+            past=False,
+            upstream=False,
+            session=mock.ANY,
+        )
+        assert mock_set_state.call_args_list == [
+            mock.call(
+                tasks=[dag.task_dict["print_the_context"], dag.task_dict["sleep_for_1"]],
+                state="success",
+                **options,
+            ),
+            mock.call(tasks=[dag.task_dict["sleep_for_0"]], state="failed", **options),
+        ]
+
+    def test_should_set_state_in_a_single_request(self, session):
+        self.create_task_instances(session)
+        response = self.client.post(
+            "/api/v1/dags/example_python_operator/updateTaskInstancesState/bulk",
+            environ_overrides={'REMOTE_USER': "test"},
+            json={
+                "updates": [
+                    self._update("print_the_context"),
+                    self._update("sleep_for_0", new_state="failed"),
+                    self._update("sleep_for_1", dry_run=True),
+                ]
+            },
+        )
+        assert response.status_code == 200, response.data
+        states = dict(session.query(TaskInstance.task_id, TaskInstance.state))
+        assert states["print_the_context"] == State.SUCCESS
+        assert states["sleep_for_0"] == State.FAILED
+        assert states["sleep_for_1"] == State.RUNNING
+        assert {ti["task_id"] for ti in response.json["task_instances"]} == {
+            "print_the_context",
+            "sleep_for_0",
+            "sleep_for_1",
+        }
+
+    def test_should_raise_404_not_found_dag(self):
+        response = self.client.post(
+            "/api/v1/dags/INVALID_DAG/updateTaskInstancesState/bulk",
+            environ_overrides={'REMOTE_USER': "test"},
+            json={"updates": [self._update("print_the_context")]},
+        )
+        assert response.status_code == 404
+
+    def test_should_raise_403_forbidden(self):
+        response = self.client.post(
+            "/api/v1/dags/example_python_operator/updateTaskInstancesState/bulk",
+            environ_overrides={'REMOTE_USER': "test_no_permissions"},
+            json={"updates": [self._update("print_the_context")]},
+        )
+        assert response.status_code == 403
@@ -308,3 +308,67 @@ class TestPostVariables(TestVariableEndpoint):
         )
 
         assert_401(response)
+
+
+class TestPostVariablesBulk(TestVariableEndpoint):
+    def test_should_create_variables(self):
+        Variable.set("var_existing", "old")
+        response = self.client.post(
+            "/api/v1/variables/bulk",
+            json={
+                "variables": [
+                    {"key": "var_existing", "value": "new"},
+                    {"key": "var_create", "value": "{}"},
+                    {"key": "var_existing", "value": "newer"},
+                ]
+            },
+            environ_overrides={'REMOTE_USER': "test"},
+        )
+        assert response.status_code == 200
+        assert response.json == {
+            "results": [
+                {"index": 0, "key": "var_existing", "status": 200},
+                {"index": 1, "key": "var_create", "status": 200},
+                {
+                    "index": 2,
+                    "key": "var_existing",
+                    "status": 400,
+                    "detail": "The variable key appears more than once in the request",
+                },
+            ]
+        }
+        assert Variable.get("var_existing") == "new"
+        assert Variable.get("var_create") == "{}"
+
+    def test_should_reject_invalid_variables(self):
+        response = self.client.post(
+            "/api/v1/variables/bulk",
+            json={"variables": [{"key": "var_create", "v": "{}"}]},
+            environ_overrides={'REMOTE_USER': "test"},
+        )
+        assert response.status_code == 200
+        assert response.json == {
+            "results": [
+                {
+                    "index": 0,
+                    "status": 400,
+                    "detail": "{'value': ['Missing data for required field.'], 'v': ['Unknown field.']}",
+                },
+            ]
+        }
+        assert Variable.get("var_create", default_var=None) is None
+
+    def test_should_raises_401_unauthenticated(self):
+        response = self.client.post(
+            "/api/v1/variables/bulk", json={"variables": [{"key": "var_create", "value": "{}"}]}
+        )
+
+        assert_401(response)
+
+    def test_should_raise_403_forbidden(self):
+        response = self.client.post(
+            "/api/v1/variables/bulk",
+            json={"variables": [{"key": "var_create", "value": "{}"}]},
+            environ_overrides={'REMOTE_USER': "test_no_permissions"},
+        )
+        assert response.status_code == 403
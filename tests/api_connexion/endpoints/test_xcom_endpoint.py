@@ -14,6 +14,7 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import json
 from datetime import timedelta
 
 import pytest
@@ -451,6 +452,35 @@ class TestPaginationGetXComEntries(TestXComEndpoint):
         conn_ids = [conn["key"] for conn in response.json["xcom_entries"] if conn]
         assert conn_ids == expected_xcom_ids
 
+    @provide_session
+    def test_should_stream_ndjson_after_cursor(self, session):
+        url = f"/api/v1/dags/{self.dag_id}/dagRuns/{self.dag_run_id}/taskInstances/{self.task_id}/xcomEntries"
+        dagrun = DR(
+            dag_id=self.dag_id,
+            run_id=self.dag_run_id,
+            execution_date=self.execution_date_parsed,
+            start_date=self.execution_date_parsed,
+            run_type=DagRunType.MANUAL,
+        )
+        xcoms = self._create_xcoms(10)
+        for xcom in xcoms:
+            xcom.value = XCom.serialize_value(xcom.key)
+        session.add_all(xcoms)
+        session.add(dagrun)
+        session.commit()
+        response = self.client.get(f"{url}?limit=8", environ_overrides={'REMOTE_USER': "test"})
+        cursor = response.json["next_cursor"]
+
+        response = self.client.get(
+            f"{url}?cursor={cursor}",
+            headers={"Accept": "application/x-ndjson"},
+            environ_overrides={'REMOTE_USER': "test"},
+        )
+        assert response.status_code == 200
+        assert response.mimetype == "application/x-ndjson"
+        lines = response.get_data(as_text=True).splitlines()
+        assert [json.loads(line)["key"] for line in lines] == ["TEST_XCOM_KEY8", "TEST_XCOM_KEY9"]
+
     def _create_xcoms(self, count):
         return [
             XCom(
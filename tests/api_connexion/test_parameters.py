@@ -24,11 +24,13 @@ from pendulum.tz.timezone import Timezone
 
 from airflow.api_connexion.exceptions import BadRequest
 from airflow.api_connexion.parameters import (
+    Keyset,
     check_limit,
     format_datetime,
     format_parameters,
     validate_istimezone,
 )
+from airflow.models import DagRun
 from airflow.utils import timezone
 from tests.test_utils.config import conf_vars
 
@@ -122,3 +124,32 @@ class TestFormatParameters(unittest.TestCase):
         decorated_endpoint = decorator(endpoint)
         decorated_endpoint(limit=89)
         endpoint.assert_called_once_with(limit=89)
+
+
+class TestKeyset(unittest.TestCase):
+    def test_cursor_round_trip(self):
+        keyset = Keyset(DagRun.execution_date, DagRun.id)
+        dag_run = DagRun(execution_date=timezone.datetime(2020, 6, 13, 22, 44))
+        dag_run.id = 5
+
+        cursor = keyset.cursor_of(dag_run)
+
+        assert keyset._decode(cursor) == [timezone.datetime(2020, 6, 13, 22, 44), 5]
+
+    def test_after_expands_row_comparison(self):
+        keyset = Keyset(DagRun.dag_id, DagRun.id, descending=True)
+        dag_run = DagRun(dag_id="dag")
+        dag_run.id = 5
+        query = mock.MagicMock()
+        keyset.after(query, keyset.cursor_of(dag_run))
+
+        (condition,), _ = query.filter.call_args
+        assert str(condition.compile(compile_kwargs={"literal_binds": True})) == (
+            "dag_run.dag_id < 'dag' OR dag_run.dag_id = 'dag' AND dag_run.id < 5"
+        )
+
+    def test_invalid_cursor_raises(self):
+        keyset = Keyset(DagRun.execution_date, DagRun.id)
+        for cursor in ["not base64!", "WzFd", "WyJ4IiwgMV0"]:  # [1] and ["x", 1]
+            with pytest.raises(BadRequest):
+                keyset.after(mock.MagicMock(), cursor)
@@ -83,6 +83,7 @@ class TestCliDags(unittest.TestCase):
             pool=None,
             rerun_failed_tasks=False,
             run_backwards=False,
+            resume=False,
             verbose=False,
         )
         mock_run.reset_mock()
@@ -154,6 +155,7 @@ class TestCliDags(unittest.TestCase):
             pool=None,
             rerun_failed_tasks=False,
             run_backwards=False,
+            resume=False,
             verbose=False,
         )
         mock_run.reset_mock()
@@ -232,6 +234,7 @@ class TestCliDags(unittest.TestCase):
             pool=None,
             rerun_failed_tasks=False,
             run_backwards=False,
+            resume=False,
             verbose=False,
         )
 
@@ -271,6 +274,7 @@ class TestCliDags(unittest.TestCase):
             pool=None,
             rerun_failed_tasks=False,
             run_backwards=True,
+            resume=False,
             verbose=False,
         )
 
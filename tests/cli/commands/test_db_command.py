@@ -18,6 +18,7 @@
 import unittest
 from unittest import mock
 
+import pendulum
 import pytest
 from sqlalchemy.engine.url import make_url
 
@@ -134,3 +135,36 @@ class TestCliDb(unittest.TestCase):
     def test_cli_shell_invalid(self):
         with pytest.raises(AirflowException, match=r"Unknown driver: invalid\+psycopg2"):
             db_command.shell(self.parser.parse_args(['db', 'shell']))
+
+    @mock.patch("airflow.utils.db_cleanup.run_cleanup", return_value=[])
+    def test_cli_clean(self, mock_run_cleanup):
+        db_command.cleanup_tables(
+            self.parser.parse_args(
+                [
+                    'db',
+                    'clean',
+                    '--clean-before-timestamp',
+                    '2021-01-01T00:00:00+00:00',
+                    '--tables',
+                    'log, xcom',
+                    '--batch-size',
+                    '10',
+                    '--yes',
+                ]
+            )
+        )
+
+        mock_run_cleanup.assert_called_once_with(
+            table_names=['log', 'xcom'],
+            clean_before_timestamp=pendulum.datetime(2021, 1, 1),
+            batch_size=10,
+            dry_run=False,
+            archive_folder=None,
+        )
+
+    @mock.patch("airflow.cli.commands.db_command.input", return_value="n")
+    @mock.patch("airflow.utils.db_cleanup.run_cleanup")
+    def test_cli_clean_cancelled(self, mock_run_cleanup, _):
+        db_command.cleanup_tables(self.parser.parse_args(['db', 'clean']))
+
+        mock_run_cleanup.assert_not_called()
@@ -360,6 +360,56 @@ key2 = airflow
         test_conf.remove_option('test', 'key2')
         assert not test_conf.has_option('test', 'key2')
 
+    def test_resolved_options_are_cached(self):
+        test_conf = AirflowConfigParser(default_config=parameterized_config("[test]\nkey2 = default\n"))
+        test_conf.read_string("[test]\nkey1 = value1\n")
+
+        assert test_conf.get('test', 'key1') == 'value1'
+        assert test_conf.get('test', 'key2') == 'default'
+        with mock.patch.object(test_conf, '_get_option_from_config_file') as mock_from_file:
+            assert test_conf.get('test', 'key1') == 'value1'
+            assert test_conf.get('test', 'key2') == 'default'
+        mock_from_file.assert_not_called()
+
+    def test_resolved_options_cache_is_invalidated(self):
+        test_conf = AirflowConfigParser(default_config=parameterized_config("[test]\nkey1 = default\n"))
+        test_conf.read_string("[test]\nkey1 = value1\n")
+        assert test_conf.get('test', 'key1') == 'value1'
+
+        test_conf.set('test', 'key1', 'value2')
+        assert test_conf.get('test', 'key1') == 'value2'
+
+        test_conf.read_string("[test]\nkey1 = value3\n")
+        assert test_conf.get('test', 'key1') == 'value3'
+
+        test_conf.remove_option('test', 'key1', remove_default=False)
+        assert test_conf.get('test', 'key1') == 'default'
+
+    def test_environment_variables_take_precedence_over_cache(self):
+        test_conf = AirflowConfigParser(default_config='')
+        test_conf.read_string("[test]\nkey1 = value1\n")
+        assert test_conf.get('test', 'key1') == 'value1'
+
+        with mock.patch.dict('os.environ', AIRFLOW__TEST__KEY1='from_env'):
+            assert test_conf.get('test', 'key1') == 'from_env'
+        assert test_conf.get('test', 'key1') == 'value1'
+
+    def test_sensitive_options_refresh_interval(self):
+        test_conf = AirflowConfigParser(default_config='')
+        test_conf.read_string("[test]\nkey1_cmd = printf cmd_result\n")
+        test_conf.sensitive_config_values = test_conf.sensitive_config_values | {('test', 'key1')}
+
+        with mock.patch('airflow.configuration.run_command', return_value='cmd_result') as mock_run:
+            test_conf.get('test', 'key1')
+            test_conf.get('test', 'key1')
+        assert mock_run.call_count == 2
+
+        test_conf.read_string("[secrets]\nconfig_refresh_interval = 60\n")
+        with mock.patch('airflow.configuration.run_command', return_value='cmd_result') as mock_run:
+            assert test_conf.get('test', 'key1') == 'cmd_result'
+            assert test_conf.get('test', 'key1') == 'cmd_result'
+        assert mock_run.call_count == 1
+
     def test_getsection(self):
         test_config = '''
 [test]
@@ -0,0 +1,58 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import json
+import subprocess
+import sys
+
+import pytest
+
+
+def imported_modules(*modules):
+    """Modules imported by a new interpreter importing ``modules``"""
+    code = "; ".join(f"import {module}" for module in modules)
+    code += "; import json, sys; print(json.dumps(sorted(sys.modules)))"
+    output = subprocess.check_output([sys.executable, "-c", code], universal_newlines=True)
+    return set(json.loads(output.splitlines()[-1]))
+
+
+@pytest.mark.parametrize(
+    "module, not_imported",
+    [
+        ("airflow", ["flask", "httpx", "kubernetes", "pandas", "airflow.models.dag", "airflow.www"]),
+        ("airflow.models", ["airflow.models.dag", "airflow.models.taskinstance"]),
+        ("airflow.models.taskinstance", ["flask", "httpx", "kubernetes", "airflow.www"]),
+        ("airflow.cli.commands.task_command", ["flask", "httpx", "kubernetes", "wtforms", "airflow.www"]),
+        ("airflow.cli.commands.dag_command", ["flask", "kubernetes", "pandas", "airflow.www"]),
+    ],
+)
+def test_heavy_modules_are_not_imported(module, not_imported):
+    modules = imported_modules(module)
+
+    assert [name for name in not_imported if name in modules] == []
+
+
+def test_models_are_imported_on_access():
+    modules = imported_modules("airflow.models")
+    assert "airflow.models.dagrun" not in modules
+
+    from airflow import models
+
+    assert models.DagRun.__module__ == "airflow.models.dagrun"
+    assert [name for name in models.__all__ if not hasattr(models, name)] == []
+    with pytest.raises(AttributeError):
+        models.NotAModel  # pylint: disable=pointless-statement
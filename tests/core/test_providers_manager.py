@@ -15,10 +15,14 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import os
 import re
+import tempfile
 import unittest
+from unittest import mock
 
 from airflow.providers_manager import ProvidersManager
+from tests.test_utils.config import conf_vars
 
 ALL_PROVIDERS = [
     'apache-airflow-providers-airbyte',
@@ -275,3 +279,25 @@ class TestProviderManager(unittest.TestCase):
         provider_manager = ProvidersManager()
         extra_link_class_names = list(provider_manager.extra_links_class_names)
         assert EXTRA_LINKS == extra_link_class_names
+
+    def test_providers_from_discovery_cache(self):
+        with tempfile.TemporaryDirectory() as cache_folder:
+            with conf_vars({('core', 'discovery_cache_folder'): cache_folder}):
+                provider_manager = ProvidersManager()
+                providers = dict(provider_manager.providers)
+                hooks = dict(provider_manager.hooks)
+                field_behaviours = dict(provider_manager.field_behaviours)
+                connection_form_widgets = list(provider_manager.connection_form_widgets)
+                assert os.listdir(cache_folder) == ['providers.json']
+
+                provider_manager = ProvidersManager()
+                with mock.patch.object(provider_manager, '_add_hook') as add_hook, mock.patch.object(
+                    provider_manager, '_add_provider_info_from_local_source_file'
+                ) as add_provider_info:
+                    assert provider_manager.providers == providers
+                    assert provider_manager.hooks == hooks
+                    assert provider_manager.field_behaviours == field_behaviours
+                add_hook.assert_not_called()
+                add_provider_info.assert_not_called()
+                # The hooks adding widgets are only imported now
+                assert list(provider_manager.connection_form_widgets) == connection_form_widgets
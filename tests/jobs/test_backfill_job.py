@@ -45,6 +45,7 @@ from airflow.models.taskinstance import TaskInstanceKey
 from airflow.operators.dummy import DummyOperator
 from airflow.utils import timezone
 from airflow.utils.session import create_session
+from airflow.utils.sqlalchemy import with_row_locks
 from airflow.utils.state import State
 from airflow.utils.timeout import timeout
 from airflow.utils.types import DagRunType
@@ -1536,3 +1537,125 @@ class TestBackfillJob(unittest.TestCase):
         )
         job.run()
         assert executor.job_id is not None
+
+    def test_backfill_queue_by_priority_weight(self):
+        session = settings.Session()
+        pool = Pool(pool='test_backfill_queue_by_priority_weight_pool', slots=1)
+        session.add(pool)
+        session.commit()
+
+        dag = DAG(
+            dag_id='test_backfill_queue_by_priority_weight',
+            start_date=DEFAULT_DATE,
+            schedule_interval='@daily',
+        )
+        with dag:
+            DummyOperator(task_id='low', pool=pool.pool, priority_weight=1)
+            DummyOperator(task_id='high', pool=pool.pool, priority_weight=10)
+        dag.clear()
+
+        executor = MockExecutor()
+        job = BackfillJob(
+            dag=dag,
+            executor=executor,
+            start_date=DEFAULT_DATE,
+            end_date=DEFAULT_DATE + datetime.timedelta(days=1),
+        )
+        job.run()
+
+        # The single slot of the pool goes to the task with the highest priority weight first
+        assert [(key.task_id, key.execution_date) for key, _ in executor.sorted_tasks] == [
+            ('high', DEFAULT_DATE),
+            ('high', DEFAULT_DATE + datetime.timedelta(days=1)),
+            ('low', DEFAULT_DATE),
+            ('low', DEFAULT_DATE + datetime.timedelta(days=1)),
+        ]
+
+    @parameterized.expand([("fails_in_backfill", False), ("failed_before_backfill", True)])
+    def test_backfill_upstream_failed_with_upstream_weight_rule(self, _, failed_before):
+        dag = DAG(
+            dag_id='test_backfill_upstream_failed_with_upstream_weight_rule',
+            start_date=DEFAULT_DATE,
+            schedule_interval='@daily',
+            default_args={'weight_rule': 'upstream'},
+        )
+        with dag:
+            # The downstream tasks have the highest priority weights and are examined first
+            task_a = DummyOperator(task_id='a')
+            task_u = DummyOperator(task_id='u')
+            task_d = DummyOperator(task_id='d')
+            task_a >> task_u >> task_d
+        dag.clear()
+
+        executor = MockExecutor()
+        if failed_before:
+            with create_session() as session:
+                dag_run = dag.create_dagrun(
+                    run_type=DagRunType.BACKFILL_JOB,
+                    execution_date=DEFAULT_DATE,
+                    state=State.RUNNING,
+                    session=session,
+                )
+                dag_run.get_task_instance(task_a.task_id, session=session).state = State.FAILED
+        else:
+            executor.mock_task_fail(dag.dag_id, task_a.task_id, DEFAULT_DATE)
+        job = BackfillJob(dag=dag, executor=executor, start_date=DEFAULT_DATE, end_date=DEFAULT_DATE)
+        with pytest.raises(BackfillUnfinished) as ctx:
+            job.run()
+        assert 'deadlocked' not in str(ctx.value)
+
+        dag_run = dag.get_dagrun(execution_date=DEFAULT_DATE)
+        states = {ti.task_id: ti.state for ti in dag_run.get_task_instances()}
+        assert states == {'a': State.FAILED, 'u': State.UPSTREAM_FAILED, 'd': State.UPSTREAM_FAILED}
+
+    def test_backfill_resume(self):
+        dag = DAG(dag_id='test_backfill_resume', start_date=DEFAULT_DATE, schedule_interval='@daily')
+        with dag:
+            DummyOperator(task_id='op')
+        dag.clear()
+
+        # An interrupted backfill succeeded the first day, and left the task of the second day running
+        with create_session() as session:
+            for day, state in enumerate([State.SUCCESS, State.RUNNING]):
+                dag_run = dag.create_dagrun(
+                    run_type=DagRunType.BACKFILL_JOB,
+                    execution_date=DEFAULT_DATE + datetime.timedelta(days=day),
+                    state=state,
+                    session=session,
+                )
+                for ti in dag_run.get_task_instances(session=session):
+                    ti.state = state
+                    session.merge(ti)
+
+        executor = MockExecutor()
+        job = BackfillJob(
+            dag=dag,
+            executor=executor,
+            start_date=DEFAULT_DATE,
+            end_date=DEFAULT_DATE + datetime.timedelta(days=2),
+            resume=True,
+        )
+        job.run()
+
+        assert [key.execution_date for key, _ in executor.sorted_tasks] == [
+            DEFAULT_DATE + datetime.timedelta(days=1),
+            DEFAULT_DATE + datetime.timedelta(days=2),
+        ]
+        with create_session() as session:
+            dag_runs = session.query(DagRun).filter(DagRun.dag_id == dag.dag_id).all()
+            assert {dag_run.state for dag_run in dag_runs} == {State.SUCCESS}
+            assert len(dag_runs) == 3
+
+    def test_backfill_locks_task_instances_to_examine(self):
+        dag = DAG(dag_id='test_backfill_locks_task_instances', start_date=DEFAULT_DATE)
+        with dag:
+            DummyOperator(task_id='op')
+        dag.clear()
+
+        job = BackfillJob(dag=dag, executor=MockExecutor(), start_date=DEFAULT_DATE, end_date=DEFAULT_DATE)
+        with patch('airflow.jobs.backfill_job.with_row_locks', wraps=with_row_locks) as mock_locks:
+            job.run()
+
+        assert mock_locks.call_count > 0
+        for call in mock_locks.call_args_list:
+            assert call.kwargs['of'] is TI
@@ -374,6 +374,49 @@ class TestDagFileProcessor(unittest.TestCase):
         dag_file_processor = DagFileProcessor(dag_ids=[], log=mock_log)
         dag_file_processor.manage_slas(dag=dag, session=session)
 
+    @freeze_time(DEFAULT_DATE + datetime.timedelta(hours=5, minutes=15))
+    def test_dag_file_processor_sla_miss_recorded_since_latest_success(self):
+        """
+        Test that the dag file processor records a single SLA miss for every run
+        of every task whose deadline passed since its latest success
+        """
+        session = settings.Session()
+
+        test_start_date = DEFAULT_DATE
+        dag = DAG(dag_id='test_sla_miss', start_date=test_start_date, schedule_interval='@hourly')
+        late = DummyOperator(task_id='late', dag=dag, sla=datetime.timedelta(minutes=30))
+        lenient = DummyOperator(task_id='lenient', dag=dag, sla=datetime.timedelta(hours=2))
+        DummyOperator(task_id='no_sla', dag=dag)
+
+        session.merge(TaskInstance(task=late, execution_date=test_start_date, state=State.SUCCESS))
+        session.merge(
+            TaskInstance(
+                task=lenient,
+                execution_date=test_start_date + datetime.timedelta(hours=1),
+                state=State.SKIPPED,
+            )
+        )
+        # Already recorded, it is not inserted again
+        session.merge(
+            SlaMiss(
+                task_id='late',
+                dag_id='test_sla_miss',
+                execution_date=test_start_date + datetime.timedelta(hours=1),
+                notification_sent=True,
+            )
+        )
+        session.commit()
+
+        dag_file_processor = DagFileProcessor(dag_ids=[], log=mock.MagicMock())
+        dag_file_processor.manage_slas(dag=dag, session=session)
+
+        sla_misses = session.query(SlaMiss.task_id, SlaMiss.execution_date).order_by(
+            SlaMiss.task_id, SlaMiss.execution_date
+        )
+        assert [(task_id, execution_date - test_start_date) for task_id, execution_date in sla_misses] == [
+            ('late', datetime.timedelta(hours=hours)) for hours in range(1, 4)
+        ] + [('lenient', datetime.timedelta(hours=2))]
+
     @parameterized.expand(
         [
             [State.NONE, None, None],
@@ -3714,6 +3757,53 @@ class TestSchedulerJob(unittest.TestCase):
 
         assert dag.get_last_dagrun().creating_job_id == self.scheduler_job.id
 
+    @freeze_time(DEFAULT_DATE + datetime.timedelta(days=1, seconds=9))
+    def test_create_dag_runs_of_many_dags(self):
+        """
+        Test that _create_dag_runs creates the runs of all the DAGs and their task instances
+        at once, and skips the runs that already exist
+        """
+        dagbag = DagBag(
+            dag_folder=os.devnull,
+            include_examples=False,
+            read_dags_from_db=True,
+        )
+        for num in range(3):
+            dag = DAG(dag_id=f'test_create_dag_runs_{num}', start_date=DEFAULT_DATE)
+            for task_num in range(num + 1):
+                DummyOperator(task_id=f'dummy_{task_num}', dag=dag)
+            dagbag.bag_dag(dag=dag, root_dag=dag)
+        dagbag.sync_to_db()
+        dagbag.get_dag('test_create_dag_runs_0').create_dagrun(
+            run_type=DagRunType.SCHEDULED, execution_date=DEFAULT_DATE, state=State.RUNNING
+        )
+
+        self.scheduler_job = SchedulerJob(executor=self.null_exec)
+        self.scheduler_job.processor_agent = mock.MagicMock()
+
+        with create_session() as session:
+            dag_models = session.query(DagModel).order_by(DagModel.dag_id).all()
+            self.scheduler_job._create_dag_runs(dag_models, session)
+
+        with create_session() as session:
+            dag_runs = session.query(DagRun).order_by(DagRun.dag_id).all()
+            assert [(dr.dag_id, dr.execution_date, dr.creating_job_id) for dr in dag_runs] == [
+                ('test_create_dag_runs_0', DEFAULT_DATE, None),
+                ('test_create_dag_runs_1', DEFAULT_DATE, self.scheduler_job.id),
+                ('test_create_dag_runs_2', DEFAULT_DATE, self.scheduler_job.id),
+            ]
+            tis_per_dag = dict(
+                session.query(TaskInstance.dag_id, func.count()).group_by(TaskInstance.dag_id).all()
+            )
+            assert tis_per_dag == {
+                'test_create_dag_runs_0': 1,
+                'test_create_dag_runs_1': 2,
+                'test_create_dag_runs_2': 3,
+            }
+            assert [dm.next_dagrun for dm in session.query(DagModel).order_by(DagModel.dag_id)] == [
+                DEFAULT_DATE + datetime.timedelta(days=1)
+            ] * 3
+
     def test_extra_operator_links_not_loaded_in_scheduler_loop(self):
         """
         Test that Operator links are not loaded inside the Scheduling Loop (that does not include
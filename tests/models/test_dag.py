@@ -1009,6 +1009,43 @@ class TestDag(unittest.TestCase):
         # Copied DAG should not include unused task IDs in used_group_ids
         assert 't3' not in sub_dag._task_group.used_group_ids
 
+    def test_partial_subset_shares_operator_attributes(self):
+        with DAG("test_dag", start_date=DEFAULT_DATE) as dag:
+            op1 = DummyOperator(task_id='t1', params={'key': 'value'})
+            op2 = DummyOperator(task_id='t2')
+            op3 = DummyOperator(task_id='t3')
+            op4 = DummyOperator(task_id='t4')
+            op1 >> op2 >> op3
+            op1 >> op4
+
+        sub_dag = dag.partial_subset('t2', include_upstream=True, include_downstream=True)
+
+        assert set(sub_dag.task_dict) == {'t1', 't2', 't3'}
+        assert sub_dag.partial
+        sub_op1 = sub_dag.task_dict['t1']
+        assert sub_op1 is not op1
+        assert sub_op1.params is op1.params
+        assert sub_op1.dag is sub_dag
+        assert sub_op1.downstream_task_ids == {'t2'}
+        # The original DAG is left untouched
+        assert op1.dag is dag
+        assert op1.downstream_task_ids == {'t2', 't4'}
+        assert op1.get_flat_relative_ids() == {'t2', 't3', 't4'}
+        assert sub_op1.get_flat_relative_ids() == {'t2', 't3'}
+
+    def test_partial_subset_direct_upstream(self):
+        with DAG("test_dag", start_date=DEFAULT_DATE) as dag:
+            op1 = DummyOperator(task_id='t1')
+            op2 = DummyOperator(task_id='t2')
+            op3 = DummyOperator(task_id='t3')
+            op1 >> op2 >> op3
+
+        sub_dag = dag.partial_subset(
+            ['t3'], include_upstream=False, include_downstream=False, include_direct_upstream=True
+        )
+
+        assert set(sub_dag.task_dict) == {'t2', 't3'}
+
     def test_schedule_dag_no_previous_runs(self):
         """
         Tests scheduling a dag with no previous runs
@@ -35,10 +35,12 @@ from airflow.stats import Stats
 from airflow.utils import timezone
 from airflow.utils.callback_requests import DagCallbackRequest
 from airflow.utils.dates import days_ago
+from airflow.utils.sqlalchemy import bakery
 from airflow.utils.state import State
 from airflow.utils.trigger_rule import TriggerRule
 from airflow.utils.types import DagRunType
 from tests.models import DEFAULT_DATE
+from tests.test_utils.asserts import assert_queries_count
 from tests.test_utils.db import clear_db_jobs, clear_db_pools, clear_db_runs
 
 
@@ -591,6 +593,40 @@ class TestDagRun(unittest.TestCase):
         flaky_ti.refresh_from_db()
         assert State.NONE == flaky_ti.state
 
+    def test_verify_integrity_in_bulk(self):
+        dag = DAG('test_verify_integrity_in_bulk', start_date=DEFAULT_DATE)
+        dag.add_task(DummyOperator(task_id='removed_task', owner='test'))
+        dag.add_task(DummyOperator(task_id='kept_task', owner='test'))
+        dagrun = self.create_dag_run(dag, state=State.SUCCESS)
+
+        dagrun.dag = DAG(dag_id=dag.dag_id, start_date=dag.start_date)
+        for task_id in ['kept_task'] + [f'new_task_{num}' for num in range(20)]:
+            dagrun.dag.add_task(DummyOperator(task_id=task_id, owner='test'))
+
+        session = settings.Session()
+        # Loading the task instances, updating the removed one and inserting all the new ones
+        with assert_queries_count(3):
+            dagrun.verify_integrity(session=session)
+        session.commit()
+
+        states = {ti.task_id: ti.state for ti in dagrun.get_task_instances(session=session)}
+        assert len(states) == 22
+        assert states.pop('removed_task') == State.REMOVED
+        assert set(states.values()) == {State.NONE}
+
+    def test_task_instance_rows_without_mutation_hook(self):
+        dag = DAG('test_task_instance_rows', start_date=DEFAULT_DATE)
+        dag.add_task(DummyOperator(task_id='first', owner='test', queue='queue1', pool_slots=2, retries=3))
+        dag.add_task(BashOperator(task_id='second', bash_command='echo', executor_config={'key': 'value'}))
+        dag.get_task('first') >> dag.get_task('second')
+
+        rows = DagRun._task_instance_rows(dag.tasks, DEFAULT_DATE)
+        # Any hook makes the task instances be created as ORM objects
+        with mock.patch('airflow.settings.task_instance_mutation_hook'):
+            expected = DagRun._task_instance_rows(dag.tasks, DEFAULT_DATE)
+
+        assert rows == expected
+
     def test_already_added_task_instances_can_be_ignored(self):
         dag = DAG('triggered_dag', start_date=DEFAULT_DATE)
         dag.add_task(DummyOperator(task_id='first_task', owner='test'))
@@ -636,6 +672,49 @@ class TestDagRun(unittest.TestCase):
         task = dagrun.get_task_instances()[0]
         assert task.queue == 'queue1'
 
+    @mock.patch('airflow.settings.task_instance_mutation_hook')
+    def test_create_task_instances(self, mock_hook):
+        def mutate_task_instance(task_instance):
+            task_instance.queue = f'queue_{task_instance.dag_id}'
+
+        mock_hook.side_effect = mutate_task_instance
+
+        dags = []
+        for num in range(2):
+            dag = DAG(f'test_create_task_instances_{num}', start_date=DEFAULT_DATE)
+            DummyOperator(task_id='first', dag=dag)
+            DummyOperator(task_id='second', dag=dag)
+            # Not created, the run is before its start date
+            DummyOperator(task_id='later', dag=dag, start_date=DEFAULT_DATE + datetime.timedelta(days=1))
+            dags.append(dag)
+
+        session = settings.Session()
+        dag_runs = []
+        for dag in dags:
+            dag_run = DagRun(
+                dag_id=dag.dag_id,
+                run_id='test_create_task_instances',
+                execution_date=DEFAULT_DATE,
+                state=State.RUNNING,
+                run_type=DagRunType.SCHEDULED,
+            )
+            dag_run.dag = dag
+            dag_runs.append(dag_run)
+        session.add_all(dag_runs)
+        session.flush()
+
+        assert DagRun.create_task_instances(dag_runs, session) == 4
+        session.commit()
+
+        for dag, dag_run in zip(dags, dag_runs):
+            tis = dag_run.get_task_instances(session=session)
+            assert sorted(ti.task_id for ti in tis) == ['first', 'second']
+            for ti in tis:
+                assert ti.state == State.NONE
+                assert ti.try_number == 1
+                assert ti.queue == f'queue_{dag.dag_id}'
+                assert ti.operator == 'DummyOperator'
+
     @parameterized.expand(
         [
             (State.SUCCESS, True),
@@ -731,6 +810,35 @@ class TestDagRun(unittest.TestCase):
         session.rollback()
         session.close()
 
+    def test_next_dagruns_to_examine_bound_limit(self):
+        """
+        Check that the number of runs to examine limits the runs without baking another query
+        """
+        dag = DAG(dag_id='test_dags_limit', start_date=DEFAULT_DATE, schedule_interval='@daily')
+        DummyOperator(task_id='dummy', dag=dag, owner='airflow')
+
+        session = settings.Session()
+        session.add(DagModel(dag_id=dag.dag_id, has_task_concurrency_limits=False, is_active=True))
+        for day in range(3):
+            dag.create_dagrun(
+                run_type=DagRunType.SCHEDULED,
+                state=State.RUNNING,
+                execution_date=DEFAULT_DATE + datetime.timedelta(days=day),
+                start_date=DEFAULT_DATE,
+                session=session,
+            )
+        session.flush()
+        DagRun.next_dagruns_to_examine(session, max_number=1).all()
+        baked_queries = len(bakery.cache)
+
+        for max_number in range(1, 5):
+            runs = DagRun.next_dagruns_to_examine(session, max_number=max_number).all()
+            assert len(runs) == min(max_number, 3)
+        assert len(bakery.cache) == baked_queries
+
+        session.rollback()
+        session.close()
+
     @mock.patch.object(Stats, 'timing')
     def test_no_scheduling_delay_for_nonscheduled_runs(self, stats_mock):
         """
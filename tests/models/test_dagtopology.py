@@ -0,0 +1,115 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import pytest
+
+from airflow.models.dag import DAG
+from airflow.models.dagtopology import DagTopology
+from airflow.operators.dummy import DummyOperator
+from airflow.utils import timezone
+from airflow.utils.weight_rule import WeightRule
+
+DEFAULT_DATE = timezone.datetime(2016, 1, 1)
+
+
+@pytest.fixture
+def dag():
+    """t1 >> [t2, t3] >> t4, t5 has no dependencies."""
+    with DAG("test_dag_topology", start_date=DEFAULT_DATE) as dag:
+        t1, t2, t3, t4, _ = (DummyOperator(task_id=f"t{i}") for i in range(1, 6))
+        t1 >> [t2, t3] >> t4
+    return dag
+
+
+class TestDagTopology:
+    def test_closures(self, dag):
+        topology = dag.topology
+
+        assert topology.get_flat_relative_ids(["t1"]) == {"t2", "t3", "t4"}
+        assert topology.get_flat_relative_ids(["t4"], upstream=True) == {"t1", "t2", "t3"}
+        assert topology.get_flat_relative_ids(["t2", "t3"]) == {"t4"}
+        assert topology.get_flat_relative_ids(["t5"]) == set()
+        assert topology.task_ids.index("t1") < topology.task_ids.index("t2") < topology.task_ids.index("t4")
+
+    def test_matches_recursive_lookup(self, dag):
+        for task in dag.tasks:
+            for upstream in (True, False):
+                expected = task.get_flat_relative_ids(upstream, found_descendants={task.task_id})
+                expected.discard(task.task_id)
+                assert task.get_flat_relative_ids(upstream) == expected
+
+    def test_build_returns_none_for_cycles(self, dag):
+        dag.task_dict["t4"]._downstream_task_ids.add("t1")
+        dag.task_dict["t1"]._upstream_task_ids.add("t4")
+
+        assert DagTopology.build(dag.task_dict) is None
+
+    def test_invalidated_by_new_dependencies(self, dag):
+        assert dag.topology.get_flat_relative_ids(["t4"]) == set()
+
+        dag.task_dict["t4"] >> dag.task_dict["t5"]
+
+        assert dag.topology.get_flat_relative_ids(["t4"]) == {"t5"}
+        assert dag.task_dict["t1"].get_flat_relative_ids() == {"t2", "t3", "t4", "t5"}
+
+    def test_invalidated_by_new_tasks(self, dag):
+        assert "t6" not in dag.topology.positions
+
+        t6 = DummyOperator(task_id="t6", dag=dag)
+
+        assert "t6" in dag.topology.positions
+        assert t6.get_flat_relative_ids(upstream=True) == set()
+
+    def test_roots_leaves_and_depth(self, dag):
+        topology = dag.topology
+
+        assert topology.root_ids == ["t1", "t5"]
+        assert topology.leaf_ids == ["t4", "t5"]
+        assert [t.task_id for t in dag.roots] == ["t1", "t5"]
+        assert [t.task_id for t in dag.leaves] == ["t4", "t5"]
+        assert [topology.get_depth(f"t{i}") for i in range(1, 6)] == [0, 1, 1, 2, 0]
+
+    def test_topological_sort(self, dag):
+        order = [t.task_id for t in dag.topological_sort()]
+
+        assert sorted(order) == ["t1", "t2", "t3", "t4", "t5"]
+        assert order.index("t1") < order.index("t2") < order.index("t4")
+        assert order.index("t1") < order.index("t3") < order.index("t4")
+
+    @pytest.mark.parametrize(
+        "weight_rule, expected",
+        [
+            (WeightRule.DOWNSTREAM, {"t1": 1 + 2 + 3 + 4, "t2": 2 + 4, "t4": 4, "t5": 5}),
+            (WeightRule.UPSTREAM, {"t1": 1, "t2": 2 + 1, "t4": 4 + 3 + 2 + 1, "t5": 5}),
+            (WeightRule.ABSOLUTE, {"t1": 1, "t2": 2, "t4": 4, "t5": 5}),
+        ],
+    )
+    def test_priority_weight_total(self, dag, weight_rule, expected):
+        for i, task in enumerate(dag.tasks, start=1):
+            task.priority_weight = i
+            task.weight_rule = weight_rule
+
+        for task_id, total in expected.items():
+            assert dag.task_dict[task_id].priority_weight_total == total
+
+    def test_invalidated_by_priority_weight(self, dag):
+        assert dag.task_dict["t1"].priority_weight_total == 4
+
+        dag.task_dict["t4"].priority_weight = 10
+
+        assert dag.task_dict["t1"].priority_weight_total == 13
@@ -172,18 +172,45 @@ class TestRenderedTaskInstanceFields(unittest.TestCase):
         assert rtif_num == len(result)
 
         # Verify old records are deleted and only 'num_to_keep' records are kept
-        # For other DBs,an extra query is fired in RenderedTaskInstanceFields.delete_old_records
-        expected_query_count_based_on_db = (
-            expected_query_count + 1
-            if session.bind.dialect.name == "mssql" and expected_query_count != 0
-            else expected_query_count
-        )
-
-        with assert_queries_count(expected_query_count_based_on_db):
+        with assert_queries_count(expected_query_count):
             RTIF.delete_old_records(task_id=task.task_id, dag_id=task.dag_id, num_to_keep=num_to_keep)
         result = session.query(RTIF).filter(RTIF.dag_id == dag.dag_id, RTIF.task_id == task.task_id).all()
         assert remaining_rtifs == len(result)
 
+    def test_prune(self):
+        """
+        Test that old records of all tasks with too many records are deleted at once.
+        """
+        dag = DAG("test_prune", start_date=START_DATE)
+        with dag:
+            tasks = [BashOperator(task_id=f"test_{num}", bash_command="echo {{ ds }}") for num in range(3)]
+
+        rtif_list = [
+            RTIF(TI(task=task, execution_date=EXECUTION_DATE + timedelta(days=num)))
+            for num_records, task in zip((1, 3, 5), tasks)
+            for num in range(num_records)
+        ]
+        with create_session() as session:
+            session.add_all(rtif_list)
+
+        with create_session() as session:
+            assert RTIF.prune(num_to_keep=2, session=session) == 2
+
+            remaining = {
+                task.task_id: [
+                    execution_date
+                    for (execution_date,) in session.query(RTIF.execution_date)
+                    .filter(RTIF.dag_id == dag.dag_id, RTIF.task_id == task.task_id)
+                    .order_by(RTIF.execution_date)
+                ]
+                for task in tasks
+            }
+        assert remaining == {
+            "test_0": [EXECUTION_DATE],
+            "test_1": [EXECUTION_DATE + timedelta(days=1), EXECUTION_DATE + timedelta(days=2)],
+            "test_2": [EXECUTION_DATE + timedelta(days=3), EXECUTION_DATE + timedelta(days=4)],
+        }
+
     def test_write(self):
         """
         Test records can be written and overwritten
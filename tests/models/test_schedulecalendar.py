@@ -0,0 +1,129 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pendulum
+import pytest
+from croniter import croniter
+from dateutil.relativedelta import relativedelta
+
+from airflow.models.dag import DAG
+from airflow.models.schedulecalendar import ScheduleCalendar
+from airflow.utils import timezone
+
+START_DATE = timezone.datetime(2021, 3, 20)
+# Across the daylight saving time changes of March 2021 in Europe and the United States
+END_DATE = timezone.datetime(2021, 4, 5)
+
+SCHEDULES = [
+    pytest.param("*/30 * * * *", pendulum.timezone("UTC"), id="relative-cron"),
+    pytest.param("0 3 * * *", pendulum.timezone("UTC"), id="fixed-cron"),
+    pytest.param("*/30 * * * *", pendulum.timezone("Europe/Amsterdam"), id="relative-cron-dst"),
+    pytest.param("30 2 * * *", pendulum.timezone("Europe/Amsterdam"), id="fixed-cron-dst"),
+    pytest.param("0 */6 * * *", pendulum.timezone("America/New_York"), id="hourly-cron-dst"),
+    pytest.param("*/5 * * * *", pendulum.tz.fixed_timezone(5 * 3600), id="relative-cron-fixed-offset"),
+    pytest.param("0 */6 * * *", pendulum.tz.fixed_timezone(-12600), id="hourly-cron-fixed-offset"),
+    pytest.param(timedelta(minutes=45), pendulum.timezone("UTC"), id="timedelta"),
+    pytest.param(timedelta(days=1), pendulum.timezone("Europe/Amsterdam"), id="timedelta-dst"),
+    pytest.param(relativedelta(days=3), pendulum.timezone("UTC"), id="relativedelta"),
+]
+
+
+def following_per_call(schedule_interval, tz, dttm):
+    """The following schedule date as DAG.following_schedule computed it before the calendar"""
+    if isinstance(schedule_interval, str):
+        dttm = pendulum.instance(dttm)
+        naive = timezone.make_naive(dttm, tz)
+        cron = croniter(schedule_interval, naive)
+        fixed_cron = croniter(schedule_interval, datetime.now())
+        start = fixed_cron.get_next(datetime)
+        cron_next = fixed_cron.get_next(datetime)
+        if not (cron_next.minute == start.minute and cron_next.hour == start.hour):
+            delta = cron.get_next(datetime) - naive
+            following = dttm.in_timezone(tz) + delta
+        else:
+            naive = cron.get_next(datetime)
+            following = timezone.make_aware(naive, pendulum.timezone(tz.name))
+        return timezone.convert_to_utc(following)
+    return timezone.convert_to_utc(dttm + schedule_interval)
+
+
+def dates_per_call(schedule_interval, tz, first, end):
+    """Dates as DAG.get_run_dates computed them before the calendar, one call at a time"""
+    dates = []
+    dttm = first
+    while dttm <= end:
+        dates.append(dttm)
+        dttm = following_per_call(schedule_interval, tz, dttm)
+    return dates
+
+
+class TestScheduleCalendar:
+    @pytest.mark.parametrize("schedule_interval, tz", SCHEDULES)
+    def test_dates_match_dates_computed_per_call(self, schedule_interval, tz):
+        calendar = ScheduleCalendar(schedule_interval, tz)
+        first = calendar.following(START_DATE)
+        assert first == following_per_call(schedule_interval, tz, START_DATE)
+
+        dates = calendar.dates(first, end=END_DATE)
+
+        assert dates == dates_per_call(schedule_interval, tz, first, END_DATE)
+        assert calendar.dates(first, num=5) == dates[:5]
+        # The kept dates give the same answers
+        assert [calendar.following(dttm) for dttm in dates[:-1]] == dates[1:]
+
+    @pytest.mark.parametrize("schedule_interval, tz", SCHEDULES)
+    def test_previous_inverts_following(self, schedule_interval, tz):
+        calendar = ScheduleCalendar(schedule_interval, tz)
+        first = calendar.following(START_DATE)
+
+        assert calendar.previous(calendar.following(first)) == first
+
+    def test_following_extends_kept_dates(self):
+        calendar = ScheduleCalendar("0 * * * *", timezone.utc)
+        dttm = START_DATE
+
+        with mock.patch.object(calendar, "_following", wraps=calendar._following) as following:
+            for _ in range(3):
+                dttm = calendar.following(dttm)
+            # Asked again, the dates are found among the kept ones
+            dttm = START_DATE
+            for _ in range(3):
+                dttm = calendar.following(dttm)
+
+        assert following.call_count == 3
+        assert dttm == START_DATE + timedelta(hours=3)
+
+    def test_no_schedule_interval(self):
+        calendar = ScheduleCalendar(None, timezone.utc)
+
+        assert calendar.following(START_DATE) is None
+        assert calendar.previous(START_DATE) is None
+        assert calendar.dates(START_DATE, end=END_DATE) == [START_DATE]
+
+    def test_dag_rebuilds_calendar_when_schedule_changes(self):
+        dag = DAG("test_schedule_calendar", start_date=START_DATE, schedule_interval="@daily")
+        calendar = dag.schedule_calendar
+        assert dag.schedule_calendar is calendar
+        assert dag.following_schedule(START_DATE) == START_DATE + timedelta(days=1)
+
+        dag.schedule_interval = "@hourly"
+
+        assert dag.schedule_calendar is not calendar
+        assert dag.following_schedule(START_DATE) == START_DATE + timedelta(hours=1)
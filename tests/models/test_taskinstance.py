@@ -1051,6 +1051,52 @@ class TestTaskInstance(unittest.TestCase):
         result = ti1.xcom_pull(task_ids=['test_xcom_1', 'test_xcom_2'], key='foo')
         assert result == ['bar', 'baz']
 
+    def test_xcom_pull_uses_prefetched_xcom_args(self):
+        dag = models.DAG(dag_id='test_xcom_prefetch', start_date=DEFAULT_DATE)
+        upstream = [DummyOperator(task_id=f'upstream_{i}', dag=dag) for i in range(3)]
+        task = PythonOperator(
+            task_id='downstream',
+            dag=dag,
+            python_callable=lambda *args: None,
+            op_args=[op.output for op in upstream],
+        )
+        for op in upstream:
+            TI(task=op, execution_date=DEFAULT_DATE).xcom_push(key=models.XCOM_RETURN_KEY, value=op.task_id)
+
+        ti = TI(task=task, execution_date=DEFAULT_DATE)
+        with assert_queries_count(1):
+            ti.prefetch_xcom_args()
+        with assert_queries_count(0):
+            assert ti.xcom_pull(task_ids=['upstream_0', 'upstream_2']) == ['upstream_0', 'upstream_2']
+            assert ti.xcom_pull(task_ids='upstream_1') == 'upstream_1'
+
+        # Values that were not prefetched still come from the database
+        assert ti.xcom_pull(task_ids='upstream_1', key='missing') is None
+
+    def test_xcom_pull_own_xcom_after_prefetch(self):
+        dag = models.DAG(dag_id='test_xcom_prefetch_own', start_date=DEFAULT_DATE)
+        upstream = DummyOperator(task_id='upstream', dag=dag)
+        task = PythonOperator(
+            task_id='downstream',
+            dag=dag,
+            python_callable=lambda *args: None,
+            op_args=[upstream.output],
+        )
+        TI(task=upstream, execution_date=DEFAULT_DATE).xcom_push(key=models.XCOM_RETURN_KEY, value=1)
+
+        ti = TI(task=task, execution_date=DEFAULT_DATE)
+        ti.prefetch_xcom_args()
+        pulled = []
+        for progress in (1, 2):
+            ti.xcom_push(key='progress', value=progress)
+            pulled.append(ti.xcom_pull(task_ids='downstream', key='progress'))
+        ti.clear_xcom_data()
+
+        # The XComs the task pushes itself are never served from the prefetched values
+        assert pulled == [1, 2]
+        assert ti.xcom_pull(task_ids='downstream', key='progress') is None
+        assert ti.xcom_pull(task_ids='upstream') == 1
+
     def test_xcom_pull_after_success(self):
         """
         tests xcom set/clear relative to a task in a 'success' rerun scenario
@@ -2085,7 +2131,7 @@ class TestRunRawTaskQueriesCount(unittest.TestCase):
     @parameterized.expand(
         [
             # Expected queries, mark_success
-            (12, False),
+            (11, False),
             (7, True),
         ]
     )
@@ -2103,15 +2149,7 @@ class TestRunRawTaskQueriesCount(unittest.TestCase):
                 run_type=DagRunType.SCHEDULED,
                 session=session,
             )
-        # an extra query is fired in RenderedTaskInstanceFields.delete_old_records
-        # for other DBs. delete_old_records is called only when mark_success is False
-        expected_query_count_based_on_db = (
-            expected_query_count + 1
-            if session.bind.dialect.name == "mssql" and expected_query_count > 0 and not mark_success
-            else expected_query_count
-        )
-
-        with assert_queries_count(expected_query_count_based_on_db):
+        with assert_queries_count(expected_query_count):
             ti._run_raw_task(mark_success=mark_success)
 
     def test_execute_queries_count_store_serialized(self):
@@ -2128,11 +2166,7 @@ class TestRunRawTaskQueriesCount(unittest.TestCase):
                 run_type=DagRunType.SCHEDULED,
                 session=session,
             )
-        # an extra query is fired in RenderedTaskInstanceFields.delete_old_records
-        # for other DBs
-        expected_query_count_based_on_db = 13 if session.bind.dialect.name == "mssql" else 12
-
-        with assert_queries_count(expected_query_count_based_on_db):
+        with assert_queries_count(11):
             ti._run_raw_task()
 
     def test_operator_field_with_serialization(self):
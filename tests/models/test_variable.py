@@ -26,6 +26,8 @@ from parameterized import parameterized
 
 from airflow import settings
 from airflow.models import Variable, crypto, variable
+from airflow.secrets.cache import reset_secret_caches
+from airflow.utils.session import create_session
 from tests.test_utils import db
 from tests.test_utils.config import conf_vars
 
@@ -41,6 +43,7 @@ class TestVariable(unittest.TestCase):
 
     def tearDown(self):
         crypto._fernet = None
+        reset_secret_caches()
 
     @classmethod
     def tearDownClass(cls):
@@ -128,6 +131,19 @@ class TestVariable(unittest.TestCase):
         Variable.set(test_key, '')
         assert '' == Variable.get('test_key')
 
+    @conf_vars({('secrets', 'use_cache'): 'True'})
+    def test_variable_set_many(self):
+        reset_secret_caches()
+        Variable.set("existing_key", "old value")
+        assert Variable.get("existing_key") == "old value"
+
+        Variable.set_many({"existing_key": {"a": 1}, "new_key": [1, 2]}, serialize_json=True)
+
+        assert Variable.get("existing_key", deserialize_json=True) == {"a": 1}
+        assert Variable.get("new_key", deserialize_json=True) == [1, 2]
+        with create_session() as session:
+            assert session.query(Variable).count() == 2
+
     def test_get_non_existing_var_should_return_default(self):
         default_value = "some default val"
         assert default_value == Variable.get("thisIdDoesNotExist", default_var=default_value)
@@ -212,3 +228,29 @@ class TestVariable(unittest.TestCase):
             ]
         finally:
             session.rollback()
+
+    @conf_vars({('secrets', 'use_cache'): 'True'})
+    def test_variable_cache(self):
+        reset_secret_caches()
+        Variable.set('cached_key', 'value')
+        with mock.patch(
+            'airflow.secrets.metastore.MetastoreBackend.get_variable',
+            side_effect=lambda key: {'cached_key': 'value'}.get(key),
+        ) as mock_get_variable:
+            assert Variable.get('cached_key') == 'value'
+            assert Variable.get('cached_key') == 'value'
+            assert Variable.get('missing_key', default_var=None) is None
+            assert Variable.get('missing_key', default_var=None) is None
+        assert mock_get_variable.call_count == 2
+
+    @conf_vars({('secrets', 'use_cache'): 'True'})
+    def test_variable_cache_is_invalidated_on_set_and_delete(self):
+        reset_secret_caches()
+        Variable.set('cached_key', 'value')
+        assert Variable.get('cached_key') == 'value'
+
+        Variable.set('cached_key', 'new_value')
+        assert Variable.get('cached_key') == 'new_value'
+
+        Variable.delete('cached_key')
+        assert Variable.get('cached_key', default_var=None) is None
@@ -15,6 +15,7 @@
 # specific language governing permissions and limitations
 # under the License.
 import os
+import tempfile
 import unittest
 from unittest import mock
 
@@ -22,9 +23,11 @@ import pytest
 
 from airflow import settings
 from airflow.configuration import conf
-from airflow.models.xcom import BaseXCom, XCom, resolve_xcom_backend
+from airflow.models.xcom import BaseXCom, ObjectStorageXCom, XCom, XComPrefetch, resolve_xcom_backend
 from airflow.utils import timezone
+from airflow.utils.session import create_session
 from tests.test_utils import db
+from tests.test_utils.asserts import assert_queries_count
 from tests.test_utils.config import conf_vars
 
 
@@ -259,3 +262,162 @@ class TestXCom(unittest.TestCase):
         # pylint: enable=unexpected-keyword-arg
         instance.init_on_load()
         mock_orm_deserialize.assert_called_once_with()
+
+
+class TestXComPrefetch(unittest.TestCase):
+    def setUp(self) -> None:
+        db.clear_db_xcom()
+
+    def tearDown(self) -> None:
+        db.clear_db_xcom()
+
+    @conf_vars({("core", "enable_xcom_pickling"): "False"})
+    def test_load_fetches_all_refs_in_one_query(self):
+        execution_date = timezone.utcnow()
+        for i in range(3):
+            XCom.set(
+                key="return_value",
+                value={"i": i},
+                dag_id="test_dag",
+                task_id=f"task_{i}",
+                execution_date=execution_date,
+            )
+        XCom.set(key="other", value=0, dag_id="test_dag", task_id="task_0", execution_date=execution_date)
+
+        prefetch = XComPrefetch("test_dag", execution_date)
+        with assert_queries_count(1):
+            loaded = prefetch.load({(f"task_{i}", "return_value") for i in range(3)})
+
+        assert loaded == 3
+        assert prefetch.get("task_1", "return_value") == {"i": 1}
+        assert prefetch.get("task_0", "other") is XComPrefetch.NOT_FOUND
+        assert prefetch.get("missing", "return_value") is XComPrefetch.NOT_FOUND
+
+    def test_lru_eviction(self):
+        prefetch = XComPrefetch("test_dag", timezone.utcnow(), maxsize=2)
+        prefetch.put("a", "k", 1)
+        prefetch.put("b", "k", 2)
+        assert prefetch.get("a", "k") == 1
+        prefetch.put("c", "k", 3)
+
+        assert len(prefetch) == 2
+        assert prefetch.get("b", "k") is XComPrefetch.NOT_FOUND
+        assert prefetch.get("a", "k") == 1
+        assert prefetch.get("c", "k") == 3
+
+    def test_get_returns_a_copy(self):
+        prefetch = XComPrefetch("test_dag", timezone.utcnow())
+        prefetch.put("a", "k", {"items": [1, 2]})
+
+        pulled = prefetch.get("a", "k")
+        pulled["items"].append(3)
+
+        assert prefetch.get("a", "k") == {"items": [1, 2]}
+        assert prefetch.get("a", "k") is not prefetch.get("a", "k")
+
+    def test_discard(self):
+        prefetch = XComPrefetch("test_dag", timezone.utcnow())
+        for task_id in ("a", "b"):
+            for key in ("k", "l"):
+                prefetch.put(task_id, key, 1)
+
+        prefetch.discard("a", "k")
+        assert prefetch.get("a", "k") is XComPrefetch.NOT_FOUND
+        assert prefetch.get("a", "l") == 1
+        prefetch.discard("b")
+        assert len(prefetch) == 1
+
+    def test_zero_size_disables_cache(self):
+        prefetch = XComPrefetch("test_dag", timezone.utcnow(), maxsize=0)
+        prefetch.put("a", "k", 1)
+        assert prefetch.get("a", "k") is XComPrefetch.NOT_FOUND
+
+
+class TestObjectStorageXCom(unittest.TestCase):
+    def setUp(self) -> None:
+        self.storage_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.storage_dir.cleanup)
+
+    def _conf(self, threshold):
+        return conf_vars(
+            {
+                ("core", "xcom_storage_path"): self.storage_dir.name,
+                ("core", "xcom_storage_threshold"): str(threshold),
+                ("core", "enable_xcom_pickling"): "False",
+            }
+        )
+
+    def test_small_values_are_stored_inline(self):
+        with self._conf(threshold=1024):
+            serialized = ObjectStorageXCom.serialize_value({"a": 1})
+            assert serialized == b'{"a": 1}'
+            assert ObjectStorageXCom.deserialize_value(mock.MagicMock(value=serialized)) == {"a": 1}
+        assert os.listdir(self.storage_dir.name) == []
+
+    def test_large_values_are_stored_by_reference(self):
+        value = ["x" * 100] * 10
+        with self._conf(threshold=100):
+            serialized = ObjectStorageXCom.serialize_value(value)
+            assert serialized.startswith(ObjectStorageXCom.REFERENCE_PREFIX)
+            assert len(os.listdir(self.storage_dir.name)) == 1
+            assert ObjectStorageXCom.deserialize_value(mock.MagicMock(value=serialized)) == value
+
+    def test_orm_deserialize_value_does_not_read_payload(self):
+        with self._conf(threshold=1):
+            serialized = ObjectStorageXCom.serialize_value("large value")
+        # pylint: disable=unexpected-keyword-arg
+        instance = ObjectStorageXCom(key="key", value=serialized, task_id="task_id", dag_id="dag_id")
+        # pylint: enable=unexpected-keyword-arg
+        with mock.patch.object(ObjectStorageXCom, "_open") as mock_open:
+            rendered = instance.orm_deserialize_value()
+        mock_open.assert_not_called()
+        assert rendered.startswith("<raw value stored at ")
+
+    @mock.patch("airflow.models.xcom.XCom", ObjectStorageXCom)
+    def test_stored_values_are_deleted_with_their_xcom(self):
+        xcom_fields = dict(key="key", execution_date=timezone.utcnow(), task_id="task_id", dag_id="dag_id")
+        self.addCleanup(db.clear_db_xcom)
+        with self._conf(threshold=1):
+            ObjectStorageXCom.set(value="first", **xcom_fields)
+            ObjectStorageXCom.set(value="second", **xcom_fields)
+            # The value of the replaced XCom is deleted
+            assert len(os.listdir(self.storage_dir.name)) == 1
+
+            with create_session() as session:
+                ObjectStorageXCom.delete(session.query(ObjectStorageXCom).one(), session=session)
+
+        assert os.listdir(self.storage_dir.name) == []
+
+    def test_stored_values_are_kept_on_rollback(self):
+        with self._conf(threshold=1):
+            serialized = ObjectStorageXCom.serialize_value("large value")
+        with create_session() as session:
+            # pylint: disable=unexpected-keyword-arg
+            session.add(
+                ObjectStorageXCom(
+                    key="key",
+                    value=serialized,
+                    execution_date=timezone.utcnow(),
+                    task_id="task_id",
+                    dag_id="dag_id",
+                )
+            )
+            # pylint: enable=unexpected-keyword-arg
+            session.flush()
+            query = session.query(ObjectStorageXCom).filter(ObjectStorageXCom.key == "key")
+            ObjectStorageXCom.purge_stored_values(query, session=session)
+            query.delete()
+            session.rollback()
+
+        assert len(os.listdir(self.storage_dir.name)) == 1
+
+    def test_dataframes_are_stored_as_parquet(self):
+        pd = pytest.importorskip("pandas")
+        pytest.importorskip("pyarrow")
+        df = pd.DataFrame({"a": range(100)})
+        with self._conf(threshold=1):
+            serialized = ObjectStorageXCom.serialize_value(df)
+            assert os.listdir(self.storage_dir.name)[0].endswith(".parquet")
+            pd.testing.assert_frame_equal(
+                ObjectStorageXCom.deserialize_value(mock.MagicMock(value=serialized)), df
+            )
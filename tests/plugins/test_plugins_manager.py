@@ -193,6 +193,38 @@ class TestPluginsManager:
             assert 'Failed to import plugin' in received_logs
             assert 'testplugin.py' in received_logs
 
+    def test_loads_only_plugin_files_from_discovery_cache(self, tmp_path):
+        from airflow import plugins_manager
+
+        plugins_folder = tmp_path / "plugins"
+        plugins_folder.mkdir()
+        (plugins_folder / "cached_plugin.py").write_text(
+            "from airflow.plugins_manager import AirflowPlugin\n\n"
+            "class CachedPlugin(AirflowPlugin):\n"
+            "    name = 'cached_plugin'\n"
+        )
+        (plugins_folder / "cached_plugin_helper.py").write_text("VALUE = 1\n")
+
+        def load_plugins():
+            with mock.patch('airflow.plugins_manager.plugins', []), mock.patch(
+                'importlib.machinery.SourceFileLoader', wraps=importlib.machinery.SourceFileLoader
+            ) as loader:
+                plugins_manager.load_plugins_from_plugin_directory()
+                assert [plugin.name for plugin in plugins_manager.plugins] == ['cached_plugin']
+            return sorted(os.path.basename(call.args[1]) for call in loader.call_args_list)
+
+        with conf_vars(
+            {
+                ('core', 'plugins_folder'): str(plugins_folder),
+                ('core', 'discovery_cache_folder'): str(tmp_path / "cache"),
+            }
+        ):
+            assert load_plugins() == ['cached_plugin.py', 'cached_plugin_helper.py']
+            assert load_plugins() == ['cached_plugin.py']
+
+            (plugins_folder / "cached_plugin_helper.py").write_text("VALUE = 12\n")
+            assert load_plugins() == ['cached_plugin.py', 'cached_plugin_helper.py']
+
     def test_should_warning_about_incompatible_plugins(self, caplog):
         class AirflowAdminViewsPlugin(AirflowPlugin):
             name = "test_admin_views_plugin"
@@ -0,0 +1,100 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import unittest
+from unittest import mock
+
+from airflow.secrets.cache import SecretCache, get_secret_cache, reset_secret_caches
+from tests.test_utils.config import conf_vars
+
+
+class TestSecretCache(unittest.TestCase):
+    def test_get_and_set(self):
+        cache = SecretCache("test", ttl_seconds=60, max_size=10)
+        assert cache.get("key") is SecretCache.NOT_CACHED
+        cache.set("key", "value")
+        assert cache.get("key") == "value"
+
+    def test_negative_caching(self):
+        cache = SecretCache("test", ttl_seconds=60, max_size=10)
+        cache.set("key", None)
+        assert cache.get("key") is None
+
+    @mock.patch("airflow.secrets.cache.time.monotonic")
+    def test_entries_expire(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        cache = SecretCache("test", ttl_seconds=60, max_size=10)
+        cache.set("key", "value")
+        mock_monotonic.return_value = 159
+        assert cache.get("key") == "value"
+        mock_monotonic.return_value = 160
+        assert cache.get("key") is SecretCache.NOT_CACHED
+        assert len(cache) == 0
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = SecretCache("test", ttl_seconds=60, max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is SecretCache.NOT_CACHED
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_invalidate(self):
+        cache = SecretCache("test", ttl_seconds=60, max_size=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.invalidate("a")
+        assert cache.get("a") is SecretCache.NOT_CACHED
+        assert cache.get("b") == 2
+        cache.invalidate()
+        assert len(cache) == 0
+
+    @mock.patch("airflow.secrets.cache.Stats")
+    def test_hit_and_miss_metrics(self, mock_stats):
+        cache = SecretCache("test", ttl_seconds=60, max_size=10)
+        cache.get("key")
+        cache.set("key", "value")
+        cache.get("key")
+        mock_stats.incr.assert_has_calls(
+            [mock.call("secrets.cache.test.miss"), mock.call("secrets.cache.test.hit")]
+        )
+
+    def test_disabled_by_default(self):
+        reset_secret_caches()
+        cache = get_secret_cache("variables")
+        cache.set("key", "value")
+        assert not cache.enabled
+        assert cache.get("key") is SecretCache.NOT_CACHED
+
+    @conf_vars(
+        {
+            ("secrets", "use_cache"): "True",
+            ("secrets", "cache_ttl_seconds"): "30",
+            ("secrets", "cache_max_size"): "5",
+        }
+    )
+    def test_get_secret_cache_uses_configuration(self):
+        reset_secret_caches()
+        try:
+            cache = get_secret_cache("variables")
+            assert cache is get_secret_cache("variables")
+            assert cache.ttl_seconds == 30
+            assert cache.max_size == 5
+        finally:
+            reset_secret_caches()
@@ -0,0 +1,149 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Compare the throughput of the bulk REST API endpoints with their single item counterparts.
+
+Requests go through the Flask test client, so the numbers include request parsing, validation,
+permission checks and the database transaction, but no network round trip.
+
+To Run:
+    $ python tests/test_utils/perf/api_bulk_timing.py --num-items 1000 --batch-size 100
+"""
+import time
+from datetime import timedelta
+
+import click
+
+from airflow.models import DagModel, DagRun, Variable
+from airflow.security import permissions
+from airflow.utils import timezone
+from airflow.utils.session import create_session
+from airflow.www import app
+from tests.test_utils.api_connexion_utils import create_user, delete_user
+from tests.test_utils.config import conf_vars
+from tests.test_utils.decorators import dont_initialize_flask_app_submodules
+
+DAG_ID = "perf_api_bulk"
+USERNAME = "perf_api_bulk"
+START_DATE = timezone.datetime(2000, 1, 1)
+
+
+@dont_initialize_flask_app_submodules(
+    skip_all_except=["init_appbuilder", "init_api_experimental_auth", "init_api_connexion"]
+)
+def create_app():
+    """Create an app with only the REST API, authenticating users with the REMOTE_USER variable."""
+    with conf_vars({("api", "auth_backend"): "tests.test_utils.remote_user_api_auth_backend"}):
+        return app.create_app(testing=True)  # type:ignore
+
+
+def reset_db():
+    """Remove everything created by a previous benchmark run."""
+    with create_session() as session:
+        session.query(DagRun).filter(DagRun.dag_id == DAG_ID).delete()
+        session.query(DagModel).filter(DagModel.dag_id == DAG_ID).delete()
+        session.query(Variable).filter(Variable.key.like(f"{DAG_ID}_%")).delete(synchronize_session=False)
+        session.add(DagModel(dag_id=DAG_ID))
+
+
+def timed(label, num_items, func):
+    """Run ``func`` once and print how many items per second it handled."""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed:.4f}s ({num_items / elapsed:,.0f} items/s)")
+
+
+def dag_runs(offset, count):
+    return [
+        {
+            "dag_run_id": f"perf_{offset + i}",
+            "execution_date": (START_DATE + timedelta(minutes=offset + i)).isoformat(),
+        }
+        for i in range(count)
+    ]
+
+
+def variables(offset, count):
+    return [{"key": f"{DAG_ID}_{offset + i}", "value": str(offset + i)} for i in range(count)]
+
+
+@click.command()
+@click.option('--num-items', default=1000, help="Number of DAG runs and variables to create")
+@click.option('--batch-size', default=100, help="Number of items per bulk request")
+def main(num_items, batch_size):
+    """Time creating DAG runs and variables one request at a time and in bulk."""
+    flask_app = create_app()
+    create_user(
+        flask_app,
+        username=USERNAME,
+        role_name="PerfApiBulk",
+        permissions=[
+            (permissions.ACTION_CAN_EDIT, permissions.RESOURCE_DAG),
+            (permissions.ACTION_CAN_CREATE, permissions.RESOURCE_DAG_RUN),
+            (permissions.ACTION_CAN_CREATE, permissions.RESOURCE_VARIABLE),
+        ],
+    )
+    client = flask_app.test_client()
+    environ = {"REMOTE_USER": USERNAME}
+
+    def post(url, json):
+        response = client.post(url, json=json, environ_overrides=environ)
+        assert response.status_code == 200, response.data
+
+    def single(url, make_items):
+        def run():
+            for item in make_items(0, num_items):
+                post(url, item)
+
+        return run
+
+    def bulk(url, field, make_items):
+        def run():
+            for offset in range(0, num_items, batch_size):
+                post(url, {field: make_items(offset, min(batch_size, num_items - offset))})
+
+        return run
+
+    try:
+        with conf_vars({("api", "maximum_page_limit"): str(batch_size)}):
+            reset_db()
+            timed("post_dag_run", num_items, single(f"/api/v1/dags/{DAG_ID}/dagRuns", dag_runs))
+            reset_db()
+            timed(
+                f"post_dag_runs_bulk ({batch_size} per request)",
+                num_items,
+                bulk(f"/api/v1/dags/{DAG_ID}/dagRuns/bulk", "dag_runs", dag_runs),
+            )
+            reset_db()
+            timed("post_variables", num_items, single("/api/v1/variables", variables))
+            reset_db()
+            timed(
+                f"post_variables_bulk ({batch_size} per request)",
+                num_items,
+                bulk("/api/v1/variables/bulk", "variables", variables),
+            )
+    finally:
+        reset_db()
+        with create_session() as session:
+            session.query(DagModel).filter(DagModel.dag_id == DAG_ID).delete()
+        delete_user(flask_app, username=USERNAME)
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,120 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Benchmark the DAG topology index on large generated DAGs.
+
+To Run:
+    $ python tests/test_utils/perf/dag_topology_timing.py --num-tasks 10000 --shape layered
+"""
+import gc
+import statistics
+import time
+
+import click
+
+from airflow.models.dag import DAG
+from airflow.operators.dummy import DummyOperator
+from airflow.utils import timezone
+from airflow.utils.weight_rule import WeightRule
+
+SHAPES = ('chain', 'wide', 'layered')
+
+
+def build_dag(num_tasks, shape, layer_width):
+    """
+    Build a DAG with ``num_tasks`` tasks.
+
+    * ``chain``: every task depends on the previous one
+    * ``wide``: one root fanning out to all other tasks, which fan in to one leaf
+    * ``layered``: layers of ``layer_width`` tasks, each task depending on the whole previous layer
+    """
+    with DAG(f"perf_dag_topology_{shape}", start_date=timezone.datetime(2021, 1, 1)) as dag:
+        tasks = [
+            DummyOperator(task_id=f"task_{i}", priority_weight=i % 3 + 1, weight_rule=WeightRule.DOWNSTREAM)
+            for i in range(num_tasks)
+        ]
+    if shape == 'chain':
+        for upstream, downstream in zip(tasks, tasks[1:]):
+            upstream >> downstream
+    elif shape == 'wide':
+        tasks[0] >> tasks[1:-1] >> tasks[-1]
+    else:
+        layers = [tasks[i : i + layer_width] for i in range(0, num_tasks, layer_width)]
+        for upstream_layer, downstream_layer in zip(layers, layers[1:]):
+            for task in downstream_layer:
+                task.set_upstream(upstream_layer)
+    return dag
+
+
+def timed(label, func, repeat):
+    """Run ``func`` ``repeat`` times with a cold topology index and print its timing."""
+    times = []
+    for _ in range(repeat):
+        gc.disable()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+        gc.enable()
+    if len(times) > 1:
+        print(f"{label:<40} {statistics.mean(times):.4f}s (±{statistics.stdev(times):.4f}s)")
+    else:
+        print(f"{label:<40} {times[0]:.4f}s")
+
+
+@click.command()
+@click.option('--num-tasks', default=10000, help="Number of tasks in the generated DAG")
+@click.option('--shape', type=click.Choice(SHAPES), default='layered', help="Shape of the generated DAG")
+@click.option('--layer-width', default=100, help="Width of each layer for the layered shape")
+@click.option('--repeat', default=3, help="Number of times to run each benchmark")
+def main(num_tasks, shape, layer_width, repeat):
+    """Time building and querying the topology index of a generated DAG."""
+    start = time.perf_counter()
+    dag = build_dag(num_tasks, shape, layer_width)
+    print(f"Built {shape} DAG with {num_tasks} tasks in {time.perf_counter() - start:.4f}s")
+    print()
+
+    def cold(func):
+        def wrapped():
+            dag.invalidate_topology()
+            func()
+
+        return wrapped
+
+    timed("Build topology index", cold(lambda: dag.topology), repeat)
+    timed("topological_sort", cold(dag.topological_sort), repeat)
+    timed("roots and leaves", cold(lambda: (dag.roots, dag.leaves)), repeat)
+    timed(
+        "priority_weight_total of all tasks",
+        cold(lambda: [t.priority_weight_total for t in dag.tasks]),
+        repeat,
+    )
+    timed(
+        "get_flat_relative_ids of all roots",
+        cold(lambda: [t.get_flat_relative_ids() for t in dag.roots]),
+        repeat,
+    )
+    middle_task_id = dag.task_ids[num_tasks // 2]
+    timed(
+        "partial_subset of a middle task",
+        cold(lambda: dag.partial_subset([middle_task_id], include_upstream=True, include_downstream=True)),
+        repeat,
+    )
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
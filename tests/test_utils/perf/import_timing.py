@@ -0,0 +1,109 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Measure the time taken to import the modules run by the most common CLI commands,
+and check it against a budget.
+
+Every module is imported in a fresh interpreter with ``python -X importtime``, so
+nothing is cached between measurements. The command exits with a non-zero status
+when a module takes longer than its budget.
+
+To Run:
+    $ python tests/test_utils/perf/import_timing.py --repeat 5 --top 10
+"""
+import re
+import statistics
+import subprocess
+import sys
+
+import click
+
+# Import time budget in milliseconds of the modules run by the CLI commands
+BUDGETS_MS = {
+    'airflow': 600,
+    'airflow.cli.cli_parser': 700,
+    'airflow.cli.commands.version_command': 700,
+    'airflow.cli.commands.config_command': 700,
+    'airflow.cli.commands.task_command': 1200,
+    'airflow.cli.commands.dag_command': 1200,
+    'airflow.cli.commands.db_command': 1200,
+}
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s*(\d+) \|\s*(\d+) \|( *)(\S+)$")
+
+
+def import_times(module):
+    """
+    Import ``module`` in a new interpreter.
+
+    :return: the total import time in microseconds, and the self and cumulative
+        import times of every imported module
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        stderr=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        universal_newlines=True,
+        check=True,
+    )
+    total = 0
+    modules = {}
+    for line in proc.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        modules[name] = (int(self_us), int(cumulative_us))
+        # The modules imported at the top level add up to the whole import
+        if indent == " ":
+            total += int(cumulative_us)
+    return total, modules
+
+
+@click.command()
+@click.option('--repeat', default=3, help="Number of times to import each module")
+@click.option('--top', default=0, help="Show the N modules taking longest to import themselves")
+@click.argument('modules', nargs=-1)
+def main(repeat, top, modules):
+    """Time importing the modules of the CLI commands, or the given MODULES."""
+    over_budget = []
+    for module in modules or BUDGETS_MS:
+        runs = [import_times(module) for _ in range(repeat)]
+        total_ms = statistics.median(total for total, _ in runs) / 1000
+        budget_ms = BUDGETS_MS.get(module)
+        status = ""
+        if budget_ms is not None:
+            status = f"budget {budget_ms}ms"
+            if total_ms > budget_ms:
+                status += " EXCEEDED"
+                over_budget.append(module)
+        print(f"{module:<45} {total_ms:8.1f}ms  {status}")
+        if top:
+            _, last_modules = runs[-1]
+            slowest = sorted(last_modules.items(), key=lambda item: item[1][0], reverse=True)[:top]
+            for name, (self_us, cumulative_us) in slowest:
+                print(
+                    f"    {name:<60} self {self_us / 1000:7.1f}ms  cumulative {cumulative_us / 1000:7.1f}ms"
+                )
+    if over_budget:
+        click.echo(f"Over the import time budget: {', '.join(over_budget)}", err=True)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
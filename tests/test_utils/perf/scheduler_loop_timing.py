@@ -0,0 +1,159 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Benchmark the scheduler loop and its hot queries against the number of DAGs.
+
+For every number of DAGs, the metadata database is filled with that many
+serialized DAGs, and the scheduling part of the scheduler loop
+(``SchedulerJob._do_scheduling``) is run against a mock executor. The first
+loops create the DAG runs, the time and number of queries of the following ones
+are reported, together with the time of the queries run on every loop.
+
+The DAGs, DAG runs and task instances of the database are deleted, run it
+against a database set up for benchmarking only.
+
+To Run:
+    $ python tests/test_utils/perf/scheduler_loop_timing.py --num-dags 10 --num-dags 100 --num-dags 1000
+"""
+import gc
+import os
+import statistics
+import time
+from unittest import mock
+
+import click
+
+# Turn on unit test mode so that the scheduler does not sleep
+os.environ['AIRFLOW__CORE__UNIT_TEST_MODE'] = 'True'
+
+# pylint: disable=wrong-import-position
+from airflow.jobs.scheduler_job import SchedulerJob  # noqa: E402
+from airflow.models.dag import DAG, DagModel  # noqa: E402
+from airflow.models.dagrun import DagRun  # noqa: E402
+from airflow.models.serialized_dag import SerializedDagModel  # noqa: E402
+from airflow.operators.dummy import DummyOperator  # noqa: E402
+from airflow.utils import timezone  # noqa: E402
+from airflow.utils.session import create_session  # noqa: E402
+from tests.test_utils.db import clear_db_dags, clear_db_runs, clear_db_serialized_dags  # noqa: E402
+from tests.test_utils.mock_executor import MockExecutor  # noqa: E402
+from tests.test_utils.perf.perf_kit.sqlalchemy import count_queries  # noqa: E402
+
+# pylint: enable=wrong-import-position
+
+START_DATE = timezone.datetime(2021, 1, 1)
+
+
+def create_dags(num_dags, num_tasks):
+    """Write ``num_dags`` serialized DAGs of ``num_tasks`` chained tasks to the database."""
+    clear_db_runs()
+    clear_db_serialized_dags()
+    clear_db_dags()
+    dags = []
+    for i in range(num_dags):
+        with DAG(
+            f"perf_scheduler_loop_{i}", start_date=START_DATE, schedule_interval="@daily", max_active_runs=1
+        ) as dag:
+            tasks = [DummyOperator(task_id=f"task_{j}") for j in range(num_tasks)]
+        for upstream, downstream in zip(tasks, tasks[1:]):
+            upstream >> downstream
+        dags.append(dag)
+    DAG.bulk_write_to_db(dags)
+    with create_session() as session:
+        for dag in dags:
+            SerializedDagModel.write_dag(dag, session=session)
+        session.query(DagModel).update({DagModel.is_paused: False}, synchronize_session=False)
+
+
+def timed_ms(func):
+    """Run ``func`` and return its result and how long it took, in milliseconds."""
+    gc.disable()
+    start = time.perf_counter()
+    result = func()
+    duration = (time.perf_counter() - start) * 1000
+    gc.enable()
+    return result, duration
+
+
+def time_hot_queries(scheduler_job, repeat):
+    """Mean time of the queries the scheduler runs on every loop, in milliseconds."""
+    queries = {
+        "dags_needing_dagruns": lambda session: DagModel.dags_needing_dagruns(session).all(),
+        "next_dagruns_to_examine": lambda session: DagRun.next_dagruns_to_examine(session).all(),
+        # pylint: disable=protected-access
+        "executable_task_instances": lambda session: scheduler_job._executable_task_instances_to_queued(
+            max_tis=32, session=session
+        ),
+    }
+    times = {}
+    for name, query in queries.items():
+        durations = []
+        for _ in range(repeat):
+            with create_session() as session:
+                durations.append(timed_ms(lambda: query(session))[1])  # pylint: disable=cell-var-from-loop
+                # Nothing the queries changed is kept
+                session.rollback()
+        times[name] = statistics.mean(durations)
+    return times
+
+
+def run_loops(num_dags, num_tasks, num_loops, warmup_loops):
+    """Run the scheduler loops and print their timings for ``num_dags`` DAGs."""
+    create_dags(num_dags, num_tasks)
+    scheduler_job = SchedulerJob(subdir=os.devnull, num_runs=1)
+    scheduler_job.executor = MockExecutor(do_update=False)
+    scheduler_job.executor.parallelism = num_dags * num_tasks
+    scheduler_job.processor_agent = mock.MagicMock()
+
+    loop_times = []
+    query_counts = []
+    for loop in range(warmup_loops + num_loops):
+        with create_session() as session, count_queries(print_fn=lambda _: None) as queries:
+            # pylint: disable=protected-access,cell-var-from-loop
+            _, duration = timed_ms(lambda: scheduler_job._do_scheduling(session))
+        if loop >= warmup_loops:
+            loop_times.append(duration)
+            query_counts.append(queries.count)
+
+    hot_queries = time_hot_queries(scheduler_job, repeat=num_loops)
+    spread = f" (±{statistics.stdev(loop_times):.1f})" if len(loop_times) > 1 else ""
+    print(
+        f"{num_dags:>6} DAGs: {statistics.mean(loop_times):9.1f}ms{spread} per loop, "
+        f"{statistics.mean(query_counts):.1f} queries per loop"
+    )
+    for name, duration in hot_queries.items():
+        print(f"        {name:<30} {duration:8.2f}ms")
+
+
+@click.command()
+@click.option(
+    '--num-dags', multiple=True, type=int, default=[10, 100, 1000], help="Numbers of DAGs to benchmark"
+)
+@click.option('--num-tasks', default=5, help="Number of tasks of every DAG")
+@click.option('--num-loops', default=10, help="Number of scheduler loops timed")
+@click.option('--warmup-loops', default=2, help="Number of scheduler loops run before the timed ones")
+def main(num_dags, num_tasks, num_loops, warmup_loops):
+    """Time the scheduler loop and its hot queries against the number of DAGs."""
+    for dags in num_dags:
+        run_loops(dags, num_tasks, num_loops, warmup_loops)
+    clear_db_runs()
+    clear_db_serialized_dags()
+    clear_db_dags()
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,134 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from airflow.utils.log.worker_log_fetcher import WorkerLogFetcher, WorkerUnreachable
+
+
+class Worker:
+    """Answers the requests of the fetcher like serve_logs, and records them"""
+
+    def __init__(self, delay=0.0, down_hosts=()):
+        self.delay = delay
+        self.down_hosts = set(down_hosts)
+        self.requests = []
+        self.concurrent = 0
+        self.max_concurrent = 0
+
+    async def __call__(self, request):
+        self.requests.append(str(request.url))
+        if request.url.host in self.down_hosts:
+            raise httpx.ConnectError("Connection refused", request=request)
+        self.concurrent += 1
+        self.max_concurrent = max(self.max_concurrent, self.concurrent)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.concurrent -= 1
+        if request.url.path.endswith("missing.log"):
+            return httpx.Response(404, text="Not found")
+        return httpx.Response(200, text=f"log of {request.url.path}")
+
+
+def make_fetcher(worker, **kwargs):
+    return WorkerLogFetcher(transport=httpx.MockTransport(worker), **kwargs)
+
+
+def test_fetch_many_in_parallel():
+    worker = Worker(delay=0.2)
+    fetcher = make_fetcher(worker, max_connections_per_host=4)
+    urls = [f"http://worker:8793/log/{i}.log" for i in range(1, 5)]
+
+    start = time.monotonic()
+    logs = fetcher.fetch_many(urls)
+
+    assert time.monotonic() - start < 0.6
+    assert logs == [f"log of /log/{i}.log" for i in range(1, 5)]
+    assert worker.max_concurrent == 4
+
+
+def test_limit_concurrent_requests_per_host():
+    worker = Worker(delay=0.05)
+    fetcher = make_fetcher(worker, max_connections_per_host=2)
+
+    fetcher.fetch_many([f"http://worker:8793/log/{i}.log" for i in range(6)])
+
+    assert worker.max_concurrent == 2
+
+
+def test_return_errors_per_url():
+    fetcher = make_fetcher(Worker())
+
+    logs = fetcher.fetch_many(["http://worker:8793/log/1.log", "http://worker:8793/log/missing.log"])
+
+    assert logs[0] == "log of /log/1.log"
+    assert isinstance(logs[1], httpx.HTTPStatusError)
+    with pytest.raises(httpx.HTTPStatusError):
+        fetcher.fetch("http://worker:8793/log/missing.log")
+
+
+def test_timeout():
+    fetcher = make_fetcher(Worker(delay=1), timeout=0.1)
+
+    with pytest.raises(TimeoutError, match="No answer from worker:8793 within 0.1 seconds"):
+        fetcher.fetch("http://worker:8793/log/1.log")
+
+
+def test_stop_contacting_unreachable_worker():
+    worker = Worker(down_hosts={"down"})
+    fetcher = make_fetcher(worker, failure_threshold=2, reset_timeout=0.2)
+
+    for _ in range(2):
+        with pytest.raises(httpx.ConnectError):
+            fetcher.fetch("http://down:8793/log/1.log")
+    with pytest.raises(WorkerUnreachable):
+        fetcher.fetch("http://down:8793/log/1.log")
+    assert len(worker.requests) == 2
+    # Other workers are still contacted
+    assert fetcher.fetch("http://worker:8793/log/1.log") == "log of /log/1.log"
+
+    time.sleep(0.2)
+    worker.down_hosts.clear()
+    assert fetcher.fetch("http://down:8793/log/1.log") == "log of /log/1.log"
+
+
+def test_missing_log_is_not_a_failure_of_the_worker():
+    fetcher = make_fetcher(Worker(), failure_threshold=1)
+
+    for _ in range(2):
+        with pytest.raises(httpx.HTTPStatusError):
+            fetcher.fetch("http://worker:8793/log/missing.log")
+
+
+def test_cache_logs_of_finished_tries():
+    worker = Worker()
+    fetcher = make_fetcher(worker, cache_size=1)
+    finished, running = "http://worker:8793/log/1.log", "http://worker:8793/log/2.log"
+
+    for _ in range(2):
+        fetcher.fetch_many([finished, running], cacheable=[finished])
+
+    assert worker.requests == [finished, running, running]
+
+    fetcher.fetch("http://worker:8793/log/3.log", cacheable=True)
+    fetcher.fetch(finished)
+    assert worker.requests[-1] == finished
@@ -0,0 +1,182 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import gzip
+import json
+import os
+from datetime import timedelta
+
+import pytest
+
+from airflow.exceptions import AirflowException
+from airflow.jobs.base_job import BaseJob
+from airflow.models import DAG, DagRun, Log, TaskInstance
+from airflow.models.xcom import BaseXCom, ObjectStorageXCom
+from airflow.operators.dummy import DummyOperator
+from airflow.utils import timezone
+from airflow.utils.db_cleanup import get_retention_cutoffs, run_cleanup
+from airflow.utils.session import create_session
+from airflow.utils.state import State
+from airflow.utils.types import DagRunType
+from tests.test_utils.config import conf_vars
+from tests.test_utils.db import clear_db_jobs, clear_db_logs, clear_db_runs, clear_db_xcom
+
+START_DATE = timezone.datetime(2020, 1, 1)
+CLEAN_BEFORE = START_DATE + timedelta(days=10)
+
+
+def clear_db():
+    clear_db_runs()
+    clear_db_xcom()
+    clear_db_logs()
+    clear_db_jobs()
+
+
+@pytest.fixture(autouse=True)
+def metadata():
+    """
+    Six daily runs of a DAG with two tasks, the third one still running,
+    an XCom and a log entry per task instance, and an old running and finished job.
+    """
+    clear_db()
+    with DAG("test_db_cleanup", start_date=START_DATE) as dag:
+        tasks = [DummyOperator(task_id="first"), DummyOperator(task_id="second")]
+    with create_session() as session:
+        for day in range(6):
+            execution_date = START_DATE + timedelta(days=day)
+            state = State.RUNNING if day == 2 else State.SUCCESS
+            session.add(
+                DagRun(
+                    dag_id=dag.dag_id,
+                    run_id=f"run_{day}",
+                    run_type=DagRunType.SCHEDULED,
+                    execution_date=execution_date,
+                    state=state,
+                )
+            )
+            for task in tasks:
+                ti = TaskInstance(task, execution_date, state=state)
+                session.add(ti)
+                session.add(
+                    BaseXCom(
+                        key="key",
+                        value=b"value",
+                        timestamp=execution_date,
+                        execution_date=execution_date,
+                        task_id=task.task_id,
+                        dag_id=dag.dag_id,
+                    )
+                )
+                log = Log("success", ti)
+                log.dttm = execution_date
+                session.add(log)
+        for state in (State.RUNNING, State.SUCCESS):
+            session.execute(
+                BaseJob.__table__.insert().values(
+                    job_type="LocalTaskJob", state=state, latest_heartbeat=START_DATE
+                )
+            )
+    yield
+    clear_db()
+
+
+def remaining(column):
+    with create_session() as session:
+        return sorted(value for (value,) in session.query(column))
+
+
+def test_keep_last_and_unfinished_runs():
+    results = run_cleanup(clean_before_timestamp=CLEAN_BEFORE, batch_size=3)
+
+    kept = [START_DATE + timedelta(days=2), START_DATE + timedelta(days=5)]
+    assert remaining(DagRun.execution_date) == kept
+    assert remaining(TaskInstance.execution_date) == [kept[0]] * 2 + [kept[1]] * 2
+    assert remaining(BaseXCom.execution_date) == [kept[0]] * 2 + [kept[1]] * 2
+    assert remaining(BaseJob.state) == [State.RUNNING]
+    assert remaining(Log.dttm) == []
+    rows = {result.table: result.rows for result in results}
+    assert rows["dag_run"] == 4
+    assert rows["task_instance"] == 8
+    assert rows["xcom"] == 8
+    assert rows["log"] == 12
+    assert rows["job"] == 1
+
+
+def test_keep_rows_after_cutoff():
+    run_cleanup(table_names=["dag_run", "log"], clean_before_timestamp=START_DATE + timedelta(days=1))
+
+    assert len(remaining(DagRun.execution_date)) == 5
+    assert len(remaining(Log.dttm)) == 10
+    assert len(remaining(TaskInstance.execution_date)) == 12
+
+
+def test_dry_run():
+    results = run_cleanup(
+        table_names=["task_instance", "log"], clean_before_timestamp=CLEAN_BEFORE, dry_run=True
+    )
+
+    assert [(result.table, result.rows) for result in results] == [("task_instance", 8), ("log", 12)]
+    assert len(remaining(TaskInstance.execution_date)) == 12
+    assert len(remaining(Log.dttm)) == 12
+
+
+def test_archive_before_deleting(tmp_path):
+    run_cleanup(
+        table_names=["xcom"], clean_before_timestamp=CLEAN_BEFORE, batch_size=1, archive_folder=str(tmp_path)
+    )
+
+    (archive,) = os.listdir(tmp_path / "xcom")
+    with gzip.open(tmp_path / "xcom" / archive, "rt") as file:
+        rows = [json.loads(line) for line in file]
+    assert len(rows) == 8
+    assert {row["task_id"] for row in rows} == {"first", "second"}
+    assert rows[0]["execution_date"] == START_DATE.isoformat()
+
+
+def test_delete_values_stored_by_xcom_backend(tmp_path):
+    with conf_vars(
+        {
+            ("core", "xcom_backend"): "airflow.models.xcom.ObjectStorageXCom",
+            ("core", "xcom_storage_path"): str(tmp_path),
+            ("core", "xcom_storage_threshold"): "1",
+        }
+    ):
+        with create_session() as session:
+            for task_id, execution_date in session.query(BaseXCom.task_id, BaseXCom.execution_date):
+                session.query(BaseXCom).filter(
+                    BaseXCom.task_id == task_id, BaseXCom.execution_date == execution_date
+                ).update({BaseXCom.value: ObjectStorageXCom.serialize_value(task_id)})
+        assert len(os.listdir(tmp_path)) == 12
+
+        run_cleanup(table_names=["xcom"], clean_before_timestamp=CLEAN_BEFORE, batch_size=3)
+
+    # The values of the XComs of the last and unfinished runs are kept
+    assert len(os.listdir(tmp_path)) == 4
+
+
+def test_unknown_table():
+    with pytest.raises(AirflowException, match="Cannot clean tables \\['dag'\\]"):
+        run_cleanup(table_names=["dag"], clean_before_timestamp=CLEAN_BEFORE)
+
+
+@conf_vars({("db_cleanup", "retention_days"): "30", ("db_cleanup", "table_retention_days"): '{"log": 7}'})
+def test_retention_cutoffs_from_config():
+    now = timezone.utcnow()
+    cutoffs = get_retention_cutoffs(["log", "xcom"])
+
+    assert timedelta(days=7) - timedelta(minutes=1) < now - cutoffs["log"] <= timedelta(days=7)
+    assert timedelta(days=30) - timedelta(minutes=1) < now - cutoffs["xcom"] <= timedelta(days=30)
@@ -0,0 +1,63 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import os
+
+import pytest
+
+from airflow.utils import discovery_cache
+from tests.test_utils.config import conf_vars
+
+
+@pytest.fixture
+def cache_folder(tmp_path):
+    with conf_vars({('core', 'discovery_cache_folder'): str(tmp_path)}):
+        yield tmp_path
+
+
+def test_load_what_was_stored_with_the_same_fingerprint(cache_folder):
+    discovery_cache.store('test', [["a.py", 1, 2]], {'found': ['a.py']})
+
+    assert discovery_cache.load('test', [["a.py", 1, 2]]) == {'found': ['a.py']}
+    assert discovery_cache.load('test', [["a.py", 3, 2]]) is None
+    assert discovery_cache.load('other', [["a.py", 1, 2]]) is None
+    assert os.listdir(cache_folder) == ['test.json']
+
+
+def test_file_fingerprint_changes_with_the_file(tmp_path):
+    path = tmp_path / "plugin.py"
+    path.write_text("x = 1")
+    fingerprint = discovery_cache.file_fingerprint(str(path))
+
+    path.write_text("x = 12")
+
+    assert discovery_cache.file_fingerprint(str(path)) != fingerprint
+
+
+def test_invalid_cache_is_ignored(cache_folder):
+    (cache_folder / "test.json").write_text("{not json")
+
+    assert discovery_cache.load('test', []) is None
+    discovery_cache.store('test', [], ['data'])
+    assert discovery_cache.load('test', []) == ['data']
+
+
+@conf_vars({('core', 'discovery_cache_folder'): ''})
+def test_disabled_cache():
+    discovery_cache.store('test', [], ['data'])
+
+    assert discovery_cache.load('test', []) is None
@@ -21,12 +21,14 @@ import logging.config
 import os
 import re
 import unittest
+from unittest import mock
 
 from airflow.config_templates.airflow_local_settings import DEFAULT_LOGGING_CONFIG
 from airflow.models import DAG, DagRun, TaskInstance
 from airflow.operators.dummy import DummyOperator
 from airflow.operators.python import PythonOperator
 from airflow.utils.log.file_task_handler import FileTaskHandler
+from airflow.utils.log.worker_log_fetcher import WorkerUnreachable
 from airflow.utils.log.logging_mixin import set_context
 from airflow.utils.session import create_session
 from airflow.utils.state import State
@@ -231,3 +233,38 @@ class TestFilenameRendering(unittest.TestCase):
         fth = FileTaskHandler('', '{{ ti.dag_id }}/{{ ti.task_id }}/{{ ts }}/{{ try_number }}.log')
         rendered_filename = fth._render_filename(self.ti, 42)
         assert expected_filename == rendered_filename
+
+
+class TestReadFromWorker(unittest.TestCase):
+    def setUp(self):
+        dag = DAG('dag_for_testing_read_from_worker', start_date=DEFAULT_DATE)
+        task = DummyOperator(task_id='task_for_testing_read_from_worker', dag=dag)
+        self.ti = TaskInstance(task=task, execution_date=DEFAULT_DATE)
+        self.ti.hostname = 'worker'
+        self.ti.try_number = 3
+        self.ti.state = State.RUNNING
+        self.fth = FileTaskHandler('/nonexistent', '{try_number}.log')
+
+    @mock.patch('airflow.utils.log.file_task_handler.get_worker_log_fetcher')
+    def test_fetch_all_tries_at_once(self, mock_get_fetcher):
+        fetcher = mock_get_fetcher.return_value
+        fetcher.fetch_many.return_value = ['first', 'second', WorkerUnreachable('worker is down')]
+
+        logs, _ = self.fth.read(self.ti)
+
+        urls = [f'http://worker:8793/log/{try_number}.log' for try_number in (1, 2, 3)]
+        fetcher.fetch_many.assert_called_once_with(urls, cacheable=urls[:2])
+        fetcher.fetch.assert_not_called()
+        assert logs[0][0][1].endswith('\nfirst')
+        assert logs[1][0][1].endswith('\nsecond')
+        assert logs[2][0][1].endswith('*** Failed to fetch log file from worker. worker is down\n')
+
+    @mock.patch('airflow.utils.log.file_task_handler.get_worker_log_fetcher')
+    def test_fetch_single_try(self, mock_get_fetcher):
+        fetcher = mock_get_fetcher.return_value
+        fetcher.fetch.return_value = 'third'
+
+        logs, _ = self.fth.read(self.ti, try_number=3)
+
+        fetcher.fetch.assert_called_once_with('http://worker:8793/log/3.log', cacheable=False)
+        assert logs[0][0][1].endswith('\nthird')
@@ -22,10 +22,12 @@ from unittest import mock
 
 import pytest
 from parameterized import parameterized
+from sqlalchemy import create_engine, orm
 from sqlalchemy.exc import StatementError
 
 from airflow import settings
-from airflow.models import DAG
+from airflow.jobs.scheduler_job import SchedulerJob
+from airflow.models import DAG, DagModel, DagRun
 from airflow.settings import Session
 from airflow.utils.sqlalchemy import nowait, prohibit_commit, skip_locked, with_row_locks
 from airflow.utils.state import State
@@ -188,6 +190,23 @@ class TestSqlAlchemyUtils(unittest.TestCase):
             assert returned_value == query
             query.with_for_update.assert_not_called()
 
+    @parameterized.expand(["postgresql", "mysql", "mssql", "sqlite"])
+    def test_baked_scheduler_queries_compile(self, dialect):
+        engine = create_engine(f"{dialect}://", strategy="mock", executor=mock.Mock())
+        session = orm.Session(bind=engine)
+        results = [
+            DagModel.dags_needing_dagruns(session=session),
+            DagRun.next_dagruns_to_examine(session=session, max_number=5),
+            SchedulerJob._scheduled_task_instances_query(  # pylint: disable=protected-access
+                7, ["starved"], session=session
+            ),
+        ]
+
+        for result in results:
+            sql = str(result._as_query().statement.compile(dialect=engine.dialect))
+            # MSSQL only supports a literal limit without an ORDER BY
+            assert ("TOP " in sql) == (dialect == "mssql")
+
     def test_prohibit_commit(self):
         with prohibit_commit(self.session) as guard:
             self.session.execute('SELECT 1')
@@ -0,0 +1,140 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from datetime import timedelta
+
+import pytest
+
+from airflow.models import DAG, TaskFail
+from airflow.operators.dummy import DummyOperator
+from airflow.utils import timezone
+from airflow.utils.session import create_session
+from airflow.utils.state import State
+from airflow.utils.types import DagRunType
+from airflow.www.chart_data import (
+    CHART_DATA_CACHE,
+    ChartDataCache,
+    get_duration_points,
+    get_gantt_data,
+    get_landing_times_points,
+    get_tries_points,
+)
+from airflow.www.utils import epoch
+from tests.test_utils.asserts import assert_queries_count
+from tests.test_utils.db import clear_db_runs, clear_db_task_fail
+
+DEFAULT_DATE = timezone.datetime(2021, 1, 1)
+END_DATE = DEFAULT_DATE + timedelta(days=1)
+
+
+@pytest.fixture
+def dag():
+    with DAG("test_chart_data", start_date=DEFAULT_DATE, schedule_interval="@daily") as dag:
+        DummyOperator(task_id="first") >> DummyOperator(task_id="second")
+    return dag
+
+
+@pytest.fixture
+def dag_runs(dag):
+    clear_db_runs()
+    clear_db_task_fail()
+    CHART_DATA_CACHE.clear()
+    with create_session() as session:
+        for i in range(2):
+            dag_run = dag.create_dagrun(
+                run_type=DagRunType.SCHEDULED,
+                execution_date=DEFAULT_DATE + timedelta(days=i),
+                state=State.RUNNING,
+                session=session,
+            )
+            for ti in dag_run.get_task_instances(session=session):
+                ti.state = State.SUCCESS
+                ti.try_number = 2
+                ti.start_date = dag_run.execution_date + timedelta(hours=1)
+                ti.end_date = ti.start_date + timedelta(seconds=30 if ti.task_id == 'first' else 60)
+                ti.duration = (ti.end_date - ti.start_date).total_seconds()
+                session.merge(ti)
+                session.add(TaskFail(dag.get_task(ti.task_id), ti.execution_date, ti.start_date, ti.end_date))
+    yield
+    clear_db_runs()
+    clear_db_task_fail()
+    CHART_DATA_CACHE.clear()
+
+
+@pytest.mark.usefixtures("dag_runs")
+def test_duration_points(dag):
+    with create_session() as session:
+        points = get_duration_points(dag, DEFAULT_DATE, END_DATE, session)
+
+    assert points['x'] == {
+        'first': [epoch(DEFAULT_DATE), epoch(END_DATE)],
+        'second': [epoch(DEFAULT_DATE), epoch(END_DATE)],
+    }
+    assert points['y'] == {'first': [30.0, 30.0], 'second': [60.0, 60.0]}
+    assert points['cumulative_y'] == {'first': [60.0, 60.0], 'second': [120.0, 120.0]}
+    assert points['max_date'] == END_DATE
+
+
+@pytest.mark.usefixtures("dag_runs")
+def test_tries_and_landing_times_points_of_partial_dag(dag):
+    partial = dag.partial_subset(task_ids_or_regex='second', include_upstream=False)
+    with create_session() as session:
+        tries = get_tries_points(partial, DEFAULT_DATE, DEFAULT_DATE, session)
+        landing_times = get_landing_times_points(partial, DEFAULT_DATE, DEFAULT_DATE, session)
+
+    assert tries == {'x': {'second': [epoch(DEFAULT_DATE)]}, 'y': {'second': [2]}, 'max_date': DEFAULT_DATE}
+    # Landing times are relative to the end of the schedule period, one day after the execution date
+    assert landing_times['y'] == {'second': [3660.0 - 86400.0]}
+
+
+@pytest.mark.usefixtures("dag_runs")
+def test_unchanged_windows_are_not_fetched_again(dag):
+    cache = ChartDataCache()
+    with create_session() as session:
+        with assert_queries_count(2):
+            rows = cache.get_task_instance_rows(dag.dag_id, DEFAULT_DATE, END_DATE, session)
+        with assert_queries_count(1):
+            assert cache.get_task_instance_rows(dag.dag_id, DEFAULT_DATE, END_DATE, session) is rows
+
+        dag.get_dagrun(END_DATE, session=session).get_task_instance('first', session=session).set_state(
+            State.FAILED, session=session
+        )
+        session.flush()
+        with assert_queries_count(2):
+            rows = cache.get_task_instance_rows(dag.dag_id, DEFAULT_DATE, END_DATE, session)
+
+    assert [row.state for row in rows if row.task_id == 'first'] == [State.SUCCESS, State.FAILED]
+
+
+@pytest.mark.usefixtures("dag_runs")
+def test_gantt_data(dag):
+    with create_session() as session:
+        session.add(TaskFail(dag.get_task('first'), DEFAULT_DATE, DEFAULT_DATE, DEFAULT_DATE))
+        session.flush()
+        with assert_queries_count(2):
+            data = get_gantt_data(dag, DEFAULT_DATE, session)
+
+    assert data['taskNames'] == ['first', 'second']
+    assert data['height'] == 75
+    assert [(task['task_id'], task['state'], task['try_number']) for task in data['tasks']] == [
+        ('first', State.SUCCESS, 2),
+        ('second', State.SUCCESS, 2),
+        ('first', State.FAILED, 1),
+        ('first', State.FAILED, 2),
+        ('second', State.FAILED, 1),
+    ]
+    assert data['tasks'][0]['end_date'] == (DEFAULT_DATE + timedelta(hours=1, seconds=30)).isoformat()
@@ -0,0 +1,132 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+
+from airflow.models import DAG, DagRun
+from airflow.operators.dummy import DummyOperator
+from airflow.utils import timezone
+from airflow.utils.session import create_session
+from airflow.utils.state import State
+from airflow.utils.types import DagRunType
+from airflow.www.dag_stats import (
+    DAG_STATS_CACHE,
+    DagStatsCache,
+    get_dag_run_states,
+    get_last_dag_runs,
+    get_task_instance_states,
+)
+from tests.test_utils.asserts import assert_queries_count
+from tests.test_utils.db import clear_db_runs
+
+DEFAULT_DATE = timezone.datetime(2021, 1, 1)
+
+
+@pytest.fixture
+def dag():
+    with DAG("test_dag_stats", start_date=DEFAULT_DATE, schedule_interval="@daily") as dag:
+        DummyOperator(task_id="first") >> DummyOperator(task_id="second")
+    return dag
+
+
+@pytest.fixture
+def dag_runs(dag):
+    clear_db_runs()
+    dag.sync_to_db()
+    for i, state in enumerate([State.SUCCESS, State.RUNNING]):
+        dag.create_dagrun(
+            run_type=DagRunType.SCHEDULED,
+            execution_date=DEFAULT_DATE + timedelta(days=i),
+            start_date=DEFAULT_DATE + timedelta(days=i),
+            state=state,
+        )
+    yield
+    clear_db_runs()
+
+
+class TestDagStatsCache:
+    def test_stale_dags_are_computed_together(self):
+        cache = DagStatsCache(refresh_interval=3600)
+        compute = mock.Mock(side_effect=lambda dag_ids: {dag_id: dag_id.upper() for dag_id in dag_ids})
+
+        assert cache.get("kind", ["a", "b"], compute) == {"a": "A", "b": "B"}
+        assert cache.get("kind", ["a", "b", "c"], compute) == {"a": "A", "b": "B", "c": "C"}
+        cache.invalidate(["a"])
+        assert cache.get("kind", ["a", "b", "c"], compute) == {"a": "A", "b": "B", "c": "C"}
+
+        assert compute.call_args_list == [mock.call(["a", "b"]), mock.call(["c"]), mock.call(["a"])]
+
+    def test_default_for_missing_dags(self):
+        cache = DagStatsCache(refresh_interval=3600)
+        compute = mock.Mock(return_value={})
+
+        assert cache.get("kind", ["a"], compute, default=0) == {"a": 0}
+        assert cache.get("kind", ["a"], compute, default=0) == {"a": 0}
+        compute.assert_called_once_with(["a"])
+
+    def test_zero_interval_disables_cache(self):
+        cache = DagStatsCache(refresh_interval=0)
+        compute = mock.Mock(return_value={"a": 1})
+
+        cache.get("kind", ["a"], compute)
+        cache.get("kind", ["a"], compute)
+        assert compute.call_count == 2
+
+
+@pytest.mark.usefixtures("dag_runs")
+def test_stats(dag):
+    DAG_STATS_CACHE.clear()
+    with create_session() as session:
+        with assert_queries_count(3):
+            dag_run_states = get_dag_run_states([dag.dag_id, "missing"], session)
+            task_instance_states = get_task_instance_states([dag.dag_id, "missing"], session)
+            last_dag_runs = get_last_dag_runs([dag.dag_id, "missing"], session)
+        with assert_queries_count(0):
+            assert get_dag_run_states([dag.dag_id], session) == {dag.dag_id: dag_run_states[dag.dag_id]}
+
+    assert dag_run_states == {dag.dag_id: {State.SUCCESS: 1, State.RUNNING: 1}, "missing": {}}
+    # Task instances of the running and of the latest completed run
+    assert task_instance_states == {dag.dag_id: {None: 4}, "missing": {}}
+    assert last_dag_runs == {
+        dag.dag_id: (DEFAULT_DATE + timedelta(days=1), DEFAULT_DATE + timedelta(days=1)),
+        "missing": None,
+    }
+
+
+@pytest.mark.usefixtures("dag_runs")
+def test_flushed_state_changes_invalidate_their_dag(dag):
+    DAG_STATS_CACHE.clear()
+    with create_session() as session:
+        get_dag_run_states([dag.dag_id], session)
+        dag_run = session.query(DagRun).filter(DagRun.state == State.RUNNING).one()
+        dag_run.set_state(State.FAILED)
+        session.flush()
+
+        assert get_dag_run_states([dag.dag_id], session) == {dag.dag_id: {State.SUCCESS: 1, State.FAILED: 1}}
+
+
+@pytest.mark.usefixtures("dag_runs")
+def test_bulk_changes_invalidate_all_dags(dag):
+    DAG_STATS_CACHE.clear()
+    with create_session() as session:
+        get_dag_run_states([dag.dag_id], session)
+        session.query(DagRun).filter(DagRun.dag_id == dag.dag_id).delete()
+
+        assert get_dag_run_states([dag.dag_id], session) == {dag.dag_id: {}}
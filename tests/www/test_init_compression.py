@@ -0,0 +1,132 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import gzip
+import json
+
+import pytest
+from flask import Flask, Response, jsonify, make_response, request
+
+from airflow.www.extensions import init_compression
+from tests.test_utils.config import conf_vars
+
+PAYLOAD = {"items": [{"id": i, "name": f"task_{i}"} for i in range(200)]}
+
+
+@pytest.fixture
+def app(tmp_path):
+    static = tmp_path / "static"
+    static.mkdir()
+    (static / "bundle.js").write_text("var a = 1;\n" * 500)
+    (static / "bundle.js.gz").write_bytes(gzip.compress(b"var a = 1;\n" * 500))
+    (static / "plain.js").write_text("var b = 2;\n" * 500)
+
+    app = Flask(__name__, static_folder=str(static))
+
+    @app.route("/big")
+    def big():
+        return jsonify(PAYLOAD)
+
+    @app.route("/small")
+    def small():
+        return jsonify({"id": 1})
+
+    @app.route("/stream")
+    def stream():
+        return Response(
+            (json.dumps(item) + "\n" for item in PAYLOAD["items"]), mimetype="application/x-ndjson"
+        )
+
+    @app.route("/etag")
+    def etag():
+        response = make_response(jsonify(PAYLOAD))
+        response.add_etag()
+        return response.make_conditional(request)
+
+    with conf_vars({("webserver", "compress_min_size"): "1024"}):
+        init_compression.init_response_compression(app)
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def test_should_compress_large_responses(client):
+    response = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert int(response.headers["Content-Length"]) == len(response.data)
+    assert json.loads(gzip.decompress(response.data)) == PAYLOAD
+
+
+@pytest.mark.parametrize(
+    "url, accept_encoding",
+    [("/small", "gzip"), ("/big", ""), ("/big", "identity"), ("/big", "gzip;q=0")],
+)
+def test_should_not_compress(client, url, accept_encoding):
+    response = client.get(url, headers={"Accept-Encoding": accept_encoding})
+    assert "Content-Encoding" not in response.headers
+    json.loads(response.data)
+
+
+def test_should_compress_streamed_responses(client):
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    lines = gzip.decompress(response.data).decode().splitlines()
+    assert [json.loads(line) for line in lines] == PAYLOAD["items"]
+
+
+def test_should_keep_conditional_requests_working(client):
+    response = client.get("/etag", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    etag = response.headers["ETag"]
+    assert etag.startswith("W/")
+
+    response = client.get("/etag", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert response.status_code == 304
+
+
+def test_should_serve_precompressed_static_files(client):
+    response = client.get("/static/bundle.js", headers={"Accept-Encoding": "br, gzip"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.data) == b"var a = 1;\n" * 500
+    mimetype = response.mimetype
+    response.close()
+
+    response = client.get("/static/bundle.js")
+    assert "Content-Encoding" not in response.headers
+    assert response.mimetype == mimetype
+    assert response.data == b"var a = 1;\n" * 500
+    response.close()
+
+
+def test_should_compress_static_files_without_precompressed_variant(client):
+    response = client.get("/static/plain.js", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.data) == b"var b = 2;\n" * 500
+    response.close()
+
+
+@conf_vars({("webserver", "compress_responses"): "False"})
+def test_should_not_register_when_disabled():
+    app = Flask(__name__)
+    init_compression.init_response_compression(app)
+    assert not app.after_request_funcs
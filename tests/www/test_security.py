@@ -32,6 +32,7 @@ from airflow.models import DagModel
 from airflow.models.dag import DAG
 from airflow.security import permissions
 from airflow.www import app as application
+from airflow.www.security import PermissionIndex
 from airflow.www.utils import CustomSQLAInterface
 from tests.test_utils import api_connexion_utils
 from tests.test_utils.asserts import assert_queries_count
@@ -640,6 +641,72 @@ class TestSecurity(unittest.TestCase):
 
         assert 'Admin' in roles
 
+    def test_permission_index_is_cached_per_role_set(self):
+        self._create_dag("dag_a")
+        self._create_dag("dag_b")
+        user = api_connexion_utils.create_user(
+            self.app,
+            "permission_index_user",
+            "MyRole2",
+            permissions=[
+                (permissions.ACTION_CAN_READ, permissions.RESOURCE_WEBSITE),
+                (permissions.ACTION_CAN_READ, permissions.resource_name_for_dag("dag_a")),
+            ],
+        )
+
+        with self.app.app_context():
+            with assert_queries_count(2):
+                assert self.security_manager.can_read_dag("dag_a", user)
+            with assert_queries_count(0):
+                assert not self.security_manager.can_read_dag("dag_b", user)
+                assert not self.security_manager.can_edit_dag("dag_a", user)
+                assert self.security_manager.has_access(
+                    permissions.ACTION_CAN_READ, permissions.RESOURCE_WEBSITE, user
+                )
+
+        # A new request only checks that the role permissions did not change
+        with self.app.app_context():
+            with assert_queries_count(1):
+                assert self.security_manager.can_read_dag("dag_a", user)
+
+        assert self.security_manager.get_readable_dag_ids(user) == {"dag_a"}
+        assert self.security_manager.get_editable_dag_ids(user) == set()
+
+    def test_permission_index_picks_up_permission_changes(self):
+        self._create_dag("dag_a")
+        user = api_connexion_utils.create_user(self.app, "permission_index_user", "MyRole3")
+        role = self.security_manager.find_role("MyRole3")
+        dag_resource_name = permissions.resource_name_for_dag("dag_a")
+        assert not self.security_manager.can_read_dag("dag_a", user)
+
+        # Changed through the security manager
+        self.security_manager.add_permission_to_role(
+            role, self.security_manager.get_permission(permissions.ACTION_CAN_EDIT, dag_resource_name)
+        )
+        assert self.security_manager.can_edit_dag("dag_a", user)
+
+        # Changed directly in the database, e.g. by another webserver process
+        role.permissions = [
+            self.security_manager.get_permission(permissions.ACTION_CAN_READ, dag_resource_name)
+        ]
+        self.security_manager.get_session.commit()
+        assert self.security_manager.can_read_dag("dag_a", user)
+        assert not self.security_manager.can_edit_dag("dag_a", user)
+
+    def test_dag_access_filter_for_all_dags_access(self):
+        user = api_connexion_utils.create_user(
+            self.app,
+            "permission_index_user",
+            "MyRole1",
+            permissions=[(permissions.ACTION_CAN_READ, permissions.RESOURCE_DAG)],
+        )
+        self._create_dag("dag_a")
+
+        criterion = self.security_manager.dag_access_filter(DagModel.dag_id, READ_ONLY, user)
+
+        assert str(criterion) == "true"
+        assert self.security_manager.get_readable_dag_ids(user) == {"dag_a"}
+
     def test_prefixed_dag_id_is_deprecated(self):
         with pytest.warns(
             DeprecationWarning,
@@ -649,3 +716,20 @@ class TestSecurity(unittest.TestCase):
             ),
         ):
             self.security_manager.prefixed_dag_id("hello")
+
+
+class TestPermissionIndex:
+    def test_permission_index(self):
+        index = PermissionIndex(
+            [
+                (permissions.ACTION_CAN_READ, permissions.RESOURCE_DAG),
+                (permissions.ACTION_CAN_EDIT, permissions.resource_name_for_dag("dag_a")),
+                (permissions.ACTION_CAN_READ, permissions.RESOURCE_WEBSITE),
+            ]
+        )
+
+        assert index.has(permissions.ACTION_CAN_READ, permissions.RESOURCE_WEBSITE)
+        assert not index.has(permissions.ACTION_CAN_EDIT, permissions.RESOURCE_WEBSITE)
+        assert index.get_dag_ids([permissions.ACTION_CAN_READ]) is None
+        assert "dag_a" in index.get_dag_ids([permissions.ACTION_CAN_EDIT])
+        assert index.get_dag_ids([permissions.ACTION_CAN_DELETE]) == set()
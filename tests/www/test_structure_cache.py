@@ -0,0 +1,104 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from unittest import mock
+
+import pytest
+from flask import Flask
+
+from airflow.models import DAG
+from airflow.operators.dummy import DummyOperator
+from airflow.utils import timezone
+from airflow.www.structure_cache import (
+    STRUCTURE_CACHE,
+    StructureCache,
+    conditional_json_response,
+    get_partial_subset,
+)
+
+
+@pytest.fixture
+def dag():
+    with DAG("test_structure_cache", start_date=timezone.datetime(2021, 1, 1)) as dag:
+        DummyOperator(task_id="first") >> DummyOperator(task_id="second") >> DummyOperator(task_id="third")
+    return dag
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    STRUCTURE_CACHE.clear()
+    yield
+    STRUCTURE_CACHE.clear()
+
+
+def test_structure_cache_evicts_least_recently_used():
+    cache = StructureCache(max_entries=2)
+    build = mock.Mock(side_effect=lambda: object())
+    first = cache.get("a", build)
+    cache.get("b", build)
+    assert cache.get("a", build) is first
+    cache.get("c", build)
+    assert build.call_count == 3
+
+    assert cache.get("a", build) is first
+    cache.get("b", build)
+    assert build.call_count == 4
+
+
+def test_partial_subset_is_shared_while_hash_is_unchanged(dag):
+    subset = get_partial_subset(dag, "hash", "second", include_upstream=True, include_downstream=False)
+    assert subset.task_ids == ["first", "second"]
+    assert (
+        get_partial_subset(dag, "hash", "second", include_upstream=True, include_downstream=False) is subset
+    )
+    assert get_partial_subset(
+        dag, "other", "second", include_upstream=True, include_downstream=False
+    ) is not (subset)
+    assert get_partial_subset(dag, None, "second", include_upstream=True, include_downstream=False) is not (
+        subset
+    )
+
+
+def test_conditional_json_response():
+    app = Flask(__name__)
+    render = mock.Mock(return_value={"tasks": ["first"]})
+
+    with app.test_request_context("/"):
+        response = conditional_json_response(("tasks", "dag", "hash"), render)
+    assert response.status_code == 200
+    assert response.get_json() == {"tasks": ["first"]}
+    etag, weak = response.get_etag()
+    assert weak
+    assert response.cache_control.no_cache
+
+    with app.test_request_context("/"):
+        assert conditional_json_response(("tasks", "dag", "hash"), render).get_json() == {"tasks": ["first"]}
+    assert render.call_count == 1
+
+    with app.test_request_context("/", headers={"If-None-Match": f'W/"{etag}"'}):
+        response = conditional_json_response(("tasks", "dag", "hash"), render)
+    assert response.status_code == 304
+    assert response.get_etag() == (etag, True)
+
+    with app.test_request_context("/", headers={"If-None-Match": f'W/"{etag}"'}):
+        response = conditional_json_response(("tasks", "dag", "new_hash"), render)
+    assert response.status_code == 200
+    assert response.get_etag()[0] != etag
+
+    with app.test_request_context("/"):
+        assert conditional_json_response(None, render) == {"tasks": ["first"]}
+    assert render.call_count == 3
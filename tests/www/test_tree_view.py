@@ -0,0 +1,123 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import json
+from datetime import timedelta
+
+import pytest
+
+from airflow.models import DAG
+from airflow.operators.dummy import DummyOperator
+from airflow.utils import timezone
+from airflow.utils.session import create_session
+from airflow.utils.state import State
+from airflow.utils.types import DagRunType
+from airflow.www.tree_view import TreeDataCache, TreeLayout, get_tree_data
+from tests.test_utils.asserts import assert_queries_count
+from tests.test_utils.db import clear_db_runs
+
+DEFAULT_DATE = timezone.datetime(2021, 1, 1)
+
+
+@pytest.fixture
+def dag():
+    with DAG("test_tree_view_payload", start_date=DEFAULT_DATE, schedule_interval="@daily") as dag:
+        first = DummyOperator(task_id="first")
+        second = DummyOperator(task_id="second")
+        third = DummyOperator(task_id="third")
+        last = DummyOperator(task_id="last")
+        first >> [second, third] >> last
+    return dag
+
+
+@pytest.fixture
+def dag_runs(dag):
+    clear_db_runs()
+    runs = [
+        dag.create_dagrun(
+            run_type=DagRunType.SCHEDULED,
+            execution_date=DEFAULT_DATE + timedelta(days=i),
+            state=State.RUNNING,
+        )
+        for i in range(2)
+    ]
+    yield {dr.execution_date: {'execution_date': dr.execution_date.isoformat()} for dr in runs}
+    clear_db_runs()
+
+
+def _nodes(nodes):
+    for node in nodes:
+        yield node
+        yield from _nodes(node.get('children', []) + node.get('_children', []))
+
+
+def test_layout_renders_rows_in_every_node(dag):
+    layout = TreeLayout(dag)
+    rows = [json.dumps([task_id]) for task_id in layout.task_ids]
+
+    nodes = json.loads(layout.render(rows))
+
+    assert [node['name'] for node in nodes] == ['first']
+    assert sorted(node['name'] for node in _nodes(nodes)) == ['first', 'last', 'last', 'second', 'third']
+    for node in _nodes(nodes):
+        assert node['instances'] == [node['name']]
+
+
+def test_get_tree_data(dag, dag_runs):
+    with create_session() as session:
+        ti = dag.get_dagrun(DEFAULT_DATE, session=session).get_task_instance('second', session=session)
+        ti.state = State.SUCCESS
+        ti.start_date = DEFAULT_DATE
+        ti.end_date = DEFAULT_DATE + timedelta(seconds=12)
+        ti.duration = 12.5
+        session.merge(ti)
+        session.commit()
+
+        data = json.loads(get_tree_data(dag, dag_runs, dag_hash=None, session=session))
+
+    assert data['name'] == '[DAG]'
+    assert [run['execution_date'] for run in data['instances']] == [d.isoformat() for d in sorted(dag_runs)]
+    second = next(node for node in _nodes(data['children']) if node['name'] == 'second')
+    assert second['instances'][0] == [State.SUCCESS, 1, int(DEFAULT_DATE.timestamp()), 12]
+    assert second['instances'][1] == [None, 1, None, None]
+
+
+def test_unchanged_runs_are_not_fetched_again(dag, dag_runs):
+    cache = TreeDataCache()
+    dates = sorted(dag_runs)
+    with create_session() as session:
+        with assert_queries_count(2):
+            first = cache.get_task_instance_cells(dag.dag_id, dates, session)
+        with assert_queries_count(1):
+            assert cache.get_task_instance_cells(dag.dag_id, dates, session) == first
+
+        dag.get_dagrun(dates[1], session=session).get_task_instance('first', session=session).set_state(
+            State.FAILED, session=session
+        )
+        session.flush()
+        cells = cache.get_task_instance_cells(dag.dag_id, dates, session)
+
+    assert cells[dates[0]] is first[dates[0]]
+    assert json.loads(cells[dates[1]]['first'])[0] == State.FAILED
+
+
+def test_layout_is_cached_per_dag_hash(dag):
+    cache = TreeDataCache()
+    layout = cache.get_layout(dag, "hash")
+    assert cache.get_layout(dag, "hash") is layout
+    assert cache.get_layout(dag, "new_hash") is not layout
+    assert cache.get_layout(dag, None) is not cache.get_layout(dag, None)
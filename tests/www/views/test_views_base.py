@@ -33,7 +33,7 @@ from tests.test_utils.www import check_content_in_response, check_content_not_in
 
 
 def test_index(admin_client):
-    with assert_queries_count(44):
+    with assert_queries_count(9):
         resp = admin_client.get('/', follow_redirects=True)
     check_content_in_response('DAGs', resp)
 
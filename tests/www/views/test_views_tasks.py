@@ -222,6 +222,27 @@ def test_escape_in_tree_view(app, admin_client, test_str, expected_text):
     check_content_in_response(expected_text, resp)
 
 
+def test_tree_data_conditional_get(app, admin_client):
+    url = 'object/tree_data?dag_id=test_tree_view'
+    resp = admin_client.get(url)
+    assert resp.status_code == 200
+    etag = resp.headers['ETag']
+
+    resp = admin_client.get(url, headers={'If-None-Match': etag})
+    assert resp.status_code == 304
+    assert resp.data == b''
+
+    app.dag_bag.get_dag('test_tree_view').create_dagrun(
+        execution_date=DEFAULT_DATE,
+        start_date=timezone.utcnow(),
+        run_type=DagRunType.MANUAL,
+        state=State.RUNNING,
+    )
+    resp = admin_client.get(url, headers={'If-None-Match': etag})
+    assert resp.status_code == 200
+    assert resp.headers['ETag'] != etag
+
+
 def test_dag_details_trigger_origin_tree_view(app, admin_client):
     app.dag_bag.get_dag('test_tree_view').create_dagrun(
         run_type=DagRunType.SCHEDULED,